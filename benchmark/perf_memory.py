@@ -9,6 +9,7 @@ Examples
     uv run python benchmark/perf_memory.py --rows 50000 --cols 30
     uv run python benchmark/perf_memory.py --wire json --output before.json
     uv run python benchmark/perf_memory.py --compare before.json
+    uv run python benchmark/perf_memory.py --zip-sweep
 
 """
 
@@ -41,6 +42,18 @@ WORKLOAD_DESCRIPTION = {
     'style_pattern': 'column modulo four fixed styles',
 }
 METADATA_TOOLS = frozenset({'git', 'go'})
+ZIP_LEVEL_CHOICES = ('default', *(str(level) for level in range(10)))
+# Stored, fastest, the recommended fast level, and the stdlib compressor.
+ZIP_SWEEP_LEVELS = ('0', '1', '6', 'default')
+# Go runtime figures summarized across samples; each sample is one export in
+# a fresh process, so the cumulative counters describe that export alone.
+NATIVE_RUNTIME_SUMMARY_KEYS = (
+    'heap_peak_bytes',
+    'total_bytes',
+    'export_allocated_bytes',
+    'gc_cycles',
+    'gc_pause_seconds',
+)
 
 
 def _package_version(distribution: str) -> str | None:
@@ -165,6 +178,9 @@ def _worker(
     else:
         xlsx_bytes = len(native.export_bytes(payload, 1))
     exported = time.perf_counter()
+    # Go heap and GC figures separate the embedded runtime's share of the
+    # peak RSS from Python's; None for libraries older than ABI v7.
+    native_runtime = native.runtime_stats()
 
     return {
         'rows': rows,
@@ -177,15 +193,23 @@ def _worker(
         'export_seconds': exported - built,
         'total_seconds': exported - started,
         'peak_rss_bytes': _peak_rss_bytes(),
+        'native_runtime': native_runtime,
         'xlsx_bytes': xlsx_bytes,
         'wire_bytes': len(payload),
+        'zip_level': os.environ.get('PYFASTEXCEL_ZIP_LEVEL') or 'default',
         'native_abi': native.abi_version,
         'native_library': str(native_path),
         'native_library_sha256': _file_sha256(native_path),
     }
 
 
-def _run_sample(rows: int, cols: int, wire: str, destination: str) -> dict[str, Any]:
+def _run_sample(
+    rows: int,
+    cols: int,
+    wire: str,
+    destination: str,
+    zip_level: str | None = None,
+) -> dict[str, Any]:
     # Preserve virtual-environment launcher symlinks while making PATH lookup
     # impossible for the worker executable.
     python_executable = str(Path(sys.executable).absolute())
@@ -202,11 +226,18 @@ def _run_sample(rows: int, cols: int, wire: str, destination: str) -> dict[str,
         '--destination',
         destination,
     ]
+    # ``None`` inherits PYFASTEXCEL_ZIP_LEVEL from the caller's environment.
+    env = dict(os.environ)
+    if zip_level == 'default':
+        env.pop('PYFASTEXCEL_ZIP_LEVEL', None)
+    elif zip_level is not None:
+        env['PYFASTEXCEL_ZIP_LEVEL'] = zip_level
     # The executable and harness are absolute, validated values are separate
     # arguments, and no shell interprets the command.
     completed = subprocess.run(  # nosec B603
         command,
         cwd=ROOT,
+        env=env,
         check=True,
         capture_output=True,
         text=True,
@@ -281,9 +312,40 @@ def _summarize(samples: list[dict[str, Any]]) -> dict[str, Any]:
         if rss_values
         else None
     )
+    runtimes = [sample['native_runtime'] for sample in samples if sample.get('native_runtime')]
+    for key in NATIVE_RUNTIME_SUMMARY_KEYS:
+        values = [runtime[key] for runtime in runtimes]
+        summary[f'native_{key}'] = (
+            {'mean': statistics.mean(values), 'min': min(values), 'max': max(values)}
+            if values
+            else None
+        )
     return summary
 
 
+def _zip_level_sweep(
+    rows: int,
+    cols: int,
+    wire: str,
+    destination: str,
+    repeat: int,
+) -> list[dict[str, Any]]:
+    """Export the same workload once per ZIP level and tabulate the cost."""
+    table = []
+    for zip_level in ZIP_SWEEP_LEVELS:
+        samples = [_run_sample(rows, cols, wire, destination, zip_level) for _ in range(repeat)]
+        summary = _summarize(samples)
+        table.append(
+            {
+                'zip_level': zip_level,
+                'export_seconds': summary['export_seconds'],
+                'total_seconds': summary['total_seconds'],
+                'xlsx_bytes': samples[0]['xlsx_bytes'],
+            },
+        )
+    return table
+
+
 def _comparison(current: dict[str, Any], baseline: dict[str, Any]) -> dict[str, float]:
     for key in (
         'schema_version',
@@ -299,6 +361,9 @@ def _comparison(current: dict[str, Any], baseline: dict[str, Any]) -> dict[str,
     baseline_destination = baseline['workload'].get('destination', 'bytes')
     if current_destination != baseline_destination:
         raise ValueError('cannot compare byte-return and direct-file destinations')
+    current_zip_level = current['workload'].get('zip_level', 'default')
+    if current_zip_level != baseline['workload'].get('zip_level', 'default'):
+        raise ValueError('cannot compare different zip compression levels')
 
     changes: dict[str, float] = {}
     for key in ('build_seconds', 'export_seconds', 'total_seconds'):
@@ -310,6 +375,12 @@ def _comparison(current: dict[str, Any], baseline: dict[str, Any]) -> dict[str,
     new_rss = current['summary'].get('peak_rss_bytes')
     if old_rss and new_rss:
         changes['peak_rss_percent'] = (new_rss['mean'] - old_rss['mean']) / old_rss['mean'] * 100
+    old_heap = baseline['summary'].get('native_heap_peak_bytes')
+    new_heap = current['summary'].get('native_heap_peak_bytes')
+    if old_heap and new_heap:
+        changes['native_heap_peak_percent'] = (
+            (new_heap['mean'] - old_heap['mean']) / old_heap['mean'] * 100
+        )
     return changes
 
 
@@ -320,6 +391,16 @@ def _parse_args() -> argparse.Namespace:
     parser.add_argument('--repeat', type=int, default=3)
     parser.add_argument('--wire', choices=('msgpack', 'json'), default='msgpack')
     parser.add_argument('--destination', choices=('bytes', 'file'), default='bytes')
+    parser.add_argument(
+        '--zip-level',
+        choices=ZIP_LEVEL_CHOICES,
+        help='PYFASTEXCEL_ZIP_LEVEL for every sample (default: inherit the environment)',
+    )
+    parser.add_argument(
+        '--zip-sweep',
+        action='store_true',
+        help=f'also export at zip levels {", ".join(ZIP_SWEEP_LEVELS)} and tabulate them',
+    )
     parser.add_argument('--output', type=Path)
     parser.add_argument('--compare', type=Path)
     parser.add_argument('--worker', action='store_true', help=argparse.SUPPRESS)
@@ -337,7 +418,8 @@ def main() -> None:
 
     _require_current_native_build()
     samples = [
-        _run_sample(args.rows, args.cols, args.wire, args.destination) for _ in range(args.repeat)
+        _run_sample(args.rows, args.cols, args.wire, args.destination, args.zip_level)
+        for _ in range(args.repeat)
     ]
     native_fingerprints = {
         (
@@ -390,6 +472,7 @@ def main() -> None:
             'wire_requested': args.wire,
             'wire_effective': samples[0]['effective_wire'],
             'destination': args.destination,
+            'zip_level': samples[0]['zip_level'],
             'repeat': args.repeat,
             **WORKLOAD_DESCRIPTION,
         },
@@ -397,6 +480,15 @@ def main() -> None:
         'summary': _summarize(samples),
     }
 
+    if args.zip_sweep:
+        report['zip_level_sweep'] = _zip_level_sweep(
+            args.rows,
+            args.cols,
+            args.wire,
+            args.destination,
+            args.repeat,
+        )
+
     if args.compare:
         with args.compare.open(encoding='utf-8') as baseline_file:
             report['change_from_baseline'] = _comparison(report, json.load(baseline_file))
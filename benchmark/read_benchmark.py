@@ -0,0 +1,96 @@
+"""pyfastexcel.read_rows vs openpyxl read-only throughput benchmark.
+
+Writes one workbook with pyfastexcel, then times reading every row of it with
+``pyfastexcel.read_rows`` and with openpyxl's ``read_only`` mode, after
+checking that both return the same values. Every sample reads the whole sheet.
+
+Usage:
+    uv run python benchmark/read_benchmark.py
+    uv run python benchmark/read_benchmark.py --rows 50000 --cols 30 --repeat 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from openpyxl import load_workbook
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))  # noqa
+
+from pyfastexcel import Workbook, read_rows  # noqa: E402
+
+
+def write_workbook(path: Path, rows: int, cols: int) -> None:
+    workbook = Workbook()
+    sheet = workbook['Sheet1']
+    for row in range(rows):
+        sheet[row] = [f'r{row}c{col}' if col % 2 else row * cols + col for col in range(cols)]
+    workbook.save(str(path))
+
+
+def read_with_pyfastexcel(path: Path) -> list[list[str]]:
+    return list(read_rows(path))
+
+
+def read_with_openpyxl(path: Path) -> list[list[str]]:
+    workbook = load_workbook(path, read_only=True)
+    try:
+        return [
+            ['' if value is None else str(value) for value in row]
+            for row in workbook.active.iter_rows(values_only=True)
+        ]
+    finally:
+        workbook.close()
+
+
+def check_parity(path: Path) -> None:
+    pyfastexcel_rows = read_with_pyfastexcel(path)
+    openpyxl_rows = read_with_openpyxl(path)
+    if pyfastexcel_rows != openpyxl_rows:
+        raise SystemExit('read_rows and openpyxl read_only returned different rows')
+
+
+def measure(read, path: Path, repeat: int) -> list[float]:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        read(path)
+        samples.append(time.perf_counter() - started)
+    return samples
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=50000)
+    parser.add_argument('--cols', type=int, default=30)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / 'read_benchmark.xlsx'
+        write_workbook(path, args.rows, args.cols)
+        check_parity(path)
+        print(f'Read {args.rows} rows x {args.cols} columns, {args.repeat} samples')
+        results = {
+            'pyfastexcel.read_rows': measure(read_with_pyfastexcel, path, args.repeat),
+            'openpyxl read_only': measure(read_with_openpyxl, path, args.repeat),
+        }
+    for name, samples in results.items():
+        print(
+            f'{name:<24} mean {statistics.mean(samples):.3f}s '
+            f'min {min(samples):.3f}s max {max(samples):.3f}s'
+        )
+    ratio = statistics.mean(results['openpyxl read_only']) / statistics.mean(
+        results['pyfastexcel.read_rows']
+    )
+    print(f'read_rows is {ratio:.1f}x faster')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+package main
+
+/*
+#include <stdint.h>
+
+typedef int32_t (*pyfastexcel_progress_fn)(int64_t sheet, int64_t rows_written, int64_t bytes_compressed);
+
+static int32_t pyfastexcel_call_progress(
+	void *callback,
+	int64_t sheet,
+	int64_t rows_written,
+	int64_t bytes_compressed
+) {
+	return ((pyfastexcel_progress_fn)callback)(sheet, rows_written, bytes_compressed);
+}
+*/
+import "C"
+
+import (
+	"sync/atomic"
+	"unsafe"
+
+	"github.com/Zncl2222/pyfastexcel/pyfastexcel/core"
+)
+
+// exportHooks adapts the progress callback and cancellation flag of the
+// ABI-v6 entry points to core.ExportHooks. progress is a C function
+// `int32_t (*)(int64_t sheet, int64_t rows_written, int64_t bytes_compressed)`
+// that returns non-zero to stop the export, and cancel points to an int32 the
+// caller sets to non-zero, from any thread, for the same. Either may be NULL.
+func exportHooks(progress unsafe.Pointer, cancel unsafe.Pointer) *core.ExportHooks {
+	if progress == nil && cancel == nil {
+		return nil
+	}
+	var stopped atomic.Bool
+	hooks := &core.ExportHooks{}
+	if progress != nil {
+		hooks.Progress = func(sheet int, rowsWritten int64, bytesCompressed int64) {
+			status := C.pyfastexcel_call_progress(
+				progress,
+				C.int64_t(sheet),
+				C.int64_t(rowsWritten),
+				C.int64_t(bytesCompressed),
+			)
+			if status != 0 {
+				stopped.Store(true)
+			}
+		}
+	}
+	flag := (*int32)(cancel)
+	hooks.Cancelled = func() bool {
+		return stopped.Load() || (flag != nil && atomic.LoadInt32(flag) != 0)
+	}
+	return hooks
+}
@@ -7,6 +7,7 @@ import (
 import (
 	"bytes"
 	"encoding/binary"
+	"encoding/json"
 	"fmt"
 	"io/fs"
 	"math"
@@ -52,7 +53,7 @@ func Export(data *C.char, useCatchPanic int64) *C.char {
 //
 //export GetABIVersion
 func GetABIVersion() int64 {
-	return 2
+	return 11
 }
 
 // ExportV2 accepts a length-delimited PFX2 or legacy JSON payload and returns
@@ -66,9 +67,56 @@ func ExportV2(
 	useCatchPanic int64,
 	outLen *C.size_t,
 	outError **C.char,
-) (result unsafe.Pointer) {
+) unsafe.Pointer {
 	_ = useCatchPanic // ABI compatibility: v2 always converts panics to errors.
+	return exportBytes(data, dataLen, outLen, outError, nil, nil)
+}
+
+// ExportV3 is ExportV2 that also returns the export report as a C-owned JSON
+// string in outReport. The report is only set on success; the caller must
+// release it with FreeCPointer.
+//
+//export ExportV3
+func ExportV3(
+	data unsafe.Pointer,
+	dataLen C.size_t,
+	outLen *C.size_t,
+	outError **C.char,
+	outReport **C.char,
+) unsafe.Pointer {
+	return exportBytes(data, dataLen, outLen, outError, outReport, nil)
+}
+
+// ExportV4 is ExportV3 with a progress callback and a cancellation flag, both
+// optional. progress is called as progress(sheet, rows_written,
+// bytes_compressed) from native threads, never concurrently: with a
+// sheet_order index while rows are written, and with sheet -1 while the
+// workbook is compressed. A non-zero return value, or setting the int32 at
+// cancel to non-zero, stops the export with an error.
+//
+//export ExportV4
+func ExportV4(
+	data unsafe.Pointer,
+	dataLen C.size_t,
+	outLen *C.size_t,
+	outError **C.char,
+	outReport **C.char,
+	progress unsafe.Pointer,
+	cancel unsafe.Pointer,
+) unsafe.Pointer {
+	return exportBytes(data, dataLen, outLen, outError, outReport, exportHooks(progress, cancel))
+}
+
+func exportBytes(
+	data unsafe.Pointer,
+	dataLen C.size_t,
+	outLen *C.size_t,
+	outError **C.char,
+	outReport **C.char,
+	hooks *core.ExportHooks,
+) (result unsafe.Pointer) {
 	initializeV2Outputs(outLen, outError)
+	initializeV3Report(outReport)
 	defer func() {
 		if recovered := recover(); recovered != nil {
 			if result != nil {
@@ -78,6 +126,7 @@ func ExportV2(
 			if outLen != nil {
 				*outLen = 0
 			}
+			freeV3Report(outReport)
 			setV2Error(outError, fmt.Errorf("pyfastexcel panic: %v", recovered))
 		}
 	}()
@@ -91,22 +140,92 @@ func ExportV2(
 		setV2Error(outError, err)
 		return nil
 	}
-	workbook, err := core.WriteExcelV2(payload)
+	// The workbook is copied to C memory straight out of the pooled export
+	// buffer, which is reused by the next export.
+	var workbookLength int
+	report, err := core.WriteExcelWithHooksFunc(payload, hooks, func(workbook []byte) error {
+		if len(workbook) == 0 {
+			return fmt.Errorf("generated workbook is empty")
+		}
+		result = C.CBytes(workbook)
+		if result == nil {
+			return fmt.Errorf("allocate C workbook buffer")
+		}
+		workbookLength = len(workbook)
+		return nil
+	})
+	if err == nil {
+		err = setV3Report(outReport, report)
+	}
 	if err != nil {
+		if result != nil {
+			C.free(result)
+			result = nil
+		}
 		setV2Error(outError, err)
 		return nil
 	}
-	if len(workbook) == 0 {
-		setV2Error(outError, fmt.Errorf("generated workbook is empty"))
+	*outLen = C.size_t(workbookLength)
+	return result
+}
+
+// GetPoolStatsV2 returns the cumulative counters of the native buffer pools
+// as a C-owned JSON object keyed by pool name. The caller must release it
+// with FreeCPointer.
+//
+//export GetPoolStatsV2
+func GetPoolStatsV2() *C.char {
+	encoded, err := json.Marshal(core.PoolStatistics())
+	if err != nil {
 		return nil
 	}
-	result = C.CBytes(workbook)
-	if result == nil {
-		setV2Error(outError, fmt.Errorf("allocate C workbook buffer"))
+	return C.CString(string(encoded))
+}
+
+// GetRuntimeStatsV2 returns a runtime/metrics snapshot of the embedded Go
+// runtime (heap, GC, goroutines and per-export allocations) as a C-owned JSON
+// object. The caller must release it with FreeCPointer.
+//
+//export GetRuntimeStatsV2
+func GetRuntimeStatsV2() *C.char {
+	encoded, err := json.Marshal(core.RuntimeStatistics())
+	if err != nil {
 		return nil
 	}
-	*outLen = C.size_t(len(workbook))
-	return result
+	return C.CString(string(encoded))
+}
+
+// StartProfileV2 starts a runtime/pprof capture of the exports that follow:
+// a CPU profile written to cpuPath and a heap profile written to heapPath
+// when StopProfileV2 is called. Either path may be NULL. It returns NULL on
+// success, otherwise a C-owned error string the caller must release with
+// FreeCPointer.
+//
+//export StartProfileV2
+func StartProfileV2(cpuPath *C.char, heapPath *C.char) *C.char {
+	return optionalCError(core.StartProfile(optionalGoString(cpuPath), optionalGoString(heapPath)))
+}
+
+// StopProfileV2 ends the capture StartProfileV2 began and writes its
+// profiles. It returns NULL or a C-owned error string like StartProfileV2.
+//
+//export StopProfileV2
+func StopProfileV2() *C.char {
+	return optionalCError(core.StopProfile())
+}
+
+func optionalGoString(value *C.char) string {
+	if value == nil {
+		return ""
+	}
+	return C.GoString(value)
+}
+
+func optionalCError(err error) *C.char {
+	if err == nil {
+		return nil
+	}
+	return C.CString(err.Error())
 }
 
 // ExportToFileV2 writes a PFX2 or legacy JSON payload to a local path. It
@@ -120,12 +239,124 @@ func ExportToFileV2(
 	path *C.char,
 	useCatchPanic int64,
 	outError **C.char,
-) (status int64) {
+) int64 {
 	_ = useCatchPanic // ABI compatibility: v2 always converts panics to errors.
+	return exportFile(data, dataLen, path, outError, nil, nil)
+}
+
+// ExportToFileV3 is ExportToFileV2 that also returns the export report as a
+// C-owned JSON string in outReport on success.
+//
+//export ExportToFileV3
+func ExportToFileV3(
+	data unsafe.Pointer,
+	dataLen C.size_t,
+	path *C.char,
+	outError **C.char,
+	outReport **C.char,
+) int64 {
+	return exportFile(data, dataLen, path, outError, outReport, nil)
+}
+
+// ExportToFileV4 is ExportToFileV3 with the optional progress callback and
+// cancellation flag of ExportV4.
+//
+//export ExportToFileV4
+func ExportToFileV4(
+	data unsafe.Pointer,
+	dataLen C.size_t,
+	path *C.char,
+	outError **C.char,
+	outReport **C.char,
+	progress unsafe.Pointer,
+	cancel unsafe.Pointer,
+) int64 {
+	return exportFile(data, dataLen, path, outError, outReport, exportHooks(progress, cancel))
+}
+
+// ExportBatchV2 writes count PFX2 or legacy JSON payloads to their paths
+// concurrently, on at most maxWorkers goroutines (one per CPU when
+// maxWorkers < 1). payloads, payloadLens and paths hold one entry per item;
+// outErrors and outReports are caller-allocated arrays of count pointers that
+// receive each item's C-owned error string or JSON export report, NULL when
+// absent. The caller must release every returned string with FreeCPointer.
+// It returns the number of failed items, or -1 when the arrays themselves are
+// invalid.
+//
+//export ExportBatchV2
+func ExportBatchV2(
+	payloads *unsafe.Pointer,
+	payloadLens *C.size_t,
+	paths **C.char,
+	count C.size_t,
+	maxWorkers int64,
+	outErrors **C.char,
+	outReports **C.char,
+) (failed int64) {
+	defer func() {
+		if recovered := recover(); recovered != nil {
+			failed = -1
+		}
+	}()
+	if count == 0 {
+		return 0
+	}
+	if payloads == nil || payloadLens == nil || paths == nil || outErrors == nil || outReports == nil {
+		return -1
+	}
+	if uint64(count) > math.MaxInt32 {
+		return -1
+	}
+	itemCount := int(count)
+	payloadItems := unsafe.Slice(payloads, itemCount)
+	lengthItems := unsafe.Slice(payloadLens, itemCount)
+	pathItems := unsafe.Slice(paths, itemCount)
+	errorItems := unsafe.Slice(outErrors, itemCount)
+	reportItems := unsafe.Slice(outReports, itemCount)
+
+	items := make([]core.BatchItem, itemCount)
+	for index := range items {
+		errorItems[index] = nil
+		reportItems[index] = nil
+		payload, length := payloadItems[index], lengthItems[index]
+		if pathItems[index] == nil {
+			items[index].Load = func() ([]byte, error) {
+				return nil, fmt.Errorf("output path must not be NULL")
+			}
+			continue
+		}
+		items[index].Path = C.GoString(pathItems[index])
+		items[index].Load = func() ([]byte, error) {
+			return copyV2Payload(payload, length)
+		}
+	}
+	for index, result := range core.WriteExcelBatch(items, int(maxWorkers)) {
+		err := result.Err
+		if err == nil {
+			err = setV3Report(&reportItems[index], result.Report)
+		}
+		if err != nil {
+			setV2Error(&errorItems[index], err)
+			failed++
+		}
+	}
+	return failed
+}
+
+func exportFile(
+	data unsafe.Pointer,
+	dataLen C.size_t,
+	path *C.char,
+	outError **C.char,
+	outReport **C.char,
+	hooks *core.ExportHooks,
+) (status int64) {
 	initializeV2Outputs(nil, outError)
+	initializeV3Report(outReport)
 	status = 1
 	defer func() {
 		if recovered := recover(); recovered != nil {
+			freeV3Report(outReport)
 			setV2Error(outError, fmt.Errorf("pyfastexcel panic: %v", recovered))
 			status = 1
 		}
@@ -140,13 +371,260 @@ func ExportToFileV2(
 		setV2Error(outError, err)
 		return status
 	}
-	if err := core.WriteExcelV2ToFile(payload, C.GoString(path)); err != nil {
+	report, err := core.WriteExcelToFileWithHooks(payload, C.GoString(path), hooks)
+	if err != nil {
+		setV2Error(outError, err)
+		return status
+	}
+	if err := setV3Report(outReport, report); err != nil {
 		setV2Error(outError, err)
 		return status
 	}
 	return 0
 }
 
+// CompileTemplateV2 compiles a PFX2 payload into a reusable workbook
+// template and returns its handle for RenderTemplateV2. On failure it returns
+// 0 and a C-owned error string. The caller must release the handle with
+// ReleaseTemplateV2.
+//
+//export CompileTemplateV2
+func CompileTemplateV2(data unsafe.Pointer, dataLen C.size_t, outError **C.char) (handle int64) {
+	initializeV2Outputs(nil, outError)
+	defer func() {
+		if recovered := recover(); recovered != nil {
+			setV2Error(outError, fmt.Errorf("pyfastexcel panic: %v", recovered))
+			handle = 0
+		}
+	}()
+
+	payload, err := copyV2Payload(data, dataLen)
+	if err != nil {
+		setV2Error(outError, err)
+		return 0
+	}
+	template, err := core.CompileTemplate(payload)
+	if err != nil {
+		setV2Error(outError, err)
+		return 0
+	}
+	return core.RegisterTemplate(template)
+}
+
+// RenderTemplateV2 writes a compiled template to path with new rows appended
+// to its sheets. rows is a MessagePack row stream; rowCounts and rowOffsets
+// are arrays of sheetCount entries giving each sheet's new rows and their
+// starting offset in rows. It returns zero on success and a non-zero status
+// with a C-owned error string on failure, plus the export report like
+// ExportToFileV3.
+//
+//export RenderTemplateV2
+func RenderTemplateV2(
+	handle int64,
+	rows unsafe.Pointer,
+	rowsLen C.size_t,
+	rowCounts *int64,
+	rowOffsets *int64,
+	sheetCount C.size_t,
+	path *C.char,
+	outError **C.char,
+	outReport **C.char,
+) (status int64) {
+	initializeV2Outputs(nil, outError)
+	initializeV3Report(outReport)
+	status = 1
+	defer func() {
+		if recovered := recover(); recovered != nil {
+			freeV3Report(outReport)
+			setV2Error(outError, fmt.Errorf("pyfastexcel panic: %v", recovered))
+			status = 1
+		}
+	}()
+
+	template := core.LookupTemplate(handle)
+	if template == nil {
+		setV2Error(outError, fmt.Errorf("template handle %d is not valid", handle))
+		return status
+	}
+	if path == nil {
+		setV2Error(outError, fmt.Errorf("output path must not be NULL"))
+		return status
+	}
+	if uint64(sheetCount) > math.MaxInt32 || (sheetCount != 0 && (rowCounts == nil || rowOffsets == nil)) {
+		setV2Error(outError, fmt.Errorf("template row counts and offsets are invalid"))
+		return status
+	}
+	rowStream, err := copyV2Payload(rows, rowsLen)
+	if err != nil {
+		setV2Error(outError, err)
+		return status
+	}
+	counts := make([]int, int(sheetCount))
+	offsets := make([]int64, int(sheetCount))
+	if sheetCount != 0 {
+		for index, count := range unsafe.Slice(rowCounts, int(sheetCount)) {
+			counts[index] = int(count)
+		}
+		copy(offsets, unsafe.Slice(rowOffsets, int(sheetCount)))
+	}
+	report, err := template.Render(rowStream, counts, offsets, C.GoString(path))
+	if err != nil {
+		setV2Error(outError, err)
+		return status
+	}
+	if err := setV3Report(outReport, report); err != nil {
+		setV2Error(outError, err)
+		return status
+	}
+	return 0
+}
+
+// ReleaseTemplateV2 frees a template compiled by CompileTemplateV2. Releasing
+// an unknown handle does nothing.
+//
+//export ReleaseTemplateV2
+func ReleaseTemplateV2(handle int64) {
+	core.ReleaseTemplate(handle)
+}
+
+// OpenRowReaderV2 opens the worksheet sheet of the workbook at path for
+// streaming reads and returns a handle for ReadRowChunkV2. A NULL or empty
+// sheet selects the first worksheet, chunkRows <= 0 the default chunk size,
+// and a non-zero raw returns cell values without their number formats. On
+// failure it returns 0 and a C-owned error string. The caller must release
+// the handle with CloseRowReaderV2.
+//
+//export OpenRowReaderV2
+func OpenRowReaderV2(
+	path *C.char,
+	sheet *C.char,
+	chunkRows int64,
+	raw int64,
+	outError **C.char,
+) (handle int64) {
+	initializeV2Outputs(nil, outError)
+	defer func() {
+		if recovered := recover(); recovered != nil {
+			setV2Error(outError, fmt.Errorf("pyfastexcel panic: %v", recovered))
+			handle = 0
+		}
+	}()
+
+	if path == nil {
+		setV2Error(outError, fmt.Errorf("input path must not be NULL"))
+		return 0
+	}
+	if chunkRows > math.MaxInt32 {
+		chunkRows = math.MaxInt32
+	}
+	reader, err := core.OpenRowReader(C.GoString(path), optionalGoString(sheet), int(chunkRows), raw != 0)
+	if err != nil {
+		setV2Error(outError, err)
+		return 0
+	}
+	return core.RegisterRowReader(reader)
+}
+
+// ReadRowChunkV2 returns the next chunk of a row reader as a C-owned
+// MessagePack array of rows, each an array of cell strings. It returns NULL
+// with a zero length once every row has been read, and NULL with a C-owned
+// error string on failure. The caller must release the chunk with
+// FreeCPointer.
+//
+//export ReadRowChunkV2
+func ReadRowChunkV2(handle int64, outLen *C.size_t, outError **C.char) (result unsafe.Pointer) {
+	initializeV2Outputs(outLen, outError)
+	defer func() {
+		if recovered := recover(); recovered != nil {
+			if result != nil {
+				C.free(result)
+				result = nil
+			}
+			if outLen != nil {
+				*outLen = 0
+			}
+			setV2Error(outError, fmt.Errorf("pyfastexcel panic: %v", recovered))
+		}
+	}()
+
+	if outLen == nil {
+		setV2Error(outError, fmt.Errorf("output length pointer must not be NULL"))
+		return nil
+	}
+	reader := core.LookupRowReader(handle)
+	if reader == nil {
+		setV2Error(outError, fmt.Errorf("row reader handle %d is not valid", handle))
+		return nil
+	}
+	chunk, err := reader.Next()
+	if err != nil {
+		setV2Error(outError, err)
+		return nil
+	}
+	if len(chunk) == 0 {
+		return nil
+	}
+	result = C.CBytes(chunk)
+	*outLen = C.size_t(len(chunk))
+	return result
+}
+
+// CloseRowReaderV2 closes a row reader opened by OpenRowReaderV2 and returns
+// a C-owned error string if closing failed, otherwise NULL. Closing an
+// unknown handle does nothing.
+//
+//export CloseRowReaderV2
+func CloseRowReaderV2(handle int64) *C.char {
+	return optionalCError(core.ReleaseRowReader(handle))
+}
+
+// ReadColumnsV2 decodes columns of the worksheet sheet of the workbook at
+// path into typed buffers. request is a JSON core.ColumnRequest; a NULL or
+// empty sheet selects the first worksheet. It returns the C-owned
+// core.ReadColumns result, or NULL with a C-owned error string. The caller
+// must release the result with FreeCPointer.
+//
+//export ReadColumnsV2
+func ReadColumnsV2(
+	path *C.char,
+	sheet *C.char,
+	request *C.char,
+	outLen *C.size_t,
+	outError **C.char,
+) (result unsafe.Pointer) {
+	initializeV2Outputs(outLen, outError)
+	defer func() {
+		if recovered := recover(); recovered != nil {
+			if result != nil {
+				C.free(result)
+				result = nil
+			}
+			if outLen != nil {
+				*outLen = 0
+			}
+			setV2Error(outError, fmt.Errorf("pyfastexcel panic: %v", recovered))
+		}
+	}()
+
+	if outLen == nil || path == nil || request == nil {
+		setV2Error(outError, fmt.Errorf("output length, path and request must not be NULL"))
+		return nil
+	}
+	var columnRequest core.ColumnRequest
+	if err := json.Unmarshal([]byte(C.GoString(request)), &columnRequest); err != nil {
+		setV2Error(outError, fmt.Errorf("decode column request: %w", err))
+		return nil
+	}
+	columns, err := core.ReadColumns(C.GoString(path), optionalGoString(sheet), columnRequest)
+	if err != nil {
+		setV2Error(outError, err)
+		return nil
+	}
+	result = C.CBytes(columns)
+	*outLen = C.size_t(len(columns))
+	return result
+}
+
 func copyV2Payload(data unsafe.Pointer, dataLen C.size_t) ([]byte, error) {
 	if data == nil && dataLen != 0 {
 		return nil, fmt.Errorf("payload pointer is NULL for %d bytes", uint64(dataLen))
@@ -183,6 +661,31 @@ func setV2Error(outError **C.char, err error) {
 	*outError = C.CString(message)
 }
 
+func initializeV3Report(outReport **C.char) {
+	if outReport != nil {
+		*outReport = nil
+	}
+}
+
+func setV3Report(outReport **C.char, report core.ExportReport) error {
+	if outReport == nil {
+		return nil
+	}
+	encoded, err := json.Marshal(report)
+	if err != nil {
+		return fmt.Errorf("encode export report: %w", err)
+	}
+	*outReport = C.CString(string(encoded))
+	return nil
+}
+
+func freeV3Report(outReport **C.char) {
+	if outReport != nil && *outReport != nil {
+		C.free(unsafe.Pointer(*outReport))
+		*outReport = nil
+	}
+}
+
 func catchPanic() {
 	if r := recover(); r != nil {
 		fmt.Printf("Recovered from panic: %v\n", r)
@@ -317,8 +820,8 @@ func testExport(t *testing.T) {
 }
 
 func testExportV2(t *testing.T) {
-	if version := GetABIVersion(); version != 2 {
-		t.Fatalf("expected ABI version 2, got %d", version)
+	if version := GetABIVersion(); version != 11 {
+		t.Fatalf("expected ABI version 11, got %d", version)
 	}
 
 	input := abiTestPFX2()
@@ -423,6 +926,232 @@ func testExportToFileV2(t *testing.T) {
 	}
 }
 
+func testExportV3Report(t *testing.T) {
+	input := abiTestPFX2()
+	cInput := C.CBytes(input)
+	defer C.free(cInput)
+	var outputLength C.size_t
+	var outputError, outputReport *C.char
+	output := ExportV3(cInput, C.size_t(len(input)), &outputLength, &outputError, &outputReport)
+	if outputError != nil {
+		defer FreeCPointer(outputError, 0)
+		t.Fatalf("ExportV3 returned an error: %s", C.GoString(outputError))
+	}
+	if output == nil || outputLength == 0 {
+		t.Fatal("ExportV3 returned an empty workbook")
+	}
+	defer FreeCPointer((*C.char)(output), 0)
+	if outputReport == nil {
+		t.Fatal("ExportV3 returned no report")
+	}
+	defer FreeCPointer(outputReport, 0)
+	var report map[string]interface{}
+	if err := json.Unmarshal([]byte(C.GoString(outputReport)), &report); err != nil {
+		t.Fatalf("decode ExportV3 report: %v", err)
+	}
+	for _, key := range []string{"stream_spill_files", "stream_spill_bytes", "buffer_spill_files", "buffer_spill_bytes"} {
+		if _, ok := report[key]; !ok {
+			t.Fatalf("ExportV3 report is missing %q: %v", key, report)
+		}
+	}
+	if report["wire"] != "pfx2" || report["build"] != "sequential" {
+		t.Fatalf("ExportV3 report has wire %v and build %v, want pfx2 and sequential", report["wire"], report["build"])
+	}
+	if outputBytes, _ := report["output_bytes"].(float64); outputBytes != float64(outputLength) {
+		t.Fatalf("ExportV3 report has output_bytes %v, want %d", report["output_bytes"], outputLength)
+	}
+
+	directory := t.TempDir()
+	cPath := C.CString(filepath.Join(directory, "report.xlsx"))
+	defer C.free(unsafe.Pointer(cPath))
+	outputReport = nil
+	status := ExportToFileV3(cInput, C.size_t(len(input)), cPath, &outputError, &outputReport)
+	if outputError != nil {
+		defer FreeCPointer(outputError, 0)
+		t.Fatalf("ExportToFileV3 returned an error: %s", C.GoString(outputError))
+	}
+	if status != 0 || outputReport == nil {
+		t.Fatalf("ExportToFileV3 returned status %d and report %v", status, outputReport)
+	}
+	FreeCPointer(outputReport, 0)
+}
+
+func testPoolStatsV2(t *testing.T) {
+	readStats := func() map[string]core.PoolStats {
+		encoded := GetPoolStatsV2()
+		if encoded == nil {
+			t.Fatal("GetPoolStatsV2 returned NULL")
+		}
+		defer FreeCPointer(encoded, 0)
+		var stats map[string]core.PoolStats
+		if err := json.Unmarshal([]byte(C.GoString(encoded)), &stats); err != nil {
+			t.Fatalf("decode pool stats: %v", err)
+		}
+		return stats
+	}
+
+	before := readStats()
+	input := abiTestPFX2()
+	cInput := C.CBytes(input)
+	defer C.free(cInput)
+	for export := 0; export < 2; export++ {
+		var outputLength C.size_t
+		var outputError *C.char
+		output := ExportV2(cInput, C.size_t(len(input)), 0, &outputLength, &outputError)
+		if outputError != nil {
+			defer FreeCPointer(outputError, 0)
+			t.Fatalf("ExportV2 returned an error: %s", C.GoString(outputError))
+		}
+		FreeCPointer((*C.char)(output), 0)
+	}
+	after := readStats()
+	for _, name := range []string{"row_buffers", "byte_buffers"} {
+		if after[name].Gets <= before[name].Gets || after[name].Puts <= before[name].Puts {
+			t.Fatalf("%s pool was not used: before %+v, after %+v", name, before[name], after[name])
+		}
+	}
+}
+
+func testRuntimeStatsV2(t *testing.T) {
+	readStats := func() core.RuntimeStats {
+		encoded := GetRuntimeStatsV2()
+		if encoded == nil {
+			t.Fatal("GetRuntimeStatsV2 returned NULL")
+		}
+		defer FreeCPointer(encoded, 0)
+		var stats core.RuntimeStats
+		if err := json.Unmarshal([]byte(C.GoString(encoded)), &stats); err != nil {
+			t.Fatalf("decode runtime stats: %v", err)
+		}
+		return stats
+	}
+
+	before := readStats()
+	input := abiTestPFX2()
+	cInput := C.CBytes(input)
+	defer C.free(cInput)
+	var outputLength C.size_t
+	var outputError, outputReport *C.char
+	output := ExportV3(cInput, C.size_t(len(input)), &outputLength, &outputError, &outputReport)
+	if outputError != nil {
+		defer FreeCPointer(outputError, 0)
+		t.Fatalf("ExportV3 returned an error: %s", C.GoString(outputError))
+	}
+	FreeCPointer((*C.char)(output), 0)
+	FreeCPointer(outputReport, 0)
+	after := readStats()
+	if after.Exports != before.Exports+1 || after.ExportAllocatedBytes <= before.ExportAllocatedBytes {
+		t.Fatalf("export was not counted: before %+v, after %+v", before, after)
+	}
+	if after.HeapPeakBytes == 0 || after.HeapPeakBytes < after.HeapObjectsBytes || after.Goroutines == 0 {
+		t.Fatalf("unexpected runtime stats: %+v", after)
+	}
+}
+
+func testExportBatchV2(t *testing.T) {
+	valid := abiTestPFX2()
+	inputs := [][]byte{valid, []byte("PFX2 truncated"), valid}
+	directory := t.TempDir()
+	payloads := make([]unsafe.Pointer, len(inputs))
+	lengths := make([]C.size_t, len(inputs))
+	paths := make([]*C.char, len(inputs))
+	for index, input := range inputs {
+		payloads[index] = C.CBytes(input)
+		defer C.free(payloads[index])
+		lengths[index] = C.size_t(len(input))
+		paths[index] = C.CString(filepath.Join(directory, fmt.Sprintf("batch-%d.xlsx", index)))
+		defer C.free(unsafe.Pointer(paths[index]))
+	}
+	outputErrors := make([]*C.char, len(inputs))
+	outputReports := make([]*C.char, len(inputs))
+	failed := ExportBatchV2(
+		&payloads[0],
+		&lengths[0],
+		&paths[0],
+		C.size_t(len(inputs)),
+		2,
+		&outputErrors[0],
+		&outputReports[0],
+	)
+	for index := range inputs {
+		defer FreeCPointer(outputErrors[index], 0)
+		defer FreeCPointer(outputReports[index], 0)
+	}
+	if failed != 1 {
+		t.Fatalf("ExportBatchV2 reported %d failed items, expected 1", failed)
+	}
+	if outputErrors[1] == nil || outputReports[1] != nil {
+		t.Fatal("the truncated payload must report an error and no report")
+	}
+	for _, index := range []int{0, 2} {
+		if outputErrors[index] != nil {
+			t.Fatalf("item %d returned an error: %s", index, C.GoString(outputErrors[index]))
+		}
+		if outputReports[index] == nil {
+			t.Fatalf("item %d returned no report", index)
+		}
+		workbook, err := fs.ReadFile(os.DirFS(directory), fmt.Sprintf("batch-%d.xlsx", index))
+		if err != nil || !bytes.HasPrefix(workbook, []byte("PK")) {
+			t.Fatalf("item %d did not write a ZIP workbook: %v", index, err)
+		}
+	}
+	if status := ExportBatchV2(nil, nil, nil, 1, 0, nil, nil); status != -1 {
+		t.Fatalf("ExportBatchV2 with NULL arrays returned %d, expected -1", status)
+	}
+}
+
+func testExportV4Cancellation(t *testing.T) {
+	input := abiTestPFX2()
+	cInput := C.CBytes(input)
+	defer C.free(cInput)
+	cancel := (*int32)(C.malloc(C.size_t(unsafe.Sizeof(int32(0)))))
+	defer C.free(unsafe.Pointer(cancel))
+
+	*cancel = 0
+	var outputLength C.size_t
+	var outputError, outputReport *C.char
+	output := ExportV4(
+		cInput, C.size_t(len(input)), &outputLength, &outputError, &outputReport, nil, unsafe.Pointer(cancel),
+	)
+	if outputError != nil {
+		defer FreeCPointer(outputError, 0)
+		t.Fatalf("ExportV4 returned an error: %s", C.GoString(outputError))
+	}
+	FreeCPointer((*C.char)(output), 0)
+	FreeCPointer(outputReport, 0)
+
+	*cancel = 1
+	outputReport = nil
+	output = ExportV4(
+		cInput, C.size_t(len(input)), &outputLength, &outputError, &outputReport, nil, unsafe.Pointer(cancel),
+	)
+	if output != nil || outputLength != 0 || outputReport != nil {
+		t.Fatal("a cancelled ExportV4 must not return a workbook or a report")
+	}
+	if outputError == nil {
+		t.Fatal("a cancelled ExportV4 must report an error")
+	}
+	defer FreeCPointer(outputError, 0)
+	if message := C.GoString(outputError); !strings.Contains(message, core.ErrExportCancelled.Error()) {
+		t.Fatalf("unexpected cancellation error: %s", message)
+	}
+
+	directory := t.TempDir()
+	cPath := C.CString(filepath.Join(directory, "cancelled.xlsx"))
+	defer C.free(unsafe.Pointer(cPath))
+	var fileError *C.char
+	status := ExportToFileV4(cInput, C.size_t(len(input)), cPath, &fileError, nil, nil, unsafe.Pointer(cancel))
+	if fileError != nil {
+		defer FreeCPointer(fileError, 0)
+	}
+	if status == 0 || fileError == nil {
+		t.Fatalf("a cancelled ExportToFileV4 returned status %d", status)
+	}
+	if _, err := os.Stat(filepath.Join(directory, "cancelled.xlsx")); !os.IsNotExist(err) {
+		t.Fatalf("a cancelled ExportToFileV4 must not create its output: %v", err)
+	}
+}
+
 const abiTestJSON = `{
   "style": {},
   "protection": {},
@@ -467,3 +1196,153 @@ func abiTestPFX2() []byte {
 
 func main() {
 }
+
+func testProfileV2(t *testing.T) {
+	directory := t.TempDir()
+	cpuPath := C.CString(directory + "/cpu.pprof")
+	defer C.free(unsafe.Pointer(cpuPath))
+	heapPath := C.CString(directory + "/heap.pprof")
+	defer C.free(unsafe.Pointer(heapPath))
+
+	if err := StartProfileV2(cpuPath, heapPath); err != nil {
+		defer FreeCPointer(err, 0)
+		t.Fatalf("StartProfileV2 returned an error: %s", C.GoString(err))
+	}
+	if err := StartProfileV2(nil, heapPath); err == nil {
+		t.Fatal("StartProfileV2 started a second profile")
+	} else {
+		FreeCPointer(err, 0)
+	}
+	if err := StopProfileV2(); err != nil {
+		defer FreeCPointer(err, 0)
+		t.Fatalf("StopProfileV2 returned an error: %s", C.GoString(err))
+	}
+	for _, name := range []string{"cpu.pprof", "heap.pprof"} {
+		if info, err := os.Stat(directory + "/" + name); err != nil || info.Size() == 0 {
+			t.Fatalf("profile %s was not written: %v", name, err)
+		}
+	}
+	if err := StopProfileV2(); err == nil {
+		t.Fatal("StopProfileV2 succeeded without a running profile")
+	} else {
+		FreeCPointer(err, 0)
+	}
+}
+
+func testTemplateV2(t *testing.T) {
+	input := abiTestPFX2()
+	cInput := C.CBytes(input)
+	defer C.free(cInput)
+	var outputError *C.char
+	handle := CompileTemplateV2(cInput, C.size_t(len(input)), &outputError)
+	if handle == 0 {
+		defer FreeCPointer(outputError, 0)
+		t.Fatalf("CompileTemplateV2 returned an error: %s", C.GoString(outputError))
+	}
+	defer ReleaseTemplateV2(handle)
+
+	row := []byte{0x91, 0xa3, 'n', 'e', 'w'}
+	cRows := C.CBytes(row)
+	defer C.free(cRows)
+	counts := []int64{1}
+	offsets := []int64{0}
+	outputPath := C.CString(filepath.Join(t.TempDir(), "template.xlsx"))
+	defer C.free(unsafe.Pointer(outputPath))
+	var outputReport *C.char
+	status := RenderTemplateV2(
+		handle, cRows, C.size_t(len(row)), &counts[0], &offsets[0], 1, outputPath, &outputError, &outputReport,
+	)
+	if status != 0 {
+		defer FreeCPointer(outputError, 0)
+		t.Fatalf("RenderTemplateV2 returned an error: %s", C.GoString(outputError))
+	}
+	FreeCPointer(outputReport, 0)
+	if info, err := os.Stat(C.GoString(outputPath)); err != nil || info.Size() == 0 {
+		t.Fatalf("template render was not written: %v", err)
+	}
+
+	ReleaseTemplateV2(handle)
+	status = RenderTemplateV2(
+		handle, cRows, C.size_t(len(row)), &counts[0], &offsets[0], 1, outputPath, &outputError, &outputReport,
+	)
+	if status == 0 || outputError == nil {
+		t.Fatal("RenderTemplateV2 rendered a released template")
+	}
+	FreeCPointer(outputError, 0)
+}
+
+func testRowReaderV2(t *testing.T) {
+	input := []byte(abiTestJSON)
+	cInput := C.CBytes(input)
+	defer C.free(cInput)
+	cPath := C.CString(filepath.Join(t.TempDir(), "read.xlsx"))
+	defer C.free(unsafe.Pointer(cPath))
+	var outputError *C.char
+	if status := ExportToFileV2(cInput, C.size_t(len(input)), cPath, 1, &outputError); status != 0 {
+		defer FreeCPointer(outputError, 0)
+		t.Fatalf("ExportToFileV2 returned an error: %s", C.GoString(outputError))
+	}
+
+	handle := OpenRowReaderV2(cPath, nil, 0, 1, &outputError)
+	if handle == 0 {
+		defer FreeCPointer(outputError, 0)
+		t.Fatalf("OpenRowReaderV2 returned an error: %s", C.GoString(outputError))
+	}
+	var outputLength C.size_t
+	chunk := ReadRowChunkV2(handle, &outputLength, &outputError)
+	if chunk == nil || outputError != nil {
+		t.Fatalf("ReadRowChunkV2 returned no rows")
+	}
+	rows := C.GoBytes(chunk, C.int(outputLength))
+	FreeCPointer((*C.char)(chunk), 0)
+	// One row: ["raw", "42", "1"], the trailing empty cell left out.
+	want := []byte{0x91, 0x93, 0xa3, 'r', 'a', 'w', 0xa2, '4', '2', 0xa1, '1'}
+	if !bytes.Equal(rows, want) {
+		t.Fatalf("ReadRowChunkV2 returned %x, want %x", rows, want)
+	}
+	if chunk := ReadRowChunkV2(handle, &outputLength, &outputError); chunk != nil || outputLength != 0 {
+		t.Fatal("ReadRowChunkV2 returned rows past the end")
+	}
+	if closeError := CloseRowReaderV2(handle); closeError != nil {
+		defer FreeCPointer(closeError, 0)
+		t.Fatalf("CloseRowReaderV2 returned an error: %s", C.GoString(closeError))
+	}
+	if chunk := ReadRowChunkV2(handle, &outputLength, &outputError); chunk != nil || outputError == nil {
+		t.Fatal("ReadRowChunkV2 read a closed reader")
+	}
+	FreeCPointer(outputError, 0)
+}
+
+func testReadColumnsV2(t *testing.T) {
+	input := []byte(abiTestJSON)
+	cInput := C.CBytes(input)
+	defer C.free(cInput)
+	cPath := C.CString(filepath.Join(t.TempDir(), "columns.xlsx"))
+	defer C.free(unsafe.Pointer(cPath))
+	var outputError *C.char
+	if status := ExportToFileV2(cInput, C.size_t(len(input)), cPath, 1, &outputError); status != 0 {
+		defer FreeCPointer(outputError, 0)
+		t.Fatalf("ExportToFileV2 returned an error: %s", C.GoString(outputError))
+	}
+
+	request := C.CString(`{"header": false, "columns": [{"key": "B", "dtype": "int64"}]}`)
+	defer C.free(unsafe.Pointer(request))
+	var outputLength C.size_t
+	result := ReadColumnsV2(cPath, nil, request, &outputLength, &outputError)
+	if result == nil {
+		defer FreeCPointer(outputError, 0)
+		t.Fatalf("ReadColumnsV2 returned an error: %s", C.GoString(outputError))
+	}
+	columns := C.GoBytes(result, C.int(outputLength))
+	FreeCPointer((*C.char)(result), 0)
+	if value := binary.LittleEndian.Uint64(columns[len(columns)-8:]); value != 42 {
+		t.Fatalf("ReadColumnsV2 decoded %d, want 42", value)
+	}
+
+	badRequest := C.CString(`{"header": false, "columns": [{"key": "A", "dtype": "int64"}]}`)
+	defer C.free(unsafe.Pointer(badRequest))
+	if result := ReadColumnsV2(cPath, nil, badRequest, &outputLength, &outputError); result != nil || outputError == nil {
+		t.Fatal("ReadColumnsV2 decoded a text cell as an integer")
+	}
+	FreeCPointer(outputError, 0)
+}
@@ -1,16 +1,53 @@
+from pyfastexcel.cache import ExportCache
+from pyfastexcel.driver import (
+    CancelToken,
+    ExportCancelled,
+    native_pool_stats,
+    native_stats,
+    profile_native,
+    save_many,
+)
 from pyfastexcel.enums import ChartDataLabelPosition, ChartLineType, ChartType, MarkerSymbol
+from pyfastexcel.export_pool import ExportPool
+from pyfastexcel.plan import ExportPlan, SheetPlan
+from pyfastexcel.reader import read_columns, read_rows
+from pyfastexcel.report import ExportReport
 from pyfastexcel.style import CustomStyle, DefaultStyle
-from pyfastexcel.utils import set_debug_level, set_zip_compression_level
+from pyfastexcel.template import Template
+from pyfastexcel.utils import (
+    set_debug_level,
+    set_export_cache,
+    set_native_parallelism,
+    set_zip_compression_level,
+    set_zip_parallel_compression,
+)
 from pyfastexcel.workbook import Workbook
 from pyfastexcel.writer import StreamWriter
 
 __all__ = [
     'Workbook',
     'StreamWriter',
+    'ExportPool',
+    'CancelToken',
+    'ExportCancelled',
+    'ExportReport',
+    'ExportCache',
+    'ExportPlan',
+    'SheetPlan',
+    'Template',
     'CustomStyle',
     'DefaultStyle',
     'set_debug_level',
+    'set_export_cache',
+    'set_native_parallelism',
     'set_zip_compression_level',
+    'set_zip_parallel_compression',
+    'native_pool_stats',
+    'native_stats',
+    'profile_native',
+    'save_many',
+    'read_rows',
+    'read_columns',
     # Constants for chart creation.
     'ChartType',
     'ChartDataLabelPosition',
@@ -0,0 +1,248 @@
+from __future__ import annotations
+
+import hashlib
+import importlib.metadata
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Literal
+
+import msgspec
+
+from .wire import WIRE_MAGIC
+
+# Deterministic workbooks and workbooks exported through a cache with
+# timestamps='normalize' carry this creation and modification time unless the
+# properties were set explicitly.
+CACHE_TIMESTAMP = '1980-01-01T00:00:00Z'
+
+# Native settings that change the archive bytes without being in the payload.
+_OUTPUT_ENV_VARS = ('PYFASTEXCEL_ZIP_LEVEL', 'PYFASTEXCEL_ZIP_PARALLEL')
+
+_DISK_SUFFIX = '.xlsx'
+
+try:
+    _PACKAGE_VERSION = importlib.metadata.version('pyfastexcel')
+except importlib.metadata.PackageNotFoundError:  # pragma: no cover - source checkouts
+    _PACKAGE_VERSION = 'unknown'
+
+
+class ExportCache:
+    """
+    A content-addressed cache of exported workbooks.
+
+    Workbooks are keyed by a hash of the payload sent to the native library,
+    so a workbook whose data, styles and layout match an earlier export is
+    returned without running the native build. The key also holds the
+    package version and the native library's ABI version, so workbooks a
+    disk tier kept from another release are not reused. Export options that do not
+    change the output, such as ``max_workers``, are left out of the key.
+
+    The memory tier keeps the most recently used workbooks up to
+    ``max_bytes``. With a ``directory``, workbooks are also written there and
+    the least recently used files are removed once the directory holds more
+    than ``max_disk_bytes``. A cache is safe to share between threads.
+
+    ### Attributes:
+        max_bytes (int): The memory tier's size limit.
+        directory (str | None): The disk tier's directory, or None.
+        max_disk_bytes (int): The disk tier's size limit.
+        timestamps (str): ``'normalize'`` gives the ``Created`` and
+            ``Modified`` file properties a fixed value unless they were set
+            explicitly, so identical workbooks are byte-identical;
+            ``'ignore'`` leaves them out of the key, so a hit carries the
+            timestamps of the export that filled the entry.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = 64 << 20,
+        *,
+        directory: str | os.PathLike[str] | None = None,
+        max_disk_bytes: int = 1 << 30,
+        timestamps: Literal['normalize', 'ignore'] = 'normalize',
+    ) -> None:
+        for name, value in (('max_bytes', max_bytes), ('max_disk_bytes', max_disk_bytes)):
+            if not isinstance(value, int) or isinstance(value, bool) or value < 0:
+                raise ValueError(f'{name} must be a non-negative integer.')
+        if timestamps not in ('normalize', 'ignore'):
+            raise ValueError(
+                f"Invalid timestamps ({timestamps!r}). Expected 'normalize' or 'ignore'."
+            )
+        self.max_bytes = max_bytes
+        self.directory = os.fspath(directory) if directory is not None else None
+        self.max_disk_bytes = max_disk_bytes
+        self.timestamps = timestamps
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, bytes] = OrderedDict()
+        self._memory_bytes = 0
+        self._hits = {'memory': 0, 'disk': 0}
+        self._misses = 0
+        self._evictions = {'memory': 0, 'disk': 0}
+        if self.directory is not None:
+            os.makedirs(self.directory, exist_ok=True)
+
+    def key(self, payload: bytes, *, abi_version: int) -> str:
+        """
+        Return the cache key of an export ``payload`` (PFX2 or JSON) for the
+        native library of ``abi_version``.
+        """
+        if payload[: len(WIRE_MAGIC)] == WIRE_MAGIC:
+            metadata_end = len(WIRE_MAGIC) + 8
+            metadata_end += int.from_bytes(payload[len(WIRE_MAGIC) : metadata_end], 'big')
+            metadata = msgspec.json.decode(payload[len(WIRE_MAGIC) + 8 : metadata_end])
+            rows = memoryview(payload)[metadata_end:]
+        else:
+            metadata = msgspec.json.decode(payload)
+            rows = b''
+        # Deterministic exports order the archive differently, so that option
+        # is the one export option that stays in the key.
+        if (metadata.pop('export_options', None) or {}).get('deterministic'):
+            metadata['deterministic'] = True
+        if self.timestamps == 'ignore':
+            file_props = dict(metadata.get('file_props', {}))
+            file_props.pop('Created', None)
+            file_props.pop('Modified', None)
+            metadata['file_props'] = file_props
+
+        digest = hashlib.sha256()
+        digest.update(f'pyfastexcel={_PACKAGE_VERSION}\0abi={abi_version}\0'.encode())
+        for name in _OUTPUT_ENV_VARS:
+            digest.update(f'{name}={os.getenv(name, "")}\0'.encode())
+        digest.update(msgspec.json.encode(metadata))
+        digest.update(rows)
+        return digest.hexdigest()
+
+    def get(self, key: str) -> bytes | None:
+        """Return the workbook cached under ``key``, or None."""
+        workbook, _ = self.lookup(key)
+        return workbook
+
+    def lookup(self, key: str) -> tuple[bytes | None, str | None]:
+        """Return the workbook cached under ``key`` and the tier that held it."""
+        with self._lock:
+            workbook = self._entries.get(key)
+            if workbook is not None:
+                self._entries.move_to_end(key)
+                self._hits['memory'] += 1
+                return workbook, 'memory'
+        workbook = self._read_disk(key)
+        with self._lock:
+            if workbook is None:
+                self._misses += 1
+                return None, None
+            self._hits['disk'] += 1
+            self._remember(key, workbook)
+        return workbook, 'disk'
+
+    def put(self, key: str, workbook: bytes) -> None:
+        """Cache ``workbook`` under ``key`` in every tier."""
+        with self._lock:
+            self._remember(key, workbook)
+        self._write_disk(key, workbook)
+
+    def stats(self) -> dict[str, int]:
+        """
+        Return the cache's counters.
+
+        ``hits`` is the sum of ``memory_hits`` and ``disk_hits``; evictions
+        count entries removed to respect the size limits.
+        """
+        with self._lock:
+            return {
+                'hits': self._hits['memory'] + self._hits['disk'],
+                'memory_hits': self._hits['memory'],
+                'disk_hits': self._hits['disk'],
+                'misses': self._misses,
+                'memory_evictions': self._evictions['memory'],
+                'disk_evictions': self._evictions['disk'],
+                'memory_entries': len(self._entries),
+                'memory_bytes': self._memory_bytes,
+            }
+
+    def clear(self) -> None:
+        """Remove every cached workbook, including the files of the disk tier."""
+        with self._lock:
+            self._entries.clear()
+            self._memory_bytes = 0
+            for path, _, _ in self._disk_files():
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+
+    def _remember(self, key: str, workbook: bytes) -> None:
+        if len(workbook) > self.max_bytes:
+            return
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._memory_bytes -= len(previous)
+        self._entries[key] = workbook
+        self._memory_bytes += len(workbook)
+        while self._memory_bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._memory_bytes -= len(evicted)
+            self._evictions['memory'] += 1
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.directory, key + _DISK_SUFFIX)
+
+    def _read_disk(self, key: str) -> bytes | None:
+        if self.directory is None:
+            return None
+        path = self._disk_path(key)
+        try:
+            with open(path, 'rb') as file:
+                workbook = file.read()
+            # Disk eviction goes by modification time, so a hit touches the
+            # file; many filesystems do not keep access times.
+            os.utime(path)
+        except OSError:
+            return None
+        return workbook
+
+    def _write_disk(self, key: str, workbook: bytes) -> None:
+        if self.directory is None or len(workbook) > self.max_disk_bytes:
+            return
+        descriptor, temporary = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(descriptor, 'wb') as file:
+                file.write(workbook)
+            os.replace(temporary, self._disk_path(key))
+        except BaseException:
+            try:
+                os.remove(temporary)
+            except OSError:
+                pass
+            raise
+        self._evict_disk()
+
+    def _disk_files(self) -> list[tuple[str, float, int]]:
+        if self.directory is None:
+            return []
+        files = []
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                if not entry.name.endswith(_DISK_SUFFIX):
+                    continue
+                try:
+                    status = entry.stat()
+                except OSError:
+                    continue
+                files.append((entry.path, status.st_mtime, status.st_size))
+        return files
+
+    def _evict_disk(self) -> None:
+        files = sorted(self._disk_files(), key=lambda file: file[1])
+        total = sum(size for _, _, size in files)
+        for path, _, size in files:
+            if total <= self.max_disk_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            with self._lock:
+                self._evictions['disk'] += 1
@@ -0,0 +1,524 @@
+package core
+
+import (
+	"archive/zip"
+	"bytes"
+	"compress/flate"
+	"errors"
+	"fmt"
+	"io"
+	"slices"
+	"strings"
+	"sync"
+)
+
+// stdlibZipLevel is the level archive/zip uses for its built-in DEFLATE
+// compressor. Rewritten parts use it when no PYFASTEXCEL_ZIP_LEVEL is set, so
+// the rewritten entries match what excelize would have produced serially.
+const stdlibZipLevel = 5
+
+// zipBlockSize is the amount of uncompressed data per independently
+// compressed DEFLATE block in PYFASTEXCEL_ZIP_PARALLEL=blocks mode. Parts no
+// larger than one block are compressed in one piece.
+const zipBlockSize = 1 << 20
+
+// deflateWindowSize is the DEFLATE history window. Each block is primed with
+// the last window of the previous block so that back-references across the
+// block boundary stay available and the ratio barely changes.
+const deflateWindowSize = 32 << 10
+
+// zipDataDescriptorFlag marks an entry whose CRC and sizes follow its data
+// instead of filling its local header.
+const zipDataDescriptorFlag = 0x8
+
+// deflateWriter is the subset shared by compress/flate and
+// klauspost/compress writers.
+type deflateWriter interface {
+	io.WriteCloser
+	Flush() error
+}
+
+// deflateFactory creates the compressor for one rewritten archive part or
+// block. A nil dict starts a stream without history.
+type deflateFactory func(output io.Writer, dict []byte) (deflateWriter, error)
+
+// compressedPart is a fully compressed archive entry waiting to be written.
+type compressedPart struct {
+	method uint16
+	buffer *spillBuffer
+	err    error
+}
+
+// archiveRewrite configures how a staged archive is rewritten.
+type archiveRewrite struct {
+	compressor deflateFactory
+	// workers is the number of parts compressed at once and, through slots,
+	// also bounds the blocks of split parts.
+	workers int
+	slots   compressionSlots
+	// blockSize > 0 splits larger parts with compressBlocks.
+	blockSize int
+	// newBuffer returns the buffer for one compressed part.
+	newBuffer func() *spillBuffer
+}
+
+func memoryPartBuffer() *spillBuffer {
+	return newSpillBuffer(-1, "", nil)
+}
+
+func archiveCompressor(settings archiveSettings) deflateFactory {
+	if settings.level == 0 {
+		return func(output io.Writer, dict []byte) (deflateWriter, error) {
+			if dict == nil {
+				return flate.NewWriter(output, stdlibZipLevel)
+			}
+			return flate.NewWriterDict(output, stdlibZipLevel, dict)
+		}
+	}
+	level := settings.level
+	return func(output io.Writer, dict []byte) (deflateWriter, error) {
+		return newFastDeflateWriter(output, level, dict)
+	}
+}
+
+// writeRewrittenArchive lets excelize serialize into a stored-block staging
+// buffer and then rewrites that archive into output, either with every part
+// compressed concurrently or, in STORE mode, uncompressed. Unless a spill
+// threshold says otherwise the staging buffer lives on disk, which keeps the
+// uncompressed XML out of memory.
+func (ew *ExcelWriter) writeRewrittenArchive(output io.Writer) (err error) {
+	staging := newSpillBuffer(ew.options.stagingSpillThreshold(), ew.options.TempDir, &ew.bufferSpill)
+	defer func() {
+		if closeErr := staging.Close(); closeErr != nil {
+			err = errors.Join(err, fmt.Errorf("remove archive staging file: %w", closeErr))
+		}
+	}()
+
+	if err := ew.File.Write(staging); err != nil {
+		return fmt.Errorf("serialize workbook: %w", err)
+	}
+	if zipSettings.store {
+		return storeArchive(staging, staging.Size(), output)
+	}
+	rewrite := archiveRewrite{
+		compressor: archiveCompressor(zipSettings),
+		workers:    ew.options.workers(),
+		newBuffer: func() *spillBuffer {
+			return newSpillBuffer(ew.options.SpillThreshold, ew.options.TempDir, &ew.bufferSpill)
+		},
+	}
+	if zipSettings.blocks {
+		rewrite.blockSize = zipBlockSize
+	}
+	return rewrite.run(staging, staging.Size(), output)
+}
+
+// run recompresses every entry of a staged ZIP archive on a pool of workers
+// and writes the entries to output in their original order with raw entry
+// creation. At most 2*workers compressed parts are buffered at once. Entry
+// names, flags and timestamps are carried over unchanged, so the result is a
+// standard DEFLATE archive with the same layout.
+func (rewrite archiveRewrite) run(staged io.ReaderAt, size int64, output io.Writer) (err error) {
+	archive, err := zip.NewReader(staged, size)
+	if err != nil {
+		return fmt.Errorf("read staged archive: %w", err)
+	}
+	if rewrite.workers < 1 {
+		rewrite.workers = 1
+	}
+	if rewrite.slots == nil {
+		rewrite.slots = newCompressionSlots(rewrite.workers)
+	}
+	if rewrite.newBuffer == nil {
+		rewrite.newBuffer = memoryPartBuffer
+	}
+
+	files := archive.File
+	results := make([]chan compressedPart, len(files))
+	for index := range results {
+		results[index] = make(chan compressedPart, 1)
+	}
+	jobs := make(chan int)
+	window := make(chan struct{}, 2*rewrite.workers)
+	done := make(chan struct{})
+	var wg sync.WaitGroup
+	for worker := 0; worker < rewrite.workers; worker++ {
+		wg.Add(1)
+		go func() {
+			defer wg.Done()
+			for index := range jobs {
+				results[index] <- rewrite.compressPart(files[index])
+			}
+		}()
+	}
+	go func() {
+		defer close(jobs)
+		for index := range files {
+			select {
+			case window <- struct{}{}:
+			case <-done:
+				return
+			}
+			select {
+			case jobs <- index:
+			case <-done:
+				return
+			}
+		}
+	}()
+	written := 0
+	defer func() {
+		close(done)
+		wg.Wait()
+		// Release parts compressed ahead of a failure.
+		for _, result := range results[written:] {
+			select {
+			case part := <-result:
+				if part.buffer != nil {
+					err = errors.Join(err, part.buffer.Close())
+				}
+			default:
+			}
+		}
+	}()
+
+	zipWriter := zip.NewWriter(output)
+	for index, file := range files {
+		part := <-results[index]
+		written = index + 1
+		<-window
+		if part.err != nil {
+			return fmt.Errorf("compress archive part %q: %w", file.Name, part.err)
+		}
+		err := writeRawPart(zipWriter, file, part)
+		if closeErr := part.buffer.Close(); err == nil {
+			err = closeErr
+		}
+		if err != nil {
+			return fmt.Errorf("write archive part %q: %w", file.Name, err)
+		}
+	}
+	if err := zipWriter.Close(); err != nil {
+		return fmt.Errorf("finish archive: %w", err)
+	}
+	return nil
+}
+
+func writeRawPart(zipWriter *zip.Writer, file *zip.File, part compressedPart) error {
+	header := rewrittenHeader(file, part.method)
+	header.CompressedSize64 = uint64(part.buffer.Size())
+	entry, err := zipWriter.CreateRaw(header)
+	if err != nil {
+		return err
+	}
+	_, err = part.buffer.WriteTo(entry)
+	return err
+}
+
+// storeArchive copies every entry of a staged ZIP archive to output as an
+// uncompressed STORE entry. Parts are streamed one at a time, so memory use
+// does not grow with the part size.
+func storeArchive(staged io.ReaderAt, size int64, output io.Writer) error {
+	archive, err := zip.NewReader(staged, size)
+	if err != nil {
+		return fmt.Errorf("read staged archive: %w", err)
+	}
+	zipWriter := zip.NewWriter(output)
+	for _, file := range archive.File {
+		if err := storeArchivePart(zipWriter, file); err != nil {
+			return fmt.Errorf("store archive part %q: %w", file.Name, err)
+		}
+	}
+	if err := zipWriter.Close(); err != nil {
+		return fmt.Errorf("finish archive: %w", err)
+	}
+	return nil
+}
+
+func storeArchivePart(zipWriter *zip.Writer, file *zip.File) error {
+	source, err := file.Open()
+	if err != nil {
+		return err
+	}
+	defer source.Close()
+
+	header := rewrittenHeader(file, zip.Store)
+	header.CompressedSize64 = file.UncompressedSize64
+	// The staged entry was streamed with a data descriptor. Streaming readers
+	// such as Java's ZipInputStream reject one after a STORE entry, and the
+	// CRC and sizes are known here, so they go in the local header instead.
+	header.Flags &^= zipDataDescriptorFlag
+	entry, err := zipWriter.CreateRaw(header)
+	if err != nil {
+		return err
+	}
+	_, err = io.Copy(entry, source)
+	return err
+}
+
+// contentTypesPart is the package part that readers expect first in an
+// OOXML archive.
+const contentTypesPart = "[Content_Types].xml"
+
+// writeCanonicalArchive serializes the workbook into a staging buffer and
+// copies it to output with canonicalizeArchive. excelize writes stream sheets
+// in map order, so this is what makes the part order stable.
+func (ew *ExcelWriter) writeCanonicalArchive(output io.Writer) (err error) {
+	staging := newSpillBuffer(ew.options.stagingSpillThreshold(), ew.options.TempDir, &ew.bufferSpill)
+	defer func() {
+		if closeErr := staging.Close(); closeErr != nil {
+			err = errors.Join(err, fmt.Errorf("remove archive staging file: %w", closeErr))
+		}
+	}()
+
+	if err := ew.writeExcelizeArchive(staging); err != nil {
+		return err
+	}
+	return canonicalizeArchive(staging, staging.Size(), output)
+}
+
+// canonicalizeArchive copies every entry of a ZIP archive to output without
+// recompressing it: [Content_Types].xml first, the other parts sorted by
+// name, each with a zero modification time and no extra fields.
+func canonicalizeArchive(staged io.ReaderAt, size int64, output io.Writer) error {
+	archive, err := zip.NewReader(staged, size)
+	if err != nil {
+		return fmt.Errorf("read staged archive: %w", err)
+	}
+	files := slices.Clone(archive.File)
+	slices.SortFunc(files, func(left, right *zip.File) int {
+		if (left.Name == contentTypesPart) != (right.Name == contentTypesPart) {
+			if left.Name == contentTypesPart {
+				return -1
+			}
+			return 1
+		}
+		return strings.Compare(left.Name, right.Name)
+	})
+	zipWriter := zip.NewWriter(output)
+	for _, file := range files {
+		if err := copyCanonicalPart(zipWriter, file); err != nil {
+			return fmt.Errorf("copy archive part %q: %w", file.Name, err)
+		}
+	}
+	if err := zipWriter.Close(); err != nil {
+		return fmt.Errorf("finish archive: %w", err)
+	}
+	return nil
+}
+
+func copyCanonicalPart(zipWriter *zip.Writer, file *zip.File) error {
+	source, err := file.OpenRaw()
+	if err != nil {
+		return err
+	}
+	header := rewrittenHeader(file, file.Method)
+	header.Comment = ""
+	header.ModifiedTime = 0
+	header.ModifiedDate = 0
+	header.CompressedSize64 = file.CompressedSize64
+	entry, err := zipWriter.CreateRaw(header)
+	if err != nil {
+		return err
+	}
+	_, err = io.Copy(entry, source)
+	return err
+}
+
+// compressPart decompresses one staged entry and compresses it again with
+// the target compressor. Entries that are not DEFLATE are copied raw.
+func (rewrite archiveRewrite) compressPart(file *zip.File) compressedPart {
+	buffer := rewrite.newBuffer()
+	method, err := rewrite.compressPartInto(buffer, file)
+	if err != nil {
+		return compressedPart{err: errors.Join(err, buffer.Close())}
+	}
+	return compressedPart{method: method, buffer: buffer}
+}
+
+func (rewrite archiveRewrite) compressPartInto(buffer *spillBuffer, file *zip.File) (uint16, error) {
+	if file.Method != zip.Deflate {
+		raw, err := file.OpenRaw()
+		if err != nil {
+			return 0, err
+		}
+		_, err = io.Copy(buffer, raw)
+		return file.Method, err
+	}
+
+	source, err := file.Open()
+	if err != nil {
+		return 0, err
+	}
+	defer source.Close()
+
+	if rewrite.blockSize > 0 && file.UncompressedSize64 > uint64(rewrite.blockSize) {
+		err := compressBlocks(
+			source, buffer, rewrite.compressor, rewrite.blockSize, rewrite.workers, rewrite.slots,
+		)
+		return zip.Deflate, err
+	}
+	rewrite.slots.acquire()
+	defer rewrite.slots.release()
+	deflater, err := rewrite.compressor(buffer, nil)
+	if err != nil {
+		return 0, err
+	}
+	if _, err := io.Copy(deflater, source); err != nil {
+		return 0, err
+	}
+	return zip.Deflate, deflater.Close()
+}
+
+// compressionSlots bounds how many compressors run at once across all parts
+// and blocks of one archive. A nil value does not limit anything.
+type compressionSlots chan struct{}
+
+func newCompressionSlots(count int) compressionSlots {
+	return make(compressionSlots, count)
+}
+
+func (slots compressionSlots) acquire() {
+	if slots != nil {
+		slots <- struct{}{}
+	}
+}
+
+func (slots compressionSlots) release() {
+	if slots != nil {
+		<-slots
+	}
+}
+
+// compressBlocks compresses source pigz-style: it is cut into blockSize
+// blocks, up to workers of them in flight, that are compressed independently
+// while holding one of slots. Each block is primed with the previous block's
+// last window as a preset dictionary and ended with a sync flush so it stops
+// on a byte boundary. Concatenating the blocks in
+// order and appending an empty final block yields one valid DEFLATE stream.
+func compressBlocks(
+	source io.Reader,
+	output io.Writer,
+	compressor deflateFactory,
+	blockSize int,
+	workers int,
+	slots compressionSlots,
+) error {
+	if workers < 1 {
+		workers = 1
+	}
+	pending := make(chan chan compressedBlock, workers)
+	done := make(chan struct{})
+	var wg sync.WaitGroup
+	wg.Add(1)
+	go func() {
+		defer wg.Done()
+		defer close(pending)
+		var previous []byte
+		for {
+			input := make([]byte, blockSize)
+			read, readErr := io.ReadFull(source, input)
+			if read == 0 && readErr == io.EOF {
+				return
+			}
+			result := make(chan compressedBlock, 1)
+			select {
+			case pending <- result:
+			case <-done:
+				return
+			}
+			if readErr != nil && readErr != io.EOF && readErr != io.ErrUnexpectedEOF {
+				result <- compressedBlock{err: readErr}
+				return
+			}
+			block := input[:read]
+			dict := previous
+			if len(dict) > deflateWindowSize {
+				dict = dict[len(dict)-deflateWindowSize:]
+			}
+			wg.Add(1)
+			go func() {
+				defer wg.Done()
+				slots.acquire()
+				defer slots.release()
+				result <- compressBlock(block, dict, compressor)
+			}()
+			if readErr != nil {
+				return
+			}
+			previous = block
+		}
+	}()
+
+	var err error
+	for result := range pending {
+		block := <-result
+		if block.err != nil {
+			err = block.err
+			break
+		}
+		_, err = block.buffer.WriteTo(output)
+		putByteBuffer(block.buffer)
+		if err != nil {
+			break
+		}
+	}
+	close(done)
+	wg.Wait()
+	if err != nil {
+		return err
+	}
+
+	slots.acquire()
+	defer slots.release()
+	final, err := compressor(output, nil)
+	if err != nil {
+		return err
+	}
+	return final.Close()
+}
+
+// compressedBlock is one sync-flushed DEFLATE block of a larger part. The
+// buffer comes from byteBufferPool.
+type compressedBlock struct {
+	buffer *bytes.Buffer
+	err    error
+}
+
+func compressBlock(data, dict []byte, compressor deflateFactory) compressedBlock {
+	buffer := getByteBuffer()
+	buffer.Grow(len(data) / 4)
+	deflater, err := compressor(buffer, dict)
+	if err == nil {
+		_, err = deflater.Write(data)
+	}
+	if err == nil {
+		err = deflater.Flush()
+	}
+	if err != nil {
+		putByteBuffer(buffer)
+		return compressedBlock{err: err}
+	}
+	return compressedBlock{buffer: buffer}
+}
+
+// rewrittenHeader copies the staged entry header, including the CRC32 that
+// archive/zip computed over the uncompressed part; the caller fills in the
+// size of the rewritten data. Modified stays zero so no extended-timestamp
+// field is added that the staged entry did not have.
+func rewrittenHeader(file *zip.File, method uint16) *zip.FileHeader {
+	return &zip.FileHeader{
+		Name:               file.Name,
+		Comment:            file.Comment,
+		NonUTF8:            file.NonUTF8,
+		CreatorVersion:     file.CreatorVersion,
+		ReaderVersion:      file.ReaderVersion,
+		Flags:              file.Flags,
+		Method:             method,
+		ModifiedTime:       file.ModifiedTime,
+		ModifiedDate:       file.ModifiedDate,
+		CRC32:              file.CRC32,
+		UncompressedSize64: file.UncompressedSize64,
+		ExternalAttrs:      file.ExternalAttrs,
+	}
+}
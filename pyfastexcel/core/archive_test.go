@@ -0,0 +1,344 @@
+package core
+
+import (
+	"archive/zip"
+	"bytes"
+	"compress/flate"
+	"encoding/binary"
+	"fmt"
+	"io"
+	"strings"
+	"sync/atomic"
+	"testing"
+	"time"
+)
+
+type testArchivePart struct {
+	name string
+	data string
+}
+
+func newTestArchiveParts() []testArchivePart {
+	parts := []testArchivePart{
+		{name: "[Content_Types].xml", data: `<?xml version="1.0"?><Types/>`},
+		{name: "xl/workbook.xml", data: `<workbook><sheets/></workbook>`},
+	}
+	for sheet := 1; sheet <= 6; sheet++ {
+		var xml strings.Builder
+		xml.WriteString("<worksheet><sheetData>")
+		for row := 1; row <= 400*sheet; row++ {
+			fmt.Fprintf(&xml, `<row r="%d"><c r="A%d"><v>%d</v></c></row>`, row, row, row*sheet)
+		}
+		xml.WriteString("</sheetData></worksheet>")
+		parts = append(parts, testArchivePart{
+			name: fmt.Sprintf("xl/worksheets/sheet%d.xml", sheet),
+			data: xml.String(),
+		})
+	}
+	return parts
+}
+
+// buildTestArchive writes parts the way excelize does (zip.Writer.Create).
+// A nil compressor keeps archive/zip's built-in DEFLATE.
+func buildTestArchive(t testing.TB, parts []testArchivePart, compressor zip.Compressor) []byte {
+	t.Helper()
+
+	var archive bytes.Buffer
+	writer := zip.NewWriter(&archive)
+	if compressor != nil {
+		writer.RegisterCompressor(zip.Deflate, compressor)
+	}
+	for _, part := range parts {
+		entry, err := writer.Create(part.name)
+		if err != nil {
+			t.Fatalf("create %s: %v", part.name, err)
+		}
+		if _, err := io.WriteString(entry, part.data); err != nil {
+			t.Fatalf("write %s: %v", part.name, err)
+		}
+	}
+	if err := writer.Close(); err != nil {
+		t.Fatalf("close archive: %v", err)
+	}
+	return archive.Bytes()
+}
+
+func storedBlockCompressor(output io.Writer) (io.WriteCloser, error) {
+	return flate.NewWriter(output, flate.NoCompression)
+}
+
+func TestRewriteArchiveMatchesSerialStandardLibraryOutput(t *testing.T) {
+	parts := newTestArchiveParts()
+	expected := buildTestArchive(t, parts, nil)
+	staged := buildTestArchive(t, parts, storedBlockCompressor)
+
+	for _, workers := range []int{1, 3, 16} {
+		var rewritten bytes.Buffer
+		err := archiveRewrite{
+			compressor: archiveCompressor(archiveSettings{}),
+			workers:    workers,
+		}.run(bytes.NewReader(staged), int64(len(staged)), &rewritten)
+		if err != nil {
+			t.Fatalf("rewrite with %d workers: %v", workers, err)
+		}
+		if !bytes.Equal(rewritten.Bytes(), expected) {
+			t.Fatalf("rewrite with %d workers differs from the serial archive", workers)
+		}
+	}
+}
+
+func TestRewriteArchiveWithLevelKeepsContentReadable(t *testing.T) {
+	parts := newTestArchiveParts()
+	staged := buildTestArchive(t, parts, storedBlockCompressor)
+
+	var rewritten bytes.Buffer
+	err := archiveRewrite{
+		compressor: archiveCompressor(archiveSettings{level: 1, parallel: true}),
+		workers:    4,
+	}.run(bytes.NewReader(staged), int64(len(staged)), &rewritten)
+	if err != nil {
+		t.Fatalf("rewrite: %v", err)
+	}
+	assertRewrittenArchiveContent(t, rewritten.Bytes(), parts)
+}
+
+func TestRewriteArchiveInBlocksKeepsContentReadable(t *testing.T) {
+	parts := newTestArchiveParts()
+	staged := buildTestArchive(t, parts, storedBlockCompressor)
+
+	var rewritten bytes.Buffer
+	err := archiveRewrite{
+		compressor: archiveCompressor(archiveSettings{parallel: true, blocks: true}),
+		workers:    4,
+		blockSize:  4 << 10,
+	}.run(bytes.NewReader(staged), int64(len(staged)), &rewritten)
+	if err != nil {
+		t.Fatalf("rewrite in blocks: %v", err)
+	}
+	assertRewrittenArchiveContent(t, rewritten.Bytes(), parts)
+}
+
+func assertRewrittenArchiveContent(t *testing.T, rewritten []byte, parts []testArchivePart) {
+	t.Helper()
+
+	staged := buildTestArchive(t, parts, storedBlockCompressor)
+	if len(rewritten) >= len(staged) {
+		t.Fatalf("rewritten archive (%d bytes) is not smaller than staging (%d bytes)", len(rewritten), len(staged))
+	}
+
+	reader, err := zip.NewReader(bytes.NewReader(rewritten), int64(len(rewritten)))
+	if err != nil {
+		t.Fatalf("open rewritten archive: %v", err)
+	}
+	if len(reader.File) != len(parts) {
+		t.Fatalf("rewritten archive has %d entries, want %d", len(reader.File), len(parts))
+	}
+	for index, file := range reader.File {
+		if file.Name != parts[index].name {
+			t.Fatalf("entry %d is %q, want %q", index, file.Name, parts[index].name)
+		}
+		source, err := file.Open()
+		if err != nil {
+			t.Fatalf("open %s: %v", file.Name, err)
+		}
+		data, err := io.ReadAll(source)
+		source.Close()
+		if err != nil {
+			t.Fatalf("read %s: %v", file.Name, err)
+		}
+		if string(data) != parts[index].data {
+			t.Fatalf("entry %s content changed", file.Name)
+		}
+	}
+}
+
+func TestRewriteArchiveRejectsCorruptStaging(t *testing.T) {
+	staged := buildTestArchive(t, newTestArchiveParts(), storedBlockCompressor)
+	corrupt := bytes.Replace(staged, []byte(`<row r="7">`), []byte(`<row r="8">`), 1)
+
+	err := archiveRewrite{
+		compressor: archiveCompressor(archiveSettings{}),
+		workers:    2,
+	}.run(bytes.NewReader(corrupt), int64(len(corrupt)), io.Discard)
+	if err == nil || !strings.Contains(err.Error(), "compress archive part") {
+		t.Fatalf("expected checksum error for the corrupted part, got %v", err)
+	}
+}
+
+func TestCompressBlocksProducesOneDeflateStream(t *testing.T) {
+	var input bytes.Buffer
+	for row := 0; input.Len() < 300<<10; row++ {
+		fmt.Fprintf(&input, `<row r="%d"><c t="s"><v>%d</v></c></row>`, row, row%97)
+	}
+	compressor := archiveCompressor(archiveSettings{})
+
+	var whole bytes.Buffer
+	deflater, err := compressor(&whole, nil)
+	if err != nil {
+		t.Fatalf("create serial compressor: %v", err)
+	}
+	if _, err := deflater.Write(input.Bytes()); err != nil {
+		t.Fatalf("serial compress: %v", err)
+	}
+	if err := deflater.Close(); err != nil {
+		t.Fatalf("close serial compressor: %v", err)
+	}
+
+	for _, blockSize := range []int{1 << 10, 7 << 10, 64 << 10, 1 << 20} {
+		var blocks bytes.Buffer
+		err := compressBlocks(bytes.NewReader(input.Bytes()), &blocks, compressor, blockSize, 3, nil)
+		if err != nil {
+			t.Fatalf("compress in %d byte blocks: %v", blockSize, err)
+		}
+		inflated, err := io.ReadAll(flate.NewReader(bytes.NewReader(blocks.Bytes())))
+		if err != nil {
+			t.Fatalf("inflate %d byte blocks: %v", blockSize, err)
+		}
+		if !bytes.Equal(inflated, input.Bytes()) {
+			t.Fatalf("%d byte blocks do not round-trip", blockSize)
+		}
+		// The carried dictionary keeps the ratio close to a serial stream.
+		if blocks.Len() > whole.Len()*3/2 {
+			t.Fatalf("%d byte blocks: %d bytes vs %d serial", blockSize, blocks.Len(), whole.Len())
+		}
+	}
+}
+
+func TestStoreArchiveWritesUncompressedEntries(t *testing.T) {
+	parts := newTestArchiveParts()
+	staged := buildTestArchive(t, parts, storedBlockCompressor)
+
+	var stored bytes.Buffer
+	if err := storeArchive(bytes.NewReader(staged), int64(len(staged)), &stored); err != nil {
+		t.Fatalf("store archive: %v", err)
+	}
+	reader, err := zip.NewReader(bytes.NewReader(stored.Bytes()), int64(stored.Len()))
+	if err != nil {
+		t.Fatalf("open stored archive: %v", err)
+	}
+	if len(reader.File) != len(parts) {
+		t.Fatalf("stored archive has %d entries, want %d", len(reader.File), len(parts))
+	}
+	archive := stored.Bytes()
+	offset := 0
+	for index, file := range reader.File {
+		if file.Method != zip.Store {
+			t.Fatalf("entry %s uses method %d, want STORE", file.Name, file.Method)
+		}
+		// Streaming readers only see the local header, so it must carry the
+		// real CRC and sizes, with no data descriptor after the data.
+		local := archive[offset:]
+		if binary.LittleEndian.Uint32(local) != 0x04034b50 {
+			t.Fatalf("entry %s has no local header at offset %d", file.Name, offset)
+		}
+		flags := binary.LittleEndian.Uint16(local[6:])
+		crc := binary.LittleEndian.Uint32(local[14:])
+		compressedSize := binary.LittleEndian.Uint32(local[18:])
+		size := binary.LittleEndian.Uint32(local[22:])
+		if flags&zipDataDescriptorFlag != 0 || file.Flags&zipDataDescriptorFlag != 0 {
+			t.Fatalf("entry %s is followed by a data descriptor", file.Name)
+		}
+		if crc != file.CRC32 || compressedSize != size || int(size) != len(parts[index].data) {
+			t.Fatalf("entry %s local header has crc %x and sizes %d/%d", file.Name, crc, compressedSize, size)
+		}
+		nameLength := int(binary.LittleEndian.Uint16(local[26:]))
+		extraLength := int(binary.LittleEndian.Uint16(local[28:]))
+		offset += 30 + nameLength + extraLength + int(size)
+		if file.CompressedSize64 != uint64(len(parts[index].data)) {
+			t.Fatalf("entry %s stores %d bytes, want %d", file.Name, file.CompressedSize64, len(parts[index].data))
+		}
+		source, err := file.Open()
+		if err != nil {
+			t.Fatalf("open %s: %v", file.Name, err)
+		}
+		data, err := io.ReadAll(source)
+		source.Close()
+		if err != nil {
+			t.Fatalf("read %s: %v", file.Name, err)
+		}
+		if string(data) != parts[index].data {
+			t.Fatalf("entry %s content changed", file.Name)
+		}
+	}
+}
+
+func TestCanonicalizeArchiveSortsPartsAndClearsTimestamps(t *testing.T) {
+	parts := newTestArchiveParts()
+	shuffled := append([]testArchivePart{parts[len(parts)-1]}, parts[:len(parts)-1]...)
+	shuffled[1], shuffled[len(shuffled)-1] = shuffled[len(shuffled)-1], shuffled[1]
+
+	var canonical [][]byte
+	for _, order := range [][]testArchivePart{parts, shuffled} {
+		var archive bytes.Buffer
+		writer := zip.NewWriter(&archive)
+		for _, part := range order {
+			entry, err := writer.CreateHeader(&zip.FileHeader{
+				Name:     part.name,
+				Method:   zip.Deflate,
+				Modified: time.Now(),
+			})
+			if err != nil {
+				t.Fatalf("create %s: %v", part.name, err)
+			}
+			if _, err := io.WriteString(entry, part.data); err != nil {
+				t.Fatalf("write %s: %v", part.name, err)
+			}
+		}
+		if err := writer.Close(); err != nil {
+			t.Fatalf("close archive: %v", err)
+		}
+
+		var output bytes.Buffer
+		if err := canonicalizeArchive(bytes.NewReader(archive.Bytes()), int64(archive.Len()), &output); err != nil {
+			t.Fatalf("canonicalize archive: %v", err)
+		}
+		canonical = append(canonical, output.Bytes())
+	}
+	if !bytes.Equal(canonical[0], canonical[1]) {
+		t.Fatal("archives with the same parts in another order differ after canonicalization")
+	}
+
+	reader, err := zip.NewReader(bytes.NewReader(canonical[0]), int64(len(canonical[0])))
+	if err != nil {
+		t.Fatalf("open canonical archive: %v", err)
+	}
+	if reader.File[0].Name != contentTypesPart {
+		t.Fatalf("first entry is %s, want %s", reader.File[0].Name, contentTypesPart)
+	}
+	for index, file := range reader.File {
+		if index > 1 && file.Name < reader.File[index-1].Name {
+			t.Fatalf("entry %s follows %s", file.Name, reader.File[index-1].Name)
+		}
+		if file.ModifiedTime != 0 || file.ModifiedDate != 0 || len(file.Extra) != 0 {
+			t.Fatalf("entry %s keeps a timestamp", file.Name)
+		}
+	}
+	assertRewrittenArchiveContent(t, canonical[0], parts)
+}
+
+func TestArchiveRewriteBoundsConcurrentCompressors(t *testing.T) {
+	parts := newTestArchiveParts()
+	staged := buildTestArchive(t, parts, storedBlockCompressor)
+	var active, peak atomic.Int64
+	compressor := archiveCompressor(archiveSettings{})
+	counting := func(output io.Writer, dict []byte) (deflateWriter, error) {
+		if current := active.Add(1); current > peak.Load() {
+			peak.Store(current)
+		}
+		time.Sleep(time.Millisecond)
+		active.Add(-1)
+		return compressor(output, dict)
+	}
+
+	var rewritten bytes.Buffer
+	err := archiveRewrite{compressor: counting, workers: 2, blockSize: 1 << 10}.run(
+		bytes.NewReader(staged), int64(len(staged)), &rewritten,
+	)
+	if err != nil {
+		t.Fatalf("rewrite with two workers: %v", err)
+	}
+	assertRewrittenArchiveContent(t, rewritten.Bytes(), parts)
+	if peak.Load() > 2 {
+		t.Fatalf("%d compressors ran at once with two workers", peak.Load())
+	}
+}
@@ -0,0 +1,62 @@
+package core
+
+import (
+	"runtime"
+	"sync"
+)
+
+// BatchItem is one workbook of an export batch.
+type BatchItem struct {
+	// Path is the file the workbook is written to.
+	Path string
+	// Load returns the PFX2 or legacy JSON payload. WriteExcelBatch calls it
+	// on the worker that exports the item, so a payload is only held while
+	// its workbook is written.
+	Load func() ([]byte, error)
+}
+
+// BatchResult is the outcome of one BatchItem.
+type BatchResult struct {
+	Report ExportReport
+	Err    error
+}
+
+// WriteExcelBatch writes every item to its path on at most maxWorkers
+// goroutines, GOMAXPROCS when maxWorkers is not positive, and returns the
+// results in item order. A failing item does not stop the others. Styles
+// of workbooks with identical style tables are parsed once.
+func WriteExcelBatch(items []BatchItem, maxWorkers int) []BatchResult {
+	results := make([]BatchResult, len(items))
+	if maxWorkers < 1 {
+		maxWorkers = runtime.GOMAXPROCS(0)
+	}
+	styles := newStyleDefinitionCache()
+	jobs := make(chan int)
+	var workers sync.WaitGroup
+	for worker := 0; worker < min(maxWorkers, len(items)); worker++ {
+		workers.Add(1)
+		go func() {
+			defer workers.Done()
+			for index := range jobs {
+				results[index] = writeBatchItem(items[index], styles)
+			}
+		}()
+	}
+	for index := range items {
+		jobs <- index
+	}
+	close(jobs)
+	workers.Wait()
+	return results
+}
+
+func writeBatchItem(item BatchItem, styles *styleDefinitionCache) (result BatchResult) {
+	defer recoverAsError(&result.Err)
+	payload, err := item.Load()
+	if err != nil {
+		result.Err = err
+		return result
+	}
+	result.Report, result.Err = writeExcelToFile(payload, item.Path, styles, nil)
+	return result
+}
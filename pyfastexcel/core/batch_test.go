@@ -0,0 +1,97 @@
+package core
+
+import (
+	"encoding/json"
+	"errors"
+	"os"
+	"path/filepath"
+	"reflect"
+	"strconv"
+	"testing"
+)
+
+// jsonStyleDefinition is testStyleDefinition as it arrives in the metadata,
+// with JSON numbers decoded as float64.
+func jsonStyleDefinition(t *testing.T, color string) map[string]interface{} {
+	t.Helper()
+	encoded, err := json.Marshal(testStyleDefinition(color))
+	if err != nil {
+		t.Fatalf("encode style definition: %v", err)
+	}
+	var definition map[string]interface{}
+	if err := json.Unmarshal(encoded, &definition); err != nil {
+		t.Fatalf("decode style definition: %v", err)
+	}
+	return definition
+}
+
+func TestStyleDefinitionCacheSharesParsedStyles(t *testing.T) {
+	cache := newStyleDefinitionCache()
+	table := string(make([]byte, 32))
+	first := cache.style(table, "accent", jsonStyleDefinition(t, "FF0000"))
+	second := cache.style(table, "accent", jsonStyleDefinition(t, "FF0000"))
+	cache.style(table, "other", jsonStyleDefinition(t, "00FF00"))
+	cache.style("", "accent", jsonStyleDefinition(t, "0000FF"))
+	if cache.hits != 1 || len(cache.styles) != 2 {
+		t.Fatalf("expected 1 hit and 2 cached styles, got %d and %d", cache.hits, len(cache.styles))
+	}
+	if !reflect.DeepEqual(first, second) {
+		t.Fatalf("cached style differs: %+v != %+v", first, second)
+	}
+	if first == second || first.Font == second.Font || first.CustomNumFmt == second.CustomNumFmt {
+		t.Fatal("every caller must get its own copy of a cached style")
+	}
+	if !reflect.DeepEqual(first, parseStyleDefinition(jsonStyleDefinition(t, "FF0000"))) {
+		t.Fatal("cached style differs from a freshly parsed one")
+	}
+}
+
+func TestCloneStyleCopiesPointerFields(t *testing.T) {
+	theme, charset, places := 1, 2, 3
+	style := parseStyleDefinition(jsonStyleDefinition(t, "FF0000"))
+	style.Font.ColorTheme = &theme
+	style.Font.Charset = &charset
+	style.DecimalPlaces = &places
+	clone := cloneStyle(style)
+	if !reflect.DeepEqual(clone, style) {
+		t.Fatalf("clone differs: %+v != %+v", clone, style)
+	}
+	if clone.Font.ColorTheme == style.Font.ColorTheme ||
+		clone.Font.Charset == style.Font.Charset ||
+		clone.DecimalPlaces == style.DecimalPlaces {
+		t.Fatal("the clone shares a pointer field with the cached style")
+	}
+}
+
+func TestWriteExcelBatchReportsPerItemErrors(t *testing.T) {
+	const sheets = 2
+	const rowsPerSheet = 8
+	directory := t.TempDir()
+	payload := newMultiSheetPFX2Payload(t, multiSheetTestRows(sheets, rowsPerSheet), nil)
+	items := make([]BatchItem, 5)
+	for index := range items {
+		items[index].Path = filepath.Join(directory, "book-"+strconv.Itoa(index)+".xlsx")
+		items[index].Load = func() ([]byte, error) { return payload, nil }
+	}
+	items[1].Load = func() ([]byte, error) { return payload[:wireHeaderSize+4], nil }
+	items[3].Load = func() ([]byte, error) { return nil, errors.New("payload unavailable") }
+
+	results := WriteExcelBatch(items, 2)
+	for index, result := range results {
+		failing := index == 1 || index == 3
+		if failing != (result.Err != nil) {
+			t.Fatalf("item %d: unexpected error state %v", index, result.Err)
+		}
+		if failing {
+			continue
+		}
+		workbookBytes, err := os.ReadFile(items[index].Path)
+		if err != nil {
+			t.Fatalf("read item %d: %v", index, err)
+		}
+		assertMultiSheetContent(t, workbookBytes, sheets, rowsPerSheet)
+	}
+	if results[3].Err.Error() != "payload unavailable" {
+		t.Fatalf("unexpected load error: %v", results[3].Err)
+	}
+}
@@ -0,0 +1,290 @@
+package core
+
+import (
+	"bytes"
+	"encoding/binary"
+	"encoding/json"
+	"errors"
+	"fmt"
+	"math"
+	"strconv"
+	"strings"
+
+	"github.com/vmihailenco/msgpack/v5"
+	"github.com/xuri/excelize/v2"
+)
+
+// Column types ReadColumns decodes cells into.
+const (
+	columnFloat64 = "float64"
+	columnInt64   = "int64"
+	columnBool    = "bool"
+	columnString  = "str"
+)
+
+// columnAlignment aligns every column buffer in a ReadColumns result, so
+// 8-byte values can be viewed in place.
+const columnAlignment = 8
+
+// ColumnSpec names one column to read and the type to decode it into.
+type ColumnSpec struct {
+	// Key is the header text of the column, or its letter when the sheet has
+	// no header row.
+	Key   string `json:"key"`
+	Dtype string `json:"dtype"`
+}
+
+// ColumnRequest selects the columns ReadColumns decodes.
+type ColumnRequest struct {
+	// Header takes the column names from the first row.
+	Header bool `json:"header"`
+	// Columns are the columns to read; nil reads every column as strings.
+	Columns []ColumnSpec `json:"columns"`
+}
+
+// ColumnInfo locates one decoded column in a ReadColumns result.
+type ColumnInfo struct {
+	Name   string `json:"name"`
+	Dtype  string `json:"dtype"`
+	Offset int    `json:"offset"`
+	Length int    `json:"length"`
+}
+
+// columnResult is the metadata of a ReadColumns result.
+type columnResult struct {
+	Rows    int          `json:"rows"`
+	Columns []ColumnInfo `json:"columns"`
+}
+
+// columnBuffer accumulates the decoded values of one column. Numbers are
+// little-endian 8-byte values and booleans one byte each.
+type columnBuffer struct {
+	name   string
+	dtype  string
+	index  int
+	values []byte
+	texts  []string
+}
+
+func newColumnBuffer(name, dtype string, index int) (*columnBuffer, error) {
+	switch dtype {
+	case columnFloat64, columnInt64, columnBool, columnString:
+		return &columnBuffer{name: name, dtype: dtype, index: index}, nil
+	}
+	return nil, fmt.Errorf(
+		"column %q has an unsupported dtype %q (expected float64, int64, bool or str)",
+		name,
+		dtype,
+	)
+}
+
+// appendCell decodes the raw value of the cell at row into the column.
+func (column *columnBuffer) appendCell(value string, row int) error {
+	switch column.dtype {
+	case columnString:
+		column.texts = append(column.texts, value)
+		return nil
+	case columnFloat64:
+		number := math.NaN()
+		if value != "" {
+			parsed, err := strconv.ParseFloat(value, 64)
+			if err != nil {
+				return column.cellError(value, row, "a number")
+			}
+			number = parsed
+		}
+		column.values = binary.LittleEndian.AppendUint64(column.values, math.Float64bits(number))
+		return nil
+	case columnInt64:
+		number, err := strconv.ParseInt(value, 10, 64)
+		if err != nil {
+			// Integers written as floats, such as "3.0" or "1E+3", still qualify.
+			parsed, floatErr := strconv.ParseFloat(value, 64)
+			if floatErr != nil || parsed != math.Trunc(parsed) || math.Abs(parsed) >= 1<<63 {
+				return column.cellError(value, row, "an integer")
+			}
+			number = int64(parsed)
+		}
+		column.values = binary.LittleEndian.AppendUint64(column.values, uint64(number))
+		return nil
+	default:
+		switch strings.ToUpper(value) {
+		case "1", "TRUE":
+			column.values = append(column.values, 1)
+		case "0", "FALSE":
+			column.values = append(column.values, 0)
+		default:
+			return column.cellError(value, row, "a boolean")
+		}
+		return nil
+	}
+}
+
+func (column *columnBuffer) cellError(value string, row int, expected string) error {
+	cell, _ := excelize.CoordinatesToCellName(column.index+1, row)
+	if value == "" {
+		return fmt.Errorf("cell %s of column %q is empty, expected %s", cell, column.name, expected)
+	}
+	return fmt.Errorf("cell %s of column %q is %q, expected %s", cell, column.name, value, expected)
+}
+
+// ReadColumns decodes columns of sheet, the first worksheet when sheet is
+// empty, into typed buffers. Cells are read raw, without number formats;
+// empty float64 cells become NaN. The result is an 8-byte little-endian
+// metadata length, the JSON columnResult, and the column buffers, each
+// starting at a multiple of columnAlignment after the metadata padding.
+func ReadColumns(path, sheet string, request ColumnRequest) (result []byte, err error) {
+	defer recoverAsError(&err)
+
+	file, rows, err := openSheetRows(path, sheet)
+	if err != nil {
+		return nil, err
+	}
+	defer func() {
+		err = errors.Join(err, rows.Close(), file.Close())
+	}()
+
+	options := excelize.Options{RawCellValue: true}
+	var columns []*columnBuffer
+	allColumns := request.Columns == nil
+	rowNumber := 0
+	if request.Header {
+		var header []string
+		if rows.Next() {
+			rowNumber++
+			if header, err = rows.Columns(options); err != nil {
+				return nil, fmt.Errorf("read header row: %w", err)
+			}
+		}
+		if columns, err = headerColumns(header, request.Columns); err != nil {
+			return nil, err
+		}
+		allColumns = false
+	} else if !allColumns {
+		if columns, err = letterColumns(request.Columns); err != nil {
+			return nil, err
+		}
+	}
+
+	dataRows := 0
+	for rows.Next() {
+		rowNumber++
+		row, err := rows.Columns(options)
+		if err != nil {
+			return nil, fmt.Errorf("read row %d: %w", rowNumber, err)
+		}
+		// Without a header or a column list, the widest row so far sets the
+		// columns, and earlier rows are padded with empty strings.
+		for allColumns && len(columns) < len(row) {
+			name, _ := excelize.ColumnNumberToName(len(columns) + 1)
+			column := &columnBuffer{name: name, dtype: columnString, index: len(columns)}
+			column.texts = make([]string, dataRows, max(dataRows, 16))
+			columns = append(columns, column)
+		}
+		for _, column := range columns {
+			value := ""
+			if column.index < len(row) {
+				value = row[column.index]
+			}
+			if err := column.appendCell(value, rowNumber); err != nil {
+				return nil, err
+			}
+		}
+		dataRows++
+	}
+	if err := rows.Error(); err != nil {
+		return nil, fmt.Errorf("read rows: %w", err)
+	}
+	return encodeColumns(columns, dataRows)
+}
+
+// headerColumns resolves specs against the header row; nil specs select
+// every named column as strings.
+func headerColumns(header []string, specs []ColumnSpec) ([]*columnBuffer, error) {
+	positions := make(map[string]int, len(header))
+	for index, name := range header {
+		if _, seen := positions[name]; !seen {
+			positions[name] = index
+		}
+	}
+	if specs == nil {
+		specs = make([]ColumnSpec, 0, len(header))
+		for index, name := range header {
+			if name != "" && positions[name] == index {
+				specs = append(specs, ColumnSpec{Key: name, Dtype: columnString})
+			}
+		}
+	}
+	columns := make([]*columnBuffer, 0, len(specs))
+	for _, spec := range specs {
+		index, ok := positions[spec.Key]
+		if !ok || spec.Key == "" {
+			return nil, fmt.Errorf("column %q is not in the header row", spec.Key)
+		}
+		column, err := newColumnBuffer(spec.Key, spec.Dtype, index)
+		if err != nil {
+			return nil, err
+		}
+		columns = append(columns, column)
+	}
+	return columns, nil
+}
+
+// letterColumns resolves specs keyed by column letter.
+func letterColumns(specs []ColumnSpec) ([]*columnBuffer, error) {
+	columns := make([]*columnBuffer, 0, len(specs))
+	for _, spec := range specs {
+		number, err := excelize.ColumnNameToNumber(spec.Key)
+		if err != nil {
+			return nil, fmt.Errorf("column %q is not a column letter: %w", spec.Key, err)
+		}
+		column, err := newColumnBuffer(spec.Key, spec.Dtype, number-1)
+		if err != nil {
+			return nil, err
+		}
+		columns = append(columns, column)
+	}
+	return columns, nil
+}
+
+func encodeColumns(columns []*columnBuffer, rowCount int) ([]byte, error) {
+	var data bytes.Buffer
+	metadata := columnResult{Rows: rowCount, Columns: make([]ColumnInfo, 0, len(columns))}
+	for _, column := range columns {
+		if padding := data.Len() % columnAlignment; padding != 0 {
+			data.Write(make([]byte, columnAlignment-padding))
+		}
+		offset := data.Len()
+		if column.dtype == columnString {
+			encoder := msgpack.NewEncoder(&data)
+			if err := encoder.EncodeArrayLen(len(column.texts)); err != nil {
+				return nil, err
+			}
+			for _, text := range column.texts {
+				if err := encoder.EncodeString(text); err != nil {
+					return nil, err
+				}
+			}
+		} else {
+			data.Write(column.values)
+		}
+		metadata.Columns = append(metadata.Columns, ColumnInfo{
+			Name:   column.name,
+			Dtype:  column.dtype,
+			Offset: offset,
+			Length: data.Len() - offset,
+		})
+	}
+
+	encoded, err := json.Marshal(metadata)
+	if err != nil {
+		return nil, fmt.Errorf("encode column metadata: %w", err)
+	}
+	headerSize := 8 + len(encoded)
+	padding := (columnAlignment - headerSize%columnAlignment) % columnAlignment
+	result := make([]byte, 0, headerSize+padding+data.Len())
+	result = binary.LittleEndian.AppendUint64(result, uint64(len(encoded)))
+	result = append(result, encoded...)
+	result = append(result, make([]byte, padding)...)
+	return append(result, data.Bytes()...), nil
+}
@@ -0,0 +1,133 @@
+package core
+
+import (
+	"encoding/binary"
+	"encoding/json"
+	"fmt"
+	"math"
+	"path/filepath"
+	"strings"
+	"testing"
+
+	"github.com/vmihailenco/msgpack/v5"
+	"github.com/xuri/excelize/v2"
+)
+
+// decodedColumns splits a ReadColumns result into its metadata and the
+// bytes of each column.
+func decodedColumns(t *testing.T, result []byte) (columnResult, map[string][]byte) {
+	t.Helper()
+	metadataLength := int(binary.LittleEndian.Uint64(result))
+	var metadata columnResult
+	if err := json.Unmarshal(result[8:8+metadataLength], &metadata); err != nil {
+		t.Fatalf("decode column metadata: %v", err)
+	}
+	dataStart := 8 + metadataLength
+	dataStart += (columnAlignment - dataStart%columnAlignment) % columnAlignment
+	buffers := map[string][]byte{}
+	for _, column := range metadata.Columns {
+		if column.Offset%columnAlignment != 0 {
+			t.Fatalf("column %s starts at unaligned offset %d", column.Name, column.Offset)
+		}
+		start := dataStart + column.Offset
+		buffers[column.Name] = result[start : start+column.Length]
+	}
+	return metadata, buffers
+}
+
+func decodedFloats(buffer []byte) []float64 {
+	values := make([]float64, len(buffer)/8)
+	for index := range values {
+		values[index] = math.Float64frombits(binary.LittleEndian.Uint64(buffer[index*8:]))
+	}
+	return values
+}
+
+func TestReadColumnsDecodesLetterColumnsIntoTypedBuffers(t *testing.T) {
+	path := writeReaderTestWorkbook(t, 5)
+	result, err := ReadColumns(path, "Data", ColumnRequest{Columns: []ColumnSpec{
+		{Key: "B", Dtype: columnFloat64},
+		{Key: "A", Dtype: columnString},
+	}})
+	if err != nil {
+		t.Fatalf("read columns: %v", err)
+	}
+	metadata, buffers := decodedColumns(t, result)
+	if metadata.Rows != 7 || len(metadata.Columns) != 2 {
+		t.Fatalf("unexpected column metadata %+v", metadata)
+	}
+	numbers := decodedFloats(buffers["B"])
+	if len(numbers) != 7 || numbers[2] != 3 || !math.IsNaN(numbers[5]) || numbers[6] != 1.5 {
+		t.Fatalf("column B = %v", numbers)
+	}
+	var names []string
+	if err := msgpack.Unmarshal(buffers["A"], &names); err != nil {
+		t.Fatalf("decode column A: %v", err)
+	}
+	if len(names) != 7 || names[0] != "item 1" || names[6] != "" {
+		t.Fatalf("column A = %q", names)
+	}
+
+	_, err = ReadColumns(path, "Data", ColumnRequest{Columns: []ColumnSpec{{Key: "B", Dtype: columnInt64}}})
+	if err == nil || !strings.Contains(err.Error(), "cell B6") {
+		t.Fatalf("expected an error naming the empty cell B6, got %v", err)
+	}
+}
+
+func TestReadColumnsResolvesHeaderNames(t *testing.T) {
+	file := excelize.NewFile()
+	rows := [][]interface{}{
+		{"name", "qty", "ok"},
+		{"apple", 3, true},
+		{"pear", 5.0, false},
+	}
+	for index, row := range rows {
+		if err := file.SetSheetRow("Sheet1", fmt.Sprintf("A%d", index+1), &row); err != nil {
+			t.Fatalf("write row: %v", err)
+		}
+	}
+	path := filepath.Join(t.TempDir(), "header.xlsx")
+	if err := file.SaveAs(path); err != nil {
+		t.Fatalf("save workbook: %v", err)
+	}
+	file.Close()
+
+	result, err := ReadColumns(path, "", ColumnRequest{Header: true, Columns: []ColumnSpec{
+		{Key: "ok", Dtype: columnBool},
+		{Key: "qty", Dtype: columnInt64},
+	}})
+	if err != nil {
+		t.Fatalf("read columns: %v", err)
+	}
+	metadata, buffers := decodedColumns(t, result)
+	if metadata.Rows != 2 || metadata.Columns[0].Name != "ok" {
+		t.Fatalf("unexpected column metadata %+v", metadata)
+	}
+	if string(buffers["ok"]) != "\x01\x00" {
+		t.Fatalf("column ok = %v", buffers["ok"])
+	}
+	if binary.LittleEndian.Uint64(buffers["qty"][8:]) != 5 {
+		t.Fatalf("column qty = %v", buffers["qty"])
+	}
+
+	result, err = ReadColumns(path, "", ColumnRequest{Header: true})
+	if err != nil {
+		t.Fatalf("read every column: %v", err)
+	}
+	metadata, _ = decodedColumns(t, result)
+	if len(metadata.Columns) != 3 || metadata.Columns[2].Dtype != columnString {
+		t.Fatalf("unexpected column metadata %+v", metadata)
+	}
+
+	for name, request := range map[string]ColumnRequest{
+		"missing header":  {Header: true, Columns: []ColumnSpec{{Key: "price", Dtype: columnFloat64}}},
+		"unknown dtype":   {Header: true, Columns: []ColumnSpec{{Key: "qty", Dtype: "decimal"}}},
+		"text as number":  {Header: true, Columns: []ColumnSpec{{Key: "name", Dtype: columnFloat64}}},
+		"not a letter":    {Columns: []ColumnSpec{{Key: "A1", Dtype: columnString}}},
+		"number as bools": {Header: true, Columns: []ColumnSpec{{Key: "qty", Dtype: columnBool}}},
+	} {
+		if _, err := ReadColumns(path, "", request); err == nil {
+			t.Errorf("%s: expected an error", name)
+		}
+	}
+}
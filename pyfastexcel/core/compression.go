@@ -12,38 +12,122 @@ import (
 // produces byte-for-byte the same archives as previous releases. Levels 1-9
 // switch to klauspost/compress: level 1 is fastest, level 9 is smallest;
 // level 6 compresses the reference 1.5M-cell workload about 3x faster than
-// the standard library for roughly 20% larger files.
+// the standard library for roughly 20% larger files. Level 0 writes STORE
+// entries (no compression) for output that is re-compressed or consumed
+// locally anyway.
 const zipLevelEnvVar = "PYFASTEXCEL_ZIP_LEVEL"
 
-var configureZipOnce sync.Once
+// zipParallelEnvVar enables concurrent compression of the archive parts.
+// "parts" lets excelize write a cheap stored-block staging archive and then
+// compresses its parts on a worker pool (see archive.go), so a multi-sheet
+// workbook no longer compresses one sheet at a time. It combines with
+// zipLevelEnvVar; without a level the parts keep the standard library
+// compressor and the archive bytes are unchanged. "blocks" additionally
+// splits parts larger than zipBlockSize into pigz-style DEFLATE blocks that
+// are compressed concurrently, for single-sheet workbooks whose one
+// worksheet part dominates the archive.
+const zipParallelEnvVar = "PYFASTEXCEL_ZIP_PARALLEL"
 
-// configureZipCompression applies PYFASTEXCEL_ZIP_LEVEL once per process.
-// Registration happens before any workbook bytes are produced, and the
-// underlying registry swap is atomic, so concurrent exports are safe.
+const (
+	zipParallelParts  = "parts"
+	zipParallelBlocks = "blocks"
+)
+
+// archiveSettings is the process-wide compression configuration resolved by
+// configureZipCompression.
+type archiveSettings struct {
+	// level is the requested DEFLATE level; 0 keeps the standard library.
+	level int
+	// store writes uncompressed STORE entries (PYFASTEXCEL_ZIP_LEVEL=0).
+	store bool
+	// parallel routes serialization through the staged archive rewrite.
+	parallel bool
+	// blocks splits large parts into concurrently compressed blocks.
+	blocks bool
+}
+
+var (
+	configureZipOnce sync.Once
+	zipSettings      archiveSettings
+)
+
+// configureZipCompression applies PYFASTEXCEL_ZIP_LEVEL and
+// PYFASTEXCEL_ZIP_PARALLEL once per process. Registration happens before any
+// workbook bytes are produced, and the underlying registry swap is atomic, so
+// concurrent exports are safe.
 func configureZipCompression() {
 	configureZipOnce.Do(func() {
-		raw := os.Getenv(zipLevelEnvVar)
-		if raw == "" {
-			return
-		}
-		level, err := strconv.Atoi(raw)
-		if err != nil || level < 1 || level > 9 {
-			fmt.Fprintf(
-				os.Stderr,
-				"pyfastexcel: ignoring %s=%q (expected an integer from 1 to 9)\n",
-				zipLevelEnvVar,
-				raw,
-			)
+		level, levelSet := zipLevelFromEnv()
+		parallel, blocks := zipParallelFromEnv()
+		if !levelSet && !parallel {
 			return
 		}
 		if !fastZipSupported {
+			variable := zipLevelEnvVar
+			if !levelSet {
+				variable = zipParallelEnvVar
+			}
 			fmt.Fprintf(
 				os.Stderr,
 				"pyfastexcel: %s is set but this native library was built without fast-zip support\n",
-				zipLevelEnvVar,
+				variable,
 			)
 			return
 		}
+		zipSettings = archiveSettings{level: level, parallel: parallel, blocks: blocks}
+		if levelSet && level == 0 {
+			// STORE: stage stored blocks and copy the parts out uncompressed.
+			zipSettings = archiveSettings{store: true}
+		}
+		if zipSettings.rewrite() {
+			setFastZipStaging()
+			return
+		}
 		setFastZipLevel(level)
 	})
 }
+
+// rewrite reports whether excelize's output is staged and rewritten by
+// archive.go instead of being written directly.
+func (settings archiveSettings) rewrite() bool {
+	return settings.parallel || settings.store
+}
+
+func zipLevelFromEnv() (int, bool) {
+	raw := os.Getenv(zipLevelEnvVar)
+	if raw == "" {
+		return 0, false
+	}
+	level, err := strconv.Atoi(raw)
+	if err != nil || level < 0 || level > 9 {
+		fmt.Fprintf(
+			os.Stderr,
+			"pyfastexcel: ignoring %s=%q (expected an integer from 0 to 9)\n",
+			zipLevelEnvVar,
+			raw,
+		)
+		return 0, false
+	}
+	return level, true
+}
+
+func zipParallelFromEnv() (parallel bool, blocks bool) {
+	raw := os.Getenv(zipParallelEnvVar)
+	switch raw {
+	case "":
+		return false, false
+	case zipParallelParts:
+		return true, false
+	case zipParallelBlocks:
+		return true, true
+	}
+	fmt.Fprintf(
+		os.Stderr,
+		"pyfastexcel: ignoring %s=%q (expected %q or %q)\n",
+		zipParallelEnvVar,
+		raw,
+		zipParallelParts,
+		zipParallelBlocks,
+	)
+	return false, false
+}
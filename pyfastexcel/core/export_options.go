@@ -0,0 +1,242 @@
+package core
+
+import (
+	"errors"
+	"fmt"
+	"math"
+	"os"
+	"runtime"
+	"strings"
+	"sync/atomic"
+	"time"
+)
+
+// exportOptionsKey names the optional top-level metadata object that carries
+// per-export native settings.
+const exportOptionsKey = "export_options"
+
+// streamSpillPrefix is the name prefix excelize uses for the temporary files
+// its stream writers spill sheet XML to.
+const streamSpillPrefix = "excelize-"
+
+// exportOptions are the per-export settings sent by Python.
+type exportOptions struct {
+	// TempDir is the parent directory of every temporary file the export
+	// creates. Empty selects os.TempDir().
+	TempDir string
+	// SpillThreshold is the size in bytes above which pyfastexcel's own
+	// buffers (archive staging and rewritten parts) move to a temporary file.
+	// Negative keeps the defaults.
+	SpillThreshold int64
+	// MaxWorkers caps the goroutines that write sheets and compress the
+	// archive concurrently. Zero selects GOMAXPROCS.
+	MaxWorkers int
+	// Trace records the export's spans in ExportReport.Trace.
+	Trace bool
+	// Deterministic writes the archive entries in a canonical order with
+	// fixed timestamps, so equal payloads give byte-identical workbooks.
+	Deterministic bool
+}
+
+// ExportReport describes the resources one export used besides the workbook
+// itself. The ABI-v3 entry points return it to Python as JSON.
+type ExportReport struct {
+	// StreamSpillFiles and StreamSpillBytes count the temporary files excelize
+	// stream writers spilled sheet XML to. excelize spills each stream sheet
+	// past excelize.StreamChunkSize (16 MiB), a compile-time constant.
+	StreamSpillFiles int   `json:"stream_spill_files"`
+	StreamSpillBytes int64 `json:"stream_spill_bytes"`
+	// BufferSpillFiles and BufferSpillBytes count pyfastexcel buffers that
+	// grew past the spill threshold and were moved to disk.
+	BufferSpillFiles int64 `json:"buffer_spill_files"`
+	BufferSpillBytes int64 `json:"buffer_spill_bytes"`
+	// Wire is the payload format the export decoded, "pfx2" or "json".
+	Wire string `json:"wire"`
+	// Build is "parallel" when stream sheets were written by the worker
+	// pool of buildWireSheetsParallel, otherwise "sequential".
+	Build string `json:"build"`
+	// BuildNanos is the time spent decoding rows and writing sheets,
+	// WriteNanos the time spent compressing and writing the archive.
+	BuildNanos int64 `json:"build_ns"`
+	WriteNanos int64 `json:"write_ns"`
+	// OutputBytes is the size of the generated workbook.
+	OutputBytes int64 `json:"output_bytes"`
+	// AllocatedBytes is the Go heap allocated while the export ran,
+	// including allocations of exports running at the same time.
+	AllocatedBytes int64 `json:"allocated_bytes"`
+	// Trace holds the export's spans when export_options.trace was set.
+	Trace []TraceEvent `json:"trace,omitempty"`
+}
+
+// exportStats records how one export ran, for its ExportReport.
+type exportStats struct {
+	wire        string
+	parallel    bool
+	buildTime   time.Duration
+	writeTime   time.Duration
+	outputBytes int64
+	// allocatedAtStart is the heap allocation counter when the export began.
+	allocatedAtStart uint64
+}
+
+// spillStats accumulates buffer spills; buffers of one export may spill from
+// several compression workers at once.
+type spillStats struct {
+	files atomic.Int64
+	bytes atomic.Int64
+}
+
+func (stats *spillStats) add(size int64) {
+	if stats == nil {
+		return
+	}
+	stats.files.Add(1)
+	stats.bytes.Add(size)
+}
+
+func parseExportOptions(raw interface{}) (exportOptions, error) {
+	options := exportOptions{SpillThreshold: -1}
+	if raw == nil {
+		return options, nil
+	}
+	fields, ok := raw.(map[string]interface{})
+	if !ok {
+		return options, fmt.Errorf("workbook metadata field %q must be an object", exportOptionsKey)
+	}
+	if value := fields["temp_dir"]; value != nil {
+		directory, ok := value.(string)
+		if !ok || directory == "" {
+			return options, fmt.Errorf("export option temp_dir must be a non-empty string")
+		}
+		options.TempDir = directory
+	}
+	if value := fields["spill_threshold"]; value != nil {
+		threshold, ok := value.(float64)
+		if !ok || threshold < 0 || threshold != math.Trunc(threshold) || threshold > math.MaxInt64 {
+			return options, fmt.Errorf("export option spill_threshold must be a non-negative integer")
+		}
+		options.SpillThreshold = int64(threshold)
+	}
+	if value := fields["max_workers"]; value != nil {
+		workers, ok := value.(float64)
+		if !ok || workers < 1 || workers != math.Trunc(workers) || workers > math.MaxInt32 {
+			return options, fmt.Errorf("export option max_workers must be a positive integer")
+		}
+		options.MaxWorkers = int(workers)
+	}
+	if value := fields["trace"]; value != nil {
+		trace, ok := value.(bool)
+		if !ok {
+			return options, fmt.Errorf("export option trace must be a boolean")
+		}
+		options.Trace = trace
+	}
+	if value := fields["deterministic"]; value != nil {
+		deterministic, ok := value.(bool)
+		if !ok {
+			return options, fmt.Errorf("export option deterministic must be a boolean")
+		}
+		options.Deterministic = deterministic
+	}
+	return options, nil
+}
+
+// workers is the number of goroutines the export may keep busy at once.
+func (options exportOptions) workers() int {
+	if options.MaxWorkers > 0 {
+		return options.MaxWorkers
+	}
+	return runtime.GOMAXPROCS(0)
+}
+
+// stagingSpillThreshold is the threshold for the archive staging buffer,
+// which goes straight to disk unless a threshold was requested.
+func (options exportOptions) stagingSpillThreshold() int64 {
+	if options.SpillThreshold < 0 {
+		return 0
+	}
+	return options.SpillThreshold
+}
+
+// newExportTempDir creates the private directory excelize spills into for
+// one export, so its spill files can be measured and removed together.
+func newExportTempDir(options exportOptions) (string, error) {
+	directory, err := os.MkdirTemp(options.TempDir, "pyfastexcel-")
+	if err != nil {
+		return "", fmt.Errorf("create temporary directory: %w", err)
+	}
+	return directory, nil
+}
+
+// measureStreamSpill sums the excelize spill files in the export's private
+// directory. It must run before File.Close, which deletes them.
+func (ew *ExcelWriter) measureStreamSpill() (files int, size int64, err error) {
+	if ew.tempDir == "" {
+		return 0, 0, nil
+	}
+	entries, err := os.ReadDir(ew.tempDir)
+	if err != nil {
+		return 0, 0, fmt.Errorf("measure stream spill files: %w", err)
+	}
+	for _, entry := range entries {
+		if !strings.HasPrefix(entry.Name(), streamSpillPrefix) {
+			continue
+		}
+		info, err := entry.Info()
+		if err != nil {
+			if errors.Is(err, os.ErrNotExist) {
+				continue
+			}
+			return 0, 0, fmt.Errorf("measure stream spill files: %w", err)
+		}
+		files++
+		size += info.Size()
+	}
+	return files, size, nil
+}
+
+func (ew *ExcelWriter) exportReport() (ExportReport, error) {
+	files, size, err := ew.measureStreamSpill()
+	if err != nil {
+		return ExportReport{}, err
+	}
+	build := "sequential"
+	if ew.stats.parallel {
+		build = "parallel"
+	}
+	return ExportReport{
+		StreamSpillFiles: files,
+		StreamSpillBytes: size,
+		BufferSpillFiles: ew.bufferSpill.files.Load(),
+		BufferSpillBytes: ew.bufferSpill.bytes.Load(),
+		Wire:             ew.stats.wire,
+		Build:            build,
+		BuildNanos:       ew.stats.buildTime.Nanoseconds(),
+		WriteNanos:       ew.stats.writeTime.Nanoseconds(),
+		OutputBytes:      ew.stats.outputBytes,
+		AllocatedBytes:   recordExportRuntime(ew.stats.allocatedAtStart),
+		Trace:            ew.trace.snapshot(),
+	}, nil
+}
+
+// runBuild runs the build step of prepareWorkbookPayload and records its
+// duration.
+func (ew *ExcelWriter) runBuild(build func() error) error {
+	start := time.Now()
+	err := build()
+	ew.stats.buildTime = time.Since(start)
+	ew.trace.record("build workbook", traceExportLane, start, nil)
+	return err
+}
+
+// close releases the workbook and removes the export's private temporary
+// directory.
+func (ew *ExcelWriter) close() error {
+	err := ew.File.Close()
+	if ew.tempDir != "" {
+		if removeErr := os.RemoveAll(ew.tempDir); removeErr != nil {
+			err = errors.Join(err, fmt.Errorf("remove temporary directory: %w", removeErr))
+		}
+	}
+	return err
+}
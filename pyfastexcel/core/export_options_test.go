@@ -0,0 +1,162 @@
+package core
+
+import (
+	"bytes"
+	"io"
+	"os"
+	"strings"
+	"testing"
+)
+
+func TestParseExportOptionsValidatesFields(t *testing.T) {
+	options, err := parseExportOptions(nil)
+	if err != nil || options.TempDir != "" || options.SpillThreshold != -1 {
+		t.Fatalf("missing export options should keep defaults, got %+v, %v", options, err)
+	}
+
+	options, err = parseExportOptions(map[string]interface{}{
+		"temp_dir":        "/scratch",
+		"spill_threshold": float64(4096),
+		"max_workers":     float64(3),
+		"deterministic":   true,
+	})
+	if err != nil {
+		t.Fatalf("parse valid export options: %v", err)
+	}
+	if options.TempDir != "/scratch" || options.SpillThreshold != 4096 || options.workers() != 3 ||
+		!options.Deterministic {
+		t.Fatalf("unexpected export options: %+v", options)
+	}
+	if options.stagingSpillThreshold() != 4096 {
+		t.Fatalf("staging threshold = %d, want 4096", options.stagingSpillThreshold())
+	}
+
+	for name, raw := range map[string]interface{}{
+		"not an object":      []interface{}{},
+		"empty temp_dir":     map[string]interface{}{"temp_dir": ""},
+		"numeric temp_dir":   map[string]interface{}{"temp_dir": float64(1)},
+		"negative threshold": map[string]interface{}{"spill_threshold": float64(-1)},
+		"partial threshold":  map[string]interface{}{"spill_threshold": 1.5},
+		"string threshold":   map[string]interface{}{"spill_threshold": "1"},
+		"zero workers":       map[string]interface{}{"max_workers": float64(0)},
+		"partial workers":    map[string]interface{}{"max_workers": 1.5},
+		"string determinism": map[string]interface{}{"deterministic": "yes"},
+	} {
+		if _, err := parseExportOptions(raw); err == nil {
+			t.Errorf("%s: expected an error", name)
+		}
+	}
+}
+
+func TestSpillBufferMovesToDiskPastThreshold(t *testing.T) {
+	directory := t.TempDir()
+	var stats spillStats
+	buffer := newSpillBuffer(8, directory, &stats)
+
+	if _, err := io.WriteString(buffer, "abcdef"); err != nil {
+		t.Fatalf("write below threshold: %v", err)
+	}
+	if buffer.file != nil {
+		t.Fatal("buffer spilled below its threshold")
+	}
+	if _, err := io.WriteString(buffer, "ghijkl"); err != nil {
+		t.Fatalf("write past threshold: %v", err)
+	}
+	if buffer.file == nil {
+		t.Fatal("buffer did not spill past its threshold")
+	}
+	if !strings.HasPrefix(buffer.file.Name(), directory) {
+		t.Fatalf("spill file %q is not in %q", buffer.file.Name(), directory)
+	}
+
+	chunk := make([]byte, 4)
+	if _, err := buffer.ReadAt(chunk, 4); err != nil || string(chunk) != "efgh" {
+		t.Fatalf("ReadAt = %q, %v", chunk, err)
+	}
+	for pass := 0; pass < 2; pass++ {
+		var copied bytes.Buffer
+		if _, err := buffer.WriteTo(&copied); err != nil || copied.String() != "abcdefghijkl" {
+			t.Fatalf("WriteTo pass %d = %q, %v", pass, copied.String(), err)
+		}
+	}
+
+	if err := buffer.Close(); err != nil {
+		t.Fatalf("close spill buffer: %v", err)
+	}
+	entries, err := os.ReadDir(directory)
+	if err != nil {
+		t.Fatalf("read spill directory: %v", err)
+	}
+	if len(entries) != 0 {
+		t.Fatalf("spill file left behind: %v", entries)
+	}
+	if stats.files.Load() != 1 || stats.bytes.Load() != 12 {
+		t.Fatalf("spill stats = %d files, %d bytes", stats.files.Load(), stats.bytes.Load())
+	}
+}
+
+func TestArchiveRewriteSpillsLargeParts(t *testing.T) {
+	parts := newTestArchiveParts()
+	staged := buildTestArchive(t, parts, storedBlockCompressor)
+	directory := t.TempDir()
+	var stats spillStats
+
+	var rewritten bytes.Buffer
+	err := archiveRewrite{
+		compressor: archiveCompressor(archiveSettings{}),
+		workers:    3,
+		newBuffer: func() *spillBuffer {
+			return newSpillBuffer(1<<10, directory, &stats)
+		},
+	}.run(bytes.NewReader(staged), int64(len(staged)), &rewritten)
+	if err != nil {
+		t.Fatalf("rewrite with spilling part buffers: %v", err)
+	}
+	assertRewrittenArchiveContent(t, rewritten.Bytes(), parts)
+	if stats.files.Load() == 0 || stats.bytes.Load() == 0 {
+		t.Fatal("expected the larger sheet parts to spill")
+	}
+	if entries, _ := os.ReadDir(directory); len(entries) != 0 {
+		t.Fatalf("spill files left behind: %v", entries)
+	}
+}
+
+func TestWriteExcelWithReportUsesAndCleansTempDir(t *testing.T) {
+	directory := t.TempDir()
+	rows := []interface{}{[]interface{}{"alpha", float64(1)}, []interface{}{"beta", float64(2)}}
+	payload := newPFX2TestPayload(t, "StreamWriter", true, rows, nil)
+	payload = mutatePFX2TestMetadata(t, payload, func(metadata map[string]interface{}) {
+		metadata[exportOptionsKey] = map[string]interface{}{
+			"temp_dir":        directory,
+			"spill_threshold": float64(0),
+		}
+	})
+
+	output, report, err := WriteExcelWithReport(payload)
+	if err != nil {
+		t.Fatalf("export with options: %v", err)
+	}
+	if len(output) == 0 {
+		t.Fatal("export returned no workbook")
+	}
+	if report.StreamSpillFiles != 0 {
+		t.Fatalf("small sheets should not spill: %+v", report)
+	}
+	if report.Wire != "pfx2" || report.Build != "sequential" || report.OutputBytes != int64(len(output)) {
+		t.Fatalf("report does not describe the export: %+v", report)
+	}
+	if report.BuildNanos <= 0 || report.WriteNanos <= 0 {
+		t.Fatalf("report is missing stage timings: %+v", report)
+	}
+	if entries, _ := os.ReadDir(directory); len(entries) != 0 {
+		t.Fatalf("temporary files left in %s: %v", directory, entries)
+	}
+
+	payload = mutatePFX2TestMetadata(t, payload, func(metadata map[string]interface{}) {
+		metadata[exportOptionsKey] = map[string]interface{}{"spill_threshold": "large"}
+	})
+	if _, _, err := WriteExcelWithReport(payload); err == nil ||
+		!strings.Contains(err.Error(), "spill_threshold") {
+		t.Fatalf("expected invalid export option error, got %v", err)
+	}
+}
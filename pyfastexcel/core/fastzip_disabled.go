@@ -2,8 +2,20 @@
 
 package core
 
+import (
+	"compress/flate"
+	"io"
+)
+
 // Stub used when the library is built without the pfx_fastzip tag (plain
-// `go build` / `go test`). PYFASTEXCEL_ZIP_LEVEL is reported as unsupported.
+// `go build` / `go test`). PYFASTEXCEL_ZIP_LEVEL and PYFASTEXCEL_ZIP_PARALLEL
+// are reported as unsupported.
 const fastZipSupported = false
 
 func setFastZipLevel(int) {}
+
+func setFastZipStaging() {}
+
+func newFastDeflateWriter(output io.Writer, level int, dict []byte) (*flate.Writer, error) {
+	return flate.NewWriterDict(output, level, dict)
+}
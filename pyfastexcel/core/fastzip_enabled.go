@@ -33,3 +33,21 @@ func setFastZipLevel(level int) {
 		return kpflate.NewWriter(out, level)
 	}))
 }
+
+// setFastZipStaging makes excelize emit DEFLATE entries made of stored blocks.
+// The staging archive costs little more than a copy to produce; the archive
+// rewrite then does the real compression of every part concurrently.
+func setFastZipStaging() {
+	zipCompressors.Store(zip.Deflate, zip.Compressor(func(out io.Writer) (io.WriteCloser, error) {
+		return kpflate.NewWriter(out, kpflate.NoCompression)
+	}))
+}
+
+// newFastDeflateWriter returns the klauspost/compress writer used for parts
+// and blocks compressed outside excelize, primed with dict when it is set.
+func newFastDeflateWriter(output io.Writer, level int, dict []byte) (*kpflate.Writer, error) {
+	if dict == nil {
+		return kpflate.NewWriter(output, level)
+	}
+	return kpflate.NewWriterDict(output, level, dict)
+}
@@ -0,0 +1,165 @@
+package core
+
+import (
+	"fmt"
+
+	"github.com/xuri/excelize/v2"
+)
+
+// styleSpan is a run of horizontally adjacent cells on one row that share a
+// style ID; columns are 1-based and inclusive.
+type styleSpan struct {
+	firstColumn int
+	lastColumn  int
+	styleID     int
+}
+
+// styleRows is the row range a pending style rectangle covers so far.
+type styleRows struct {
+	first int
+	last  int
+}
+
+// normalSheetWriter writes NormalWriter rows in batches. Values go through
+// one SetSheetRow call per run of adjacent non-empty cells, formulas through
+// SetCellFormula, and styles are collected into rectangles of identically
+// styled cells that are applied with a single range SetCellStyle call each
+// once the rectangle stops growing. Rows must be written in ascending,
+// consecutive order, and flush must be called after the last row.
+type normalSheetWriter struct {
+	file    *excelize.File
+	sheet   string
+	values  []interface{}
+	spans   []styleSpan
+	pending map[styleSpan]styleRows
+	next    map[styleSpan]styleRows
+}
+
+func newNormalSheetWriter(file *excelize.File, sheet string) *normalSheetWriter {
+	return &normalSheetWriter{
+		file:    file,
+		sheet:   sheet,
+		pending: make(map[styleSpan]styleRows),
+		next:    make(map[styleSpan]styleRows),
+	}
+}
+
+// writeRow writes the decoded cells of one row. nil items are left empty,
+// excelize.Cell and *excelize.Cell items carry a style and optionally a
+// formula, and anything else is a plain value.
+func (writer *normalSheetWriter) writeRow(rowNumber int, row []interface{}) error {
+	runStart := -1
+	writer.values = writer.values[:0]
+	writer.spans = writer.spans[:0]
+	for column, item := range row {
+		cell, styled := styledCell(item)
+		if styled {
+			writer.addStyledColumn(column+1, cell.StyleID)
+		}
+		if item == nil || (styled && cell.Formula != "") {
+			if err := writer.writeValues(runStart, rowNumber); err != nil {
+				return err
+			}
+			runStart = -1
+			if item != nil {
+				if err := writer.writeFormula(column+1, rowNumber, cell.Formula); err != nil {
+					return err
+				}
+			}
+			continue
+		}
+		if runStart < 0 {
+			runStart = column
+		}
+		if styled {
+			writer.values = append(writer.values, cell.Value)
+		} else {
+			writer.values = append(writer.values, item)
+		}
+	}
+	if err := writer.writeValues(runStart, rowNumber); err != nil {
+		return err
+	}
+	return writer.extendStyles(rowNumber)
+}
+
+func (writer *normalSheetWriter) writeValues(runStart int, rowNumber int) error {
+	if runStart < 0 || len(writer.values) == 0 {
+		return nil
+	}
+	cellName, err := excelize.CoordinatesToCellName(runStart+1, rowNumber)
+	if err != nil {
+		return fmt.Errorf("resolve sheet %q row %d column %d: %w", writer.sheet, rowNumber, runStart+1, err)
+	}
+	if err := writer.file.SetSheetRow(writer.sheet, cellName, &writer.values); err != nil {
+		return fmt.Errorf("write normal sheet %q row %d from %s: %w", writer.sheet, rowNumber, cellName, err)
+	}
+	writer.values = writer.values[:0]
+	return nil
+}
+
+func (writer *normalSheetWriter) writeFormula(column int, rowNumber int, formula string) error {
+	cellName, err := excelize.CoordinatesToCellName(column, rowNumber)
+	if err != nil {
+		return fmt.Errorf("resolve sheet %q row %d column %d: %w", writer.sheet, rowNumber, column, err)
+	}
+	if err := writer.file.SetCellFormula(writer.sheet, cellName, formula); err != nil {
+		return fmt.Errorf("write normal sheet %q cell %s: %w", writer.sheet, cellName, err)
+	}
+	return nil
+}
+
+// addStyledColumn grows the current row's last span or starts a new one.
+func (writer *normalSheetWriter) addStyledColumn(column int, styleID int) {
+	if count := len(writer.spans); count > 0 {
+		last := &writer.spans[count-1]
+		if last.lastColumn == column-1 && last.styleID == styleID {
+			last.lastColumn = column
+			return
+		}
+	}
+	writer.spans = append(writer.spans, styleSpan{firstColumn: column, lastColumn: column, styleID: styleID})
+}
+
+// extendStyles carries every pending rectangle that this row continues down
+// by one row and applies the rectangles it does not continue.
+func (writer *normalSheetWriter) extendStyles(rowNumber int) error {
+	for _, span := range writer.spans {
+		rows, ok := writer.pending[span]
+		if ok && rows.last == rowNumber-1 {
+			delete(writer.pending, span)
+			rows.last = rowNumber
+		} else {
+			rows = styleRows{first: rowNumber, last: rowNumber}
+		}
+		writer.next[span] = rows
+	}
+	if err := writer.applyPending(); err != nil {
+		return err
+	}
+	writer.pending, writer.next = writer.next, writer.pending
+	return nil
+}
+
+// flush applies the styles still pending after the last row.
+func (writer *normalSheetWriter) flush() error {
+	return writer.applyPending()
+}
+
+func (writer *normalSheetWriter) applyPending() error {
+	for span, rows := range writer.pending {
+		topLeft, err := excelize.CoordinatesToCellName(span.firstColumn, rows.first)
+		if err != nil {
+			return fmt.Errorf("resolve style range on sheet %q: %w", writer.sheet, err)
+		}
+		bottomRight, err := excelize.CoordinatesToCellName(span.lastColumn, rows.last)
+		if err != nil {
+			return fmt.Errorf("resolve style range on sheet %q: %w", writer.sheet, err)
+		}
+		if err := writer.file.SetCellStyle(writer.sheet, topLeft, bottomRight, span.styleID); err != nil {
+			return fmt.Errorf("style normal sheet %q range %s:%s: %w", writer.sheet, topLeft, bottomRight, err)
+		}
+		delete(writer.pending, span)
+	}
+	return nil
+}
@@ -0,0 +1,103 @@
+package core
+
+import (
+	"testing"
+
+	"github.com/xuri/excelize/v2"
+)
+
+func TestNormalSheetWriterMatchesPerCellWrites(t *testing.T) {
+	file := excelize.NewFile()
+	defer file.Close()
+	bold, err := file.NewStyle(&excelize.Style{Font: &excelize.Font{Bold: true}})
+	if err != nil {
+		t.Fatalf("create bold style: %v", err)
+	}
+	italic, err := file.NewStyle(&excelize.Style{Font: &excelize.Font{Italic: true}})
+	if err != nil {
+		t.Fatalf("create italic style: %v", err)
+	}
+
+	rows := [][]interface{}{
+		{
+			excelize.Cell{StyleID: bold, Value: "a"},
+			excelize.Cell{StyleID: bold, Value: "b"},
+			nil,
+			excelize.Cell{StyleID: italic, Value: 1.5},
+		},
+		{
+			excelize.Cell{StyleID: bold, Value: "c"},
+			excelize.Cell{StyleID: bold, Formula: "A1&B1"},
+			"plain",
+			excelize.Cell{StyleID: bold, Value: true},
+		},
+		{},
+		{excelize.Cell{StyleID: italic, Value: ""}},
+	}
+	writer := newNormalSheetWriter(file, "Sheet1")
+	for index, row := range rows {
+		if err := writer.writeRow(index+1, row); err != nil {
+			t.Fatalf("write row %d: %v", index+1, err)
+		}
+	}
+	if err := writer.flush(); err != nil {
+		t.Fatalf("flush styles: %v", err)
+	}
+
+	for cell, expected := range map[string]string{
+		"A1": "a", "B1": "b", "C1": "", "D1": "1.5",
+		"A2": "c", "C2": "plain", "D2": "TRUE", "A4": "",
+	} {
+		value, err := file.GetCellValue("Sheet1", cell)
+		if err != nil {
+			t.Fatalf("get %s: %v", cell, err)
+		}
+		if value != expected {
+			t.Errorf("%s = %q, want %q", cell, value, expected)
+		}
+	}
+	formula, err := file.GetCellFormula("Sheet1", "B2")
+	if err != nil || formula != "A1&B1" {
+		t.Fatalf("B2 formula = %q, %v", formula, err)
+	}
+	for cell, expected := range map[string]int{
+		"A1": bold, "B1": bold, "C1": 0, "D1": italic,
+		"A2": bold, "B2": bold, "C2": 0, "D2": bold,
+		"A3": 0, "A4": italic,
+	} {
+		style, err := file.GetCellStyle("Sheet1", cell)
+		if err != nil {
+			t.Fatalf("get %s style: %v", cell, err)
+		}
+		if style != expected {
+			t.Errorf("%s style = %d, want %d", cell, style, expected)
+		}
+	}
+}
+
+func TestNormalSheetWriterCoalescesStyleRectangles(t *testing.T) {
+	writer := newNormalSheetWriter(nil, "Sheet1")
+	row := []interface{}{excelize.Cell{StyleID: 3}, excelize.Cell{StyleID: 3}, excelize.Cell{StyleID: 4}}
+	for rowNumber := 1; rowNumber <= 3; rowNumber++ {
+		writer.spans = writer.spans[:0]
+		for column, item := range row {
+			writer.addStyledColumn(column+1, item.(excelize.Cell).StyleID)
+		}
+		if err := writer.extendStyles(rowNumber); err != nil {
+			t.Fatalf("extend styles on row %d: %v", rowNumber, err)
+		}
+	}
+
+	expected := map[styleSpan]styleRows{
+		{firstColumn: 1, lastColumn: 2, styleID: 3}: {first: 1, last: 3},
+		{firstColumn: 3, lastColumn: 3, styleID: 4}: {first: 1, last: 3},
+	}
+	if len(writer.pending) != len(expected) {
+		t.Fatalf("pending rectangles = %v, want %v", writer.pending, expected)
+	}
+	for span, rows := range expected {
+		if writer.pending[span] != rows {
+			t.Fatalf("rectangle %+v covers %+v, want %+v", span, writer.pending[span], rows)
+		}
+	}
+}
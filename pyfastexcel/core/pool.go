@@ -0,0 +1,109 @@
+package core
+
+import (
+	"bytes"
+	"sync"
+	"sync/atomic"
+)
+
+// maxPooledBufferBytes is the largest byte buffer returned to the pool. A
+// single huge export would otherwise keep its output buffer alive for the
+// life of the process.
+const maxPooledBufferBytes = 64 << 20
+
+// PoolStats are the cumulative counters of one buffer pool since the
+// process started. Gets minus Misses is the number of reused buffers.
+type PoolStats struct {
+	Gets      int64 `json:"gets"`
+	Misses    int64 `json:"misses"`
+	Puts      int64 `json:"puts"`
+	Discarded int64 `json:"discarded"`
+}
+
+// countedPool is a sync.Pool that counts how often it is asked for an item,
+// how often it had none to hand out and how many items came back.
+type countedPool struct {
+	pool      sync.Pool
+	create    func() interface{}
+	gets      atomic.Int64
+	misses    atomic.Int64
+	puts      atomic.Int64
+	discarded atomic.Int64
+}
+
+func (pool *countedPool) get() interface{} {
+	pool.gets.Add(1)
+	if item := pool.pool.Get(); item != nil {
+		return item
+	}
+	pool.misses.Add(1)
+	return pool.create()
+}
+
+func (pool *countedPool) put(item interface{}) {
+	pool.puts.Add(1)
+	pool.pool.Put(item)
+}
+
+func (pool *countedPool) discard() {
+	pool.discarded.Add(1)
+}
+
+func (pool *countedPool) stats() PoolStats {
+	return PoolStats{
+		Gets:      pool.gets.Load(),
+		Misses:    pool.misses.Load(),
+		Puts:      pool.puts.Load(),
+		Discarded: pool.discarded.Load(),
+	}
+}
+
+// Buffers shared by every export in the process. A service that runs many
+// exports otherwise allocates and collects the same row, cell and archive
+// buffers over and over.
+var (
+	rowBufferPool = countedPool{
+		create: func() interface{} { return &wireRowBuffer{} },
+	}
+	byteBufferPool = countedPool{
+		create: func() interface{} { return new(bytes.Buffer) },
+	}
+)
+
+// PoolStatistics reports the counters of the native buffer pools by name.
+func PoolStatistics() map[string]PoolStats {
+	return map[string]PoolStats{
+		"row_buffers":  rowBufferPool.stats(),
+		"byte_buffers": byteBufferPool.stats(),
+	}
+}
+
+func getRowBuffer() *wireRowBuffer {
+	return rowBufferPool.get().(*wireRowBuffer)
+}
+
+// putRowBuffer returns a row buffer to the pool. Its cells are cleared first:
+// decoded strings share memory with the export's payload, which a pooled
+// buffer must not keep alive.
+func putRowBuffer(buffer *wireRowBuffer) {
+	clear(buffer.row[:cap(buffer.row)])
+	clear(buffer.cells[:cap(buffer.cells)])
+	buffer.row = buffer.row[:0]
+	buffer.cells = buffer.cells[:0]
+	rowBufferPool.put(buffer)
+}
+
+func getByteBuffer() *bytes.Buffer {
+	return byteBufferPool.get().(*bytes.Buffer)
+}
+
+// putByteBuffer resets a byte buffer and returns it to the pool unless it
+// has grown past maxPooledBufferBytes.
+func putByteBuffer(buffer *bytes.Buffer) {
+	if buffer.Cap() > maxPooledBufferBytes {
+		byteBufferPool.discard()
+		return
+	}
+	buffer.Reset()
+	byteBufferPool.put(buffer)
+}
@@ -0,0 +1,49 @@
+package core
+
+import (
+	"bytes"
+	"testing"
+
+	"github.com/xuri/excelize/v2"
+)
+
+func TestPutRowBufferDropsPayloadReferences(t *testing.T) {
+	buffer := &wireRowBuffer{
+		row:   []interface{}{"text", nil},
+		cells: []excelize.Cell{{StyleID: 3, Value: "text"}},
+	}
+	buffer.row[1] = &buffer.cells[0]
+	row, cells := buffer.row[:cap(buffer.row)], buffer.cells[:cap(buffer.cells)]
+
+	putRowBuffer(buffer)
+	if len(buffer.row) != 0 || len(buffer.cells) != 0 {
+		t.Fatalf("pooled buffer keeps %d items and %d cells", len(buffer.row), len(buffer.cells))
+	}
+	for index, item := range row {
+		if item != nil {
+			t.Fatalf("row item %d still references %#v", index, item)
+		}
+	}
+	if cells[0] != (excelize.Cell{}) {
+		t.Fatalf("cell still holds %#v", cells[0])
+	}
+}
+
+func TestPutByteBufferDiscardsOversizedBuffers(t *testing.T) {
+	before := byteBufferPool.stats()
+	small := getByteBuffer()
+	small.WriteString("workbook")
+	putByteBuffer(small)
+	if small.Len() != 0 {
+		t.Fatal("pooled byte buffer was not reset")
+	}
+	putByteBuffer(bytes.NewBuffer(make([]byte, 0, maxPooledBufferBytes+1)))
+
+	after := byteBufferPool.stats()
+	if after.Gets != before.Gets+1 || after.Puts != before.Puts+1 || after.Discarded != before.Discarded+1 {
+		t.Fatalf("unexpected pool counters: before %+v, after %+v", before, after)
+	}
+	if _, ok := PoolStatistics()["byte_buffers"]; !ok {
+		t.Fatal("PoolStatistics does not report the byte buffer pool")
+	}
+}
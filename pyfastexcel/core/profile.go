@@ -0,0 +1,93 @@
+package core
+
+import (
+	"errors"
+	"fmt"
+	"os"
+	"runtime"
+	"runtime/pprof"
+	"sync"
+)
+
+// nativeProfile is the profile StartProfile began; StopProfile finishes it.
+type nativeProfile struct {
+	cpu      *os.File
+	heapPath string
+}
+
+var (
+	profileMu     sync.Mutex
+	activeProfile *nativeProfile
+)
+
+// StartProfile begins a runtime/pprof capture of the exports that follow. A
+// CPU profile is written to cpuPath until StopProfile; a heap profile is
+// written to heapPath when StopProfile is called. Either path may be empty,
+// but not both, and only one capture may run at a time.
+func StartProfile(cpuPath, heapPath string) error {
+	if cpuPath == "" && heapPath == "" {
+		return fmt.Errorf("a native profile needs a CPU or heap profile path")
+	}
+	profileMu.Lock()
+	defer profileMu.Unlock()
+	if activeProfile != nil {
+		return fmt.Errorf("a native profile is already running")
+	}
+
+	profile := &nativeProfile{heapPath: heapPath}
+	if cpuPath != "" {
+		file, err := os.Create(cpuPath)
+		if err != nil {
+			return fmt.Errorf("create CPU profile: %w", err)
+		}
+		if err := pprof.StartCPUProfile(file); err != nil {
+			return errors.Join(fmt.Errorf("start CPU profile: %w", err), file.Close(), os.Remove(cpuPath))
+		}
+		profile.cpu = file
+	}
+	activeProfile = profile
+	return nil
+}
+
+// StopProfile ends the capture StartProfile began and writes its profiles.
+// The heap profile is taken after a garbage collection, so its in-use
+// figures show what the exports kept alive; its alloc figures cover the
+// whole process.
+func StopProfile() error {
+	profileMu.Lock()
+	defer profileMu.Unlock()
+	profile := activeProfile
+	if profile == nil {
+		return fmt.Errorf("no native profile is running")
+	}
+	activeProfile = nil
+
+	var err error
+	if profile.cpu != nil {
+		pprof.StopCPUProfile()
+		if closeErr := profile.cpu.Close(); closeErr != nil {
+			err = fmt.Errorf("write CPU profile: %w", closeErr)
+		}
+	}
+	if profile.heapPath != "" {
+		err = errors.Join(err, writeHeapProfile(profile.heapPath))
+	}
+	return err
+}
+
+func writeHeapProfile(path string) (err error) {
+	file, err := os.Create(path)
+	if err != nil {
+		return fmt.Errorf("create heap profile: %w", err)
+	}
+	defer func() {
+		if closeErr := file.Close(); closeErr != nil && err == nil {
+			err = fmt.Errorf("write heap profile: %w", closeErr)
+		}
+	}()
+	runtime.GC()
+	if err := pprof.Lookup("heap").WriteTo(file, 0); err != nil {
+		return fmt.Errorf("write heap profile: %w", err)
+	}
+	return nil
+}
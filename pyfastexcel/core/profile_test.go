@@ -0,0 +1,54 @@
+package core
+
+import (
+	"os"
+	"path/filepath"
+	"testing"
+)
+
+func TestProfileWritesCPUAndHeapProfiles(t *testing.T) {
+	directory := t.TempDir()
+	cpuPath := filepath.Join(directory, "cpu.pprof")
+	heapPath := filepath.Join(directory, "heap.pprof")
+
+	if err := StartProfile("", ""); err == nil {
+		t.Fatal("a profile without paths was started")
+	}
+	if err := StopProfile(); err == nil {
+		t.Fatal("stopping without a running profile succeeded")
+	}
+	if err := StartProfile(cpuPath, heapPath); err != nil {
+		t.Fatalf("start profile: %v", err)
+	}
+	if err := StartProfile(cpuPath, ""); err == nil {
+		t.Fatal("a second profile was started while one was running")
+	}
+	payload := newMultiSheetPFX2Payload(t, multiSheetTestRows(2, 200), nil)
+	if _, err := WriteExcelV2(payload); err != nil {
+		t.Fatalf("export while profiling: %v", err)
+	}
+	if err := StopProfile(); err != nil {
+		t.Fatalf("stop profile: %v", err)
+	}
+
+	for _, path := range []string{cpuPath, heapPath} {
+		data, err := os.ReadFile(path)
+		if err != nil {
+			t.Fatalf("read %s: %v", path, err)
+		}
+		// pprof files are gzip-compressed protocol buffers.
+		if len(data) < 2 || data[0] != 0x1f || data[1] != 0x8b {
+			t.Fatalf("%s is not a gzip-compressed pprof profile", path)
+		}
+	}
+
+	if err := StartProfile(filepath.Join(directory, "missing", "cpu.pprof"), ""); err == nil {
+		t.Fatal("a CPU profile in a missing directory was started")
+	}
+	if err := StartProfile("", heapPath); err != nil {
+		t.Fatalf("restart after a failed start: %v", err)
+	}
+	if err := StopProfile(); err != nil {
+		t.Fatalf("stop heap-only profile: %v", err)
+	}
+}
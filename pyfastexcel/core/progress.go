@@ -0,0 +1,127 @@
+package core
+
+import (
+	"errors"
+	"io"
+	"sync"
+	"sync/atomic"
+)
+
+// progressRowChunk is the number of rows a sheet writes between two checks
+// of ExportHooks.Cancelled and two progress reports.
+const progressRowChunk = 4096
+
+// progressByteChunk is the number of archive bytes written between two
+// checks and reports while the workbook is compressed.
+const progressByteChunk = 1 << 20
+
+// ErrExportCancelled is returned by an export whose ExportHooks.Cancelled
+// reported true.
+var ErrExportCancelled = errors.New("pyfastexcel export cancelled")
+
+// ExportHooks let the caller follow and stop an export while it runs. Both
+// are optional and are called from the export's goroutines; Cancelled may
+// run concurrently, Progress calls never overlap.
+type ExportHooks struct {
+	// Cancelled is polled after every sheet, every progressRowChunk rows and
+	// every progressByteChunk archive bytes; true stops the export with
+	// ErrExportCancelled.
+	Cancelled func() bool
+	// Progress receives the rows written to a sheet so far, by sheet_order
+	// index, or with sheet -1 the total rows and the archive bytes written so
+	// far while the workbook is compressed.
+	Progress func(sheet int, rowsWritten int64, bytesCompressed int64)
+}
+
+// exportProgress applies ExportHooks to one export. A nil *exportProgress
+// ignores every call, which is what exports without hooks use.
+type exportProgress struct {
+	hooks           ExportHooks
+	mu              sync.Mutex
+	rowsWritten     atomic.Int64
+	bytesCompressed atomic.Int64
+}
+
+func newExportProgress(hooks *ExportHooks) *exportProgress {
+	if hooks == nil || (hooks.Cancelled == nil && hooks.Progress == nil) {
+		return nil
+	}
+	return &exportProgress{hooks: *hooks}
+}
+
+func (progress *exportProgress) cancelled() bool {
+	return progress.hooks.Cancelled != nil && progress.hooks.Cancelled()
+}
+
+func (progress *exportProgress) report(sheet int, rows int64) {
+	if progress.hooks.Progress == nil {
+		return
+	}
+	progress.mu.Lock()
+	defer progress.mu.Unlock()
+	progress.hooks.Progress(sheet, rows, progress.bytesCompressed.Load())
+}
+
+// row is called after rowNumber rows of a sheet were written. Every
+// progressRowChunk rows it checks for cancellation and reports progress.
+func (progress *exportProgress) row(sheet int, rowNumber int) error {
+	if progress == nil || rowNumber%progressRowChunk != 0 {
+		return nil
+	}
+	progress.rowsWritten.Add(progressRowChunk)
+	if progress.cancelled() {
+		return ErrExportCancelled
+	}
+	progress.report(sheet, int64(rowNumber))
+	return nil
+}
+
+// sheetDone checks for cancellation once a sheet's rows are written and
+// reports its final row count.
+func (progress *exportProgress) sheetDone(sheet int, rowCount int) error {
+	if progress == nil {
+		return nil
+	}
+	progress.rowsWritten.Add(int64(rowCount % progressRowChunk))
+	if progress.cancelled() {
+		return ErrExportCancelled
+	}
+	progress.report(sheet, int64(rowCount))
+	return nil
+}
+
+// writer counts the archive bytes written to output, checking for
+// cancellation and reporting every progressByteChunk bytes.
+func (progress *exportProgress) writer(output io.Writer) io.Writer {
+	if progress == nil {
+		return output
+	}
+	return &progressWriter{output: output, progress: progress}
+}
+
+// archiveDone reports the final archive size.
+func (progress *exportProgress) archiveDone() {
+	if progress != nil {
+		progress.report(-1, progress.rowsWritten.Load())
+	}
+}
+
+type progressWriter struct {
+	output   io.Writer
+	progress *exportProgress
+	pending  int
+}
+
+func (writer *progressWriter) Write(data []byte) (int, error) {
+	written, err := writer.output.Write(data)
+	writer.progress.bytesCompressed.Add(int64(written))
+	writer.pending += written
+	if err == nil && writer.pending >= progressByteChunk {
+		writer.pending = 0
+		if writer.progress.cancelled() {
+			return written, ErrExportCancelled
+		}
+		writer.progress.report(-1, writer.progress.rowsWritten.Load())
+	}
+	return written, err
+}
@@ -0,0 +1,116 @@
+package core
+
+import (
+	"bytes"
+	"errors"
+	"testing"
+)
+
+func TestExportProgressReportsEveryRowChunk(t *testing.T) {
+	type event struct {
+		sheet       int
+		rows, bytes int64
+	}
+	var events []event
+	progress := newExportProgress(&ExportHooks{
+		Progress: func(sheet int, rows int64, bytes int64) {
+			events = append(events, event{sheet, rows, bytes})
+		},
+	})
+	for rowNumber := 1; rowNumber <= 2*progressRowChunk+5; rowNumber++ {
+		if err := progress.row(1, rowNumber); err != nil {
+			t.Fatalf("row %d: %v", rowNumber, err)
+		}
+	}
+	if err := progress.sheetDone(1, 2*progressRowChunk+5); err != nil {
+		t.Fatalf("sheetDone: %v", err)
+	}
+	var archive bytes.Buffer
+	if _, err := progress.writer(&archive).Write(make([]byte, progressByteChunk)); err != nil {
+		t.Fatalf("write archive: %v", err)
+	}
+	progress.archiveDone()
+
+	expected := []event{
+		{1, progressRowChunk, 0},
+		{1, 2 * progressRowChunk, 0},
+		{1, 2*progressRowChunk + 5, 0},
+		{-1, 2*progressRowChunk + 5, progressByteChunk},
+		{-1, 2*progressRowChunk + 5, progressByteChunk},
+	}
+	if len(events) != len(expected) {
+		t.Fatalf("expected %d events, got %+v", len(expected), events)
+	}
+	for index := range expected {
+		if events[index] != expected[index] {
+			t.Fatalf("event %d: expected %+v, got %+v", index, expected[index], events[index])
+		}
+	}
+}
+
+func TestExportProgressStopsOnCancellation(t *testing.T) {
+	cancelled := false
+	progress := newExportProgress(&ExportHooks{Cancelled: func() bool { return cancelled }})
+	if err := progress.row(0, progressRowChunk); err != nil {
+		t.Fatalf("uncancelled row chunk: %v", err)
+	}
+	cancelled = true
+	if err := progress.row(0, progressRowChunk+1); err != nil {
+		t.Fatal("cancellation must only be checked between row chunks")
+	}
+	if err := progress.row(0, 2*progressRowChunk); !errors.Is(err, ErrExportCancelled) {
+		t.Fatalf("expected ErrExportCancelled from a row chunk, got %v", err)
+	}
+	if err := progress.sheetDone(0, 3); !errors.Is(err, ErrExportCancelled) {
+		t.Fatalf("expected ErrExportCancelled at the end of a sheet, got %v", err)
+	}
+	if _, err := progress.writer(&bytes.Buffer{}).Write(make([]byte, progressByteChunk)); !errors.Is(err, ErrExportCancelled) {
+		t.Fatalf("expected ErrExportCancelled while compressing, got %v", err)
+	}
+
+	var disabled *exportProgress
+	if newExportProgress(&ExportHooks{}) != nil || disabled.row(0, progressRowChunk) != nil {
+		t.Fatal("exports without hooks must not track progress")
+	}
+}
+
+func TestWriteExcelWithHooksFuncReportsAndCancels(t *testing.T) {
+	const sheets = 3
+	const rowsPerSheet = 20
+	payload := newMultiSheetPFX2Payload(t, multiSheetTestRows(sheets, rowsPerSheet), nil)
+	rowsBySheet := map[int]int64{}
+	var compressed int64
+	hooks := &ExportHooks{
+		Progress: func(sheet int, rows int64, bytes int64) {
+			if sheet >= 0 {
+				rowsBySheet[sheet] = rows
+			}
+			compressed = bytes
+		},
+	}
+	var workbookSize int
+	_, err := WriteExcelWithHooksFunc(payload, hooks, func(workbook []byte) error {
+		workbookSize = len(workbook)
+		return nil
+	})
+	if err != nil {
+		t.Fatalf("WriteExcelWithHooksFunc returned an error: %v", err)
+	}
+	for sheet := 0; sheet < sheets; sheet++ {
+		if rowsBySheet[sheet] != rowsPerSheet {
+			t.Fatalf("sheet %d reported %d rows, expected %d", sheet, rowsBySheet[sheet], rowsPerSheet)
+		}
+	}
+	if compressed != int64(workbookSize) {
+		t.Fatalf("reported %d compressed bytes for a %d byte workbook", compressed, workbookSize)
+	}
+
+	hooks = &ExportHooks{Cancelled: func() bool { return true }}
+	_, err = WriteExcelWithHooksFunc(payload, hooks, func([]byte) error {
+		t.Fatal("a cancelled export must not produce a workbook")
+		return nil
+	})
+	if !errors.Is(err, ErrExportCancelled) {
+		t.Fatalf("expected ErrExportCancelled, got %v", err)
+	}
+}
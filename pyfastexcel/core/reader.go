@@ -0,0 +1,171 @@
+package core
+
+import (
+	"bytes"
+	"errors"
+	"fmt"
+	"sync"
+
+	"github.com/vmihailenco/msgpack/v5"
+	"github.com/xuri/excelize/v2"
+)
+
+// defaultReaderChunkRows is the number of rows per chunk when the caller
+// does not choose one.
+const defaultReaderChunkRows = 1024
+
+// RowReader streams the rows of one worksheet with excelize's Rows iterator
+// and hands them out in MessagePack chunks, so only one chunk of decoded rows
+// is held at a time. A RowReader is safe for concurrent use, although chunks
+// are produced one after another.
+type RowReader struct {
+	mu        sync.Mutex
+	file      *excelize.File
+	rows      *excelize.Rows
+	chunkRows int
+	options   excelize.Options
+	done      bool
+	// rowNumber is the worksheet row last read, across chunks.
+	rowNumber int
+}
+
+// OpenRowReader opens the workbook at path for reading the rows of sheet.
+// An empty sheet selects the first worksheet. raw returns cell values as
+// stored instead of formatted with their number formats.
+func OpenRowReader(path, sheet string, chunkRows int, raw bool) (reader *RowReader, err error) {
+	defer recoverAsError(&err)
+
+	if chunkRows <= 0 {
+		chunkRows = defaultReaderChunkRows
+	}
+	file, rows, err := openSheetRows(path, sheet)
+	if err != nil {
+		return nil, err
+	}
+	return &RowReader{
+		file:      file,
+		rows:      rows,
+		chunkRows: chunkRows,
+		options:   excelize.Options{RawCellValue: raw},
+	}, nil
+}
+
+// openSheetRows opens the workbook at path and a Rows iterator over sheet,
+// the first worksheet when sheet is empty. The caller closes both.
+func openSheetRows(path, sheet string) (file *excelize.File, rows *excelize.Rows, err error) {
+	file, err = excelize.OpenFile(path)
+	if err != nil {
+		return nil, nil, fmt.Errorf("open workbook %q: %w", path, err)
+	}
+	defer func() {
+		if err != nil {
+			err = errors.Join(err, file.Close())
+		}
+	}()
+	if sheet == "" {
+		sheets := file.GetSheetList()
+		if len(sheets) == 0 {
+			return nil, nil, fmt.Errorf("workbook %q has no worksheets", path)
+		}
+		sheet = sheets[0]
+	} else if index, indexErr := file.GetSheetIndex(sheet); indexErr != nil || index < 0 {
+		return nil, nil, fmt.Errorf("sheet %q does not exist in %q", sheet, path)
+	}
+	rows, err = file.Rows(sheet)
+	if err != nil {
+		return nil, nil, fmt.Errorf("read sheet %q: %w", sheet, err)
+	}
+	return file, rows, nil
+}
+
+// Next returns the next chunk as a MessagePack array of rows, each an array
+// of cell strings with empty cells as "" and trailing empty cells left out.
+// It returns nil once every row has been read.
+func (reader *RowReader) Next() (chunk []byte, err error) {
+	defer recoverAsError(&err)
+
+	reader.mu.Lock()
+	defer reader.mu.Unlock()
+	if reader.done {
+		return nil, nil
+	}
+	rows := make([][]string, 0, reader.chunkRows)
+	for len(rows) < reader.chunkRows && reader.rows.Next() {
+		reader.rowNumber++
+		columns, err := reader.rows.Columns(reader.options)
+		if err != nil {
+			return nil, fmt.Errorf("read row %d: %w", reader.rowNumber, err)
+		}
+		rows = append(rows, columns)
+	}
+	if err := reader.rows.Error(); err != nil {
+		return nil, fmt.Errorf("read rows: %w", err)
+	}
+	if len(rows) < reader.chunkRows {
+		reader.done = true
+	}
+	if len(rows) == 0 {
+		return nil, nil
+	}
+
+	var buffer bytes.Buffer
+	encoder := msgpack.NewEncoder(&buffer)
+	if err := encoder.EncodeArrayLen(len(rows)); err != nil {
+		return nil, err
+	}
+	for _, row := range rows {
+		if err := encoder.EncodeArrayLen(len(row)); err != nil {
+			return nil, err
+		}
+		for _, value := range row {
+			if err := encoder.EncodeString(value); err != nil {
+				return nil, err
+			}
+		}
+	}
+	return buffer.Bytes(), nil
+}
+
+// Close releases the iterator and the workbook, including any worksheet
+// excelize extracted to a temporary file.
+func (reader *RowReader) Close() error {
+	reader.mu.Lock()
+	defer reader.mu.Unlock()
+	reader.done = true
+	return errors.Join(reader.rows.Close(), reader.file.Close())
+}
+
+var (
+	rowReadersMu    sync.Mutex
+	rowReaders      = map[int64]*RowReader{}
+	nextRowReaderID int64
+)
+
+// RegisterRowReader keeps reader alive behind a handle for the C ABI.
+func RegisterRowReader(reader *RowReader) int64 {
+	rowReadersMu.Lock()
+	defer rowReadersMu.Unlock()
+	nextRowReaderID++
+	rowReaders[nextRowReaderID] = reader
+	return nextRowReaderID
+}
+
+// LookupRowReader returns the reader behind handle, or nil.
+func LookupRowReader(handle int64) *RowReader {
+	rowReadersMu.Lock()
+	defer rowReadersMu.Unlock()
+	return rowReaders[handle]
+}
+
+// ReleaseRowReader closes and drops the reader behind handle. Releasing an
+// unknown handle does nothing.
+func ReleaseRowReader(handle int64) error {
+	rowReadersMu.Lock()
+	reader, ok := rowReaders[handle]
+	delete(rowReaders, handle)
+	rowReadersMu.Unlock()
+	if !ok {
+		return nil
+	}
+	return reader.Close()
+}
@@ -0,0 +1,136 @@
+package core
+
+import (
+	"fmt"
+	"path/filepath"
+	"testing"
+
+	"github.com/vmihailenco/msgpack/v5"
+	"github.com/xuri/excelize/v2"
+)
+
+// writeReaderTestWorkbook saves a workbook whose second sheet has rowCount
+// rows, a gap row and a number formatted with two decimals.
+func writeReaderTestWorkbook(t *testing.T, rowCount int) string {
+	t.Helper()
+	file := excelize.NewFile()
+	defer file.Close()
+	if _, err := file.NewSheet("Data"); err != nil {
+		t.Fatalf("create sheet: %v", err)
+	}
+	for row := 1; row <= rowCount; row++ {
+		values := []interface{}{fmt.Sprintf("item %d", row), row, nil, true}
+		if err := file.SetSheetRow("Data", fmt.Sprintf("A%d", row), &values); err != nil {
+			t.Fatalf("write row %d: %v", row, err)
+		}
+	}
+	if err := file.SetCellValue("Data", fmt.Sprintf("B%d", rowCount+2), 1.5); err != nil {
+		t.Fatalf("write number: %v", err)
+	}
+	style, err := file.NewStyle(&excelize.Style{NumFmt: 2})
+	if err != nil {
+		t.Fatalf("create style: %v", err)
+	}
+	cell := fmt.Sprintf("B%d", rowCount+2)
+	if err := file.SetCellStyle("Data", cell, cell, style); err != nil {
+		t.Fatalf("style number: %v", err)
+	}
+	path := filepath.Join(t.TempDir(), "read.xlsx")
+	if err := file.SaveAs(path); err != nil {
+		t.Fatalf("save workbook: %v", err)
+	}
+	return path
+}
+
+func readAllRowChunks(t *testing.T, reader *RowReader) (rows [][]string, chunks int) {
+	t.Helper()
+	for {
+		chunk, err := reader.Next()
+		if err != nil {
+			t.Fatalf("read chunk: %v", err)
+		}
+		if chunk == nil {
+			return rows, chunks
+		}
+		var decoded [][]string
+		if err := msgpack.Unmarshal(chunk, &decoded); err != nil {
+			t.Fatalf("decode chunk: %v", err)
+		}
+		rows = append(rows, decoded...)
+		chunks++
+	}
+}
+
+func TestRowReaderStreamsRowsInChunks(t *testing.T) {
+	path := writeReaderTestWorkbook(t, 5)
+	reader, err := OpenRowReader(path, "Data", 2, true)
+	if err != nil {
+		t.Fatalf("open reader: %v", err)
+	}
+	rows, chunks := readAllRowChunks(t, reader)
+	if err := reader.Close(); err != nil {
+		t.Fatalf("close reader: %v", err)
+	}
+
+	if chunks != 4 || len(rows) != 7 {
+		t.Fatalf("read %d rows in %d chunks, want 7 rows in 4", len(rows), chunks)
+	}
+	if want := []string{"item 3", "3", "", "1"}; fmt.Sprint(rows[2]) != fmt.Sprint(want) {
+		t.Fatalf("row 3 = %q, want %q", rows[2], want)
+	}
+	if len(rows[5]) != 0 || fmt.Sprint(rows[6]) != fmt.Sprint([]string{"", "1.5"}) {
+		t.Fatalf("gap and last rows = %q, %q", rows[5], rows[6])
+	}
+	if chunk, err := reader.Next(); chunk != nil || err != nil {
+		t.Fatalf("closed reader returned %q, %v", chunk, err)
+	}
+
+	formatted, err := OpenRowReader(path, "Data", 0, false)
+	if err != nil {
+		t.Fatalf("open formatted reader: %v", err)
+	}
+	defer formatted.Close()
+	rows, _ = readAllRowChunks(t, formatted)
+	if rows[6][1] != "1.50" || rows[0][3] != "TRUE" {
+		t.Fatalf("formatted values = %q, %q", rows[6][1], rows[0][3])
+	}
+}
+
+func TestOpenRowReaderDefaultsToTheFirstSheetAndRejectsUnknownSheets(t *testing.T) {
+	path := writeReaderTestWorkbook(t, 1)
+	reader, err := OpenRowReader(path, "", 0, true)
+	if err != nil {
+		t.Fatalf("open reader: %v", err)
+	}
+	rows, _ := readAllRowChunks(t, reader)
+	if err := reader.Close(); err != nil {
+		t.Fatalf("close reader: %v", err)
+	}
+	if len(rows) != 0 {
+		t.Fatalf("the empty first sheet returned %d rows", len(rows))
+	}
+
+	if _, err := OpenRowReader(path, "Missing", 0, true); err == nil {
+		t.Fatal("expected an error for a missing sheet")
+	}
+	if _, err := OpenRowReader(filepath.Join(t.TempDir(), "missing.xlsx"), "", 0, true); err == nil {
+		t.Fatal("expected an error for a missing file")
+	}
+}
+
+func TestReleaseRowReaderClosesTheReader(t *testing.T) {
+	reader, err := OpenRowReader(writeReaderTestWorkbook(t, 1), "Data", 0, true)
+	if err != nil {
+		t.Fatalf("open reader: %v", err)
+	}
+	handle := RegisterRowReader(reader)
+	if LookupRowReader(handle) != reader {
+		t.Fatal("registered reader is not found")
+	}
+	if err := ReleaseRowReader(handle); err != nil {
+		t.Fatalf("release reader: %v", err)
+	}
+	if LookupRowReader(handle) != nil || ReleaseRowReader(handle) != nil {
+		t.Fatal("released reader is still registered")
+	}
+}
@@ -0,0 +1,156 @@
+package core
+
+import (
+	"math"
+	"runtime/metrics"
+	"sync/atomic"
+)
+
+// Go runtime metrics read by RuntimeStatistics. gcPausesMetric replaced
+// legacyGCPausesMetric in Go 1.22; the legacy name is read when the runtime
+// does not know the new one.
+const (
+	heapLiveMetric       = "/gc/heap/live:bytes"
+	heapObjectsMetric    = "/memory/classes/heap/objects:bytes"
+	totalMemoryMetric    = "/memory/classes/total:bytes"
+	heapAllocsMetric     = "/gc/heap/allocs:bytes"
+	gcCyclesMetric       = "/gc/cycles/total:gc-cycles"
+	gcPausesMetric       = "/sched/pauses/total/gc:seconds"
+	legacyGCPausesMetric = "/gc/pauses:seconds"
+	goroutinesMetric     = "/sched/goroutines:goroutines"
+)
+
+// RuntimeStats is a snapshot of the Go runtime embedded in the native
+// library. The ABI-v7 entry point returns it to Python as JSON.
+type RuntimeStats struct {
+	// HeapLiveBytes is the heap that survived the last GC cycle,
+	// HeapObjectsBytes the heap currently occupied by objects, live or not.
+	HeapLiveBytes    uint64 `json:"heap_live_bytes"`
+	HeapObjectsBytes uint64 `json:"heap_objects_bytes"`
+	// HeapPeakBytes is the largest HeapObjectsBytes sampled so far. It is
+	// sampled at the end of every export and on every RuntimeStatistics
+	// call, so a short spike inside an export can exceed it.
+	HeapPeakBytes uint64 `json:"heap_peak_bytes"`
+	// TotalBytes is all memory the Go runtime has mapped, heap or not.
+	TotalBytes uint64 `json:"total_bytes"`
+	// HeapAllocatedBytes counts every byte allocated on the Go heap since the
+	// process started.
+	HeapAllocatedBytes uint64 `json:"heap_allocated_bytes"`
+	GCCycles           uint64 `json:"gc_cycles"`
+	// GCPauses and GCPauseSeconds count the stop-the-world pauses of the
+	// collector. runtime/metrics keeps pause times as a histogram, so the
+	// total is estimated from bucket midpoints.
+	GCPauses       uint64  `json:"gc_pauses"`
+	GCPauseSeconds float64 `json:"gc_pause_seconds"`
+	Goroutines     uint64  `json:"goroutines"`
+	// Exports and ExportAllocatedBytes count finished exports and the heap
+	// bytes allocated while they ran; concurrent exports count each other's
+	// allocations too.
+	Exports              int64 `json:"exports"`
+	ExportAllocatedBytes int64 `json:"export_allocated_bytes"`
+}
+
+var (
+	heapPeakBytes        atomic.Uint64
+	finishedExports      atomic.Int64
+	exportAllocatedBytes atomic.Int64
+)
+
+// RuntimeStatistics reads the runtime metrics of the process.
+func RuntimeStatistics() RuntimeStats {
+	samples := []metrics.Sample{
+		{Name: heapLiveMetric},
+		{Name: heapObjectsMetric},
+		{Name: totalMemoryMetric},
+		{Name: heapAllocsMetric},
+		{Name: gcCyclesMetric},
+		{Name: gcPausesMetric},
+		{Name: goroutinesMetric},
+	}
+	metrics.Read(samples)
+	pauses := samples[5:6]
+	if pauses[0].Value.Kind() != metrics.KindFloat64Histogram {
+		pauses = []metrics.Sample{{Name: legacyGCPausesMetric}}
+		metrics.Read(pauses)
+	}
+	pauseCount, pauseSeconds := histogramTotals(pauses[0].Value)
+	heapObjects := metricUint64(samples[1].Value)
+	return RuntimeStats{
+		HeapLiveBytes:        metricUint64(samples[0].Value),
+		HeapObjectsBytes:     heapObjects,
+		HeapPeakBytes:        recordHeapPeak(heapObjects),
+		TotalBytes:           metricUint64(samples[2].Value),
+		HeapAllocatedBytes:   metricUint64(samples[3].Value),
+		GCCycles:             metricUint64(samples[4].Value),
+		GCPauses:             pauseCount,
+		GCPauseSeconds:       pauseSeconds,
+		Goroutines:           metricUint64(samples[6].Value),
+		Exports:              finishedExports.Load(),
+		ExportAllocatedBytes: exportAllocatedBytes.Load(),
+	}
+}
+
+func metricUint64(value metrics.Value) uint64 {
+	if value.Kind() != metrics.KindUint64 {
+		return 0
+	}
+	return value.Uint64()
+}
+
+// histogramTotals returns the number of samples in a histogram and their
+// sum, estimated from the bucket midpoints. Open-ended buckets use their
+// finite bound.
+func histogramTotals(value metrics.Value) (count uint64, total float64) {
+	if value.Kind() != metrics.KindFloat64Histogram {
+		return 0, 0
+	}
+	histogram := value.Float64Histogram()
+	for index, bucketCount := range histogram.Counts {
+		if bucketCount == 0 {
+			continue
+		}
+		lower, upper := histogram.Buckets[index], histogram.Buckets[index+1]
+		midpoint := (lower + upper) / 2
+		if math.IsInf(lower, -1) {
+			midpoint = upper
+		} else if math.IsInf(upper, 1) {
+			midpoint = lower
+		}
+		count += bucketCount
+		total += float64(bucketCount) * midpoint
+	}
+	return count, total
+}
+
+// recordHeapPeak raises the recorded heap peak to heapObjects and returns
+// the peak.
+func recordHeapPeak(heapObjects uint64) uint64 {
+	for {
+		peak := heapPeakBytes.Load()
+		if heapObjects <= peak {
+			return peak
+		}
+		if heapPeakBytes.CompareAndSwap(peak, heapObjects) {
+			return heapObjects
+		}
+	}
+}
+
+// heapAllocatedBytes reads the cumulative heap allocation counter.
+func heapAllocatedBytes() uint64 {
+	samples := []metrics.Sample{{Name: heapAllocsMetric}}
+	metrics.Read(samples)
+	return metricUint64(samples[0].Value)
+}
+
+// recordExportRuntime samples the heap peak at the end of an export and
+// returns the heap bytes allocated since allocatedAtStart.
+func recordExportRuntime(allocatedAtStart uint64) int64 {
+	samples := []metrics.Sample{{Name: heapObjectsMetric}, {Name: heapAllocsMetric}}
+	metrics.Read(samples)
+	recordHeapPeak(metricUint64(samples[0].Value))
+	allocated := int64(metricUint64(samples[1].Value) - allocatedAtStart)
+	finishedExports.Add(1)
+	exportAllocatedBytes.Add(allocated)
+	return allocated
+}
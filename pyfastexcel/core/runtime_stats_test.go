@@ -0,0 +1,69 @@
+package core
+
+import (
+	"math"
+	"runtime"
+	"runtime/metrics"
+	"testing"
+)
+
+var runtimeStatsSink [][]byte
+
+func TestRuntimeStatisticsReportsHeapGCAndExports(t *testing.T) {
+	before := RuntimeStatistics()
+	allocatedAtStart := heapAllocatedBytes()
+	for index := 0; index < 64; index++ {
+		runtimeStatsSink = append(runtimeStatsSink, make([]byte, 64<<10))
+	}
+	allocated := recordExportRuntime(allocatedAtStart)
+	runtimeStatsSink = nil
+	runtime.GC()
+	after := RuntimeStatistics()
+
+	if allocated < 64*(64<<10) {
+		t.Fatalf("export allocated %d bytes, want at least %d", allocated, 64*(64<<10))
+	}
+	if after.Exports != before.Exports+1 ||
+		after.ExportAllocatedBytes != before.ExportAllocatedBytes+allocated {
+		t.Fatalf("export was not counted: before %+v, after %+v", before, after)
+	}
+	if after.GCCycles <= before.GCCycles || after.GCPauses == 0 || after.GCPauseSeconds <= 0 {
+		t.Fatalf("GC cycle was not reported: before %+v, after %+v", before, after)
+	}
+	if after.HeapAllocatedBytes < before.HeapAllocatedBytes+uint64(allocated) {
+		t.Fatalf("heap allocations did not grow: before %+v, after %+v", before, after)
+	}
+	if after.HeapPeakBytes < after.HeapObjectsBytes || after.HeapPeakBytes < 64*(64<<10) {
+		t.Fatalf("heap peak %d is below the sampled heap: %+v", after.HeapPeakBytes, after)
+	}
+	if after.HeapLiveBytes == 0 || after.TotalBytes < after.HeapObjectsBytes || after.Goroutines == 0 {
+		t.Fatalf("unexpected runtime stats: %+v", after)
+	}
+}
+
+func TestHistogramTotalsUseBucketMidpoints(t *testing.T) {
+	samples := []metrics.Sample{{Name: heapLiveMetric}}
+	metrics.Read(samples)
+	if count, total := histogramTotals(samples[0].Value); count != 0 || total != 0 {
+		t.Fatalf("non-histogram metric gave %d samples totalling %f", count, total)
+	}
+
+	for _, name := range []string{gcPausesMetric, legacyGCPausesMetric} {
+		samples = []metrics.Sample{{Name: name}}
+		metrics.Read(samples)
+		if samples[0].Value.Kind() != metrics.KindFloat64Histogram {
+			continue
+		}
+		histogram := samples[0].Value.Float64Histogram()
+		count, total := histogramTotals(samples[0].Value)
+		var want uint64
+		for _, bucketCount := range histogram.Counts {
+			want += bucketCount
+		}
+		if count != want || math.IsInf(total, 0) || math.IsNaN(total) {
+			t.Fatalf("%s totals = %d, %f; want %d finite", name, count, total, want)
+		}
+		return
+	}
+	t.Fatal("no GC pause histogram is available")
+}
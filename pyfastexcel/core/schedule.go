@@ -0,0 +1,140 @@
+package core
+
+import (
+	"fmt"
+	"sort"
+)
+
+// splitSheetMinRows is the smallest stream sheet scheduleStreamSheets splits
+// into a decode and a write stage; below it the hand-off costs more than
+// it saves. Tests lower it to exercise the split path on small payloads.
+var splitSheetMinRows = 1 << 16
+
+// sheetStage is the part of a stream sheet a sheetJob covers.
+type sheetStage int
+
+const (
+	// wholeSheet decodes and writes the sheet on one worker.
+	wholeSheet sheetStage = iota
+	// decodeStage decodes the sheet's rows into the job's rows channel.
+	decodeStage
+	// writeStage writes the rows decodeStage hands over, in row order.
+	writeStage
+)
+
+// sheetJob is one unit of work of the parallel stream sheet pool. The two
+// stages of a split sheet share the same rows channel.
+type sheetJob struct {
+	sheetIndex int
+	stage      sheetStage
+	rows       chan wireRowResult
+}
+
+// scheduleStreamSheets orders the stream sheets by row_counts, largest first,
+// so the sheets that bound the export start before the short ones fill the
+// pool. A sheet holding more than its fair share of all rows (and at least
+// splitSheetMinRows) is split into a decode and a write job that run on two
+// workers at once. An excelize StreamWriter only accepts a sheet's rows in
+// ascending order, so a sheet cannot be cut into row ranges written
+// independently; splitting off the decoding is how one sheet spreads over
+// two workers. The write job is queued right after its decode job, which
+// keeps the pool from stalling on a decoder whose writer never starts.
+func scheduleStreamSheets(streamSheets []int, rowCounts []int, workers int) []sheetJob {
+	ordered := append([]int(nil), streamSheets...)
+	sort.SliceStable(ordered, func(left, right int) bool {
+		return rowCounts[ordered[left]] > rowCounts[ordered[right]]
+	})
+
+	totalRows := 0
+	for _, sheetIndex := range ordered {
+		totalRows += rowCounts[sheetIndex]
+	}
+	jobs := make([]sheetJob, 0, len(ordered))
+	for _, sheetIndex := range ordered {
+		rowCount := rowCounts[sheetIndex]
+		if workers < 2 || rowCount < splitSheetMinRows || rowCount*workers <= totalRows {
+			jobs = append(jobs, sheetJob{sheetIndex: sheetIndex, stage: wholeSheet})
+			continue
+		}
+		rows := make(chan wireRowResult, 256)
+		jobs = append(
+			jobs,
+			sheetJob{sheetIndex: sheetIndex, stage: decodeStage, rows: rows},
+			sheetJob{sheetIndex: sheetIndex, stage: writeStage, rows: rows},
+		)
+	}
+	return jobs
+}
+
+// decodeStreamSheetSegment is the decode stage of a split sheet. It decodes
+// every row of the sheet's segment into pooled buffers, sends them to rows
+// and closes the channel once it is done, has failed or has been cancelled.
+func (ew *ExcelWriter) decodeStreamSheetSegment(
+	sheet *preparedStreamSheet,
+	segment []byte,
+	rowCount int,
+	noStyle bool,
+	control *wireParallelControl,
+	rows chan<- wireRowResult,
+) {
+	defer close(rows)
+	scanner := newWireScanner(segment)
+	for rowIndex := 0; rowIndex < rowCount; rowIndex++ {
+		buffer := getRowBuffer()
+		row, err := ew.decodeWireRow(scanner, noStyle, buffer)
+		if err != nil {
+			putRowBuffer(buffer)
+			control.fail(fmt.Errorf("decode sheet %q row %d: %w", sheet.name, rowIndex+1, err))
+			return
+		}
+		select {
+		case rows <- wireRowResult{row: row, buffer: buffer}:
+		case <-control.cancel:
+			putRowBuffer(buffer)
+			return
+		}
+	}
+	if _, err := scanner.peekCode(); err == nil {
+		control.fail(fmt.Errorf("PFX2 sheet %q segment contains trailing MessagePack data", sheet.name))
+	}
+}
+
+// writeDecodedStreamSheet is the write stage of a split sheet. It writes the
+// rows of its decode stage until the channel closes and then the trailing
+// height-only rows, unless the decode stage or another worker failed.
+func (ew *ExcelWriter) writeDecodedStreamSheet(
+	sheet *preparedStreamSheet,
+	rowCount int,
+	control *wireParallelControl,
+	rows <-chan wireRowResult,
+) {
+	rowNumber := 0
+	for result := range rows {
+		rowNumber++
+		ew.capturePivotSourceHeader(sheet.name, rowNumber, result.row)
+		err := sheet.setRow(rowNumber, result.row)
+		putRowBuffer(result.buffer)
+		if err == nil {
+			err = ew.progress.row(sheet.index, rowNumber)
+		}
+		if err != nil {
+			control.fail(err)
+			return
+		}
+	}
+	select {
+	case <-control.cancel:
+		return
+	default:
+	}
+	if rowNumber != rowCount {
+		return
+	}
+	if err := ew.progress.sheetDone(sheet.index, rowCount); err != nil {
+		control.fail(err)
+		return
+	}
+	if err := writeTrailingStreamRows(sheet.streamWriter, sheet.rowHeights, rowCount); err != nil {
+		control.fail(fmt.Errorf("stream sheet %q: %w", sheet.name, err))
+	}
+}
@@ -0,0 +1,53 @@
+package core
+
+import (
+	"reflect"
+	"testing"
+)
+
+func TestScheduleStreamSheetsOrdersLargestFirst(t *testing.T) {
+	jobs := scheduleStreamSheets([]int{0, 2, 3, 5}, []int{10, 0, 40, 10, 0, 25}, 2)
+	var order []int
+	for _, job := range jobs {
+		if job.stage != wholeSheet {
+			t.Fatalf("sheet %d below splitSheetMinRows was split", job.sheetIndex)
+		}
+		order = append(order, job.sheetIndex)
+	}
+	if expected := []int{2, 5, 0, 3}; !reflect.DeepEqual(order, expected) {
+		t.Fatalf("expected order %v, got %v", expected, order)
+	}
+}
+
+func TestScheduleStreamSheetsSplitsOversizedSheets(t *testing.T) {
+	previous := splitSheetMinRows
+	splitSheetMinRows = 100
+	defer func() { splitSheetMinRows = previous }()
+
+	rowCounts := []int{50, 1000, 99, 400}
+	jobs := scheduleStreamSheets([]int{0, 1, 2, 3}, rowCounts, 4)
+	if len(jobs) != 6 {
+		t.Fatalf("expected 6 jobs, got %d: %+v", len(jobs), jobs)
+	}
+	expected := []struct {
+		sheetIndex int
+		stage      sheetStage
+	}{
+		{1, decodeStage}, {1, writeStage}, {3, decodeStage}, {3, writeStage}, {2, wholeSheet}, {0, wholeSheet},
+	}
+	for index, job := range jobs {
+		if job.sheetIndex != expected[index].sheetIndex || job.stage != expected[index].stage {
+			t.Fatalf("job %d: expected %+v, got sheet %d stage %d", index, expected[index], job.sheetIndex, job.stage)
+		}
+	}
+	if jobs[0].rows == nil || jobs[0].rows != jobs[1].rows {
+		t.Fatal("the stages of a split sheet must share one rows channel")
+	}
+
+	// One worker cannot run both stages of a split sheet at once.
+	for _, job := range scheduleStreamSheets([]int{0, 1, 2, 3}, rowCounts, 1) {
+		if job.stage != wholeSheet {
+			t.Fatalf("sheet %d was split on a single worker", job.sheetIndex)
+		}
+	}
+}
@@ -0,0 +1,126 @@
+package core
+
+import (
+	"bytes"
+	"errors"
+	"fmt"
+	"io"
+	"os"
+)
+
+// spillBuffer keeps its contents in memory until they grow past threshold
+// and then moves them to a temporary file in dir. A negative threshold never
+// spills. The in-memory buffer is borrowed from byteBufferPool and given back
+// by Close. It is not safe for concurrent use.
+type spillBuffer struct {
+	threshold int64
+	dir       string
+	stats     *spillStats
+	memory    *bytes.Buffer
+	file      *os.File
+	size      int64
+}
+
+func newSpillBuffer(threshold int64, dir string, stats *spillStats) *spillBuffer {
+	return &spillBuffer{threshold: threshold, dir: dir, stats: stats}
+}
+
+func (buffer *spillBuffer) Write(data []byte) (int, error) {
+	if buffer.file == nil && buffer.threshold >= 0 &&
+		buffer.size+int64(len(data)) > buffer.threshold {
+		if err := buffer.spill(); err != nil {
+			return 0, err
+		}
+	}
+	var written int
+	var err error
+	if buffer.file != nil {
+		written, err = buffer.file.Write(data)
+	} else {
+		if buffer.memory == nil {
+			buffer.memory = getByteBuffer()
+		}
+		written, err = buffer.memory.Write(data)
+	}
+	buffer.size += int64(written)
+	return written, err
+}
+
+func (buffer *spillBuffer) spill() error {
+	file, err := os.CreateTemp(buffer.dir, "pyfastexcel-spill-*.tmp")
+	if err != nil {
+		return fmt.Errorf("create spill file: %w", err)
+	}
+	if _, err := file.Write(buffer.contents()); err != nil {
+		return errors.Join(
+			fmt.Errorf("write spill file: %w", err),
+			file.Close(),
+			os.Remove(file.Name()),
+		)
+	}
+	buffer.releaseMemory()
+	buffer.file = file
+	return nil
+}
+
+// contents returns the in-memory data; it is empty once the buffer spilled.
+func (buffer *spillBuffer) contents() []byte {
+	if buffer.memory == nil {
+		return nil
+	}
+	return buffer.memory.Bytes()
+}
+
+func (buffer *spillBuffer) releaseMemory() {
+	if buffer.memory != nil {
+		putByteBuffer(buffer.memory)
+		buffer.memory = nil
+	}
+}
+
+// Size reports the number of bytes written so far.
+func (buffer *spillBuffer) Size() int64 {
+	return buffer.size
+}
+
+func (buffer *spillBuffer) ReadAt(data []byte, offset int64) (int, error) {
+	if buffer.file != nil {
+		return buffer.file.ReadAt(data, offset)
+	}
+	contents := buffer.contents()
+	if offset >= int64(len(contents)) {
+		return 0, io.EOF
+	}
+	read := copy(data, contents[offset:])
+	if read < len(data) {
+		return read, io.EOF
+	}
+	return read, nil
+}
+
+// WriteTo copies the whole contents to output without consuming them.
+func (buffer *spillBuffer) WriteTo(output io.Writer) (int64, error) {
+	if buffer.file != nil {
+		return io.Copy(output, io.NewSectionReader(buffer.file, 0, buffer.size))
+	}
+	written, err := output.Write(buffer.contents())
+	return int64(written), err
+}
+
+// Close returns the in-memory buffer to its pool, records a spill in the
+// export statistics and removes the spill file. The buffer must not be used
+// afterwards.
+func (buffer *spillBuffer) Close() error {
+	buffer.releaseMemory()
+	if buffer.file == nil {
+		return nil
+	}
+	buffer.stats.add(buffer.size)
+	name := buffer.file.Name()
+	err := buffer.file.Close()
+	buffer.file = nil
+	if removeErr := os.Remove(name); removeErr != nil && !errors.Is(removeErr, os.ErrNotExist) {
+		err = errors.Join(err, fmt.Errorf("remove spill file: %w", removeErr))
+	}
+	return err
+}
@@ -5,6 +5,7 @@ import (
 	"fmt"
 	"reflect"
 	"sort"
+	"sync"
 
 	"github.com/xuri/excelize/v2"
 )
@@ -244,20 +245,114 @@ func CreateStyle(file *excelize.File, styleSettings map[string]interface{}) map[
 		styleNames = append(styleNames, name)
 	}
 	sort.Strings(styleNames)
-	styleMap, _, err := createStylesOrdered(file, styleSettings, styleNames)
+	styleMap, _, err := createStylesOrdered(file, styleSettings, styleNames, nil, "")
 	if err != nil {
 		panic(err)
 	}
 	return styleMap
 }
 
+// parseStyleDefinition converts one style of the workbook metadata to the
+// excelize style it describes.
+func parseStyleDefinition(style map[string]interface{}) *excelize.Style {
+	customNumFmt := style["CustomNumFmt"].(string)
+	return &excelize.Style{
+		Font:         getFontStyle(style["Font"].(map[string]interface{})),
+		Fill:         getFillStyle(style["Fill"].(map[string]interface{})),
+		Border:       getBorderStyle(style["Border"].(map[string]interface{})),
+		Alignment:    getAlignmentStyle(style["Alignment"].(map[string]interface{})),
+		Protection:   getProtectionStyle(style["Protection"].(map[string]interface{})),
+		CustomNumFmt: &customNumFmt,
+	}
+}
+
+// styleDefinitionCache shares parsed styles between the workbooks of one
+// export batch or template. A style is keyed by its name and the style table
+// it belongs to, the digest splitWirePayload takes of the table's metadata
+// JSON once per workbook, so a lookup costs no encoding. It is safe for
+// concurrent use; a nil cache, or a workbook without a style table digest,
+// parses every style.
+type styleDefinitionCache struct {
+	mu     sync.Mutex
+	styles map[string]*excelize.Style
+	hits   int
+}
+
+func newStyleDefinitionCache() *styleDefinitionCache {
+	return &styleDefinitionCache{styles: make(map[string]*excelize.Style)}
+}
+
+// style returns a private copy of the parsed definition, because excelize
+// may normalize the style it is given while registering it.
+func (cache *styleDefinitionCache) style(
+	styleTable string,
+	name string,
+	definition map[string]interface{},
+) *excelize.Style {
+	if cache == nil || styleTable == "" {
+		return parseStyleDefinition(definition)
+	}
+	// The digest has a fixed length, so the concatenation is unambiguous.
+	key := styleTable + name
+	cache.mu.Lock()
+	parsed, ok := cache.styles[key]
+	if ok {
+		cache.hits++
+	}
+	cache.mu.Unlock()
+	if !ok {
+		parsed = parseStyleDefinition(definition)
+		cache.mu.Lock()
+		cache.styles[key] = parsed
+		cache.mu.Unlock()
+	}
+	return cloneStyle(parsed)
+}
+
+func cloneStyle(style *excelize.Style) *excelize.Style {
+	clone := *style
+	clone.Border = append([]excelize.Border(nil), style.Border...)
+	clone.Fill.Color = append([]string(nil), style.Fill.Color...)
+	if style.Font != nil {
+		font := *style.Font
+		font.ColorTheme = cloneInt(style.Font.ColorTheme)
+		font.Charset = cloneInt(style.Font.Charset)
+		clone.Font = &font
+	}
+	if style.Alignment != nil {
+		alignment := *style.Alignment
+		clone.Alignment = &alignment
+	}
+	if style.Protection != nil {
+		protection := *style.Protection
+		clone.Protection = &protection
+	}
+	clone.DecimalPlaces = cloneInt(style.DecimalPlaces)
+	if style.CustomNumFmt != nil {
+		customNumFmt := *style.CustomNumFmt
+		clone.CustomNumFmt = &customNumFmt
+	}
+	return &clone
+}
+
+func cloneInt(value *int) *int {
+	if value == nil {
+		return nil
+	}
+	copied := *value
+	return &copied
+}
+
 // createStylesOrdered creates workbook styles in the supplied wire order. The
 // returned slice maps a compact wire style ID to excelize's workbook-local
-// style ID.
+// style ID. Parsed definitions come from cache, which may be nil, under the
+// styleTable digest of the workbook.
 func createStylesOrdered(
 	file *excelize.File,
 	styleSettings map[string]interface{},
 	styleNames []string,
+	cache *styleDefinitionCache,
+	styleTable string,
 ) (map[string]int, []int, error) {
 	styleMap := make(map[string]int, len(styleNames))
 	styleIDs := make([]int, len(styleNames))
@@ -272,15 +367,8 @@ func createStylesOrdered(
 		if !ok {
 			return nil, nil, fmt.Errorf("style %q is missing from metadata", key)
 		}
-		customNumFmt := style.(map[string]interface{})["CustomNumFmt"].(string)
-		customStyle, err := file.NewStyle(&excelize.Style{
-			Font:         getFontStyle(style.(map[string]interface{})["Font"].(map[string]interface{})),
-			Fill:         getFillStyle(style.(map[string]interface{})["Fill"].(map[string]interface{})),
-			Border:       getBorderStyle(style.(map[string]interface{})["Border"].(map[string]interface{})),
-			Alignment:    getAlignmentStyle(style.(map[string]interface{})["Alignment"].(map[string]interface{})),
-			Protection:   getProtectionStyle(style.(map[string]interface{})["Protection"].(map[string]interface{})),
-			CustomNumFmt: &customNumFmt,
-		})
+		definition := cache.style(styleTable, key, style.(map[string]interface{}))
+		customStyle, err := file.NewStyle(definition)
 		if err != nil {
 			return nil, nil, fmt.Errorf("create style %q: %w", key, err)
 		}
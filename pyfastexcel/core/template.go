@@ -0,0 +1,183 @@
+package core
+
+import (
+	"bytes"
+	"errors"
+	"fmt"
+	"sync"
+	"time"
+)
+
+// Template is a compiled workbook layout: the metadata of a PFX2 payload,
+// validated once, with its style definitions parsed once, and the rows the
+// layout already holds (header rows, for example). Render writes it with new
+// rows appended to its sheets. A Template is immutable and safe for
+// concurrent renders.
+type Template struct {
+	metadata   []byte
+	styleNames []string
+	rowCounts  []int
+	segments   [][]byte
+	styleTable string
+	styles     *styleDefinitionCache
+}
+
+// CompileTemplate compiles a PFX2 payload whose wire metadata carries
+// sheet_offsets. The payload is not retained.
+func CompileTemplate(payload []byte) (template *Template, err error) {
+	defer recoverAsError(&err)
+
+	if !bytes.HasPrefix(payload, wireMagic[:]) {
+		return nil, fmt.Errorf("templates need a PFX2 payload")
+	}
+	metadata, wire, rowStream, err := splitWirePayload(payload)
+	if err != nil {
+		return nil, err
+	}
+	if len(wire.SheetOffsets) != len(wire.RowCounts) {
+		return nil, fmt.Errorf("template payload needs sheet_offsets for every sheet")
+	}
+	writer, err := newExcelWriter(metadata)
+	if err != nil {
+		return nil, err
+	}
+	defer func() {
+		err = errors.Join(err, writer.close())
+	}()
+	if err := validateWireMetadata(writer, wire, int64(len(rowStream))); err != nil {
+		return nil, err
+	}
+
+	template = &Template{
+		metadata:   bytes.Clone(metadata),
+		styleNames: wire.StyleNames,
+		rowCounts:  wire.RowCounts,
+		segments:   make([][]byte, len(wire.RowCounts)),
+		styleTable: wire.styleTable,
+		styles:     newStyleDefinitionCache(),
+	}
+	for sheetIndex := range wire.RowCounts {
+		segmentEnd := int64(len(rowStream))
+		if sheetIndex+1 < len(wire.SheetOffsets) {
+			segmentEnd = wire.SheetOffsets[sheetIndex+1]
+		}
+		template.segments[sheetIndex] = bytes.Clone(rowStream[wire.SheetOffsets[sheetIndex]:segmentEnd])
+	}
+	for _, name := range wire.StyleNames {
+		definition, ok := writer.StyleMap[name].(map[string]interface{})
+		if !ok {
+			return nil, fmt.Errorf("style %q is missing from metadata", name)
+		}
+		template.styles.style(template.styleTable, name, definition)
+	}
+	return template, nil
+}
+
+// Render writes the template to path with rows appended to its sheets.
+// rows is a MessagePack row stream in the PFX2 row encoding; rowCounts and
+// rowOffsets give each sheet's rows and starting offset within it.
+func (template *Template) Render(
+	rows []byte,
+	rowCounts []int,
+	rowOffsets []int64,
+	path string,
+) (ExportReport, error) {
+	start := time.Now()
+	wire, rowStream, err := template.compose(rows, rowCounts, rowOffsets)
+	if err != nil {
+		return ExportReport{}, err
+	}
+	prepare := func() (*ExcelWriter, func() error, error) {
+		return prepareWireWorkbook(template.metadata, wire, rowStream, start)
+	}
+	return writePreparedToFile(prepare, path, template.styles, nil)
+}
+
+// compose builds the wire configuration and row stream of one render: every
+// sheet's template rows followed by its new rows.
+func (template *Template) compose(
+	rows []byte,
+	rowCounts []int,
+	rowOffsets []int64,
+) (wireConfiguration, []byte, error) {
+	if len(rowCounts) != len(template.rowCounts) || len(rowOffsets) != len(template.rowCounts) {
+		return wireConfiguration{}, nil, fmt.Errorf(
+			"template has %d sheets, got row counts for %d and offsets for %d",
+			len(template.rowCounts),
+			len(rowCounts),
+			len(rowOffsets),
+		)
+	}
+	size := len(rows)
+	for _, segment := range template.segments {
+		size += len(segment)
+	}
+	rowStream := make([]byte, 0, size)
+	wire := wireConfiguration{
+		Version:      wireVersion,
+		StyleNames:   template.styleNames,
+		RowCounts:    make([]int, len(rowCounts)),
+		SheetOffsets: make([]int64, len(rowCounts)),
+		styleTable:   template.styleTable,
+	}
+	previous := int64(0)
+	for sheetIndex, offset := range rowOffsets {
+		if rowCounts[sheetIndex] < 0 || offset < previous || offset > int64(len(rows)) {
+			return wireConfiguration{}, nil, fmt.Errorf(
+				"template render sheet %d has an invalid row count or offset",
+				sheetIndex,
+			)
+		}
+		previous = offset
+	}
+	for sheetIndex, rowCount := range rowCounts {
+		segmentEnd := int64(len(rows))
+		if sheetIndex+1 < len(rowOffsets) {
+			segmentEnd = rowOffsets[sheetIndex+1]
+		}
+		wire.SheetOffsets[sheetIndex] = int64(len(rowStream))
+		wire.RowCounts[sheetIndex] = template.rowCounts[sheetIndex] + rowCount
+		if wire.RowCounts[sheetIndex] > maxExcelRows {
+			return wireConfiguration{}, nil, fmt.Errorf(
+				"template render sheet %d has %d rows, more than Excel allows",
+				sheetIndex,
+				wire.RowCounts[sheetIndex],
+			)
+		}
+		rowStream = append(rowStream, template.segments[sheetIndex]...)
+		rowStream = append(rowStream, rows[rowOffsets[sheetIndex]:segmentEnd]...)
+	}
+	return wire, rowStream, nil
+}
+
+var (
+	templatesMu    sync.Mutex
+	templates      = map[int64]*Template{}
+	nextTemplateID int64
+)
+
+// RegisterTemplate keeps template alive behind a handle for the C ABI.
+func RegisterTemplate(template *Template) int64 {
+	templatesMu.Lock()
+	defer templatesMu.Unlock()
+	nextTemplateID++
+	templates[nextTemplateID] = template
+	return nextTemplateID
+}
+
+// LookupTemplate returns the template behind handle, or nil.
+func LookupTemplate(handle int64) *Template {
+	templatesMu.Lock()
+	defer templatesMu.Unlock()
+	return templates[handle]
+}
+
+// ReleaseTemplate drops the template behind handle. Renders already running
+// keep their reference and finish normally.
+func ReleaseTemplate(handle int64) bool {
+	templatesMu.Lock()
+	defer templatesMu.Unlock()
+	_, ok := templates[handle]
+	delete(templates, handle)
+	return ok
+}
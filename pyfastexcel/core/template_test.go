@@ -0,0 +1,124 @@
+package core
+
+import (
+	"bytes"
+	"os"
+	"path/filepath"
+	"sync"
+	"testing"
+
+	"github.com/vmihailenco/msgpack/v5"
+)
+
+// encodeTemplateRows encodes rows the way Template.Render expects them.
+func encodeTemplateRows(t *testing.T, rowsBySheet [][]interface{}) ([]byte, []int, []int64) {
+	t.Helper()
+	var encoded bytes.Buffer
+	encoder := msgpack.NewEncoder(&encoded)
+	counts := make([]int, len(rowsBySheet))
+	offsets := make([]int64, len(rowsBySheet))
+	for sheetIndex, rows := range rowsBySheet {
+		offsets[sheetIndex] = int64(encoded.Len())
+		counts[sheetIndex] = len(rows)
+		for _, row := range rows {
+			if err := encoder.Encode(row); err != nil {
+				t.Fatalf("encode template row: %v", err)
+			}
+		}
+	}
+	return encoded.Bytes(), counts, offsets
+}
+
+func TestTemplateRendersNewRowsAfterItsOwnRows(t *testing.T) {
+	const sheets = 3
+	const rowsPerSheet = 20
+	allRows := multiSheetTestRows(sheets, rowsPerSheet)
+	headerRows := make([][]interface{}, sheets)
+	newRows := make([][]interface{}, sheets)
+	for sheetIndex, rows := range allRows {
+		headerRows[sheetIndex] = rows[:5]
+		newRows[sheetIndex] = rows[5:]
+	}
+	template, err := CompileTemplate(newMultiSheetPFX2Payload(t, headerRows, nil))
+	if err != nil {
+		t.Fatalf("compile template: %v", err)
+	}
+	rows, counts, offsets := encodeTemplateRows(t, newRows)
+
+	directory := t.TempDir()
+	var renders sync.WaitGroup
+	for render := 0; render < 4; render++ {
+		renders.Add(1)
+		go func(path string) {
+			defer renders.Done()
+			report, err := template.Render(rows, counts, offsets, path)
+			if err != nil {
+				t.Errorf("render %s: %v", path, err)
+				return
+			}
+			if report.Wire != "pfx2" || report.OutputBytes == 0 {
+				t.Errorf("unexpected render report %+v", report)
+			}
+		}(filepath.Join(directory, "render"+string(rune('a'+render))+".xlsx"))
+	}
+	renders.Wait()
+	for render := 0; render < 4; render++ {
+		workbookBytes, err := os.ReadFile(filepath.Join(directory, "render"+string(rune('a'+render))+".xlsx"))
+		if err != nil {
+			t.Fatalf("read render %d: %v", render, err)
+		}
+		assertMultiSheetContent(t, workbookBytes, sheets, rowsPerSheet)
+	}
+	if template.styles.hits == 0 {
+		t.Fatal("renders did not reuse the compiled style definitions")
+	}
+}
+
+func TestTemplateRejectsInvalidPayloadsAndRows(t *testing.T) {
+	if _, err := CompileTemplate([]byte(`{"content": {}}`)); err == nil {
+		t.Fatal("a JSON payload was compiled")
+	}
+	withoutOffsets := newMultiSheetPFX2Payload(t, multiSheetTestRows(2, 1), func(wire map[string]interface{}) {
+		delete(wire, "sheet_offsets")
+	})
+	if _, err := CompileTemplate(withoutOffsets); err == nil {
+		t.Fatal("a payload without sheet_offsets was compiled")
+	}
+
+	template, err := CompileTemplate(newMultiSheetPFX2Payload(t, multiSheetTestRows(2, 1), nil))
+	if err != nil {
+		t.Fatalf("compile template: %v", err)
+	}
+	rows, counts, offsets := encodeTemplateRows(t, multiSheetTestRows(2, 2))
+	path := filepath.Join(t.TempDir(), "out.xlsx")
+	for name, render := range map[string]func() error{
+		"missing sheet": func() error {
+			_, err := template.Render(rows, counts[:1], offsets[:1], path)
+			return err
+		},
+		"offsets out of order": func() error {
+			_, err := template.Render(rows, counts, []int64{offsets[1], offsets[0]}, path)
+			return err
+		},
+		"offset out of bounds": func() error {
+			_, err := template.Render(rows, counts, []int64{0, int64(len(rows)) + 1}, path)
+			return err
+		},
+		"too many rows": func() error {
+			_, err := template.Render(rows, []int{2, 3}, offsets, path)
+			return err
+		},
+	} {
+		if err := render(); err == nil {
+			t.Errorf("%s: expected an error", name)
+		}
+	}
+
+	handle := RegisterTemplate(template)
+	if LookupTemplate(handle) != template || !ReleaseTemplate(handle) {
+		t.Fatal("registered template was not found")
+	}
+	if LookupTemplate(handle) != nil || ReleaseTemplate(handle) {
+		t.Fatal("released template is still registered")
+	}
+}
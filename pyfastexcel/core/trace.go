@@ -0,0 +1,114 @@
+package core
+
+import (
+	"fmt"
+	"sort"
+	"sync"
+	"time"
+)
+
+// Trace lanes: the goroutine that runs the export, the row decoder goroutine
+// of the sequential path, and worker w of the parallel sheet pool on lane
+// traceWorkerLane(w).
+const (
+	traceExportLane  = 0
+	traceDecoderLane = 1
+)
+
+func traceWorkerLane(worker int) int {
+	return worker + 2
+}
+
+func traceLaneName(lane int) string {
+	switch lane {
+	case traceExportLane:
+		return "export"
+	case traceDecoderLane:
+		return "row decoder"
+	}
+	return fmt.Sprintf("sheet worker %d", lane-2)
+}
+
+// TraceEvent is one complete ("X") or thread-name metadata ("M") event of
+// the Chrome trace-event format. Timestamps are Unix microseconds, so Python
+// can put native spans on the same timeline as its own. Lane becomes the
+// event's tid; Python assigns the pid.
+type TraceEvent struct {
+	Name      string                 `json:"name"`
+	Category  string                 `json:"cat,omitempty"`
+	Phase     string                 `json:"ph"`
+	Timestamp int64                  `json:"ts"`
+	Duration  int64                  `json:"dur,omitempty"`
+	Lane      int                    `json:"tid"`
+	Args      map[string]interface{} `json:"args,omitempty"`
+}
+
+// exportTrace collects the spans of one export when export_options.trace is
+// set. A nil *exportTrace records nothing.
+type exportTrace struct {
+	mu     sync.Mutex
+	events []TraceEvent
+}
+
+// record adds a span that began at start and ends now.
+func (trace *exportTrace) record(name string, lane int, start time.Time, args map[string]interface{}) {
+	if trace == nil {
+		return
+	}
+	event := TraceEvent{
+		Name:      name,
+		Category:  "native",
+		Phase:     "X",
+		Timestamp: start.UnixMicro(),
+		Duration:  time.Since(start).Microseconds(),
+		Lane:      lane,
+		Args:      args,
+	}
+	trace.mu.Lock()
+	trace.events = append(trace.events, event)
+	trace.mu.Unlock()
+}
+
+// span starts a span and returns the function that ends it, for use as
+// `defer ew.trace.span(...)()`.
+func (trace *exportTrace) span(name string, lane int, args map[string]interface{}) func() {
+	if trace == nil {
+		return func() {}
+	}
+	start := time.Now()
+	return func() {
+		trace.record(name, lane, start, args)
+	}
+}
+
+// snapshot returns a name event for every lane used, then the spans.
+func (trace *exportTrace) snapshot() []TraceEvent {
+	if trace == nil {
+		return nil
+	}
+	trace.mu.Lock()
+	defer trace.mu.Unlock()
+	used := map[int]bool{}
+	var lanes []int
+	for _, event := range trace.events {
+		if !used[event.Lane] {
+			used[event.Lane] = true
+			lanes = append(lanes, event.Lane)
+		}
+	}
+	sort.Ints(lanes)
+	events := make([]TraceEvent, 0, len(lanes)+len(trace.events))
+	for _, lane := range lanes {
+		events = append(events, TraceEvent{
+			Name:  "thread_name",
+			Phase: "M",
+			Lane:  lane,
+			Args:  map[string]interface{}{"name": traceLaneName(lane)},
+		})
+	}
+	return append(events, trace.events...)
+}
+
+func sheetTraceArgs(sheet string, rows int) map[string]interface{} {
+	return map[string]interface{}{"sheet": sheet, "rows": rows}
+}
@@ -0,0 +1,85 @@
+package core
+
+import (
+	"testing"
+	"time"
+)
+
+func TestExportTraceRecordsSpansAndNamesLanes(t *testing.T) {
+	var disabled *exportTrace
+	disabled.record("ignored", traceExportLane, time.Now(), nil)
+	disabled.span("ignored", traceExportLane, nil)()
+	if events := disabled.snapshot(); events != nil {
+		t.Fatalf("disabled trace recorded %+v", events)
+	}
+
+	trace := &exportTrace{}
+	start := time.Now()
+	trace.record("decode sheet", traceWorkerLane(1), start, sheetTraceArgs("Data", 3))
+	trace.span("write archive", traceExportLane, nil)()
+	events := trace.snapshot()
+	if len(events) != 4 {
+		t.Fatalf("got %d events, want 2 lane names and 2 spans: %+v", len(events), events)
+	}
+	for index, want := range []string{"export", "sheet worker 1"} {
+		if events[index].Phase != "M" || events[index].Name != "thread_name" || events[index].Args["name"] != want {
+			t.Fatalf("lane name %d = %+v, want %q", index, events[index], want)
+		}
+	}
+	span := events[2]
+	if span.Phase != "X" || span.Lane != traceWorkerLane(1) || span.Timestamp != start.UnixMicro() ||
+		span.Args["sheet"] != "Data" || span.Args["rows"] != 3 {
+		t.Fatalf("unexpected span %+v", span)
+	}
+	if traceLaneName(traceDecoderLane) != "row decoder" {
+		t.Fatalf("decoder lane is named %q", traceLaneName(traceDecoderLane))
+	}
+}
+
+func TestWriteExcelV2TraceCoversSheetWorkersAndArchive(t *testing.T) {
+	const sheets = 3
+	payload := newMultiSheetPFX2Payload(t, multiSheetTestRows(sheets, 20), nil)
+	_, report, err := WriteExcelWithReport(payload)
+	if err != nil {
+		t.Fatalf("export without trace: %v", err)
+	}
+	if report.Trace != nil {
+		t.Fatalf("export without trace option recorded %d events", len(report.Trace))
+	}
+
+	payload = mutatePFX2TestMetadata(t, payload, func(metadata map[string]interface{}) {
+		metadata[exportOptionsKey] = map[string]interface{}{"trace": true, "max_workers": float64(2)}
+	})
+	_, report, err = WriteExcelWithReport(payload)
+	if err != nil {
+		t.Fatalf("traced export: %v", err)
+	}
+	spans := map[string]int{}
+	sheetsWritten := map[interface{}]bool{}
+	for _, event := range report.Trace {
+		if event.Phase != "X" {
+			continue
+		}
+		spans[event.Name]++
+		if event.Name == "write sheet" {
+			if event.Lane < traceWorkerLane(0) {
+				t.Fatalf("stream sheet span on lane %d, want a worker lane", event.Lane)
+			}
+			sheetsWritten[event.Args["sheet"]] = true
+		}
+	}
+	for _, name := range []string{
+		"parse metadata", "initialize styles", "build workbook", "create pivot tables", "write archive",
+	} {
+		if spans[name] != 1 {
+			t.Errorf("got %d %q spans, want 1: %v", spans[name], name, spans)
+		}
+	}
+	if len(sheetsWritten) != sheets || spans["flush sheet"] != sheets {
+		t.Fatalf("spans do not cover every sheet: %v, %v", sheetsWritten, spans)
+	}
+
+	if _, err := parseExportOptions(map[string]interface{}{"trace": "yes"}); err == nil {
+		t.Fatal("a non-boolean trace option was accepted")
+	}
+}
@@ -2,6 +2,7 @@ package core
 
 import (
 	"bytes"
+	"crypto/sha256"
 	"encoding/binary"
 	"encoding/json"
 	"errors"
@@ -12,8 +13,8 @@ import (
 	"strconv"
 	"strings"
 	"sync"
+	"time"
 
-	"github.com/vmihailenco/msgpack/v5"
 	"github.com/vmihailenco/msgpack/v5/msgpcode"
 	"github.com/xuri/excelize/v2"
 )
@@ -37,71 +38,162 @@ type wireConfiguration struct {
 	// decode through the sequential path; when present it enables one
 	// decoder per sheet so multi-sheet workbooks are written concurrently.
 	SheetOffsets []int64 `json:"sheet_offsets"`
+	// styleTable is the SHA-256 digest of the metadata's style JSON, which
+	// keys the parsed styles a batch or template shares.
+	styleTable string
 }
 
 type wireMetadata struct {
-	Wire wireConfiguration `json:"_pyfastexcel_wire"`
+	Wire  wireConfiguration `json:"_pyfastexcel_wire"`
+	Style json.RawMessage   `json:"style"`
 }
 
 // WriteExcelV2 generates raw XLSX bytes from either the PFX2 wire format or
 // the complete legacy JSON payload used by the debugging escape hatch.
-func WriteExcelV2(payload []byte) (result []byte, err error) {
+func WriteExcelV2(payload []byte) ([]byte, error) {
+	result, _, err := WriteExcelWithReport(payload)
+	return result, err
+}
+
+// WriteExcelWithReport is WriteExcelV2 that also reports the resources the
+// export used, such as temporary-file spills.
+func WriteExcelWithReport(payload []byte) ([]byte, ExportReport, error) {
+	var buffer bytes.Buffer
+	report, err := writeExcelToBuffer(payload, &buffer, nil)
+	if err != nil {
+		return nil, report, err
+	}
+	return buffer.Bytes(), report, nil
+}
+
+// WriteExcelWithReportFunc is WriteExcelWithReport for callers that copy the
+// workbook out right away. The workbook is built in a pooled buffer and
+// passed to consume, which must not keep the slice after it returns.
+func WriteExcelWithReportFunc(payload []byte, consume func(workbook []byte) error) (ExportReport, error) {
+	return WriteExcelWithHooksFunc(payload, nil, consume)
+}
+
+// WriteExcelWithHooksFunc is WriteExcelWithReportFunc for an export the
+// caller follows and may cancel through hooks, which may be nil.
+func WriteExcelWithHooksFunc(
+	payload []byte,
+	hooks *ExportHooks,
+	consume func(workbook []byte) error,
+) (ExportReport, error) {
+	buffer := getByteBuffer()
+	defer putByteBuffer(buffer)
+	report, err := writeExcelToBuffer(payload, buffer, hooks)
+	if err != nil {
+		return report, err
+	}
+	return report, consume(buffer.Bytes())
+}
+
+func writeExcelToBuffer(payload []byte, buffer *bytes.Buffer, hooks *ExportHooks) (report ExportReport, err error) {
 	defer recoverAsError(&err)
 
+	allocatedAtStart := heapAllocatedBytes()
 	writer, build, err := prepareWorkbookPayload(payload)
 	if err != nil {
-		return nil, err
+		return report, err
 	}
+	writer.stats.allocatedAtStart = allocatedAtStart
+	writer.progress = newExportProgress(hooks)
 	defer func() {
-		err = errors.Join(err, writer.File.Close())
+		err = errors.Join(err, writer.close())
 	}()
 
-	if err = build(); err != nil {
-		return nil, err
+	if err = writer.runBuild(build); err != nil {
+		return report, err
 	}
-	return writer.writeToBytes()
+	if err = writer.writeTo(buffer); err != nil {
+		return report, err
+	}
+	return writer.exportReport()
 }
 
 // WriteExcelV2ToFile writes a workbook without routing ZIP bytes through the
 // cgo boundary. The ZIP is completed in a private temporary file before
 // the destination is opened, preserving the legacy save path on generation
 // failure while retaining open(2) semantics for symlinks and existing files.
-func WriteExcelV2ToFile(payload []byte, path string) (err error) {
+func WriteExcelV2ToFile(payload []byte, path string) error {
+	_, err := WriteExcelToFileWithReport(payload, path)
+	return err
+}
+
+// WriteExcelToFileWithReport is WriteExcelV2ToFile that also reports the
+// resources the export used.
+func WriteExcelToFileWithReport(payload []byte, path string) (report ExportReport, err error) {
+	return writeExcelToFile(payload, path, nil, nil)
+}
+
+// WriteExcelToFileWithHooks is WriteExcelToFileWithReport for an export the
+// caller follows and may cancel through hooks, which may be nil.
+func WriteExcelToFileWithHooks(payload []byte, path string, hooks *ExportHooks) (ExportReport, error) {
+	return writeExcelToFile(payload, path, nil, hooks)
+}
+
+func writeExcelToFile(
+	payload []byte,
+	path string,
+	styles *styleDefinitionCache,
+	hooks *ExportHooks,
+) (ExportReport, error) {
+	prepare := func() (*ExcelWriter, func() error, error) {
+		return prepareWorkbookPayload(payload)
+	}
+	return writePreparedToFile(prepare, path, styles, hooks)
+}
+
+// writePreparedToFile writes the workbook prepare returns to path.
+func writePreparedToFile(
+	prepare func() (*ExcelWriter, func() error, error),
+	path string,
+	styles *styleDefinitionCache,
+	hooks *ExportHooks,
+) (report ExportReport, err error) {
 	defer recoverAsError(&err)
 
-	writer, build, err := prepareWorkbookPayload(payload)
+	allocatedAtStart := heapAllocatedBytes()
+	writer, build, err := prepare()
 	if err != nil {
-		return err
+		return report, err
 	}
+	writer.stats.allocatedAtStart = allocatedAtStart
+	writer.styles = styles
+	writer.progress = newExportProgress(hooks)
 	writerOpen := true
 	defer func() {
 		if writerOpen {
-			err = errors.Join(err, writer.File.Close())
+			err = errors.Join(err, writer.close())
 		}
 	}()
 
-	if err = build(); err != nil {
-		return err
+	if err = writer.runBuild(build); err != nil {
+		return report, err
 	}
 	temporaryPath, err := writer.writeToTemporary(path)
 	if err != nil {
-		return err
+		return report, err
 	}
 	defer func() {
 		if removeErr := os.Remove(temporaryPath); removeErr != nil && !errors.Is(removeErr, os.ErrNotExist) {
 			err = errors.Join(err, fmt.Errorf("remove temporary output: %w", removeErr))
 		}
 	}()
+	if report, err = writer.exportReport(); err != nil {
+		return report, err
+	}
 
 	writerOpen = false
-	if err := writer.File.Close(); err != nil {
-		return fmt.Errorf("close generated workbook: %w", err)
+	if err := writer.close(); err != nil {
+		return report, fmt.Errorf("close generated workbook: %w", err)
 	}
-	return copyTemporaryWorkbook(temporaryPath, path)
+	return report, copyTemporaryWorkbook(temporaryPath, path)
 }
 
 func (ew *ExcelWriter) writeToTemporary(path string) (temporaryPath string, err error) {
-	temporary, err := os.CreateTemp("", "pyfastexcel-*.tmp")
+	temporary, err := os.CreateTemp(ew.options.TempDir, "pyfastexcel-*.tmp")
 	if err != nil {
 		return "", fmt.Errorf("create temporary output for %q: %w", path, err)
 	}
@@ -155,20 +247,33 @@ func copyTemporaryWorkbook(temporaryPath, path string) (err error) {
 }
 
 func prepareWorkbookPayload(payload []byte) (*ExcelWriter, func() error, error) {
+	start := time.Now()
 	if !bytes.HasPrefix(payload, wireMagic[:]) {
 		writer, err := newExcelWriter(payload)
 		if err != nil {
 			return nil, nil, err
 		}
+		writer.stats.wire = "json"
+		writer.trace.record("parse metadata", traceExportLane, start, map[string]interface{}{"wire": "json"})
 		return writer, writer.buildLegacyWorkbook, nil
 	}
 
+	metadataBytes, wire, rowStream, err := splitWirePayload(payload)
+	if err != nil {
+		return nil, nil, err
+	}
+	return prepareWireWorkbook(metadataBytes, wire, rowStream, start)
+}
+
+// splitWirePayload splits a PFX2 payload into its metadata JSON, its wire
+// configuration and its row stream.
+func splitWirePayload(payload []byte) ([]byte, wireConfiguration, []byte, error) {
 	if len(payload) < wireHeaderSize {
-		return nil, nil, fmt.Errorf("PFX2 payload is truncated before metadata length")
+		return nil, wireConfiguration{}, nil, fmt.Errorf("PFX2 payload is truncated before metadata length")
 	}
 	metadataLength := binary.BigEndian.Uint64(payload[len(wireMagic):wireHeaderSize])
 	if metadataLength > maxWireMetadataBytes {
-		return nil, nil, fmt.Errorf(
+		return nil, wireConfiguration{}, nil, fmt.Errorf(
 			"PFX2 metadata length %d exceeds limit %d",
 			metadataLength,
 			maxWireMetadataBytes,
@@ -176,7 +281,7 @@ func prepareWorkbookPayload(payload []byte) (*ExcelWriter, func() error, error)
 	}
 	remaining := len(payload) - wireHeaderSize
 	if metadataLength > uint64(remaining) {
-		return nil, nil, fmt.Errorf(
+		return nil, wireConfiguration{}, nil, fmt.Errorf(
 			"PFX2 metadata length %d exceeds remaining payload length %d",
 			metadataLength,
 			remaining,
@@ -187,30 +292,45 @@ func prepareWorkbookPayload(payload []byte) (*ExcelWriter, func() error, error)
 
 	var metadata wireMetadata
 	if err := json.Unmarshal(metadataBytes, &metadata); err != nil {
-		return nil, nil, fmt.Errorf("decode PFX2 wire metadata: %w", err)
+		return nil, wireConfiguration{}, nil, fmt.Errorf("decode PFX2 wire metadata: %w", err)
 	}
+	styleTable := sha256.Sum256(metadata.Style)
+	metadata.Wire.styleTable = string(styleTable[:])
 	if metadata.Wire.Version != wireVersion {
-		return nil, nil, fmt.Errorf(
+		return nil, wireConfiguration{}, nil, fmt.Errorf(
 			"unsupported PFX2 wire version %d (expected %d)",
 			metadata.Wire.Version,
 			wireVersion,
 		)
 	}
+	return metadataBytes, metadata.Wire, payload[metadataEnd:], nil
+}
 
+// prepareWireWorkbook creates the writer of a PFX2 workbook from its parts.
+// wire replaces the configuration inside metadataBytes, which compiled
+// templates reuse with new rows.
+func prepareWireWorkbook(
+	metadataBytes []byte,
+	wire wireConfiguration,
+	rowStream []byte,
+	start time.Time,
+) (*ExcelWriter, func() error, error) {
 	writer, err := newExcelWriter(metadataBytes)
 	if err != nil {
 		return nil, nil, err
 	}
-	rowStream := payload[metadataEnd:]
-	if err := validateWireMetadata(writer, metadata.Wire, int64(len(rowStream))); err != nil {
-		_ = writer.File.Close()
+	if err := validateWireMetadata(writer, wire, int64(len(rowStream))); err != nil {
+		_ = writer.close()
 		return nil, nil, err
 	}
 
 	writer.WireRowStream = rowStream
-	decoder := msgpack.NewDecoder(bytes.NewReader(rowStream))
+	writer.styleTable = wire.styleTable
+	writer.stats.wire = "pfx2"
+	writer.trace.record("parse metadata", traceExportLane, start, map[string]interface{}{"wire": "pfx2"})
+	scanner := newWireScanner(rowStream)
 	build := func() error {
-		return writer.buildWireWorkbook(decoder, metadata.Wire)
+		return writer.buildWireWorkbook(scanner, wire)
 	}
 	return writer, build, nil
 }
@@ -314,21 +434,23 @@ func validateWireMetadata(writer *ExcelWriter, wire wireConfiguration, rowStream
 }
 
 // wireRowResult carries one decoded row (or its decode error) from the
-// decoder goroutine to the sheet-writing loop.
+// decoder goroutine to the sheet-writing loop. The row lives in buffer, which
+// the consumer returns to rowBufferPool once the row is written.
 type wireRowResult struct {
-	row []interface{}
-	err error
+	row    []interface{}
+	buffer *wireRowBuffer
+	err    error
 }
 
 // startWireRowDecoder decodes every row of every sheet, in payload order, on
 // its own goroutine so MessagePack decoding overlaps excelize's row
-// serialization. The decoder goroutine owns `decoder` exclusively: it stops at
+// serialization. The decoder goroutine owns `scanner` exclusively: it stops at
 // the first error, checks for trailing data after the final row, and always
 // closes the channel. Closing `cancel` releases the goroutine early when the
 // consumer bails out first.
 func startWireRowDecoder(
 	ew *ExcelWriter,
-	decoder *msgpack.Decoder,
+	scanner *wireScanner,
 	wire wireConfiguration,
 	noStyleBySheet []bool,
 	cancel <-chan struct{},
@@ -338,10 +460,16 @@ func startWireRowDecoder(
 		defer close(results)
 		for sheetIndex := range wire.RowCounts {
 			noStyle := noStyleBySheet[sheetIndex]
+			sheetStart := time.Now()
 			for rowIndex := 0; rowIndex < wire.RowCounts[sheetIndex]; rowIndex++ {
-				row, err := ew.decodeWireRow(decoder, noStyle, nil)
+				buffer := getRowBuffer()
+				row, err := ew.decodeWireRow(scanner, noStyle, buffer)
+				if err != nil {
+					putRowBuffer(buffer)
+					buffer = nil
+				}
 				select {
-				case results <- wireRowResult{row: row, err: err}:
+				case results <- wireRowResult{row: row, buffer: buffer, err: err}:
 				case <-cancel:
 					return
 				}
@@ -349,14 +477,15 @@ func startWireRowDecoder(
 					return
 				}
 			}
+			ew.trace.record(
+				"decode sheet",
+				traceDecoderLane,
+				sheetStart,
+				sheetTraceArgs(ew.SheetOrder[sheetIndex].(string), wire.RowCounts[sheetIndex]),
+			)
 		}
-		var trailingErr error
-		if _, err := decoder.PeekCode(); err == nil {
-			trailingErr = fmt.Errorf("PFX2 payload contains trailing MessagePack data")
-		} else if !errors.Is(err, io.EOF) {
-			trailingErr = fmt.Errorf("check PFX2 payload end: %w", err)
-		}
-		if trailingErr != nil {
+		if _, err := scanner.peekCode(); err == nil {
+			trailingErr := fmt.Errorf("PFX2 payload contains trailing MessagePack data")
 			select {
 			case results <- wireRowResult{err: trailingErr}:
 			case <-cancel:
@@ -366,10 +495,93 @@ func startWireRowDecoder(
 	return results
 }
 
-func (ew *ExcelWriter) buildWireWorkbook(decoder *msgpack.Decoder, wire wireConfiguration) error {
+// wireRowReader hands the rows of the whole row stream, in payload order, to
+// the sequential sheet loop. Rows come from a startWireRowDecoder goroutine,
+// or are decoded inline when the export may only keep one goroutine busy.
+// Each row stays valid until the next call to next.
+type wireRowReader struct {
+	ew      *ExcelWriter
+	scanner *wireScanner
+	noStyle []bool
+	rows    <-chan wireRowResult
+	cancel  chan struct{}
+	current *wireRowBuffer
+}
+
+func (ew *ExcelWriter) newWireRowReader(
+	scanner *wireScanner,
+	wire wireConfiguration,
+	noStyleBySheet []bool,
+) *wireRowReader {
+	reader := &wireRowReader{ew: ew, scanner: scanner, noStyle: noStyleBySheet}
+	if ew.options.workers() > 1 {
+		reader.cancel = make(chan struct{})
+		reader.rows = startWireRowDecoder(ew, scanner, wire, noStyleBySheet, reader.cancel)
+	}
+	return reader
+}
+
+func (reader *wireRowReader) next(sheet string, sheetIndex int, rowIndex int) ([]interface{}, error) {
+	reader.release()
+	if reader.rows == nil {
+		buffer := getRowBuffer()
+		row, err := reader.ew.decodeWireRow(reader.scanner, reader.noStyle[sheetIndex], buffer)
+		if err != nil {
+			putRowBuffer(buffer)
+			return nil, fmt.Errorf("decode sheet %q row %d: %w", sheet, rowIndex+1, err)
+		}
+		reader.current = buffer
+		return row, nil
+	}
+	result, ok := <-reader.rows
+	if !ok {
+		return nil, fmt.Errorf("decode sheet %q row %d: row stream ended early", sheet, rowIndex+1)
+	}
+	if result.err != nil {
+		return nil, fmt.Errorf("decode sheet %q row %d: %w", sheet, rowIndex+1, result.err)
+	}
+	reader.current = result.buffer
+	return result.row, nil
+}
+
+// finish checks for trailing data after the final row. The decoder goroutine
+// queues that verdict after the last row, so anything still on the channel
+// is it.
+func (reader *wireRowReader) finish() error {
+	if reader.rows == nil {
+		if _, err := reader.scanner.peekCode(); err == nil {
+			return fmt.Errorf("PFX2 payload contains trailing MessagePack data")
+		}
+		return nil
+	}
+	if result, ok := <-reader.rows; ok && result.err != nil {
+		return result.err
+	}
+	return nil
+}
+
+// close returns the current row to the pool and releases the decoder
+// goroutine if the sheet loop stopped early.
+func (reader *wireRowReader) close() {
+	reader.release()
+	if reader.cancel != nil {
+		close(reader.cancel)
+	}
+}
+
+func (reader *wireRowReader) release() {
+	if reader.current != nil {
+		putRowBuffer(reader.current)
+		reader.current = nil
+	}
+}
+
+func (ew *ExcelWriter) buildWireWorkbook(scanner *wireScanner, wire wireConfiguration) error {
+	stylesStart := time.Now()
 	if err := ew.initializeStyles(wire.StyleNames); err != nil {
 		return err
 	}
+	ew.trace.record("initialize styles", traceExportLane, stylesStart, nil)
 	if err := ew.setFileProps(ew.FileProps); err != nil {
 		return err
 	}
@@ -383,7 +595,7 @@ func (ew *ExcelWriter) buildWireWorkbook(decoder *msgpack.Decoder, wire wireConf
 	// NoStyle is validated up front because the decoder goroutine needs the
 	// complete schedule before the first sheet is written.
 	noStyleBySheet := make([]bool, len(ew.SheetOrder))
-	allStreamSheets := true
+	streamSheets := 0
 	for sheetIndex, item := range ew.SheetOrder {
 		sheet := item.(string)
 		sheetData := ew.Content[sheet].(map[string]interface{})
@@ -392,21 +604,21 @@ func (ew *ExcelWriter) buildWireWorkbook(decoder *msgpack.Decoder, wire wireConf
 			return fmt.Errorf("PFX2 sheet %q NoStyle must be a boolean", sheet)
 		}
 		noStyleBySheet[sheetIndex] = noStyle
-		if sheetData["WriterEngine"] == "NormalWriter" {
-			allStreamSheets = false
+		if sheetData["WriterEngine"] != "NormalWriter" {
+			streamSheets++
 		}
 	}
 
 	// Multiple stream sheets can serialize rows concurrently (excelize
 	// StreamWriter.SetRow only touches per-sheet state); sheet_offsets let
-	// each worker decode its own slice of the row stream. Workbooks that
-	// contain a NormalWriter sheet keep the sequential path because normal
-	// writes go through shared *excelize.File methods.
+	// each worker decode its own slice of the row stream. NormalWriter
+	// sheets go through shared *excelize.File methods, so the parallel path
+	// writes them on the coordinating goroutine before the workers start.
 	// PYFASTEXCEL_SEQUENTIAL=1 is a debugging escape hatch.
-	if allStreamSheets &&
-		len(ew.SheetOrder) > 1 &&
+	if streamSheets > 1 &&
 		len(wire.SheetOffsets) == len(ew.SheetOrder) &&
 		os.Getenv("PYFASTEXCEL_SEQUENTIAL") == "" {
+		ew.stats.parallel = true
 		return ew.buildWireSheetsParallel(wire, noStyleBySheet)
 	}
 
@@ -419,22 +631,12 @@ func (ew *ExcelWriter) buildWireWorkbook(decoder *msgpack.Decoder, wire wireConf
 		}
 	}
 
-	cancel := make(chan struct{})
-	defer close(cancel)
-	decodedRows := startWireRowDecoder(ew, decoder, wire, noStyleBySheet, cancel)
-	nextRow := func(sheet string, rowIndex int) ([]interface{}, error) {
-		result, ok := <-decodedRows
-		if !ok {
-			return nil, fmt.Errorf("decode sheet %q row %d: row stream ended early", sheet, rowIndex+1)
-		}
-		if result.err != nil {
-			return nil, fmt.Errorf("decode sheet %q row %d: %w", sheet, rowIndex+1, result.err)
-		}
-		return result.row, nil
-	}
+	rows := ew.newWireRowReader(scanner, wire, noStyleBySheet)
+	defer rows.close()
 
 	var pivotTableList [][]interface{}
 	for sheetIndex, item := range ew.SheetOrder {
+		sheetStart := time.Now()
 		sheet := item.(string)
 		sheetData := ew.Content[sheet].(map[string]interface{})
 		if !hasSheet1 && sheetCount == 1 {
@@ -454,15 +656,25 @@ func (ew *ExcelWriter) buildWireWorkbook(decoder *msgpack.Decoder, wire wireConf
 			if err := ew.prepareNormalWrite(sheet, sheetData); err != nil {
 				return err
 			}
+			normalWriter := newNormalSheetWriter(ew.File, sheet)
 			for rowIndex := 0; rowIndex < rowCount; rowIndex++ {
-				row, err := nextRow(sheet, rowIndex)
+				row, err := rows.next(sheet, sheetIndex, rowIndex)
 				if err != nil {
 					return err
 				}
 				ew.capturePivotSourceHeader(sheet, rowIndex+1, row)
-				if err := ew.writeDecodedNormalRow(sheet, rowIndex+1, row); err != nil {
+				if err := normalWriter.writeRow(rowIndex+1, row); err != nil {
 					return err
 				}
+				if err := ew.progress.row(sheetIndex, rowIndex+1); err != nil {
+					return err
+				}
+			}
+			if err := ew.progress.sheetDone(sheetIndex, rowCount); err != nil {
+				return err
+			}
+			if err := normalWriter.flush(); err != nil {
+				return err
 			}
 			if err := ew.createTable(sheet, sheetData["Table"].([]interface{})); err != nil {
 				return err
@@ -473,7 +685,7 @@ func (ew *ExcelWriter) buildWireWorkbook(decoder *msgpack.Decoder, wire wireConf
 				return err
 			}
 			for rowIndex := 0; rowIndex < rowCount; rowIndex++ {
-				row, err := nextRow(sheet, rowIndex)
+				row, err := rows.next(sheet, sheetIndex, rowIndex)
 				if err != nil {
 					return err
 				}
@@ -487,27 +699,43 @@ func (ew *ExcelWriter) buildWireWorkbook(decoder *msgpack.Decoder, wire wireConf
 				if err != nil {
 					return fmt.Errorf("write stream sheet %q row %d: %w", sheet, rowIndex+1, err)
 				}
+				if err := ew.progress.row(sheetIndex, rowIndex+1); err != nil {
+					return err
+				}
+			}
+			if err := ew.progress.sheetDone(sheetIndex, rowCount); err != nil {
+				return err
+			}
+			if err := writeTrailingStreamRows(streamWriter, rowHeightMap, rowCount); err != nil {
+				return fmt.Errorf("stream sheet %q: %w", sheet, err)
 			}
 			if err := streamCreateTable(streamWriter, sheetData["Table"].([]interface{})); err != nil {
 				return fmt.Errorf("create tables on stream sheet %q: %w", sheet, err)
 			}
+			flushStart := time.Now()
 			if err := streamWriter.Flush(); err != nil {
 				return fmt.Errorf("flush stream sheet %q: %w", sheet, err)
 			}
+			ew.trace.record("flush sheet", traceExportLane, flushStart, sheetTraceArgs(sheet, rowCount))
 		}
 
 		pivotTableList = append(pivotTableList, sheetData["PivotTable"].([]interface{}))
 		if err := ew.File.SetSheetVisible(sheet, sheetData["SheetVisible"].(bool)); err != nil {
 			return fmt.Errorf("set visibility for sheet %q: %w", sheet, err)
 		}
+		ew.trace.record("write sheet", traceExportLane, sheetStart, sheetTraceArgs(sheet, rowCount))
 	}
 
-	// A trailing-data error is queued after the final row; anything else on
-	// the channel at this point is that verdict.
-	if result, ok := <-decodedRows; ok && result.err != nil {
-		return result.err
+	if err := rows.finish(); err != nil {
+		return err
 	}
+	return ew.createPivotTables(pivotTableList)
+}
 
+// createPivotTables creates the pivot tables of every sheet once all sheets
+// are written.
+func (ew *ExcelWriter) createPivotTables(pivotTableList [][]interface{}) error {
+	defer ew.trace.span("create pivot tables", traceExportLane, nil)()
 	for _, pivots := range pivotTableList {
 		if err := ew.seedPivotSourceHeaders(pivots); err != nil {
 			return err
@@ -547,19 +775,41 @@ func (control *wireParallelControl) firstError() error {
 	return control.err
 }
 
+// preparedStreamSheet is one sheet of the parallel path; streamWriter is nil
+// for NormalWriter sheets.
 type preparedStreamSheet struct {
+	index        int
 	name         string
 	data         map[string]interface{}
 	streamWriter *excelize.StreamWriter
 	rowHeights   map[string]excelize.RowOpts
 }
 
-// buildWireSheetsParallel writes multi-sheet, all-StreamWriter workbooks with
-// one worker goroutine per sheet, each decoding its own sheet_offsets slice
-// of the row stream and serializing rows as it goes. Everything that touches
-// shared *excelize.File state stays on this goroutine: sheet creation and
-// preparation happen before the workers start, tables/Flush/visibility and
-// pivot tables after they finish.
+// setRow writes one decoded row to the sheet's stream writer, with its row
+// height when the sheet sets one.
+func (sheet *preparedStreamSheet) setRow(rowNumber int, row []interface{}) error {
+	var err error
+	cell := "A" + strconv.Itoa(rowNumber)
+	if rowHeight, ok := sheet.rowHeights[strconv.Itoa(rowNumber)]; ok {
+		err = sheet.streamWriter.SetRow(cell, row, rowHeight)
+	} else {
+		err = sheet.streamWriter.SetRow(cell, row)
+	}
+	if err != nil {
+		return fmt.Errorf("write stream sheet %q row %d: %w", sheet.name, rowNumber, err)
+	}
+	return nil
+}
+
+// buildWireSheetsParallel writes workbooks with several StreamWriter sheets
+// on a pool of at most options.workers() goroutines. Each worker takes one
+// job of scheduleStreamSheets at a time, largest sheet first: a whole sheet,
+// whose sheet_offsets slice of the row stream it decodes and serializes as it
+// goes, or one stage of a sheet that was split across two workers.
+// Everything that touches shared *excelize.File state stays on this
+// goroutine: sheet creation and preparation, and the rows and tables of
+// NormalWriter sheets, happen before the workers start; stream
+// tables/Flush, visibility and pivot tables after they finish.
 func (ew *ExcelWriter) buildWireSheetsParallel(
 	wire wireConfiguration,
 	noStyleBySheet []bool,
@@ -588,38 +838,97 @@ func (ew *ExcelWriter) buildWireSheetsParallel(
 			}
 			sheetCount++
 		}
+		prepared[sheetIndex] = preparedStreamSheet{index: sheetIndex, name: sheet, data: sheetData}
+		if sheetData["WriterEngine"] == "NormalWriter" {
+			if err := ew.prepareNormalWrite(sheet, sheetData); err != nil {
+				return err
+			}
+			continue
+		}
 		streamWriter, rowHeightMap, err := ew.prepareStreamWrite(sheet, sheetData)
 		if err != nil {
 			return err
 		}
-		prepared[sheetIndex] = preparedStreamSheet{
-			name:         sheet,
-			data:         sheetData,
-			streamWriter: streamWriter,
-			rowHeights:   rowHeightMap,
-		}
+		prepared[sheetIndex].streamWriter = streamWriter
+		prepared[sheetIndex].rowHeights = rowHeightMap
 	}
 
-	control := newWireParallelControl()
 	stream := ew.WireRowStream
-	var workers sync.WaitGroup
-	for sheetIndex := range prepared {
-		segmentStart := wire.SheetOffsets[sheetIndex]
+	segment := func(sheetIndex int) []byte {
 		segmentEnd := int64(len(stream))
 		if sheetIndex+1 < len(wire.SheetOffsets) {
 			segmentEnd = wire.SheetOffsets[sheetIndex+1]
 		}
-		workers.Add(1)
-		go func(sheet *preparedStreamSheet, segment []byte, rowCount int, noStyle bool) {
-			defer workers.Done()
-			ew.writeStreamSheetSegment(sheet, segment, rowCount, noStyle, control)
-		}(
-			&prepared[sheetIndex],
-			stream[segmentStart:segmentEnd],
+		return stream[wire.SheetOffsets[sheetIndex]:segmentEnd]
+	}
+	for sheetIndex := range prepared {
+		sheet := &prepared[sheetIndex]
+		if sheet.streamWriter != nil {
+			continue
+		}
+		sheetStart := time.Now()
+		err := ew.writeNormalSheetSegment(
+			sheet,
+			segment(sheetIndex),
 			wire.RowCounts[sheetIndex],
 			noStyleBySheet[sheetIndex],
 		)
+		if err != nil {
+			return err
+		}
+		ew.trace.record(
+			"write sheet", traceExportLane, sheetStart, sheetTraceArgs(sheet.name, wire.RowCounts[sheetIndex]),
+		)
+	}
+
+	var streamSheets []int
+	for sheetIndex := range prepared {
+		if prepared[sheetIndex].streamWriter != nil {
+			streamSheets = append(streamSheets, sheetIndex)
+		}
+	}
+	control := newWireParallelControl()
+	scheduled := scheduleStreamSheets(streamSheets, wire.RowCounts, ew.options.workers())
+	jobs := make(chan sheetJob)
+	var workers sync.WaitGroup
+	for worker := 0; worker < min(ew.options.workers(), len(scheduled)); worker++ {
+		workers.Add(1)
+		lane := traceWorkerLane(worker)
+		go func() {
+			defer workers.Done()
+			for job := range jobs {
+				sheet := &prepared[job.sheetIndex]
+				rowCount := wire.RowCounts[job.sheetIndex]
+				noStyle := noStyleBySheet[job.sheetIndex]
+				jobStart := time.Now()
+				span := "write sheet"
+				switch job.stage {
+				case decodeStage:
+					span = "decode sheet"
+					ew.decodeStreamSheetSegment(
+						sheet, segment(job.sheetIndex), rowCount, noStyle, control, job.rows,
+					)
+				case writeStage:
+					span = "write decoded sheet"
+					ew.writeDecodedStreamSheet(sheet, rowCount, control, job.rows)
+				default:
+					ew.writeStreamSheetSegment(
+						sheet, segment(job.sheetIndex), rowCount, noStyle, control,
+					)
+				}
+				ew.trace.record(span, lane, jobStart, sheetTraceArgs(sheet.name, rowCount))
+			}
+		}()
+	}
+schedule:
+	for _, job := range scheduled {
+		select {
+		case jobs <- job:
+		case <-control.cancel:
+			break schedule
+		}
 	}
+	close(jobs)
 	workers.Wait()
 	if err := control.firstError(); err != nil {
 		return err
@@ -628,31 +937,28 @@ func (ew *ExcelWriter) buildWireSheetsParallel(
 	var pivotTableList [][]interface{}
 	for index := range prepared {
 		sheet := &prepared[index]
-		if err := streamCreateTable(sheet.streamWriter, sheet.data["Table"].([]interface{})); err != nil {
-			return fmt.Errorf("create tables on stream sheet %q: %w", sheet.name, err)
-		}
-		if err := sheet.streamWriter.Flush(); err != nil {
-			return fmt.Errorf("flush stream sheet %q: %w", sheet.name, err)
+		if sheet.streamWriter != nil {
+			if err := streamCreateTable(sheet.streamWriter, sheet.data["Table"].([]interface{})); err != nil {
+				return fmt.Errorf("create tables on stream sheet %q: %w", sheet.name, err)
+			}
+			flushStart := time.Now()
+			if err := sheet.streamWriter.Flush(); err != nil {
+				return fmt.Errorf("flush stream sheet %q: %w", sheet.name, err)
+			}
+			ew.trace.record(
+				"flush sheet", traceExportLane, flushStart, sheetTraceArgs(sheet.name, wire.RowCounts[index]),
+			)
 		}
 		pivotTableList = append(pivotTableList, sheet.data["PivotTable"].([]interface{}))
 		if err := ew.File.SetSheetVisible(sheet.name, sheet.data["SheetVisible"].(bool)); err != nil {
 			return fmt.Errorf("set visibility for sheet %q: %w", sheet.name, err)
 		}
 	}
-
-	for _, pivots := range pivotTableList {
-		if err := ew.seedPivotSourceHeaders(pivots); err != nil {
-			return err
-		}
-		if err := ew.createPivotTable(pivots); err != nil {
-			return err
-		}
-	}
-	return nil
+	return ew.createPivotTables(pivotTableList)
 }
 
 // writeStreamSheetSegment decodes one sheet's slice of the row stream and
-// serializes its rows. Workers share no mutable state: the decoder and row
+// serializes its rows. Workers share no mutable state: the scanner and row
 // buffer are worker-local, SetRow only touches per-sheet excelize state, and
 // capturePivotSourceHeader only mutates this sheet's own header map.
 func (ew *ExcelWriter) writeStreamSheetSegment(
@@ -662,48 +968,121 @@ func (ew *ExcelWriter) writeStreamSheetSegment(
 	noStyle bool,
 	control *wireParallelControl,
 ) {
-	decoder := msgpack.NewDecoder(bytes.NewReader(segment))
-	var rowBuffer []interface{}
+	err := ew.forEachSegmentRow(
+		sheet.name,
+		segment,
+		rowCount,
+		noStyle,
+		control.cancel,
+		func(rowNumber int, row []interface{}) error {
+			if err := sheet.setRow(rowNumber, row); err != nil {
+				return err
+			}
+			return ew.progress.row(sheet.index, rowNumber)
+		},
+	)
+	if err == nil {
+		err = ew.progress.sheetDone(sheet.index, rowCount)
+	}
+	if err == nil {
+		err = writeTrailingStreamRows(sheet.streamWriter, sheet.rowHeights, rowCount)
+		if err != nil {
+			err = fmt.Errorf("stream sheet %q: %w", sheet.name, err)
+		}
+	}
+	if err != nil {
+		control.fail(err)
+	}
+}
+
+// writeNormalSheetSegment writes a NormalWriter sheet of the parallel path
+// from its slice of the row stream. It must run on the coordinating
+// goroutine while no stream worker is running.
+func (ew *ExcelWriter) writeNormalSheetSegment(
+	sheet *preparedStreamSheet,
+	segment []byte,
+	rowCount int,
+	noStyle bool,
+) error {
+	normalWriter := newNormalSheetWriter(ew.File, sheet.name)
+	err := ew.forEachSegmentRow(
+		sheet.name,
+		segment,
+		rowCount,
+		noStyle,
+		nil,
+		func(rowNumber int, row []interface{}) error {
+			if err := normalWriter.writeRow(rowNumber, row); err != nil {
+				return err
+			}
+			return ew.progress.row(sheet.index, rowNumber)
+		},
+	)
+	if err != nil {
+		return err
+	}
+	if err := ew.progress.sheetDone(sheet.index, rowCount); err != nil {
+		return err
+	}
+	if err := normalWriter.flush(); err != nil {
+		return err
+	}
+	return ew.createTable(sheet.name, sheet.data["Table"].([]interface{}))
+}
+
+// forEachSegmentRow decodes rowCount rows from one sheet's slice of the row
+// stream, records pivot source headers and passes each row to write, then
+// checks that the slice ends after the last row. The row slice passed to
+// write is reused for the next row. It stops early without an error once
+// cancel is closed.
+func (ew *ExcelWriter) forEachSegmentRow(
+	sheetName string,
+	segment []byte,
+	rowCount int,
+	noStyle bool,
+	cancel <-chan struct{},
+	write func(rowNumber int, row []interface{}) error,
+) error {
+	scanner := newWireScanner(segment)
+	rowBuffer := getRowBuffer()
+	defer putRowBuffer(rowBuffer)
 	for rowIndex := 0; rowIndex < rowCount; rowIndex++ {
 		select {
-		case <-control.cancel:
-			return
+		case <-cancel:
+			return nil
 		default:
 		}
-		row, err := ew.decodeWireRow(decoder, noStyle, rowBuffer)
+		row, err := ew.decodeWireRow(scanner, noStyle, rowBuffer)
 		if err != nil {
-			control.fail(fmt.Errorf("decode sheet %q row %d: %w", sheet.name, rowIndex+1, err))
-			return
-		}
-		rowBuffer = row
-		ew.capturePivotSourceHeader(sheet.name, rowIndex+1, row)
-		cell := "A" + strconv.Itoa(rowIndex+1)
-		if rowHeight, ok := sheet.rowHeights[strconv.Itoa(rowIndex+1)]; ok {
-			err = sheet.streamWriter.SetRow(cell, row, rowHeight)
-		} else {
-			err = sheet.streamWriter.SetRow(cell, row)
+			return fmt.Errorf("decode sheet %q row %d: %w", sheetName, rowIndex+1, err)
 		}
-		if err != nil {
-			control.fail(fmt.Errorf("write stream sheet %q row %d: %w", sheet.name, rowIndex+1, err))
-			return
+		ew.capturePivotSourceHeader(sheetName, rowIndex+1, row)
+		if err := write(rowIndex+1, row); err != nil {
+			return err
 		}
 	}
-	if _, err := decoder.PeekCode(); err == nil {
-		control.fail(fmt.Errorf(
-			"PFX2 sheet %q segment contains trailing MessagePack data",
-			sheet.name,
-		))
-	} else if !errors.Is(err, io.EOF) {
-		control.fail(fmt.Errorf("check PFX2 sheet %q segment end: %w", sheet.name, err))
+	if _, err := scanner.peekCode(); err == nil {
+		return fmt.Errorf("PFX2 sheet %q segment contains trailing MessagePack data", sheetName)
 	}
+	return nil
 }
 
+// wireRowBuffer is the storage decodeWireRow reuses from one row to the
+// next: the row handed to excelize and the styled cells its items point to.
+type wireRowBuffer struct {
+	row   []interface{}
+	cells []excelize.Cell
+}
+
+// decodeWireRow decodes one row into buffer. The row and its styled cells,
+// which point into the buffer's cell slice, are only valid until the buffer
+// is reused.
 func (ew *ExcelWriter) decodeWireRow(
-	decoder *msgpack.Decoder,
+	scanner *wireScanner,
 	noStyle bool,
-	reuse []interface{},
+	buffer *wireRowBuffer,
 ) ([]interface{}, error) {
-	columnCount, err := decoder.DecodeArrayLen()
+	columnCount, err := scanner.readArrayLen()
 	if err != nil {
 		return nil, err
 	}
@@ -711,121 +1090,92 @@ func (ew *ExcelWriter) decodeWireRow(
 		return nil, fmt.Errorf("column count %d is outside Excel limits", columnCount)
 	}
 
-	var row []interface{}
-	if columnCount <= cap(reuse) {
-		clear(reuse)
-		row = reuse[:columnCount]
+	if columnCount <= cap(buffer.row) {
+		buffer.row = buffer.row[:columnCount]
 	} else {
-		row = make([]interface{}, columnCount)
+		buffer.row = make([]interface{}, columnCount)
 	}
-	for column := 0; column < columnCount; column++ {
-		if noStyle {
-			value, err := decodeWireScalar(decoder)
-			if err != nil {
+	row := buffer.row
+	var scalar wireScalar
+	if noStyle {
+		for column := range row {
+			if err := scanner.readScalar(&scalar); err != nil {
 				return nil, fmt.Errorf("column %d: %w", column+1, err)
 			}
-			row[column] = value
-			continue
+			row[column] = scalar.value()
 		}
-		cell, err := ew.decodeWireCell(decoder)
+		return row, nil
+	}
+
+	if columnCount <= cap(buffer.cells) {
+		buffer.cells = buffer.cells[:columnCount]
+	} else {
+		buffer.cells = make([]excelize.Cell, columnCount)
+	}
+	for column := range row {
+		cell := &buffer.cells[column]
+		present, err := ew.decodeWireCell(scanner, &scalar, cell)
 		if err != nil {
 			return nil, fmt.Errorf("column %d: %w", column+1, err)
 		}
-		row[column] = cell
+		if present {
+			row[column] = cell
+		} else {
+			row[column] = nil
+		}
 	}
 	return row, nil
 }
 
-func (ew *ExcelWriter) decodeWireCell(decoder *msgpack.Decoder) (interface{}, error) {
-	code, err := decoder.PeekCode()
+// decodeWireCell decodes a styled cell into cell and reports whether the
+// column holds a cell at all; nil columns are left empty.
+func (ew *ExcelWriter) decodeWireCell(
+	scanner *wireScanner,
+	scalar *wireScalar,
+	cell *excelize.Cell,
+) (bool, error) {
+	code, err := scanner.peekCode()
 	if err != nil {
-		return nil, err
+		return false, io.ErrUnexpectedEOF
 	}
 	if code == msgpcode.Nil {
-		if err := decoder.DecodeNil(); err != nil {
-			return nil, err
-		}
-		return nil, nil
+		scanner.offset++
+		return false, nil
 	}
 
-	cellLength, err := decoder.DecodeArrayLen()
+	cellLength, err := scanner.readArrayLen()
 	if err != nil {
-		return nil, fmt.Errorf("styled cell must be an array: %w", err)
+		return false, fmt.Errorf("styled cell must be an array: %w", err)
 	}
 	if cellLength == 0 {
-		styleID := ew.StyleIDs["DEFAULT_STYLE"]
-		return excelize.Cell{StyleID: styleID, Value: ""}, nil
+		*cell = excelize.Cell{StyleID: ew.StyleIDs["DEFAULT_STYLE"], Value: ""}
+		return true, nil
 	}
 	if cellLength != 2 {
-		return nil, fmt.Errorf("styled cell must have 0 or 2 elements, got %d", cellLength)
+		return false, fmt.Errorf("styled cell must have 0 or 2 elements, got %d", cellLength)
 	}
 
-	value, err := decodeWireScalar(decoder)
-	if err != nil {
-		return nil, fmt.Errorf("decode cell value: %w", err)
+	if err := scanner.readScalar(scalar); err != nil {
+		return false, fmt.Errorf("decode cell value: %w", err)
 	}
-	wireStyleID, err := decodeWireStyleID(decoder)
+	wireStyleID, err := scanner.readStyleID()
 	if err != nil {
-		return nil, err
+		return false, err
 	}
 	if wireStyleID >= uint64(len(ew.WireStyleIDs)) {
-		return nil, fmt.Errorf(
+		return false, fmt.Errorf(
 			"style ID %d is out of range for %d styles",
 			wireStyleID,
 			len(ew.WireStyleIDs),
 		)
 	}
 	styleID := ew.WireStyleIDs[wireStyleID]
-	if stringValue, ok := value.(string); ok && strings.HasPrefix(stringValue, "=") {
-		return excelize.Cell{StyleID: styleID, Formula: normalizeFormula(stringValue)}, nil
-	}
-	return excelize.Cell{StyleID: styleID, Value: value}, nil
-}
-
-func decodeWireStyleID(decoder *msgpack.Decoder) (uint64, error) {
-	code, err := decoder.PeekCode()
-	if err != nil {
-		return 0, err
-	}
-	if !isIntegerCode(code) {
-		return 0, fmt.Errorf("style ID must be an unsigned integer")
-	}
-	value, err := decoder.DecodeInterfaceLoose()
-	if err != nil {
-		return 0, err
-	}
-	switch value := value.(type) {
-	case int64:
-		if value < 0 {
-			return 0, fmt.Errorf("style ID must not be negative")
-		}
-		return uint64(value), nil
-	case uint64:
-		return value, nil
-	default:
-		return 0, fmt.Errorf("style ID must be an unsigned integer, got %T", value)
-	}
-}
-
-func decodeWireScalar(decoder *msgpack.Decoder) (interface{}, error) {
-	code, err := decoder.PeekCode()
-	if err != nil {
-		return nil, err
-	}
-	switch {
-	case code == msgpcode.Nil:
-		return nil, decoder.DecodeNil()
-	case code == msgpcode.False || code == msgpcode.True:
-		return decoder.DecodeBool()
-	case isIntegerCode(code):
-		return decoder.DecodeInterfaceLoose()
-	case code == msgpcode.Float || code == msgpcode.Double:
-		return decoder.DecodeFloat64()
-	case msgpcode.IsString(code):
-		return decoder.DecodeString()
-	default:
-		return nil, fmt.Errorf("unsupported MessagePack scalar code 0x%02x", code)
+	if scalar.kind == wireString && strings.HasPrefix(scalar.text, "=") {
+		*cell = excelize.Cell{StyleID: styleID, Formula: normalizeFormula(scalar.text)}
+		return true, nil
 	}
+	*cell = excelize.Cell{StyleID: styleID, Value: scalar.value()}
+	return true, nil
 }
 
 func isIntegerCode(code byte) bool {
@@ -841,36 +1191,6 @@ func isIntegerCode(code byte) bool {
 	}
 }
 
-func (ew *ExcelWriter) writeDecodedNormalRow(sheet string, rowNumber int, row []interface{}) error {
-	for column, item := range row {
-		if item == nil {
-			continue
-		}
-		cellName, err := excelize.CoordinatesToCellName(column+1, rowNumber)
-		if err != nil {
-			return fmt.Errorf("resolve sheet %q row %d column %d: %w", sheet, rowNumber, column+1, err)
-		}
-		if cell, ok := item.(excelize.Cell); ok {
-			if cell.Formula != "" {
-				err = ew.File.SetCellFormula(sheet, cellName, cell.Formula)
-			} else {
-				err = ew.File.SetCellValue(sheet, cellName, cell.Value)
-			}
-			if err != nil {
-				return fmt.Errorf("write normal sheet %q cell %s: %w", sheet, cellName, err)
-			}
-			if err := ew.File.SetCellStyle(sheet, cellName, cellName, cell.StyleID); err != nil {
-				return fmt.Errorf("style normal sheet %q cell %s: %w", sheet, cellName, err)
-			}
-			continue
-		}
-		if err := ew.File.SetCellValue(sheet, cellName, item); err != nil {
-			return fmt.Errorf("write normal sheet %q cell %s: %w", sheet, cellName, err)
-		}
-	}
-	return nil
-}
-
 func (ew *ExcelWriter) markPivotSourceHeaders() {
 	ew.PivotSourceHeaders = make(map[string]map[int][]interface{})
 	for _, content := range ew.Content {
@@ -104,11 +104,64 @@ func TestWriteExcelV2ParallelSheetsRoundTrip(t *testing.T) {
 	const rowsPerSheet = 40
 	payload := newMultiSheetPFX2Payload(t, multiSheetTestRows(sheets, rowsPerSheet), nil)
 
+	workbookBytes, report, err := WriteExcelWithReport(payload)
+	if err != nil {
+		t.Fatalf("WriteExcelWithReport returned an error: %v", err)
+	}
+	assertMultiSheetContent(t, workbookBytes, sheets, rowsPerSheet)
+	if report.Build != "parallel" {
+		t.Fatalf("report build = %q, want parallel", report.Build)
+	}
+}
+
+func TestWriteExcelV2ParallelSheetsWithNormalWriterSheet(t *testing.T) {
+	const sheets = 4
+	const rowsPerSheet = 30
+	payload := newMultiSheetPFX2Payload(t, multiSheetTestRows(sheets, rowsPerSheet), nil)
+	payload = mutatePFX2TestMetadata(t, payload, func(metadata map[string]interface{}) {
+		content := metadata["content"].(map[string]interface{})
+		content["Sheet2"].(map[string]interface{})["WriterEngine"] = "NormalWriter"
+	})
+
 	workbookBytes, err := WriteExcelV2(payload)
 	if err != nil {
 		t.Fatalf("WriteExcelV2 returned an error: %v", err)
 	}
 	assertMultiSheetContent(t, workbookBytes, sheets, rowsPerSheet)
+
+	workbook, err := excelize.OpenReader(bytes.NewReader(workbookBytes))
+	if err != nil {
+		t.Fatalf("open generated workbook: %v", err)
+	}
+	defer workbook.Close()
+	if sheetList := workbook.GetSheetList(); strings.Join(sheetList, ",") != "Sheet1,Sheet2,Sheet3,Sheet4" {
+		t.Fatalf("sheet order changed: %v", sheetList)
+	}
+	plain, err := workbook.GetCellStyle("Sheet2", "A2")
+	if err != nil {
+		t.Fatalf("read Sheet2!A2 style: %v", err)
+	}
+	accent, err := workbook.GetCellStyle("Sheet2", "A1")
+	if err != nil {
+		t.Fatalf("read Sheet2!A1 style: %v", err)
+	}
+	if plain == accent {
+		t.Fatalf("NormalWriter sheet lost its per-cell styles (both %d)", plain)
+	}
+}
+
+func TestWriteExcelV2ParallelNormalWriterSheetRejectsMisalignedOffsets(t *testing.T) {
+	payload := newMultiSheetPFX2Payload(t, multiSheetTestRows(3, 4), func(wire map[string]interface{}) {
+		offsets := wire["sheet_offsets"].([]int64)
+		wire["sheet_offsets"] = []int64{0, offsets[1] - 1, offsets[2]}
+	})
+	payload = mutatePFX2TestMetadata(t, payload, func(metadata map[string]interface{}) {
+		content := metadata["content"].(map[string]interface{})
+		content["Sheet1"].(map[string]interface{})["WriterEngine"] = "NormalWriter"
+	})
+	if _, err := WriteExcelV2(payload); err == nil {
+		t.Fatal("expected an error for a misaligned NormalWriter segment")
+	}
 }
 
 func assertMultiSheetContent(t *testing.T, workbookBytes []byte, sheets, rowsPerSheet int) {
@@ -190,3 +243,54 @@ func TestWriteExcelV2WithoutSheetOffsetsStillDecodes(t *testing.T) {
 	}
 	assertMultiSheetContent(t, workbookBytes, sheets, rowsPerSheet)
 }
+
+func TestWriteExcelV2HonorsMaxWorkers(t *testing.T) {
+	const sheets = 5
+	const rowsPerSheet = 12
+	for _, maxWorkers := range []float64{1, 2, 16} {
+		for _, withOffsets := range []bool{true, false} {
+			payload := newMultiSheetPFX2Payload(t, multiSheetTestRows(sheets, rowsPerSheet), func(wire map[string]interface{}) {
+				if !withOffsets {
+					delete(wire, "sheet_offsets")
+				}
+			})
+			payload = mutatePFX2TestMetadata(t, payload, func(metadata map[string]interface{}) {
+				metadata[exportOptionsKey] = map[string]interface{}{"max_workers": maxWorkers}
+			})
+			workbookBytes, err := WriteExcelV2(payload)
+			if err != nil {
+				t.Fatalf("max_workers=%v offsets=%v: %v", maxWorkers, withOffsets, err)
+			}
+			assertMultiSheetContent(t, workbookBytes, sheets, rowsPerSheet)
+		}
+	}
+}
+
+func TestWriteExcelV2SplitsOversizedSheetsAcrossWorkers(t *testing.T) {
+	previous := splitSheetMinRows
+	splitSheetMinRows = 1
+	defer func() { splitSheetMinRows = previous }()
+
+	const sheets = 3
+	const rowsPerSheet = 40
+	payload := newMultiSheetPFX2Payload(t, multiSheetTestRows(sheets, rowsPerSheet), nil)
+	payload = mutatePFX2TestMetadata(t, payload, func(metadata map[string]interface{}) {
+		metadata[exportOptionsKey] = map[string]interface{}{"max_workers": float64(sheets + 1)}
+	})
+	workbookBytes, err := WriteExcelV2(payload)
+	if err != nil {
+		t.Fatalf("WriteExcelV2 returned an error: %v", err)
+	}
+	assertMultiSheetContent(t, workbookBytes, sheets, rowsPerSheet)
+
+	misaligned := newMultiSheetPFX2Payload(t, multiSheetTestRows(sheets, rowsPerSheet), func(wire map[string]interface{}) {
+		offsets := wire["sheet_offsets"].([]int64)
+		wire["sheet_offsets"] = []int64{0, offsets[1] - 1, offsets[2]}
+	})
+	misaligned = mutatePFX2TestMetadata(t, misaligned, func(metadata map[string]interface{}) {
+		metadata[exportOptionsKey] = map[string]interface{}{"max_workers": float64(sheets + 1)}
+	})
+	if _, err := WriteExcelV2(misaligned); err == nil {
+		t.Fatal("expected an error for misaligned sheet_offsets on split sheets")
+	}
+}
@@ -0,0 +1,298 @@
+package core
+
+import (
+	"encoding/binary"
+	"fmt"
+	"io"
+	"math"
+	"unsafe"
+
+	"github.com/vmihailenco/msgpack/v5/msgpcode"
+)
+
+// wireScalarKind identifies which field of a wireScalar holds the value.
+type wireScalarKind uint8
+
+const (
+	wireNil wireScalarKind = iota
+	wireBool
+	wireInt
+	wireUint
+	wireFloat
+	wireString
+)
+
+// wireScalar is one decoded PFX2 cell value. Integers keep the split that
+// msgpack's DecodeInterfaceLoose makes: signed and fixnum codes decode to
+// int64, unsigned codes to uint64.
+type wireScalar struct {
+	kind     wireScalarKind
+	boolean  bool
+	integer  int64
+	unsigned uint64
+	float    float64
+	text     string
+}
+
+// value boxes the scalar for excelize, which takes cell values as interface{}.
+func (scalar *wireScalar) value() interface{} {
+	switch scalar.kind {
+	case wireBool:
+		return scalar.boolean
+	case wireInt:
+		return scalar.integer
+	case wireUint:
+		return scalar.unsigned
+	case wireFloat:
+		return scalar.float
+	case wireString:
+		return scalar.text
+	default:
+		return nil
+	}
+}
+
+// wireScanner reads the MessagePack subset of the PFX2 row stream (arrays,
+// nil, booleans, integers, floats and strings) directly from a byte slice,
+// without a reader or interface{} boxing. Decoded strings share memory with
+// the slice, so the payload must not be modified until the export returns;
+// the C entry points hand the writer a private copy.
+type wireScanner struct {
+	data   []byte
+	offset int
+}
+
+func newWireScanner(data []byte) *wireScanner {
+	return &wireScanner{data: data}
+}
+
+// peekCode returns the next code without consuming it, or io.EOF at the end
+// of the data.
+func (scanner *wireScanner) peekCode() (byte, error) {
+	if scanner.offset >= len(scanner.data) {
+		return 0, io.EOF
+	}
+	return scanner.data[scanner.offset], nil
+}
+
+func (scanner *wireScanner) take(size int) ([]byte, error) {
+	if size < 0 || size > len(scanner.data)-scanner.offset {
+		return nil, io.ErrUnexpectedEOF
+	}
+	start := scanner.offset
+	scanner.offset += size
+	return scanner.data[start:scanner.offset], nil
+}
+
+func (scanner *wireScanner) readCode() (byte, error) {
+	if scanner.offset >= len(scanner.data) {
+		return 0, io.ErrUnexpectedEOF
+	}
+	code := scanner.data[scanner.offset]
+	scanner.offset++
+	return code, nil
+}
+
+// readArrayLen decodes an array header; nil decodes to -1.
+func (scanner *wireScanner) readArrayLen() (int, error) {
+	code, err := scanner.readCode()
+	if err != nil {
+		return 0, err
+	}
+	switch {
+	case code == msgpcode.Nil:
+		return -1, nil
+	case msgpcode.IsFixedArray(code):
+		return int(code & msgpcode.FixedArrayMask), nil
+	case code == msgpcode.Array16:
+		size, err := scanner.take(2)
+		if err != nil {
+			return 0, err
+		}
+		return int(binary.BigEndian.Uint16(size)), nil
+	case code == msgpcode.Array32:
+		size, err := scanner.take(4)
+		if err != nil {
+			return 0, err
+		}
+		length := binary.BigEndian.Uint32(size)
+		if uint64(length) > math.MaxInt32 {
+			return 0, fmt.Errorf("array length %d is too large", length)
+		}
+		return int(length), nil
+	default:
+		return 0, fmt.Errorf("expected a MessagePack array, got code 0x%02x", code)
+	}
+}
+
+// readScalar decodes the next value into scalar.
+func (scanner *wireScanner) readScalar(scalar *wireScalar) error {
+	code, err := scanner.readCode()
+	if err != nil {
+		return err
+	}
+	switch {
+	case code == msgpcode.Nil:
+		scalar.kind = wireNil
+	case code == msgpcode.False || code == msgpcode.True:
+		scalar.kind = wireBool
+		scalar.boolean = code == msgpcode.True
+	case msgpcode.IsFixedNum(code):
+		scalar.kind = wireInt
+		scalar.integer = int64(int8(code))
+	case code == msgpcode.Uint8 || code == msgpcode.Uint16 ||
+		code == msgpcode.Uint32 || code == msgpcode.Uint64:
+		value, err := scanner.readUnsigned(code)
+		if err != nil {
+			return err
+		}
+		scalar.kind = wireUint
+		scalar.unsigned = value
+	case code == msgpcode.Int8 || code == msgpcode.Int16 ||
+		code == msgpcode.Int32 || code == msgpcode.Int64:
+		value, err := scanner.readSigned(code)
+		if err != nil {
+			return err
+		}
+		scalar.kind = wireInt
+		scalar.integer = value
+	case code == msgpcode.Float:
+		bits, err := scanner.take(4)
+		if err != nil {
+			return err
+		}
+		scalar.kind = wireFloat
+		scalar.float = float64(math.Float32frombits(binary.BigEndian.Uint32(bits)))
+	case code == msgpcode.Double:
+		bits, err := scanner.take(8)
+		if err != nil {
+			return err
+		}
+		scalar.kind = wireFloat
+		scalar.float = math.Float64frombits(binary.BigEndian.Uint64(bits))
+	case msgpcode.IsString(code):
+		text, err := scanner.readString(code)
+		if err != nil {
+			return err
+		}
+		scalar.kind = wireString
+		scalar.text = text
+	default:
+		return fmt.Errorf("unsupported MessagePack scalar code 0x%02x", code)
+	}
+	return nil
+}
+
+// readStyleID decodes a style index, which must be a non-negative integer.
+func (scanner *wireScanner) readStyleID() (uint64, error) {
+	code, err := scanner.peekCode()
+	if err != nil {
+		if err == io.EOF {
+			return 0, io.ErrUnexpectedEOF
+		}
+		return 0, err
+	}
+	if !isIntegerCode(code) {
+		return 0, fmt.Errorf("style ID must be an unsigned integer")
+	}
+	var scalar wireScalar
+	if err := scanner.readScalar(&scalar); err != nil {
+		return 0, err
+	}
+	if scalar.kind == wireUint {
+		return scalar.unsigned, nil
+	}
+	if scalar.integer < 0 {
+		return 0, fmt.Errorf("style ID must not be negative")
+	}
+	return uint64(scalar.integer), nil
+}
+
+func (scanner *wireScanner) readUnsigned(code byte) (uint64, error) {
+	switch code {
+	case msgpcode.Uint8:
+		value, err := scanner.take(1)
+		if err != nil {
+			return 0, err
+		}
+		return uint64(value[0]), nil
+	case msgpcode.Uint16:
+		value, err := scanner.take(2)
+		if err != nil {
+			return 0, err
+		}
+		return uint64(binary.BigEndian.Uint16(value)), nil
+	case msgpcode.Uint32:
+		value, err := scanner.take(4)
+		if err != nil {
+			return 0, err
+		}
+		return uint64(binary.BigEndian.Uint32(value)), nil
+	default:
+		value, err := scanner.take(8)
+		if err != nil {
+			return 0, err
+		}
+		return binary.BigEndian.Uint64(value), nil
+	}
+}
+
+func (scanner *wireScanner) readSigned(code byte) (int64, error) {
+	switch code {
+	case msgpcode.Int8:
+		value, err := scanner.take(1)
+		if err != nil {
+			return 0, err
+		}
+		return int64(int8(value[0])), nil
+	case msgpcode.Int16:
+		value, err := scanner.take(2)
+		if err != nil {
+			return 0, err
+		}
+		return int64(int16(binary.BigEndian.Uint16(value))), nil
+	case msgpcode.Int32:
+		value, err := scanner.take(4)
+		if err != nil {
+			return 0, err
+		}
+		return int64(int32(binary.BigEndian.Uint32(value))), nil
+	default:
+		value, err := scanner.take(8)
+		if err != nil {
+			return 0, err
+		}
+		return int64(binary.BigEndian.Uint64(value)), nil
+	}
+}
+
+func (scanner *wireScanner) readString(code byte) (string, error) {
+	var length int
+	switch {
+	case msgpcode.IsFixedString(code):
+		length = int(code & msgpcode.FixedStrMask)
+	case code == msgpcode.Str8:
+		size, err := scanner.take(1)
+		if err != nil {
+			return "", err
+		}
+		length = int(size[0])
+	case code == msgpcode.Str16:
+		size, err := scanner.take(2)
+		if err != nil {
+			return "", err
+		}
+		length = int(binary.BigEndian.Uint16(size))
+	default:
+		size, err := scanner.take(4)
+		if err != nil {
+			return "", err
+		}
+		length = int(binary.BigEndian.Uint32(size))
+	}
+	text, err := scanner.take(length)
+	if err != nil || length == 0 {
+		return "", err
+	}
+	return unsafe.String(&text[0], length), nil
+}
@@ -0,0 +1,207 @@
+package core
+
+import (
+	"errors"
+	"io"
+	"math"
+	"strings"
+	"testing"
+
+	"github.com/xuri/excelize/v2"
+)
+
+func TestWireScannerDecodesScalarSubset(t *testing.T) {
+	data := []byte{
+		0xc0,       // nil
+		0xc3,       // true
+		0xc2,       // false
+		0x05,       // positive fixnum
+		0xf9,       // negative fixnum -7
+		0xcc, 0xc8, // uint8 200
+		0xcd, 0x01, 0x00, // uint16 256
+		0xcf, 0x00, 0x20, 0x00, 0x00, 0x00, 0x00, 0x00, 0x01, // uint64 2^53+1
+		0xd0, 0x80, // int8 -128
+		0xd2, 0xff, 0xff, 0xff, 0xfe, // int32 -2
+		0xca, 0x3f, 0xc0, 0x00, 0x00, // float32 1.5
+		0xcb, 0x40, 0x09, 0x21, 0xfb, 0x54, 0x44, 0x2d, 0x18, // float64 pi
+		0xa2, 'h', 'i', // fixstr
+		0xd9, 0x03, '=', 'A', '1', // str8
+		0xa0, // empty string
+	}
+	expected := []interface{}{
+		nil, true, false, int64(5), int64(-7), uint64(200), uint64(256),
+		uint64(1<<53 + 1), int64(-128), int64(-2), 1.5, math.Pi, "hi", "=A1", "",
+	}
+
+	scanner := newWireScanner(data)
+	var scalar wireScalar
+	for index, want := range expected {
+		if err := scanner.readScalar(&scalar); err != nil {
+			t.Fatalf("scalar %d: %v", index, err)
+		}
+		if got := scalar.value(); got != want {
+			t.Fatalf("scalar %d = %#v, want %#v", index, got, want)
+		}
+	}
+	if _, err := scanner.peekCode(); !errors.Is(err, io.EOF) {
+		t.Fatalf("expected the scanner to be at the end, got %v", err)
+	}
+}
+
+func TestWireScannerRejectsMalformedData(t *testing.T) {
+	var scalar wireScalar
+	for name, data := range map[string][]byte{
+		"truncated uint32": {0xce, 0x00, 0x01},
+		"truncated string": {0xa5, 'a', 'b'},
+		"truncated str16":  {0xda, 0x00},
+		"empty":            {},
+	} {
+		err := newWireScanner(data).readScalar(&scalar)
+		if !errors.Is(err, io.ErrUnexpectedEOF) {
+			t.Errorf("%s: expected io.ErrUnexpectedEOF, got %v", name, err)
+		}
+	}
+	for name, data := range map[string][]byte{
+		"array":  {0x91, 0x01},
+		"map":    {0x80},
+		"binary": {0xc4, 0x00},
+	} {
+		err := newWireScanner(data).readScalar(&scalar)
+		if err == nil || !strings.Contains(err.Error(), "unsupported MessagePack scalar") {
+			t.Errorf("%s: expected an unsupported scalar error, got %v", name, err)
+		}
+	}
+
+	if length, err := newWireScanner([]byte{0xdc, 0x01, 0x00}).readArrayLen(); err != nil || length != 256 {
+		t.Fatalf("array16 length = %d, %v", length, err)
+	}
+	if length, err := newWireScanner([]byte{0xc0}).readArrayLen(); err != nil || length != -1 {
+		t.Fatalf("nil array length = %d, %v", length, err)
+	}
+	if _, err := newWireScanner([]byte{0xa1, 'x'}).readArrayLen(); err == nil {
+		t.Fatal("expected a string to be rejected as an array header")
+	}
+	if _, err := newWireScanner([]byte{0xa1, 'x'}).readStyleID(); err == nil ||
+		!strings.Contains(err.Error(), "unsigned integer") {
+		t.Fatalf("expected a string style ID to be rejected, got %v", err)
+	}
+	if _, err := newWireScanner([]byte{0xff}).readStyleID(); err == nil ||
+		!strings.Contains(err.Error(), "negative") {
+		t.Fatalf("expected a negative style ID to be rejected, got %v", err)
+	}
+}
+
+func TestDecodeWireRowReusesBuffer(t *testing.T) {
+	writer := &ExcelWriter{
+		StyleIDs:     map[string]int{"DEFAULT_STYLE": 1},
+		WireStyleIDs: []int{1, 7},
+	}
+	row := []byte{
+		0x94,                  // four columns
+		0x92, 0xa1, 'a', 0x01, // ["a", 1]
+		0xc0,                            // empty column
+		0x90,                            // default-styled empty cell
+		0x92, 0xa3, '=', 'B', '1', 0x00, // formula
+	}
+	scanner := newWireScanner(append(append([]byte{}, row...), row...))
+	var buffer wireRowBuffer
+
+	first, err := writer.decodeWireRow(scanner, false, &buffer)
+	if err != nil {
+		t.Fatalf("decode first row: %v", err)
+	}
+	cell, ok := first[0].(*excelize.Cell)
+	if !ok || cell.StyleID != 7 || cell.Value != "a" {
+		t.Fatalf("column 1 = %#v", first[0])
+	}
+	if first[1] != nil {
+		t.Fatalf("column 2 = %#v, want nil", first[1])
+	}
+	if cell := first[2].(*excelize.Cell); cell.StyleID != 1 || cell.Value != "" {
+		t.Fatalf("column 3 = %#v", cell)
+	}
+	if cell := first[3].(*excelize.Cell); cell.StyleID != 1 || cell.Formula != "B1" || cell.Value != nil {
+		t.Fatalf("column 4 = %#v", cell)
+	}
+
+	second, err := writer.decodeWireRow(scanner, false, &buffer)
+	if err != nil {
+		t.Fatalf("decode second row: %v", err)
+	}
+	if &second[0] != &first[0] || second[0].(*excelize.Cell) != &buffer.cells[0] {
+		t.Fatal("expected the second row to reuse the row and cell buffers")
+	}
+	if _, err := scanner.peekCode(); !errors.Is(err, io.EOF) {
+		t.Fatalf("expected the scanner to be at the end, got %v", err)
+	}
+}
+
+// benchmarkWireRow is a styled ten-column row mixing the PFX2 scalar kinds.
+func benchmarkWireRow() []byte {
+	return []byte{
+		0x9a,
+		0x92, 0xa5, 'a', 'l', 'p', 'h', 'a', 0x01,
+		0x92, 0x2a, 0x00,
+		0x92, 0xcd, 0x30, 0x39, 0x01,
+		0x92, 0xd0, 0x9c, 0x00,
+		0x92, 0xcb, 0x3f, 0xf8, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x01,
+		0x92, 0xc3, 0x00,
+		0x92, 0xc0, 0x00,
+		0x90,
+		0xc0,
+		0x92, 0xa4, 'b', 'e', 't', 'a', 0x01,
+	}
+}
+
+func BenchmarkWireScannerRow(b *testing.B) {
+	row := benchmarkWireRow()
+	scanner := newWireScanner(row)
+	var scalar wireScalar
+	b.ReportAllocs()
+	b.SetBytes(int64(len(row)))
+	for i := 0; i < b.N; i++ {
+		scanner.offset = 0
+		columns, err := scanner.readArrayLen()
+		if err != nil {
+			b.Fatal(err)
+		}
+		for column := 0; column < columns; column++ {
+			code, _ := scanner.peekCode()
+			if code == 0xc0 {
+				scanner.offset++
+				continue
+			}
+			length, err := scanner.readArrayLen()
+			if err != nil {
+				b.Fatal(err)
+			}
+			if length == 0 {
+				continue
+			}
+			if err := scanner.readScalar(&scalar); err != nil {
+				b.Fatal(err)
+			}
+			if _, err := scanner.readStyleID(); err != nil {
+				b.Fatal(err)
+			}
+		}
+	}
+}
+
+func BenchmarkDecodeWireRow(b *testing.B) {
+	writer := &ExcelWriter{
+		StyleIDs:     map[string]int{"DEFAULT_STYLE": 1},
+		WireStyleIDs: []int{1, 2},
+	}
+	row := benchmarkWireRow()
+	scanner := newWireScanner(row)
+	var buffer wireRowBuffer
+	b.ReportAllocs()
+	b.SetBytes(int64(len(row)))
+	for i := 0; i < b.N; i++ {
+		scanner.offset = 0
+		if _, err := writer.decodeWireRow(scanner, false, &buffer); err != nil {
+			b.Fatal(err)
+		}
+	}
+}
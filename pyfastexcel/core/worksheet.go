@@ -2,6 +2,7 @@ package core
 
 import (
 	"fmt"
+	"sort"
 	"strconv"
 
 	"github.com/xuri/excelize/v2"
@@ -184,12 +185,21 @@ func setCellWidth(streamWriter *excelize.StreamWriter, config map[string]interfa
 		return nil
 	}
 	width := config["Width"].(map[string]interface{})
+	// The stream writer emits <col> elements in call order, so widths are set
+	// in column order to keep the sheet XML independent of map iteration.
+	columns := make([]int, 0, len(width))
+	columnWidths := make(map[int]float64, len(width))
 	for col := range width {
 		columnIndex, err := strconv.Atoi(col)
 		if err != nil {
 			return fmt.Errorf("parse stream column index %q: %w", col, err)
 		}
-		if err := streamWriter.SetColWidth(columnIndex, columnIndex, width[col].(float64)); err != nil {
+		columns = append(columns, columnIndex)
+		columnWidths[columnIndex] = width[col].(float64)
+	}
+	sort.Ints(columns)
+	for _, columnIndex := range columns {
+		if err := streamWriter.SetColWidth(columnIndex, columnIndex, columnWidths[columnIndex]); err != nil {
 			return fmt.Errorf("set stream column %d width: %w", columnIndex, err)
 		}
 	}
@@ -401,17 +411,8 @@ func (ew *ExcelWriter) addComment(sheet string, comment []interface{}) error {
 //	    as a map containing "start_row" (float64), "end_row" (float64, optional),
 //	    "outline_level" (float64), and "hidden" (bool).
 func (ew *ExcelWriter) groupRow(sheet string, group []interface{}) error {
-	var endRow int
 	for groupIndex, g := range group {
-		startRow := int(g.(map[string]interface{})["start_row"].(float64))
-		_, ok := g.(map[string]interface{})["end_row"].(float64)
-		outlineLevel := normalizeOutlineLevel(g.(map[string]interface{})["outline_level"].(float64))
-		hidden := g.(map[string]interface{})["hidden"].(bool)
-		if !ok {
-			endRow = startRow
-		} else {
-			endRow = int(g.(map[string]interface{})["end_row"].(float64))
-		}
+		startRow, endRow, outlineLevel, hidden := parseRowGroup(g)
 		for i := startRow; i <= endRow; i++ {
 			if err := ew.File.SetRowOutlineLevel(sheet, i, outlineLevel); err != nil {
 				return fmt.Errorf("set row group %d outline on sheet %q row %d: %w", groupIndex+1, sheet, i, err)
@@ -426,6 +427,71 @@ func (ew *ExcelWriter) groupRow(sheet string, group []interface{}) error {
 	return nil
 }
 
+func parseRowGroup(g interface{}) (startRow int, endRow int, outlineLevel uint8, hidden bool) {
+	config := g.(map[string]interface{})
+	startRow = int(config["start_row"].(float64))
+	endRow = startRow
+	if end, ok := config["end_row"].(float64); ok {
+		endRow = int(end)
+	}
+	outlineLevel = normalizeOutlineLevel(config["outline_level"].(float64))
+	hidden = config["hidden"].(bool)
+	return startRow, endRow, outlineLevel, hidden
+}
+
+// streamRowOptions returns the RowOpts of a stream sheet keyed by row
+// number: custom heights from getRowHeightMap plus the outline level and
+// visibility of grouped rows, which the StreamWriter writes with each row.
+func streamRowOptions(sheet string, sheetData map[string]interface{}) (map[string]excelize.RowOpts, error) {
+	rowOptions := getRowHeightMap(sheetData)
+	group, _ := sheetData["GroupedRow"].([]interface{})
+	for groupIndex, g := range group {
+		startRow, endRow, outlineLevel, hidden := parseRowGroup(g)
+		if startRow < 1 || endRow > maxExcelRows {
+			return nil, fmt.Errorf(
+				"row group %d on stream sheet %q covers rows %d-%d outside Excel limits",
+				groupIndex+1, sheet, startRow, endRow,
+			)
+		}
+		for row := startRow; row <= endRow; row++ {
+			key := strconv.Itoa(row)
+			options := rowOptions[key]
+			options.OutlineLevel = int(outlineLevel)
+			options.Hidden = options.Hidden || hidden
+			rowOptions[key] = options
+		}
+	}
+	return rowOptions, nil
+}
+
+// writeTrailingStreamRows writes the rows after the last data row that still
+// carry options, such as grouped rows below the data, as empty rows in
+// ascending order.
+func writeTrailingStreamRows(
+	streamWriter *excelize.StreamWriter,
+	rowOptions map[string]excelize.RowOpts,
+	rowCount int,
+) error {
+	var trailing []int
+	for key := range rowOptions {
+		row, err := strconv.Atoi(key)
+		if err != nil {
+			return fmt.Errorf("parse stream row number %q: %w", key, err)
+		}
+		if row > rowCount {
+			trailing = append(trailing, row)
+		}
+	}
+	sort.Ints(trailing)
+	for _, row := range trailing {
+		cell := "A" + strconv.Itoa(row)
+		if err := streamWriter.SetRow(cell, nil, rowOptions[strconv.Itoa(row)]); err != nil {
+			return fmt.Errorf("write stream row %d: %w", row, err)
+		}
+	}
+	return nil
+}
+
 // groupCol groups columns in an Excel worksheet using the provided file.
 //
 // Args:
@@ -1,6 +1,9 @@
 package core
 
 import (
+	"archive/zip"
+	"bytes"
+	"encoding/xml"
 	"strings"
 	"testing"
 
@@ -152,3 +155,151 @@ func TestGroupColumnsAcceptsCellReferencesAndRejectsInvalidReferences(t *testing
 		t.Fatalf("expected contextual invalid column error, got %v", err)
 	}
 }
+
+func TestStreamRowOptionsMergeHeightsAndGroups(t *testing.T) {
+	sheetData := newStreamWriterSheet([]interface{}{}, []interface{}{})
+	sheetData["Height"] = map[string]interface{}{"2": float64(30)}
+	sheetData["GroupedRow"] = []interface{}{
+		map[string]interface{}{"start_row": float64(2), "end_row": float64(3), "outline_level": float64(2), "hidden": true},
+		map[string]interface{}{"start_row": float64(5), "outline_level": float64(9), "hidden": false},
+	}
+
+	options, err := streamRowOptions("Sheet1", sheetData)
+	if err != nil {
+		t.Fatalf("stream row options: %v", err)
+	}
+	expected := map[string]excelize.RowOpts{
+		"2": {Height: 30, Hidden: true, OutlineLevel: 2},
+		"3": {Hidden: true, OutlineLevel: 2},
+		"5": {OutlineLevel: 7},
+	}
+	if len(options) != len(expected) {
+		t.Fatalf("row options = %+v, want %+v", options, expected)
+	}
+	for row, want := range expected {
+		if options[row] != want {
+			t.Errorf("row %s options = %+v, want %+v", row, options[row], want)
+		}
+	}
+
+	sheetData["GroupedRow"] = []interface{}{
+		map[string]interface{}{"start_row": float64(0), "outline_level": float64(1), "hidden": false},
+	}
+	if _, err := streamRowOptions("Sheet1", sheetData); err == nil ||
+		!strings.Contains(err.Error(), `row group 1 on stream sheet "Sheet1"`) {
+		t.Fatalf("expected out-of-range row group error, got %v", err)
+	}
+}
+
+func TestStreamSheetKeepsRowGroups(t *testing.T) {
+	rows := []interface{}{[]interface{}{"a"}, []interface{}{"b"}, []interface{}{"c"}}
+	payload := newPFX2TestPayload(t, "StreamWriter", true, rows, nil)
+	payload = mutatePFX2TestMetadata(t, payload, func(metadata map[string]interface{}) {
+		sheet := metadata["content"].(map[string]interface{})["Sheet1"].(map[string]interface{})
+		sheet["GroupedRow"] = []interface{}{
+			map[string]interface{}{"start_row": float64(2), "end_row": float64(5), "outline_level": float64(1), "hidden": true},
+		}
+	})
+
+	workbook, err := WriteExcelV2(payload)
+	if err != nil {
+		t.Fatalf("export grouped stream sheet: %v", err)
+	}
+	file, err := excelize.OpenReader(bytes.NewReader(workbook))
+	if err != nil {
+		t.Fatalf("open grouped workbook: %v", err)
+	}
+	defer file.Close()
+
+	for row := 2; row <= 5; row++ {
+		level, err := file.GetRowOutlineLevel("Sheet1", row)
+		if err != nil || level != 1 {
+			t.Errorf("row %d outline level = %d, %v; want 1", row, level, err)
+		}
+		visible, err := file.GetRowVisible("Sheet1", row)
+		if err != nil || visible {
+			t.Errorf("row %d visible = %v, %v; want hidden", row, visible, err)
+		}
+	}
+	if value, err := file.GetCellValue("Sheet1", "A3"); err != nil || value != "c" {
+		t.Fatalf("A3 = %q, %v; want the streamed data", value, err)
+	}
+}
+
+func TestStreamSheetRejectsColumnGroups(t *testing.T) {
+	payload := newPFX2TestPayload(t, "StreamWriter", true, []interface{}{[]interface{}{"a"}}, nil)
+	payload = mutatePFX2TestMetadata(t, payload, func(metadata map[string]interface{}) {
+		sheet := metadata["content"].(map[string]interface{})["Sheet1"].(map[string]interface{})
+		sheet["GroupedCol"] = []interface{}{
+			map[string]interface{}{"start_col": "B", "end_col": "C", "outline_level": float64(2), "hidden": false},
+		}
+	})
+	if _, err := WriteExcelV2(payload); err == nil ||
+		!strings.Contains(err.Error(), `stream sheet "Sheet1" groups columns`) {
+		t.Fatalf("expected the StreamWriter to reject column groups, got %v", err)
+	}
+}
+
+func TestGroupedColumnsWithWidthsWriteOneColPerColumn(t *testing.T) {
+	rows := []interface{}{[]interface{}{"a", "b", "c", "d"}}
+	payload := newPFX2TestPayload(t, "NormalWriter", true, rows, nil)
+	payload = mutatePFX2TestMetadata(t, payload, func(metadata map[string]interface{}) {
+		sheet := metadata["content"].(map[string]interface{})["Sheet1"].(map[string]interface{})
+		sheet["Width"] = map[string]interface{}{"2": float64(20), "4": float64(30)}
+		sheet["GroupedCol"] = []interface{}{
+			map[string]interface{}{"start_col": "B", "end_col": "C", "outline_level": float64(2), "hidden": false},
+		}
+	})
+
+	workbook, err := WriteExcelV2(payload)
+	if err != nil {
+		t.Fatalf("export grouped sheet with widths: %v", err)
+	}
+	archive, err := zip.NewReader(bytes.NewReader(workbook), int64(len(workbook)))
+	if err != nil {
+		t.Fatalf("open generated workbook: %v", err)
+	}
+	var sheetXML string
+	for _, file := range archive.File {
+		if file.Name == "xl/worksheets/sheet1.xml" {
+			sheetXML = readZipFile(t, file)
+		}
+	}
+	var worksheet struct {
+		Cols []struct {
+			Col []struct {
+				Min          int     `xml:"min,attr"`
+				Max          int     `xml:"max,attr"`
+				Width        float64 `xml:"width,attr"`
+				OutlineLevel int     `xml:"outlineLevel,attr"`
+			} `xml:"col"`
+		} `xml:"cols"`
+	}
+	if err := xml.Unmarshal([]byte(sheetXML), &worksheet); err != nil {
+		t.Fatalf("decode sheet XML: %v", err)
+	}
+	if len(worksheet.Cols) != 1 {
+		t.Fatalf("expected one <cols> element, got %d: %s", len(worksheet.Cols), sheetXML)
+	}
+
+	type column struct {
+		width        float64
+		outlineLevel int
+	}
+	columns := map[int]column{}
+	for _, col := range worksheet.Cols[0].Col {
+		for index := col.Min; index <= col.Max; index++ {
+			if _, duplicate := columns[index]; duplicate {
+				t.Fatalf("column %d is in more than one <col>: %s", index, sheetXML)
+			}
+			columns[index] = column{col.Width, col.OutlineLevel}
+		}
+	}
+	for index, expected := range map[int]column{2: {20, 2}, 3: {0, 2}, 4: {30, 0}} {
+		actual := columns[index]
+		if actual.outlineLevel != expected.outlineLevel ||
+			(expected.width != 0 && actual.width != expected.width) {
+			t.Errorf("column %d = %+v, want %+v", index, actual, expected)
+		}
+	}
+}
@@ -1,6 +1,7 @@
 package core
 
 import (
+	"bytes"
 	"encoding/base64"
 	"errors"
 	"fmt"
@@ -8,6 +9,7 @@ import (
 	"sort"
 	"strconv"
 	"strings"
+	"time"
 
 	"github.com/perimeterx/marshmallow"
 	"github.com/xuri/excelize/v2"
@@ -33,6 +35,21 @@ type ExcelWriter struct {
 	// WireRowStream references the MessagePack row bytes of a PFX2 payload;
 	// sheet_offsets index into it for concurrent per-sheet decoding.
 	WireRowStream []byte
+
+	options     exportOptions
+	tempDir     string
+	bufferSpill spillStats
+	// styles shares parsed style definitions with the other workbooks of an
+	// export batch; nil outside a batch.
+	styles *styleDefinitionCache
+	// styleTable keys this workbook's definitions in styles; empty for a
+	// legacy JSON payload, whose styles are always parsed.
+	styleTable string
+	// progress applies the caller's ExportHooks; nil without hooks.
+	progress *exportProgress
+	stats    exportStats
+	// trace records the export's spans; nil unless export_options.trace.
+	trace *exportTrace
 }
 
 // WriteExcel takes a JSON string containing file properties, styles,
@@ -66,7 +83,7 @@ func WriteExcelBytes(data string) (result []byte, err error) {
 		return nil, err
 	}
 	defer func() {
-		err = errors.Join(err, writer.File.Close())
+		err = errors.Join(err, writer.close())
 	}()
 
 	if err = writer.buildLegacyWorkbook(); err != nil {
@@ -102,14 +119,27 @@ func newExcelWriter(data []byte) (*ExcelWriter, error) {
 	if !ok {
 		return nil, fmt.Errorf("workbook metadata field %q must be an array", "sheet_order")
 	}
+	options, err := parseExportOptions(strJson[exportOptionsKey])
+	if err != nil {
+		return nil, err
+	}
+	tempDir, err := newExportTempDir(options)
+	if err != nil {
+		return nil, err
+	}
 	writer := &ExcelWriter{
-		File:       excelize.NewFile(),
+		File:       excelize.NewFile(excelize.Options{TmpDir: tempDir}),
 		StyleMap:   styleMap,
 		Content:    content,
 		FileProps:  fileProps,
 		Protection: protection,
 		SheetOrder: sheetOrder,
 		// Engine:     strJson["engine"],
+		options: options,
+		tempDir: tempDir,
+	}
+	if options.Trace {
+		writer.trace = &exportTrace{}
 	}
 	return writer, nil
 }
@@ -126,7 +156,9 @@ func (ew *ExcelWriter) writeExcel() string {
 }
 
 func (ew *ExcelWriter) initializeStyles(styleNames []string) error {
-	styleIDs, wireStyleIDs, err := createStylesOrdered(ew.File, ew.StyleMap, styleNames)
+	styleIDs, wireStyleIDs, err := createStylesOrdered(
+		ew.File, ew.StyleMap, styleNames, ew.styles, ew.styleTable,
+	)
 	if err != nil {
 		return err
 	}
@@ -141,9 +173,11 @@ func (ew *ExcelWriter) buildLegacyWorkbook() error {
 		styleNames = append(styleNames, name)
 	}
 	sort.Strings(styleNames)
+	stylesStart := time.Now()
 	if err := ew.initializeStyles(styleNames); err != nil {
 		return err
 	}
+	ew.trace.record("initialize styles", traceExportLane, stylesStart, nil)
 	if err := ew.setFileProps(ew.FileProps); err != nil {
 		return err
 	}
@@ -162,6 +196,7 @@ func (ew *ExcelWriter) buildLegacyWorkbook() error {
 		}
 	}
 	for _, sheet := range ew.SheetOrder {
+		sheetStart := time.Now()
 		sheet := sheet.(string)
 		sheetData := ew.Content[sheet].(map[string]interface{})
 
@@ -195,9 +230,11 @@ func (ew *ExcelWriter) buildLegacyWorkbook() error {
 				return fmt.Errorf("create tables on stream sheet %q: %w", sheet, err)
 			}
 
+			flushStart := time.Now()
 			if err := streamWriter.Flush(); err != nil {
 				return fmt.Errorf("flush stream sheet %q: %w", sheet, err)
 			}
+			ew.trace.record("flush sheet", traceExportLane, flushStart, map[string]interface{}{"sheet": sheet})
 		}
 		// To prevent the pivot table from being created before the data is written
 		// we store the pivot table data in a list and create it after the data is written
@@ -207,24 +244,23 @@ func (ew *ExcelWriter) buildLegacyWorkbook() error {
 		if err := ew.File.SetSheetVisible(sheet, sheetData["SheetVisible"].(bool)); err != nil {
 			return fmt.Errorf("set visibility for sheet %q: %w", sheet, err)
 		}
-
+		ew.trace.record("write sheet", traceExportLane, sheetStart, map[string]interface{}{"sheet": sheet})
 	}
 
 	// Create pivot tables after every sheet has been written and flushed. Large
 	// streamed worksheets can spill to temp files; seed the source header row in
 	// memory so excelize can validate PivotTableOptions.DataRange.
-	for _, pivot := range pivotTableList {
-		if err := ew.seedPivotSourceHeaders(pivot); err != nil {
-			return err
-		}
-		if err := ew.createPivotTable(pivot); err != nil {
-			return err
-		}
-	}
-	return nil
+	return ew.createPivotTables(pivotTableList)
 }
 
 func (ew *ExcelWriter) writeToBytes() ([]byte, error) {
+	if zipSettings.rewrite() || ew.options.Deterministic {
+		var buffer bytes.Buffer
+		if err := ew.writeArchive(&buffer); err != nil {
+			return nil, err
+		}
+		return buffer.Bytes(), nil
+	}
 	buffer, err := ew.File.WriteToBuffer()
 	if err != nil {
 		return nil, fmt.Errorf("serialize workbook: %w", err)
@@ -232,13 +268,53 @@ func (ew *ExcelWriter) writeToBytes() ([]byte, error) {
 	return buffer.Bytes(), nil
 }
 
-func (ew *ExcelWriter) writeTo(output io.Writer) error {
+// writeArchive serializes the workbook to output, canonicalizing the archive
+// in deterministic mode.
+func (ew *ExcelWriter) writeArchive(output io.Writer) error {
+	if ew.options.Deterministic {
+		return ew.writeCanonicalArchive(output)
+	}
+	return ew.writeExcelizeArchive(output)
+}
+
+// writeExcelizeArchive serializes the workbook to output as excelize lays it
+// out, through the archive rewrite when one is configured.
+func (ew *ExcelWriter) writeExcelizeArchive(output io.Writer) error {
+	if zipSettings.rewrite() {
+		return ew.writeRewrittenArchive(output)
+	}
 	if err := ew.File.Write(output); err != nil {
 		return fmt.Errorf("serialize workbook: %w", err)
 	}
 	return nil
 }
 
+func (ew *ExcelWriter) writeTo(output io.Writer) error {
+	start := time.Now()
+	counter := &countingWriter{output: output}
+	output = ew.progress.writer(counter)
+	if err := ew.writeArchive(output); err != nil {
+		return err
+	}
+	ew.stats.writeTime = time.Since(start)
+	ew.stats.outputBytes = counter.written
+	ew.trace.record("write archive", traceExportLane, start, map[string]interface{}{"bytes": counter.written})
+	ew.progress.archiveDone()
+	return nil
+}
+
+// countingWriter counts the bytes written through it.
+type countingWriter struct {
+	output  io.Writer
+	written int64
+}
+
+func (writer *countingWriter) Write(data []byte) (int, error) {
+	written, err := writer.output.Write(data)
+	writer.written += int64(written)
+	return written, err
+}
+
 func recoverAsError(err *error) {
 	if recovered := recover(); recovered != nil {
 		*err = errors.Join(*err, fmt.Errorf("pyfastexcel panic: %v", recovered))
@@ -249,12 +325,27 @@ func getCellScalarValue(item interface{}) interface{} {
 	if cell, ok := item.([]interface{}); ok && len(cell) > 0 {
 		return cell[0]
 	}
-	if cell, ok := item.(excelize.Cell); ok {
+	if cell, ok := styledCell(item); ok {
 		return cell.Value
 	}
 	return item
 }
 
+// styledCell reports whether a decoded row item is a styled cell. The legacy
+// JSON path produces excelize.Cell values, the PFX2 decoder pointers into its
+// row buffer.
+func styledCell(item interface{}) (excelize.Cell, bool) {
+	switch cell := item.(type) {
+	case excelize.Cell:
+		return cell, true
+	case *excelize.Cell:
+		if cell != nil {
+			return *cell, true
+		}
+	}
+	return excelize.Cell{}, false
+}
+
 func (ew *ExcelWriter) seedPivotSourceHeaders(pivotData []interface{}) error {
 	for pivotIndex, pivot := range pivotData {
 		pivotMap := pivot.(map[string]interface{})
@@ -382,6 +473,9 @@ func (ew *ExcelWriter) performStreamWrite(
 			}
 		}
 	}
+	if err := writeTrailingStreamRows(streamWriter, rowHeightMap, len(excelData)); err != nil {
+		return nil, fmt.Errorf("stream sheet %q: %w", sheet, err)
+	}
 	return streamWriter, nil
 }
 
@@ -430,17 +524,29 @@ func (ew *ExcelWriter) prepareStreamWrite(
 		return nil, nil, err
 	}
 
+	// The StreamWriter rewrites the worksheet's <cols> with widths and
+	// styles only, so the outline level and visibility of a column group
+	// would be lost; such sheets are written with the NormalWriter.
+	if groupedCols, _ := sheetData["GroupedCol"].([]interface{}); len(groupedCols) > 0 {
+		return nil, nil, fmt.Errorf(
+			"stream sheet %q groups columns, which needs WriterEngine NormalWriter", sheet,
+		)
+	}
+
 	streamWriter, err := ew.File.NewStreamWriter(sheet)
 	if err != nil {
 		return nil, nil, fmt.Errorf("create stream writer for sheet %q: %w", sheet, err)
 	}
 
 	// CellWidtrh should be set before SetRow
-	// Height should be set with SetRow in StreamWriter
+	// Height and row grouping should be set with SetRow in StreamWriter
 	if err := setCellWidth(streamWriter, sheetData); err != nil {
 		return nil, nil, fmt.Errorf("set widths on stream sheet %q: %w", sheet, err)
 	}
-	rowHeightMap := getRowHeightMap(sheetData)
+	rowHeightMap, err := streamRowOptions(sheet, sheetData)
+	if err != nil {
+		return nil, nil, err
+	}
 
 	if err := mergeCell(streamWriter, sheetData["MergeCells"].([]interface{})); err != nil {
 		return nil, nil, fmt.Errorf("merge cells on stream sheet %q: %w", sheet, err)
@@ -459,6 +565,7 @@ func (ew *ExcelWriter) performNormalWrite(sheet string, sheetData map[string]int
 		return err
 	}
 
+	normalWriter := newNormalSheetWriter(ew.File, sheet)
 	excelData := sheetData["Data"].([]interface{})
 	for i, rowData := range excelData {
 		row := rowData.([]interface{})
@@ -474,11 +581,11 @@ func (ew *ExcelWriter) performNormalWrite(sheet string, sheetData map[string]int
 				row[column] = cell
 			}
 		}
-		if err := ew.writeDecodedNormalRow(sheet, i+1, row); err != nil {
+		if err := normalWriter.writeRow(i+1, row); err != nil {
 			return err
 		}
 	}
-	return nil
+	return normalWriter.flush()
 }
 
 func (ew *ExcelWriter) prepareNormalWrite(sheet string, sheetData map[string]interface{}) error {
@@ -2,19 +2,31 @@ from __future__ import annotations
 
 import base64
 import ctypes
+import hashlib
+import json
 import logging
 import os
 import sys
+import time
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, overload
+from typing import Any, Callable, overload
+
+import msgspec
 
 from ._typing import Writable
+from .cache import CACHE_TIMESTAMP, ExportCache
 from .logformatter import formatter
 from .manager import StyleManager
+from .plan import ExportPlan, plan_export
+from .report import ExportReport
 from .style import CustomStyle
+from .template import Template, template_value_error
+from .trace import TRACE_ENV_VAR, ExportTrace, trace_span
 from .validators import TableFinalValidation
-from .wire import encode_payload
+from .wire import SheetSegmentCache, _UseLegacyJSON, encode_payload, encode_v2_payload
 from .worksheet import WorkSheet
 
 BASE_DIR = Path(__file__).resolve().parent
@@ -24,6 +36,45 @@ BASE_DIR = Path(__file__).resolve().parent
 _NATIVE_EXPORT_STARTED = False
 
 
+# progress(sheet, rows_written, bytes_compressed); sheet is None while the
+# workbook is compressed.
+ProgressCallback = Callable[[str | None, int, int], None]
+
+# Process-wide cap on native export workers, set by set_native_parallelism.
+_NATIVE_PARALLELISM: int | None = None
+
+# Process-wide export cache, set by set_export_cache.
+_EXPORT_CACHE: ExportCache | None = None
+
+
+def _check_max_workers(max_workers: int | None, name: str = 'max_workers') -> None:
+    if max_workers is not None and (
+        not isinstance(max_workers, int) or isinstance(max_workers, bool) or max_workers < 1
+    ):
+        raise ValueError(f'{name} must be a positive integer or None, got {max_workers!r}')
+
+
+def _export_fingerprint(
+    export_data: dict[str, Any], revisions: dict[str, int | None]
+) -> bytes | None:
+    """
+    Identify what an export of ``export_data`` would write, without encoding rows.
+
+    Rows are identified by their sheets' revisions; None if a sheet's rows
+    cannot be tracked.
+    """
+    if any(revision is None for revision in revisions.values()):
+        return None
+    metadata = dict(export_data)
+    metadata['content'] = {
+        name: {key: value for key, value in sheet.items() if key != 'Data'}
+        for name, sheet in export_data['content'].items()
+    }
+    digest = hashlib.blake2b(msgspec.json.encode(metadata), digest_size=32)
+    digest.update(msgspec.json.encode(revisions))
+    return digest.digest()
+
+
 def native_export_started() -> bool:
     """Report whether this process has already run a native export."""
     return _NATIVE_EXPORT_STARTED
@@ -34,6 +85,170 @@ def _mark_native_export_started() -> None:
     _NATIVE_EXPORT_STARTED = True
 
 
+def _load_native_library(lib_path: str | None = None) -> ctypes.CDLL:  # pragma: no cover
+    if lib_path is None:
+        if sys.platform.startswith('linux'):
+            lib_path = str(list(BASE_DIR.glob('**/*.so'))[0])
+        elif sys.platform.startswith('win32'):
+            lib_path = str(list(BASE_DIR.glob('**/*.dll'))[0])
+        elif sys.platform.startswith('darwin'):
+            lib_path = str(list(BASE_DIR.glob('**/*.dylib'))[0])
+
+    # On macOS, there is no winmode parameter, so we should not pass it
+    if sys.platform.startswith('win32') or sys.platform.startswith('linux'):
+        return ctypes.CDLL(lib_path, winmode=0)
+    return ctypes.CDLL(lib_path)
+
+
+def native_pool_stats(lib_path: str | None = None) -> dict[str, dict[str, int]] | None:
+    """
+    Reports the counters of the native library's buffer pools.
+
+    Exports reuse row, cell and byte buffers across calls within one process.
+    Each pool reports ``gets``, ``misses`` (requests that had to allocate),
+    ``puts`` and ``discarded`` (buffers too large to keep), counted since the
+    process started.
+
+    Args:
+        lib_path (str, optional): The path to the library. Defaults to the
+            bundled one.
+
+    Returns:
+        dict[str, dict[str, int]] | None: Counters keyed by pool name, or None
+            if the native library predates buffer pooling.
+    """
+    return NativeExcelClient(_load_native_library(lib_path)).pool_stats()
+
+
+def native_stats(lib_path: str | None = None) -> dict[str, int | float] | None:
+    """
+    Reports the Go runtime statistics of the native library.
+
+    The values come from Go's ``runtime/metrics`` and cover the whole process
+    since it started:
+
+    - ``heap_live_bytes``: the heap that survived the last GC.
+    - ``heap_objects_bytes``: the heap in use now.
+    - ``heap_peak_bytes``: the largest heap seen, sampled after every export.
+    - ``total_bytes``: all memory the Go runtime has mapped.
+    - ``heap_allocated_bytes``: all Go heap allocations.
+    - ``gc_cycles``, ``gc_pauses`` and ``gc_pause_seconds``: collector work;
+      the pause total is estimated from a histogram.
+    - ``goroutines``: the current goroutine count.
+    - ``exports`` and ``export_allocated_bytes``: finished exports and the
+      heap they allocated.
+
+    Args:
+        lib_path (str, optional): The path to the library. Defaults to the
+            bundled one.
+
+    Returns:
+        dict[str, int | float] | None: The statistics, or None if the native
+            library predates them.
+    """
+    return NativeExcelClient(_load_native_library(lib_path)).runtime_stats()
+
+
+@contextmanager
+def profile_native(
+    cpu: str | os.PathLike[str] | None = None,
+    heap: str | os.PathLike[str] | None = None,
+    lib_path: str | None = None,
+) -> Iterator[None]:
+    """
+    Profiles the native library with Go's ``runtime/pprof`` around a block.
+
+    The CPU profile covers every native export inside the block. The heap
+    profile is taken when the block ends, after a garbage collection. Both
+    are standard pprof files for ``go tool pprof``.
+
+    Args:
+        cpu (str | PathLike, optional): Where to write the CPU profile.
+        heap (str | PathLike, optional): Where to write the heap profile.
+        lib_path (str, optional): The path to the library. Defaults to the
+            bundled one.
+
+    Raises:
+        ValueError: If neither path is given.
+        RuntimeError: If the native library predates profiling, a profile is
+            already running, or a profile cannot be written.
+    """
+    if cpu is None and heap is None:
+        raise ValueError('profile_native needs a cpu or heap profile path')
+    native = NativeExcelClient(_load_native_library(lib_path))
+    native.start_profile(cpu, heap)
+    try:
+        yield
+    finally:
+        native.stop_profile()
+
+
+def save_many(
+    items: Iterable[tuple[ExcelDriver, str | os.PathLike[str]]],
+    *,
+    max_workers: int | None = None,
+) -> list[Exception | None]:
+    """
+    Saves many workbooks to files with one native call.
+
+    The workbooks are exported concurrently by the native library, with the
+    styles of workbooks that share a style table parsed only once. One
+    failing workbook does not stop the others: each gets its own entry in
+    the returned list. Native libraries without batch export save the
+    workbooks one by one instead.
+
+    Args:
+        items (Iterable[tuple[ExcelDriver, str | os.PathLike[str]]]): Pairs of
+            workbook and the path to save it to.
+        max_workers (int, optional): The most workbooks exported at once.
+            Defaults to the set_native_parallelism setting, or one per CPU.
+
+    Returns:
+        list[Exception | None]: None for each saved workbook, otherwise the
+            error that stopped it, in the order of ``items``.
+    """
+    _check_max_workers(max_workers)
+    items = list(items)
+    paths = []
+    for _workbook, path in items:
+        path = os.fspath(path)
+        if not isinstance(path, str):
+            raise TypeError(f'save_many paths must be str or os.PathLike[str], got {path!r}')
+        if '\x00' in path:
+            raise ValueError('embedded null byte')
+        paths.append(path)
+
+    errors: list[Exception | None] = [None] * len(items)
+    native = NativeExcelClient(_load_native_library())
+    if not native.supports_batch_export:
+        for index, ((workbook, _path), path) in enumerate(zip(items, paths)):
+            try:
+                workbook.save(path)
+            except Exception as error:
+                errors[index] = error
+        return errors
+
+    payloads = []
+    exported = []
+    for index, (workbook, _path) in enumerate(items):
+        try:
+            payloads.append(
+                encode_payload(workbook._build_export_data(), sheet_cache=workbook._sheet_cache)
+            )
+        except Exception as error:
+            errors[index] = error
+            continue
+        exported.append(index)
+    if max_workers is None:
+        max_workers = _NATIVE_PARALLELISM
+    results = native.export_batch(payloads, [paths[index] for index in exported], max_workers)
+    for index, (error_message, report) in zip(exported, results):
+        items[index][0].native_report = report
+        if error_message is not None:
+            errors[index] = RuntimeError(error_message)
+    return errors
+
+
 logger = logging.getLogger(__name__)
 style_formatter = logging.StreamHandler()
 style_formatter.setFormatter(formatter)
@@ -42,6 +257,72 @@ logger.addHandler(style_formatter)
 logger.propagate = False
 
 
+class ExportCancelled(RuntimeError):
+    """Raised by an export that was stopped through its CancelToken."""
+
+
+class CancelToken:
+    """
+    Stops running native exports from any thread.
+
+    Pass the token to ``save()`` or ``read_lib_and_create_excel()`` and call
+    ``cancel()`` while they run; the export stops at its next check and
+    raises ExportCancelled. One token may be shared by several exports, and a
+    cancelled token cancels every later export it is passed to.
+    """
+
+    def __init__(self) -> None:
+        self._flag = ctypes.c_int32(0)
+
+    def cancel(self) -> None:
+        self._flag.value = 1
+
+    @property
+    def cancelled(self) -> bool:
+        return bool(self._flag.value)
+
+
+# int32_t (*)(int64_t sheet, int64_t rows_written, int64_t bytes_compressed)
+_PROGRESS_CALLBACK = ctypes.CFUNCTYPE(
+    ctypes.c_int32, ctypes.c_int64, ctypes.c_int64, ctypes.c_int64
+)
+
+
+class _ExportHooks:
+    """The progress callback and cancellation flag of one ABI v6 export."""
+
+    def __init__(self, progress, cancel: CancelToken | None) -> None:
+        self.progress = progress
+        self.cancel = cancel
+        self.error: BaseException | None = None
+        # Referenced here so the C function pointer outlives the native call.
+        # ctypes rejects None for a CFUNCTYPE argument; the empty prototype
+        # instance is the NULL function pointer the library checks for.
+        self.callback = (
+            _PROGRESS_CALLBACK(self._report) if progress is not None else _PROGRESS_CALLBACK()
+        )
+        self.flag = ctypes.byref(cancel._flag) if cancel is not None else None
+
+    def _report(self, sheet: int, rows_written: int, bytes_compressed: int) -> int:
+        if self.error is not None:
+            return 1
+        try:
+            self.progress(sheet, rows_written, bytes_compressed)
+        except BaseException as error:
+            # Exceptions cannot cross the C boundary; stop the export and
+            # re-raise once it has returned.
+            self.error = error
+            return 1
+        return 0
+
+    def raise_error(self, error_message: str) -> None:
+        if self.error is not None:
+            raise self.error
+        if self.cancel is not None and self.cancel.cancelled:
+            raise ExportCancelled(error_message)
+        raise RuntimeError(error_message)
+
+
 # D203 conflicts with Ruff's formatter, which removes this blank line.
 class NativeExcelClient:  # noqa: D203
     """Versioned ctypes boundary with explicit ownership for C allocations."""
@@ -61,6 +342,52 @@ class NativeExcelClient:  # noqa: D203
         self.export_to_file_v2 = (
             getattr(library, 'ExportToFileV2', None) if self.abi_version >= 2 else None
         )
+        self.export_v3 = getattr(library, 'ExportV3', None) if self.abi_version >= 3 else None
+        self.export_to_file_v3 = (
+            getattr(library, 'ExportToFileV3', None) if self.abi_version >= 3 else None
+        )
+        self.get_pool_stats = (
+            getattr(library, 'GetPoolStatsV2', None) if self.abi_version >= 4 else None
+        )
+        self.export_batch_v2 = (
+            getattr(library, 'ExportBatchV2', None) if self.abi_version >= 5 else None
+        )
+        self.export_v4 = getattr(library, 'ExportV4', None) if self.abi_version >= 6 else None
+        self.export_to_file_v4 = (
+            getattr(library, 'ExportToFileV4', None) if self.abi_version >= 6 else None
+        )
+        self.get_runtime_stats = (
+            getattr(library, 'GetRuntimeStatsV2', None) if self.abi_version >= 7 else None
+        )
+        self.start_profile_v2 = (
+            getattr(library, 'StartProfileV2', None) if self.abi_version >= 8 else None
+        )
+        self.stop_profile_v2 = (
+            getattr(library, 'StopProfileV2', None) if self.abi_version >= 8 else None
+        )
+        self.compile_template_v2 = (
+            getattr(library, 'CompileTemplateV2', None) if self.abi_version >= 9 else None
+        )
+        self.render_template_v2 = (
+            getattr(library, 'RenderTemplateV2', None) if self.abi_version >= 9 else None
+        )
+        self.release_template_v2 = (
+            getattr(library, 'ReleaseTemplateV2', None) if self.abi_version >= 9 else None
+        )
+        self.open_row_reader_v2 = (
+            getattr(library, 'OpenRowReaderV2', None) if self.abi_version >= 10 else None
+        )
+        self.read_row_chunk_v2 = (
+            getattr(library, 'ReadRowChunkV2', None) if self.abi_version >= 10 else None
+        )
+        self.close_row_reader_v2 = (
+            getattr(library, 'CloseRowReaderV2', None) if self.abi_version >= 10 else None
+        )
+        self.read_columns_v2 = (
+            getattr(library, 'ReadColumnsV2', None) if self.abi_version >= 11 else None
+        )
+        # Resource report of the latest export; only ABI v3 libraries send one.
+        self.last_report: dict[str, int] | None = None
 
     @staticmethod
     def _set_signature(function, argtypes, restype) -> None:
@@ -80,7 +407,27 @@ class NativeExcelClient:  # noqa: D203
 
     @property
     def supports_direct_file_export(self) -> bool:
-        return self.export_to_file_v2 is not None
+        return (
+            self.export_to_file_v2 is not None
+            or self.export_to_file_v3 is not None
+            or self.export_to_file_v4 is not None
+        )
+
+    @property
+    def supports_export_hooks(self) -> bool:
+        return self.export_v4 is not None
+
+    @property
+    def supports_batch_export(self) -> bool:
+        return self.export_batch_v2 is not None
+
+    @property
+    def supports_templates(self) -> bool:
+        return self.compile_template_v2 is not None
+
+    @property
+    def supports_reading(self) -> bool:
+        return self.open_row_reader_v2 is not None
 
     def _free(self, pointer, *, debug: bool = False) -> None:
         if pointer:
@@ -92,29 +439,195 @@ class NativeExcelClient:  # noqa: D203
             return None
         return error_pointer.value.decode('utf-8', errors='replace')
 
-    def export_bytes(self, payload: bytes, ignore_go_panic: int) -> bytes:
+    def _take_report(self, report_pointer: ctypes.c_char_p) -> None:
+        report = self._read_report(report_pointer)
+        if report is not None:
+            self.last_report = report
+
+    def _read_report(self, report_pointer: ctypes.c_char_p) -> dict[str, int] | None:
+        try:
+            return json.loads(report_pointer.value) if report_pointer.value else None
+        finally:
+            self._free(ctypes.cast(report_pointer, ctypes.c_void_p))
+
+    def _read_json(self, function, description: str) -> Any:
+        self._set_signature(function, [], ctypes.c_void_p)
+        pointer = function()
+        try:
+            if not pointer:
+                raise RuntimeError(f'pyfastexcel native {description} are unavailable.')
+            return json.loads(ctypes.string_at(pointer))
+        finally:
+            self._free(pointer)
+
+    def pool_stats(self) -> dict[str, dict[str, int]] | None:
+        if self.get_pool_stats is None:
+            return None
+        return self._read_json(self.get_pool_stats, 'pool statistics')
+
+    def runtime_stats(self) -> dict[str, int | float] | None:
+        if self.get_runtime_stats is None:
+            return None
+        return self._read_json(self.get_runtime_stats, 'runtime statistics')
+
+    def start_profile(
+        self,
+        cpu: str | os.PathLike[str] | None,
+        heap: str | os.PathLike[str] | None,
+    ) -> None:
+        if self.start_profile_v2 is None:
+            raise RuntimeError('Profiling is not supported by this native library.')
+        self._set_signature(
+            self.start_profile_v2, [ctypes.c_char_p, ctypes.c_char_p], ctypes.c_void_p
+        )
+        self._raise_native_error(
+            self.start_profile_v2(
+                os.fsencode(cpu) if cpu is not None else None,
+                os.fsencode(heap) if heap is not None else None,
+            )
+        )
+
+    def stop_profile(self) -> None:
+        if self.stop_profile_v2 is None:
+            raise RuntimeError('Profiling is not supported by this native library.')
+        self._set_signature(self.stop_profile_v2, [], ctypes.c_void_p)
+        self._raise_native_error(self.stop_profile_v2())
+
+    def compile_template(self, payload: bytes) -> int:
+        """Compile a PFX2 payload into a native template and return its handle."""
+        if not self.supports_templates:
+            raise RuntimeError('Templates are not supported by this native library.')
         _mark_native_export_started()
-        if self.export_v2 is None:
-            return self._export_legacy(payload, ignore_go_panic)
+        self._set_signature(
+            self.compile_template_v2,
+            [ctypes.c_void_p, ctypes.c_size_t, ctypes.POINTER(ctypes.c_char_p)],
+            ctypes.c_int64,
+        )
+        payload_pointer = ctypes.c_char_p(payload)
+        error_pointer = ctypes.c_char_p()
+        handle = self.compile_template_v2(
+            ctypes.cast(payload_pointer, ctypes.c_void_p),
+            len(payload),
+            ctypes.byref(error_pointer),
+        )
+        try:
+            error_message = self._error_message(error_pointer)
+            if handle == 0 or error_message is not None:
+                raise RuntimeError(error_message or 'pyfastexcel native template compile failed.')
+        finally:
+            self._free(ctypes.cast(error_pointer, ctypes.c_void_p))
+        return handle
 
+    def render_template(
+        self,
+        handle: int,
+        rows: bytes,
+        row_counts: list[int],
+        row_offsets: list[int],
+        path: str,
+    ) -> dict[str, int] | None:
+        """
+        Write a compiled template to ``path`` with the rows of ``rows`` appended.
+
+        Renders of one template may run concurrently, so the native report is
+        returned rather than kept in ``last_report``.
+        """
+        if self.render_template_v2 is None:
+            raise RuntimeError('Templates are not supported by this native library.')
+        _mark_native_export_started()
         self._set_signature(
-            self.export_v2,
+            self.render_template_v2,
             [
+                ctypes.c_int64,
                 ctypes.c_void_p,
                 ctypes.c_size_t,
+                ctypes.POINTER(ctypes.c_int64),
+                ctypes.POINTER(ctypes.c_int64),
+                ctypes.c_size_t,
+                ctypes.c_char_p,
+                ctypes.POINTER(ctypes.c_char_p),
+                ctypes.POINTER(ctypes.c_char_p),
+            ],
+            ctypes.c_int64,
+        )
+        sheet_count = len(row_counts)
+        rows_pointer = ctypes.c_char_p(rows)
+        error_pointer = ctypes.c_char_p()
+        report_pointer = ctypes.c_char_p()
+        status = self.render_template_v2(
+            handle,
+            ctypes.cast(rows_pointer, ctypes.c_void_p),
+            len(rows),
+            (ctypes.c_int64 * sheet_count)(*row_counts),
+            (ctypes.c_int64 * sheet_count)(*row_offsets),
+            sheet_count,
+            os.fsencode(path),
+            ctypes.byref(error_pointer),
+            ctypes.byref(report_pointer),
+        )
+        try:
+            error_message = self._error_message(error_pointer)
+            if status != 0 or error_message is not None:
+                raise RuntimeError(error_message or f'pyfastexcel native export failed ({status}).')
+        finally:
+            self._free(ctypes.cast(error_pointer, ctypes.c_void_p))
+            native_report = self._read_report(report_pointer)
+        return native_report
+
+    def release_template(self, handle: int) -> None:
+        if self.release_template_v2 is None:
+            return
+        self._set_signature(self.release_template_v2, [ctypes.c_int64], None)
+        self.release_template_v2(handle)
+
+    def open_row_reader(
+        self,
+        path: str | os.PathLike[str],
+        sheet: str | None,
+        chunk_rows: int,
+        raw: bool,
+    ) -> int:
+        """Open a worksheet for streaming reads and return the reader's handle."""
+        if not self.supports_reading:
+            raise RuntimeError('Reading is not supported by this native library.')
+        self._set_signature(
+            self.open_row_reader_v2,
+            [
+                ctypes.c_char_p,
+                ctypes.c_char_p,
+                ctypes.c_int64,
                 ctypes.c_int64,
-                ctypes.POINTER(ctypes.c_size_t),
                 ctypes.POINTER(ctypes.c_char_p),
             ],
+            ctypes.c_int64,
+        )
+        error_pointer = ctypes.c_char_p()
+        handle = self.open_row_reader_v2(
+            os.fsencode(path),
+            sheet.encode('utf-8') if sheet is not None else None,
+            chunk_rows,
+            1 if raw else 0,
+            ctypes.byref(error_pointer),
+        )
+        try:
+            error_message = self._error_message(error_pointer)
+            if handle == 0 or error_message is not None:
+                raise RuntimeError(error_message or 'pyfastexcel native reader open failed.')
+        finally:
+            self._free(ctypes.cast(error_pointer, ctypes.c_void_p))
+        return handle
+
+    def read_row_chunk(self, handle: int) -> bytes | None:
+        """Return the next MessagePack row chunk of a reader, or None at the end."""
+        self._set_signature(
+            self.read_row_chunk_v2,
+            [ctypes.c_int64, ctypes.POINTER(ctypes.c_size_t), ctypes.POINTER(ctypes.c_char_p)],
             ctypes.c_void_p,
         )
-        payload_pointer = ctypes.c_char_p(payload)
         output_length = ctypes.c_size_t()
         error_pointer = ctypes.c_char_p()
-        output_pointer = self.export_v2(
-            ctypes.cast(payload_pointer, ctypes.c_void_p),
-            len(payload),
-            ignore_go_panic,
+        chunk_pointer = self.read_row_chunk_v2(
+            handle,
             ctypes.byref(output_length),
             ctypes.byref(error_pointer),
         )
@@ -122,6 +635,157 @@ class NativeExcelClient:  # noqa: D203
             error_message = self._error_message(error_pointer)
             if error_message is not None:
                 raise RuntimeError(error_message)
+            if not chunk_pointer:
+                return None
+            return ctypes.string_at(chunk_pointer, output_length.value)
+        finally:
+            self._free(chunk_pointer)
+            self._free(ctypes.cast(error_pointer, ctypes.c_void_p))
+
+    def close_row_reader(self, handle: int) -> None:
+        if self.close_row_reader_v2 is None:
+            return
+        self._set_signature(self.close_row_reader_v2, [ctypes.c_int64], ctypes.c_void_p)
+        self._raise_native_error(self.close_row_reader_v2(handle))
+
+    def read_columns(
+        self,
+        path: str | os.PathLike[str],
+        sheet: str | None,
+        request: dict[str, Any],
+    ) -> bytearray:
+        """Decode worksheet columns into the native typed-column layout."""
+        if self.read_columns_v2 is None:
+            raise RuntimeError('Reading columns is not supported by this native library.')
+        self._set_signature(
+            self.read_columns_v2,
+            [
+                ctypes.c_char_p,
+                ctypes.c_char_p,
+                ctypes.c_char_p,
+                ctypes.POINTER(ctypes.c_size_t),
+                ctypes.POINTER(ctypes.c_char_p),
+            ],
+            ctypes.c_void_p,
+        )
+        output_length = ctypes.c_size_t()
+        error_pointer = ctypes.c_char_p()
+        result_pointer = self.read_columns_v2(
+            os.fsencode(path),
+            sheet.encode('utf-8') if sheet is not None else None,
+            msgspec.json.encode(request),
+            ctypes.byref(output_length),
+            ctypes.byref(error_pointer),
+        )
+        try:
+            error_message = self._error_message(error_pointer)
+            if not result_pointer or error_message is not None:
+                raise RuntimeError(error_message or 'pyfastexcel native column read failed.')
+            # One copy into Python-owned memory, which the columns then share.
+            return bytearray((ctypes.c_char * output_length.value).from_address(result_pointer))
+        finally:
+            self._free(result_pointer)
+            self._free(ctypes.cast(error_pointer, ctypes.c_void_p))
+
+    def _raise_native_error(self, error_pointer) -> None:
+        """Raise the C-owned error string a native call returned, if any."""
+        if not error_pointer:
+            return
+        try:
+            message = ctypes.string_at(error_pointer).decode('utf-8', errors='replace')
+        finally:
+            self._free(error_pointer)
+        raise RuntimeError(message)
+
+    def export_bytes(
+        self,
+        payload: bytes,
+        ignore_go_panic: int,
+        progress=None,
+        cancel: CancelToken | None = None,
+    ) -> bytes:
+        """
+        Export ``payload`` and return the workbook bytes.
+
+        ``progress(sheet_index, rows_written, bytes_compressed)`` and
+        ``cancel`` are only honoured by ABI v6 libraries; older ones export
+        without them.
+        """
+        _mark_native_export_started()
+        self.last_report = None
+        if self.export_v2 is None and self.export_v3 is None and self.export_v4 is None:
+            return self._export_legacy(payload, ignore_go_panic)
+
+        payload_pointer = ctypes.c_char_p(payload)
+        output_length = ctypes.c_size_t()
+        error_pointer = ctypes.c_char_p()
+        report_pointer = ctypes.c_char_p()
+        hooks = _ExportHooks(progress, cancel)
+        if self.export_v4 is not None:
+            self._set_signature(
+                self.export_v4,
+                [
+                    ctypes.c_void_p,
+                    ctypes.c_size_t,
+                    ctypes.POINTER(ctypes.c_size_t),
+                    ctypes.POINTER(ctypes.c_char_p),
+                    ctypes.POINTER(ctypes.c_char_p),
+                    _PROGRESS_CALLBACK,
+                    ctypes.POINTER(ctypes.c_int32),
+                ],
+                ctypes.c_void_p,
+            )
+            output_pointer = self.export_v4(
+                ctypes.cast(payload_pointer, ctypes.c_void_p),
+                len(payload),
+                ctypes.byref(output_length),
+                ctypes.byref(error_pointer),
+                ctypes.byref(report_pointer),
+                hooks.callback,
+                hooks.flag,
+            )
+        elif self.export_v3 is not None:
+            self._set_signature(
+                self.export_v3,
+                [
+                    ctypes.c_void_p,
+                    ctypes.c_size_t,
+                    ctypes.POINTER(ctypes.c_size_t),
+                    ctypes.POINTER(ctypes.c_char_p),
+                    ctypes.POINTER(ctypes.c_char_p),
+                ],
+                ctypes.c_void_p,
+            )
+            output_pointer = self.export_v3(
+                ctypes.cast(payload_pointer, ctypes.c_void_p),
+                len(payload),
+                ctypes.byref(output_length),
+                ctypes.byref(error_pointer),
+                ctypes.byref(report_pointer),
+            )
+        else:
+            self._set_signature(
+                self.export_v2,
+                [
+                    ctypes.c_void_p,
+                    ctypes.c_size_t,
+                    ctypes.c_int64,
+                    ctypes.POINTER(ctypes.c_size_t),
+                    ctypes.POINTER(ctypes.c_char_p),
+                ],
+                ctypes.c_void_p,
+            )
+            output_pointer = self.export_v2(
+                ctypes.cast(payload_pointer, ctypes.c_void_p),
+                len(payload),
+                ignore_go_panic,
+                ctypes.byref(output_length),
+                ctypes.byref(error_pointer),
+            )
+        try:
+            error_message = self._error_message(error_pointer)
+            if error_message is not None:
+                hooks.raise_error(error_message)
             if not output_pointer:
                 raise RuntimeError('pyfastexcel native export returned a null pointer.')
             if output_length.value == 0:
@@ -130,6 +794,70 @@ class NativeExcelClient:  # noqa: D203
         finally:
             self._free(output_pointer, debug=self.debug)
             self._free(ctypes.cast(error_pointer, ctypes.c_void_p))
+            self._take_report(report_pointer)
+
+    def export_batch(
+        self,
+        payloads: list[bytes],
+        paths: list[str],
+        max_workers: int | None = None,
+    ) -> list[tuple[str | None, dict[str, int] | None]]:
+        """Export each payload to its path; return every item's error and report."""
+        if self.export_batch_v2 is None:
+            raise RuntimeError('Batch export is not supported by this native library.')
+        _mark_native_export_started()
+        count = len(payloads)
+        if count == 0:
+            return []
+
+        # The C strings point into the payload bytes, which stay referenced
+        # by ``payloads`` for the whole call.
+        payload_pointers = [ctypes.c_char_p(payload) for payload in payloads]
+        payload_array = (ctypes.c_void_p * count)(
+            *[ctypes.cast(pointer, ctypes.c_void_p) for pointer in payload_pointers]
+        )
+        length_array = (ctypes.c_size_t * count)(*[len(payload) for payload in payloads])
+        path_array = (ctypes.c_char_p * count)(*[os.fsencode(path) for path in paths])
+        error_array = (ctypes.c_void_p * count)()
+        report_array = (ctypes.c_void_p * count)()
+        self._set_signature(
+            self.export_batch_v2,
+            [
+                ctypes.POINTER(ctypes.c_void_p),
+                ctypes.POINTER(ctypes.c_size_t),
+                ctypes.POINTER(ctypes.c_char_p),
+                ctypes.c_size_t,
+                ctypes.c_int64,
+                ctypes.POINTER(ctypes.c_void_p),
+                ctypes.POINTER(ctypes.c_void_p),
+            ],
+            ctypes.c_int64,
+        )
+        failed = self.export_batch_v2(
+            payload_array,
+            length_array,
+            path_array,
+            count,
+            max_workers or 0,
+            error_array,
+            report_array,
+        )
+        results = []
+        try:
+            if failed < 0:
+                raise RuntimeError('pyfastexcel native batch export rejected its arguments.')
+            for error_pointer, report_pointer in zip(error_array, report_array):
+                error_message = None
+                if error_pointer:
+                    error_message = ctypes.string_at(error_pointer).decode(
+                        'utf-8', errors='replace'
+                    )
+                report = json.loads(ctypes.string_at(report_pointer)) if report_pointer else None
+                results.append((error_message, report))
+        finally:
+            for pointer in (*error_array, *report_array):
+                self._free(pointer)
+        return results
 
     def _export_legacy(self, payload: bytes, ignore_go_panic: int) -> bytes:
         create_excel = self.library.Export
@@ -149,37 +877,91 @@ class NativeExcelClient:  # noqa: D203
         finally:
             self._free(output_pointer, debug=self.debug)
 
-    def export_to_file(self, payload: bytes, path: str, ignore_go_panic: int) -> None:
-        if self.export_to_file_v2 is None:
+    def export_to_file(
+        self,
+        payload: bytes,
+        path: str,
+        ignore_go_panic: int,
+        progress=None,
+        cancel: CancelToken | None = None,
+    ) -> None:
+        if not self.supports_direct_file_export:
             raise RuntimeError('Direct file export is not supported by this native library.')
         _mark_native_export_started()
+        self.last_report = None
 
-        self._set_signature(
-            self.export_to_file_v2,
-            [
-                ctypes.c_void_p,
-                ctypes.c_size_t,
-                ctypes.c_char_p,
-                ctypes.c_int64,
-                ctypes.POINTER(ctypes.c_char_p),
-            ],
-            ctypes.c_int64,
-        )
         payload_pointer = ctypes.c_char_p(payload)
         error_pointer = ctypes.c_char_p()
-        status = self.export_to_file_v2(
-            ctypes.cast(payload_pointer, ctypes.c_void_p),
-            len(payload),
-            os.fsencode(path),
-            ignore_go_panic,
-            ctypes.byref(error_pointer),
-        )
+        report_pointer = ctypes.c_char_p()
+        hooks = _ExportHooks(progress, cancel)
+        if self.export_to_file_v4 is not None:
+            self._set_signature(
+                self.export_to_file_v4,
+                [
+                    ctypes.c_void_p,
+                    ctypes.c_size_t,
+                    ctypes.c_char_p,
+                    ctypes.POINTER(ctypes.c_char_p),
+                    ctypes.POINTER(ctypes.c_char_p),
+                    _PROGRESS_CALLBACK,
+                    ctypes.POINTER(ctypes.c_int32),
+                ],
+                ctypes.c_int64,
+            )
+            status = self.export_to_file_v4(
+                ctypes.cast(payload_pointer, ctypes.c_void_p),
+                len(payload),
+                os.fsencode(path),
+                ctypes.byref(error_pointer),
+                ctypes.byref(report_pointer),
+                hooks.callback,
+                hooks.flag,
+            )
+        elif self.export_to_file_v3 is not None:
+            self._set_signature(
+                self.export_to_file_v3,
+                [
+                    ctypes.c_void_p,
+                    ctypes.c_size_t,
+                    ctypes.c_char_p,
+                    ctypes.POINTER(ctypes.c_char_p),
+                    ctypes.POINTER(ctypes.c_char_p),
+                ],
+                ctypes.c_int64,
+            )
+            status = self.export_to_file_v3(
+                ctypes.cast(payload_pointer, ctypes.c_void_p),
+                len(payload),
+                os.fsencode(path),
+                ctypes.byref(error_pointer),
+                ctypes.byref(report_pointer),
+            )
+        else:
+            self._set_signature(
+                self.export_to_file_v2,
+                [
+                    ctypes.c_void_p,
+                    ctypes.c_size_t,
+                    ctypes.c_char_p,
+                    ctypes.c_int64,
+                    ctypes.POINTER(ctypes.c_char_p),
+                ],
+                ctypes.c_int64,
+            )
+            status = self.export_to_file_v2(
+                ctypes.cast(payload_pointer, ctypes.c_void_p),
+                len(payload),
+                os.fsencode(path),
+                ignore_go_panic,
+                ctypes.byref(error_pointer),
+            )
         try:
             error_message = self._error_message(error_pointer)
             if status != 0 or error_message is not None:
-                raise RuntimeError(error_message or f'pyfastexcel native export failed ({status}).')
+                hooks.raise_error(error_message or f'pyfastexcel native export failed ({status}).')
         finally:
             self._free(ctypes.cast(error_pointer, ctypes.c_void_p))
+            self._take_report(report_pointer)
 
 
 class ExcelDriver:
@@ -219,7 +1001,13 @@ class ExcelDriver:
     )
     DEBUG = False
 
-    def __init__(self, pre_allocate: dict[str, int] = None, plain_data: list[list[str]] = None):
+    def __init__(
+        self,
+        pre_allocate: dict[str, int] = None,
+        plain_data: list[list[str]] = None,
+        *,
+        deterministic: bool = False,
+    ):
         """
         Initializes the Workbook with default settings and initializes Sheet1.
 
@@ -232,6 +1020,9 @@ class ExcelDriver:
                 keys specifying the dimensions for pre-allocating data in Sheet1.
             plain_data (list[list[str]], optional): A 2D list of strings representing initial data
                 to populate Sheet1.
+            deterministic (bool, optional): Produce byte-identical files for equal workbooks:
+                the default Created and Modified properties get a fixed value and the native
+                library writes the archive parts in a canonical order with fixed timestamps.
         """
         self.style = StyleManager()
         self.workbook = {
@@ -241,49 +1032,181 @@ class ExcelDriver:
                 style_manager=self.style,
             ),
         }
+        self.deterministic = deterministic
         self.file_props = self._get_default_file_props()
+        # Export caches normalize the timestamps only while they keep this
+        # construction-time default.
+        self._file_props_time = self.file_props['Created']
         self.sheet = 'Sheet1'
         self._sheet_list = tuple(['Sheet1'])
         self._dict_wb = {}
         self.protection = {}
+        self.export_options = {}
+        self.native_report = None
+        self.export_report = None
+        self._sheet_cache = SheetSegmentCache()
+        # The _export_fingerprint of the export decoded_bytes came from.
+        self._decoded_fingerprint: bytes | None = None
 
     @property
     def sheet_list(self):
         return list(self._sheet_list)
 
     @overload
-    def save(self, file: Writable) -> None:
+    def save(
+        self,
+        file: Writable,
+        *,
+        max_workers: int | None = None,
+        progress: ProgressCallback | None = None,
+        cancel: CancelToken | None = None,
+        cache: ExportCache | None = None,
+        return_report: bool = False,
+    ) -> ExportReport | None:
         """
         Saves the workbook to a writable object.
 
         Args:
             file (Writable): Writable object that has .write() function.
+            max_workers (int, optional): The most native worker threads this
+                export may use. Defaults to the set_native_parallelism setting.
+            progress (callable, optional): Called as ``progress(sheet,
+                rows_written, bytes_compressed)`` while the export runs, with
+                sheet None while the workbook is compressed.
+            cancel (CancelToken, optional): A token whose ``cancel()`` stops
+                the export with ExportCancelled.
+            cache (ExportCache, optional): Reuse workbooks identical to earlier
+                exports. Defaults to the set_export_cache setting.
+            return_report (bool): Return an ExportReport of the save.
         """
         ...
 
     @overload
-    def save(self, path: str) -> None:
+    def save(
+        self,
+        path: str,
+        *,
+        max_workers: int | None = None,
+        progress: ProgressCallback | None = None,
+        cancel: CancelToken | None = None,
+        cache: ExportCache | None = None,
+        return_report: bool = False,
+    ) -> ExportReport | None:
         """
         Saves the workbook to a file.
 
         Args:
             path (str): A path to save the file.
+            max_workers (int, optional): The most native worker threads this
+                export may use. Defaults to the set_native_parallelism setting.
+            progress (callable, optional): Called as ``progress(sheet,
+                rows_written, bytes_compressed)`` while the export runs, with
+                sheet None while the workbook is compressed.
+            cancel (CancelToken, optional): A token whose ``cancel()`` stops
+                the export with ExportCancelled.
+            cache (ExportCache, optional): Reuse workbooks identical to earlier
+                exports. Defaults to the set_export_cache setting.
+            return_report (bool): Return an ExportReport of the save.
         """
         ...
 
-    def save(self, file_or_path: Writable | str) -> None:
+    def save(
+        self,
+        file_or_path: Writable | str,
+        *,
+        max_workers: int | None = None,
+        progress: ProgressCallback | None = None,
+        cancel: CancelToken | None = None,
+        cache: ExportCache | None = None,
+        return_report: bool = False,
+    ) -> ExportReport | None:
         if isinstance(file_or_path, str) and '\x00' in file_or_path:
             raise ValueError('embedded null byte')
-        if not hasattr(self, 'decoded_bytes'):
-            if isinstance(file_or_path, str) and self._try_direct_file_export(file_or_path):
-                return
-            self.read_lib_and_create_excel()
+        _check_max_workers(max_workers)
+        if cache is None:
+            cache = _EXPORT_CACHE
+        reused = self._decoded_bytes_current(max_workers, cache)
+        if not reused:
+            # A cache needs the workbook bytes, which direct file export skips.
+            if (
+                cache is None
+                and isinstance(file_or_path, str)
+                and self._try_direct_file_export(
+                    file_or_path, max_workers=max_workers, progress=progress, cancel=cancel
+                )
+            ):
+                return self.export_report if return_report else None
+            self.read_lib_and_create_excel(
+                max_workers=max_workers, progress=progress, cancel=cancel, cache=cache
+            )
 
+        started = time.perf_counter()
         if isinstance(file_or_path, str):
             with open(file_or_path, 'wb') as file:
                 file.write(self.decoded_bytes)
         else:
             file_or_path.write(self.decoded_bytes)
+        if reused or self.export_report is None:
+            # Nothing was exported, so the report of the export that made the
+            # bytes does not describe this save.
+            self.export_report = ExportReport(
+                output_bytes=len(self.decoded_bytes), cache='reused' if reused else None
+            )
+        self.export_report.stages['file_write'] = time.perf_counter() - started
+        return self.export_report if return_report else None
+
+    def explain_export(self, *, max_workers: int | None = None) -> ExportPlan:
+        """
+        Describes what saving the workbook would do, without exporting it.
+
+        The workbook is encoded as save() would encode it, so the wire, the
+        fallback location and the payload size are exact; the native build
+        is not run. The plan assumes a native library with PFX2 support.
+
+        Args:
+            max_workers (int, optional): The most native worker threads the
+                export may use. Defaults to the set_native_parallelism
+                setting, else one per CPU core.
+
+        Returns:
+            ExportPlan: The wire format, sheet engines, parallel path, payload
+                and style sizes, and the features that force slow paths.
+        """
+        _check_max_workers(max_workers)
+        if max_workers is None:
+            max_workers = _NATIVE_PARALLELISM
+        workers = max_workers if max_workers is not None else os.cpu_count() or 1
+        return plan_export(self._build_export_data(max_workers=max_workers), workers)
+
+    def compile_template(self, *, max_workers: int | None = None) -> Template:
+        """
+        Compiles the workbook into a reusable template held by the native library.
+
+        The styles and the workbook layout (sheets, column widths, panes,
+        merged cells, tables, charts and the rows written so far) are sent
+        and parsed once. Template.render() then sends only the new rows.
+
+        Args:
+            max_workers (int, optional): The most native worker threads each
+                render may use. Defaults to the set_native_parallelism setting.
+
+        Returns:
+            Template: The compiled template; close it to free the native copy.
+
+        Raises:
+            ValueError: If a cell of the workbook needs the JSON wire.
+            RuntimeError: If the native library does not support templates.
+        """
+        _check_max_workers(max_workers)
+        native = NativeExcelClient(self._read_lib(None), debug=self.DEBUG)
+        if not native.supports_templates:
+            raise RuntimeError('Templates are not supported by this native library.')
+        export_data = self._build_export_data(max_workers=max_workers)
+        try:
+            payload = encode_v2_payload(export_data)
+        except _UseLegacyJSON as exc:
+            raise template_value_error(exc) from None
+        return Template(native, native.compile_template(payload), export_data)
 
     def __getitem__(self, key: str) -> WorkSheet:
         return self.workbook[key]
@@ -293,44 +1216,202 @@ class ExcelDriver:
             raise KeyError(f'{sheet_name} Sheet Does Not Exist.')
 
     def read_lib_and_create_excel(
-        self, lib_path: str = None, ignore_go_panic: bool = True
-    ) -> bytes:
+        self,
+        lib_path: str = None,
+        ignore_go_panic: bool = True,
+        max_workers: int | None = None,
+        progress: ProgressCallback | None = None,
+        cancel: CancelToken | None = None,
+        cache: ExportCache | None = None,
+        return_report: bool = False,
+    ) -> bytes | tuple[bytes, ExportReport]:
         """
         Reads the library and creates the Excel file.
 
         Args:
             lib_path (str, optional): The path to the library. Defaults to None.
             ignore_go_panic (bool): The flag to determine should trigger panic in go.
+            max_workers (int, optional): The most native worker threads this
+                export may use. Defaults to the set_native_parallelism setting.
+            progress (callable, optional): Called as ``progress(sheet,
+                rows_written, bytes_compressed)`` while the export runs, with
+                sheet None while the workbook is compressed.
+            cancel (CancelToken, optional): A token whose ``cancel()`` stops
+                the export with ExportCancelled.
+            cache (ExportCache, optional): Reuse workbooks identical to earlier
+                exports. Defaults to the set_export_cache setting.
+            return_report (bool): Also return an ExportReport of the export.
 
         Returns:
-            bytes: The byte data of the created Excel file.
+            bytes: The byte data of the created Excel file, or with
+                return_report a tuple of it and the ExportReport.
         """
+        _check_max_workers(max_workers)
         catch_panic = 0 if ignore_go_panic is False else 1
         native = NativeExcelClient(self._read_lib(lib_path), debug=self.DEBUG)
-        export_data = self._build_export_data()
-        payload = encode_payload(export_data, force_json=not native.supports_v2_export)
-        self.decoded_bytes = native.export_bytes(payload, catch_panic)
+        report = ExportReport()
+        trace = ExportTrace.from_environment()
+        try:
+            export_data = self._build_export_data(
+                max_workers=max_workers, report=report, trace=trace
+            )
+            if cache is None:
+                cache = _EXPORT_CACHE
+            self._apply_cache_timestamps(export_data, cache)
+            fingerprint = _export_fingerprint(export_data, self._sheet_cache.revisions)
+            payload = self._encode_export_data(
+                export_data, force_json=not native.supports_v2_export, report=report, trace=trace
+            )
+            self._decoded_fingerprint = None
+            if cache is not None:
+                key = cache.key(payload, abi_version=native.abi_version)
+                cached, tier = cache.lookup(key)
+                report.cache = tier or 'miss'
+                if cached is not None:
+                    self.decoded_bytes = cached
+                    self._decoded_fingerprint = fingerprint
+                    report.output_bytes = len(cached)
+                    self.native_report = None
+                    self.export_report = report
+                    return (cached, report) if return_report else cached
+            started = time.perf_counter()
+            with trace_span(trace, 'native export'):
+                self.decoded_bytes = native.export_bytes(
+                    payload, catch_panic, self._sheet_progress(progress), cancel
+                )
+            self._decoded_fingerprint = fingerprint
+            report._record_native(
+                time.perf_counter() - started, native.last_report, len(self.decoded_bytes)
+            )
+            if cache is not None:
+                cache.put(key, self.decoded_bytes)
+        finally:
+            self._write_trace(trace, native.last_report)
+        self.native_report = native.last_report
+        self.export_report = report
+        if return_report:
+            return self.decoded_bytes, report
         return self.decoded_bytes
 
-    def _try_direct_file_export(self, path: str, ignore_go_panic: bool = True) -> bool:
+    def _try_direct_file_export(
+        self,
+        path: str,
+        ignore_go_panic: bool = True,
+        max_workers: int | None = None,
+        progress: ProgressCallback | None = None,
+        cancel: CancelToken | None = None,
+    ) -> bool:
         native = NativeExcelClient(self._read_lib(None), debug=self.DEBUG)
         if not native.supports_direct_file_export:
             return False
 
         catch_panic = 0 if ignore_go_panic is False else 1
-        export_data = self._build_export_data()
-        payload = encode_payload(export_data)
-        native.export_to_file(payload, path, catch_panic)
+        report = ExportReport()
+        trace = ExportTrace.from_environment()
+        try:
+            export_data = self._build_export_data(
+                max_workers=max_workers, report=report, trace=trace
+            )
+            payload = self._encode_export_data(export_data, report=report, trace=trace)
+            started = time.perf_counter()
+            with trace_span(trace, 'native export'):
+                native.export_to_file(
+                    payload, path, catch_panic, self._sheet_progress(progress), cancel
+                )
+            native_seconds = time.perf_counter() - started
+        finally:
+            self._write_trace(trace, native.last_report)
+        try:
+            output_bytes = os.path.getsize(path)
+        except OSError:
+            output_bytes = None
+        report._record_native(native_seconds, native.last_report, output_bytes)
+        self.native_report = native.last_report
+        self.export_report = report
         return True
 
-    def _build_export_data(self) -> dict[str, Any]:
-        self._create_style()
+    def _encode_export_data(
+        self,
+        export_data: dict[str, Any],
+        *,
+        force_json: bool = False,
+        report: ExportReport | None = None,
+        trace: ExportTrace | None = None,
+    ) -> bytes:
+        """Encode export data, reusing the row segments of unchanged sheets."""
+        return encode_payload(
+            export_data,
+            force_json=force_json,
+            report=report,
+            trace=trace,
+            sheet_cache=self._sheet_cache,
+        )
+
+    def _apply_cache_timestamps(
+        self, export_data: dict[str, Any], cache: ExportCache | None
+    ) -> None:
+        if cache is not None and cache.timestamps == 'normalize':
+            export_data['file_props'] = self._normalized_file_props()
+
+    def _decoded_bytes_current(self, max_workers: int | None, cache: ExportCache | None) -> bool:
+        """Whether decoded_bytes still matches the workbook, so save() may reuse it."""
+        if not hasattr(self, 'decoded_bytes') or self._decoded_fingerprint is None:
+            return False
+        export_data = self._build_export_data(max_workers=max_workers)
+        self._apply_cache_timestamps(export_data, cache)
+        fingerprint = _export_fingerprint(export_data, self._sheet_cache.revisions)
+        return fingerprint == self._decoded_fingerprint
+
+    def _sheet_progress(self, progress: ProgressCallback | None):
+        """Adapts a progress callback to the sheet_order indexes the library reports."""
+        if progress is None:
+            return None
+        sheet_names = self._sheet_list
+
+        def report(sheet: int, rows_written: int, bytes_compressed: int) -> None:
+            progress(sheet_names[sheet] if sheet >= 0 else None, rows_written, bytes_compressed)
+
+        return report
+
+    @staticmethod
+    def _write_trace(trace: ExportTrace | None, native_report: dict[str, Any] | None) -> None:
+        """Write a PYFASTEXCEL_TRACE trace with the native spans of the export."""
+        if trace is None:
+            return
+        if native_report is not None:
+            trace.add_native(native_report.pop('trace', []))
+        try:
+            trace.write()
+        except OSError as exc:
+            logger.warning('Could not write the %s trace to %s: %s', TRACE_ENV_VAR, trace.path, exc)
+
+    def _build_export_data(
+        self,
+        max_workers: int | None = None,
+        report: ExportReport | None = None,
+        trace: ExportTrace | None = None,
+    ) -> dict[str, Any]:
+        with trace_span(trace, '_build_export_data'):
+            return self._collect_export_data(max_workers, report, trace)
+
+    def _collect_export_data(
+        self,
+        max_workers: int | None,
+        report: ExportReport | None,
+        trace: ExportTrace | None,
+    ) -> dict[str, Any]:
+        started = time.perf_counter()
+        with trace_span(trace, '_create_style'):
+            self._create_style()
+        styles_built = time.perf_counter()
         workbook_data: dict[str, Any] = {}
 
         # Transfer all WorkSheet objects to the workbook dictionary.
+        revisions = {}
         for sheet in self._sheet_list:
             worksheet = self.workbook[sheet]
             workbook_data[sheet] = worksheet._transfer_to_dict()
+            revisions[sheet] = worksheet._row_revision
             if worksheet._table_list:
                 TableFinalValidation(
                     data=worksheet._data,
@@ -338,13 +1419,29 @@ class ExcelDriver:
                 )
 
         self._dict_wb = workbook_data
-        return {
+        self._sheet_cache.revisions = revisions
+        export_data = {
             'content': workbook_data,
             'file_props': self.file_props,
             'style': self.style._style_map,
             'protection': self.protection,
             'sheet_order': self._sheet_list,
         }
+        export_options = dict(self.export_options)
+        if max_workers is None:
+            max_workers = _NATIVE_PARALLELISM
+        if max_workers is not None:
+            export_options['max_workers'] = max_workers
+        if trace is not None:
+            export_options['trace'] = True
+        if self.deterministic:
+            export_options['deterministic'] = True
+        if export_options:
+            export_data['export_options'] = export_options
+        if report is not None:
+            report.stages['styles'] = styles_built - started
+            report.stages['export_data'] = time.perf_counter() - styles_built
+        return export_data
 
     def _read_lib(self, lib_path: str) -> ctypes.CDLL:  # pragma: no cover
         """
@@ -356,28 +1453,26 @@ class ExcelDriver:
         Returns:
             ctypes.CDLL: The library object.
         """
-        if lib_path is None:
-            if sys.platform.startswith('linux'):
-                lib_path = str(list(BASE_DIR.glob('**/*.so'))[0])
-            elif sys.platform.startswith('win32'):
-                lib_path = str(list(BASE_DIR.glob('**/*.dll'))[0])
-            elif sys.platform.startswith('darwin'):
-                lib_path = str(list(BASE_DIR.glob('**/*.dylib'))[0])
-
-        # On macOS, there is no winmode parameter, so we should not pass it
-        if sys.platform.startswith('win32') or sys.platform.startswith('linux'):
-            lib = ctypes.CDLL(lib_path, winmode=0)
-        else:
-            lib = ctypes.CDLL(lib_path)
-        return lib
+        return _load_native_library(lib_path)
 
     def _get_default_file_props(self) -> dict[str, str]:
-        now = datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+        if self.deterministic:
+            now = CACHE_TIMESTAMP
+        else:
+            now = datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
         file_props = self._FILE_PROPS.copy()
         file_props['Created'] = now
         file_props['Modified'] = now
         return file_props
 
+    def _normalized_file_props(self) -> dict[str, str]:
+        """File props with the default timestamps replaced by CACHE_TIMESTAMP."""
+        file_props = dict(self.file_props)
+        for key in ('Created', 'Modified'):
+            if file_props.get(key) == self._file_props_time:
+                file_props[key] = CACHE_TIMESTAMP
+        return file_props
+
     def _get_style_collections(self) -> dict[str, CustomStyle]:
         """
         Gets collections of custom styles.
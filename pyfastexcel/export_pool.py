@@ -0,0 +1,300 @@
+from __future__ import annotations
+
+import multiprocessing
+import os
+import queue
+from multiprocessing import shared_memory
+from multiprocessing.connection import Connection
+from typing import Any
+
+from .driver import ExcelDriver, NativeExcelClient, _check_max_workers, _load_native_library
+from .wire import encode_payload
+
+# Seconds a stopping worker gets to exit before it is terminated.
+_STOP_TIMEOUT = 5
+
+
+def _write_shared(data: bytes) -> shared_memory.SharedMemory:
+    block = shared_memory.SharedMemory(create=True, size=max(len(data), 1))
+    block.buf[: len(data)] = data
+    return block
+
+
+def _read_shared(name: str, size: int, *, unlink: bool = False) -> bytes:
+    block = shared_memory.SharedMemory(name=name)
+    try:
+        with block.buf[:size] as view:
+            return bytes(view)
+    finally:
+        block.close()
+        if unlink:
+            block.unlink()
+
+
+def _serve_exports(connection: Connection, native: NativeExcelClient) -> None:
+    """
+    Answers export requests from ``connection`` until it sends None or closes.
+
+    A request is ``(payload block name, payload size, path)``. With a path the
+    workbook is saved there; without one it is put in a new shared memory
+    block, which the requester reads and unlinks. Replies are
+    ``(kind, detail, size, report)`` where kind is ``'saved'``,
+    ``'workbook'`` (detail names the block) or ``'error'`` (detail is the
+    message).
+    """
+    connection.send(native.supports_v2_export)
+    while True:
+        try:
+            request = connection.recv()
+        except EOFError:
+            return
+        if request is None:
+            return
+        name, size, path = request
+        try:
+            payload = _read_shared(name, size)
+            if path is not None and native.supports_direct_file_export:
+                native.export_to_file(payload, path, 1)
+                connection.send(('saved', None, 0, native.last_report))
+                continue
+            workbook = native.export_bytes(payload, 1)
+            if path is not None:
+                with open(path, 'wb') as file:
+                    file.write(workbook)
+                connection.send(('saved', None, 0, native.last_report))
+                continue
+            block = _write_shared(workbook)
+            block.close()
+            connection.send(('workbook', block.name, len(workbook), native.last_report))
+        except Exception as error:
+            connection.send(('error', str(error), 0, None))
+
+
+def _export_worker_main(connection: Connection, lib_path: str | None) -> None:  # pragma: no cover
+    _serve_exports(connection, NativeExcelClient(_load_native_library(lib_path)))
+
+
+class _ExportWorker:
+    """One worker process and the parent's end of its pipe."""
+
+    def __init__(self, context, lib_path: str | None, timeout: float | None = None) -> None:
+        self.context = context
+        self.lib_path = lib_path
+        self.timeout = timeout
+        self.connection: Connection | None = None
+        self.process = None
+        self.supports_v2_export = True
+
+    def start(self) -> None:
+        self.connection, child = self.context.Pipe()
+        self.process = self.context.Process(
+            target=_export_worker_main,
+            args=(child, self.lib_path),
+            name='pyfastexcel-export',
+            daemon=True,
+        )
+        self.process.start()
+        child.close()
+
+    def wait_ready(self) -> None:
+        try:
+            self.supports_v2_export = self.connection.recv()
+        except (EOFError, OSError) as error:
+            raise self._exited('before it was ready') from error
+
+    def ensure_running(self) -> None:
+        if self.process is None or not self.process.is_alive():
+            self.stop()
+            self.start()
+            self.wait_ready()
+
+    def request(self, payload: bytes, path: str | None) -> tuple[bytes | None, Any]:
+        block = _write_shared(payload)
+        try:
+            self.connection.send((block.name, len(payload), path))
+            # poll returns early when the worker exits, so recv raises EOFError.
+            if not self.connection.poll(self.timeout):
+                self.terminate()
+                raise RuntimeError(
+                    f'pyfastexcel export worker did not finish within {self.timeout} '
+                    'seconds and was stopped.'
+                )
+            kind, detail, size, report = self.connection.recv()
+        except (EOFError, OSError) as error:
+            raise self._exited('during an export') from error
+        finally:
+            block.close()
+            block.unlink()
+        if kind == 'error':
+            raise RuntimeError(detail)
+        if kind == 'saved':
+            return None, report
+        return _read_shared(detail, size, unlink=True), report
+
+    def _exited(self, when: str) -> RuntimeError:
+        self.process.join(_STOP_TIMEOUT)
+        return RuntimeError(
+            f'pyfastexcel export worker exited with code {self.process.exitcode} {when}.'
+        )
+
+    def terminate(self) -> None:
+        """Ends a worker that does not answer; ensure_running starts a new one."""
+        self.process.terminate()
+        self.process.join()
+        self.stop()
+
+    def stop(self) -> None:
+        if self.connection is not None:
+            try:
+                self.connection.send(None)
+            except (OSError, ValueError):
+                pass
+            self.connection.close()
+            self.connection = None
+        if self.process is not None:
+            self.process.join(_STOP_TIMEOUT)
+            if self.process.is_alive():
+                self.process.terminate()
+                self.process.join()
+            self.process = None
+
+
+class ExportPool:
+    """
+    Exports workbooks in long-lived worker processes.
+
+    Each worker loads the native library once and exports one workbook at a
+    time. Payloads and generated workbooks travel through
+    ``multiprocessing.shared_memory``. A Go panic, a fatal error or running
+    out of memory only ends the worker, not the calling process: the export
+    raises ``RuntimeError`` and the worker is started again on its next
+    export. So does an export that outlasts ``timeout``: its worker is
+    terminated. The pool is safe to share between threads.
+
+    Workers are started with the ``spawn`` method, so scripts that create a
+    pool need the usual ``if __name__ == '__main__':`` guard.
+    """
+
+    def __init__(
+        self,
+        processes: int | None = None,
+        *,
+        lib_path: str | None = None,
+        timeout: float | None = None,
+    ) -> None:
+        """
+        Starts the worker processes.
+
+        Args:
+            processes (int, optional): The number of worker processes.
+                Defaults to the number of CPUs.
+            lib_path (str, optional): The path to the library. Defaults to the
+                bundled one.
+            timeout (float, optional): The most seconds one export may take
+                before its worker is terminated. Defaults to no limit.
+        """
+        _check_max_workers(processes, 'processes')
+        if timeout is not None and not timeout > 0:
+            raise ValueError('timeout must be a positive number of seconds or None.')
+        context = multiprocessing.get_context('spawn')
+        self._workers = [
+            _ExportWorker(context, lib_path, timeout)
+            for _ in range(processes or os.cpu_count() or 1)
+        ]
+        self._idle: queue.SimpleQueue[_ExportWorker] = queue.SimpleQueue()
+        self._closed = False
+        try:
+            for worker in self._workers:
+                worker.start()
+            for worker in self._workers:
+                worker.wait_ready()
+        except BaseException:
+            for worker in self._workers:
+                worker.stop()
+            raise
+        for worker in self._workers:
+            self._idle.put(worker)
+
+    @property
+    def processes(self) -> int:
+        return len(self._workers)
+
+    def export(self, workbook: ExcelDriver, *, max_workers: int | None = None) -> bytes:
+        """
+        Exports a workbook in a worker process.
+
+        Args:
+            workbook (ExcelDriver): The workbook to export.
+            max_workers (int, optional): The most native worker threads the
+                export may use inside its worker process.
+
+        Returns:
+            bytes: The byte data of the created Excel file.
+        """
+        workbook_bytes, _report = self._run(workbook, None, max_workers)
+        return workbook_bytes
+
+    def save(
+        self,
+        workbook: ExcelDriver,
+        path: str | os.PathLike[str],
+        *,
+        max_workers: int | None = None,
+    ) -> None:
+        """
+        Saves a workbook to a file from a worker process.
+
+        Args:
+            workbook (ExcelDriver): The workbook to save.
+            path (str | os.PathLike[str]): A path to save the file.
+            max_workers (int, optional): The most native worker threads the
+                export may use inside its worker process.
+        """
+        path = os.fspath(path)
+        if not isinstance(path, str):
+            raise TypeError(f'ExportPool paths must be str or os.PathLike[str], got {path!r}')
+        if '\x00' in path:
+            raise ValueError('embedded null byte')
+        self._run(workbook, os.path.abspath(path), max_workers)
+
+    def _run(
+        self,
+        workbook: ExcelDriver,
+        path: str | None,
+        max_workers: int | None,
+    ) -> tuple[bytes | None, Any]:
+        _check_max_workers(max_workers)
+        if self._closed:
+            raise RuntimeError('ExportPool is closed.')
+        export_data = workbook._build_export_data(max_workers=max_workers)
+        worker = self._idle.get()
+        try:
+            if self._closed:
+                raise RuntimeError('ExportPool is closed.')
+            worker.ensure_running()
+            payload = encode_payload(
+                export_data,
+                force_json=not worker.supports_v2_export,
+                sheet_cache=workbook._sheet_cache,
+            )
+            result, report = worker.request(payload, path)
+        finally:
+            self._idle.put(worker)
+        workbook.native_report = report
+        return result, report
+
+    def close(self) -> None:
+        """Waits for running exports, then stops every worker process."""
+        if self._closed:
+            return
+        self._closed = True
+        workers = [self._idle.get() for _ in self._workers]
+        for worker in workers:
+            worker.stop()
+            self._idle.put(worker)
+
+    def __enter__(self) -> ExportPool:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
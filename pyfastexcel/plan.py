@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import os
+import struct
+from dataclasses import dataclass, field
+from typing import Any
+
+import msgspec
+
+from .report import ExportReport
+from .wire import MAX_WIRE_METADATA_BYTES, WIRE_MAGIC, encode_payload
+
+# Mirrors of the native scheduler: PYFASTEXCEL_SEQUENTIAL disables the
+# parallel sheet path, and stream sheets of at least splitSheetMinRows rows
+# may be split across two workers (core/schedule.go).
+SEQUENTIAL_ENV_VAR = 'PYFASTEXCEL_SEQUENTIAL'
+_SPLIT_SHEET_MIN_ROWS = 1 << 16
+
+
+@dataclass
+class SheetPlan:
+    """
+    How the native library will write one sheet.
+
+    ### Attributes:
+        name (str): The sheet name.
+        engine (str): ``'StreamWriter'`` or ``'NormalWriter'``.
+        rows (int): The rows the sheet holds.
+        split (bool): Whether one worker decodes the rows while another
+            writes them.
+    """
+
+    name: str
+    engine: str
+    rows: int
+    split: bool = False
+
+
+@dataclass
+class ExportPlan:
+    """
+    Describes what an export would do, without running the native build.
+
+    ### Attributes:
+        wire (str): The payload format, ``'pfx2'`` or ``'json'``.
+        fallback_reason (str | None): Why the export would fall back to the
+            JSON wire, or None if it would not.
+        fallback_sheet (str | None): The sheet of the cell that causes the
+            fallback.
+        fallback_row (int | None): The 1-based row of that cell.
+        fallback_column (int | None): The 1-based column of that cell.
+        payload_bytes (int): The size of the payload sent to the library.
+        metadata_bytes (int | None): The size of the PFX2 metadata, which
+            must stay under ``MAX_WIRE_METADATA_BYTES``; None for JSON.
+        careful_rows (int): Rows the PFX2 encoder checks cell by cell.
+        styles (int): Named styles sent to the library.
+        distinct_styles (int): Styles left once identical definitions are
+            merged, which is what the workbook stores.
+        parallel (bool): Whether stream sheets are written by the native
+            worker pool.
+        workers (int): The native workers the export may use.
+        sheets (list[SheetPlan]): The sheets, in order.
+        slow_paths (list[str]): Features that make the export slower, each
+            with the sheet or setting that causes it.
+    """
+
+    wire: str
+    fallback_reason: str | None
+    fallback_sheet: str | None
+    fallback_row: int | None
+    fallback_column: int | None
+    payload_bytes: int
+    metadata_bytes: int | None
+    careful_rows: int
+    styles: int
+    distinct_styles: int
+    parallel: bool
+    workers: int
+    sheets: list[SheetPlan] = field(default_factory=list)
+    slow_paths: list[str] = field(default_factory=list)
+
+
+def plan_export(export_data: dict[str, Any], workers: int) -> ExportPlan:
+    """Plan the export of ``export_data`` on at most ``workers`` native workers."""
+    report = ExportReport()
+    payload = encode_payload(export_data, report=report)
+    metadata_bytes = None
+    if report.wire == 'pfx2':
+        metadata_bytes = struct.unpack('>Q', payload[len(WIRE_MAGIC) : len(WIRE_MAGIC) + 8])[0]
+
+    sheets = [
+        SheetPlan(
+            name=name,
+            engine=export_data['content'][name].get('WriterEngine', 'StreamWriter'),
+            rows=len(export_data['content'][name].get('Data', [])),
+        )
+        for name in export_data['sheet_order']
+    ]
+    stream_sheets = [sheet for sheet in sheets if sheet.engine == 'StreamWriter']
+    sequential = bool(os.getenv(SEQUENTIAL_ENV_VAR))
+    parallel = report.wire == 'pfx2' and len(stream_sheets) > 1 and not sequential
+    if parallel and workers >= 2:
+        total_rows = sum(sheet.rows for sheet in stream_sheets)
+        for sheet in stream_sheets:
+            sheet.split = sheet.rows >= _SPLIT_SHEET_MIN_ROWS and sheet.rows * workers > total_rows
+
+    styles = export_data['style']
+    distinct_styles = len({msgspec.json.encode(definition) for definition in styles.values()})
+    return ExportPlan(
+        wire=report.wire,
+        fallback_reason=report.fallback_reason,
+        fallback_sheet=report.fallback_sheet,
+        fallback_row=report.fallback_row,
+        fallback_column=report.fallback_column,
+        payload_bytes=report.payload_bytes,
+        metadata_bytes=metadata_bytes,
+        careful_rows=report.careful_rows,
+        styles=len(styles),
+        distinct_styles=distinct_styles,
+        parallel=parallel,
+        workers=workers,
+        sheets=sheets,
+        slow_paths=_slow_paths(report, sheets, sequential),
+    )
+
+
+def _slow_paths(report: ExportReport, sheets: list[SheetPlan], sequential: bool) -> list[str]:
+    slow_paths = []
+    if report.fallback_reason is not None:
+        location = ''
+        if report.fallback_sheet is not None:
+            location = f' (sheet {report.fallback_sheet!r}, row {report.fallback_row}'
+            if report.fallback_column is not None:
+                location += f', column {report.fallback_column}'
+            location += ')'
+        if report.fallback_reason == 'workbook metadata exceeds the PFX2 limit':
+            location = f' ({MAX_WIRE_METADATA_BYTES} bytes)'
+        slow_paths.append(
+            f'JSON wire: {report.fallback_reason}{location}; rows are sent as JSON '
+            'and every sheet is written sequentially'
+        )
+    for sheet in sheets:
+        if sheet.engine == 'NormalWriter':
+            slow_paths.append(
+                f'sheet {sheet.name!r} uses NormalWriter: it is written cell by cell '
+                'before the parallel sheet writers start'
+            )
+    if report.careful_rows:
+        slow_paths.append(
+            f'{report.careful_rows} rows need the careful PFX2 encoder '
+            '(uncommon value types or styles)'
+        )
+    if sequential:
+        slow_paths.append(f'{SEQUENTIAL_ENV_VAR} disables parallel sheet writing')
+    return slow_paths
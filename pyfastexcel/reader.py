@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+import array
+import os
+import sys
+from collections.abc import Iterator, Mapping
+from typing import Any
+
+import msgspec
+
+from . import driver
+from .driver import NativeExcelClient
+
+# Rows decoded per native call. A chunk is the most the reader holds at once,
+# on either side of the boundary.
+DEFAULT_CHUNK_ROWS = 1024
+
+_chunk_decoder = msgspec.msgpack.Decoder(list[list[str]])
+_text_decoder = msgspec.msgpack.Decoder(list[str])
+
+# Column types read_columns decodes into, with their array.array typecode and
+# little-endian NumPy dtype; str columns are lists.
+_COLUMN_TYPES = {
+    'float64': ('d', '<f8'),
+    'int64': ('q', '<i8'),
+    'bool': ('b', '?'),
+    'str': (None, None),
+}
+_COLUMN_TYPE_ALIASES = {float: 'float64', int: 'int64', bool: 'bool', str: 'str'}
+
+_COLUMN_ALIGNMENT = 8
+
+
+def read_rows(
+    path: str | os.PathLike[str],
+    sheet: str | None = None,
+    *,
+    raw: bool = True,
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+    lib_path: str | None = None,
+) -> Iterator[list[str]]:
+    """
+    Reads the rows of a worksheet with the native library.
+
+    The rows are streamed: the native library decodes ``chunk_rows`` rows at a
+    time and hands them over in one MessagePack chunk, so memory use does not
+    grow with the sheet. Each row is a list of cell values as strings, with
+    ``''`` for empty cells and trailing empty cells left out; empty rows are
+    yielded as ``[]``. The workbook stays open until the generator is
+    exhausted or closed.
+
+    Args:
+        path (str | PathLike): The workbook to read.
+        sheet (str, optional): The worksheet to read. Defaults to the first one.
+        raw (bool): Return values as stored, such as ``'0.5'`` and date serial
+            numbers. False applies the cells' number formats as Excel shows
+            them, such as ``'50%'``.
+        chunk_rows (int): The rows decoded per native call.
+        lib_path (str, optional): The path to the library. Defaults to the
+            bundled one.
+
+    Returns:
+        Iterator[list[str]]: The cell values of each row, starting from row 1.
+
+    Raises:
+        ValueError: If chunk_rows is not a positive integer.
+        RuntimeError: If the native library predates reading, or the workbook
+            or sheet cannot be read.
+    """
+    if not isinstance(chunk_rows, int) or isinstance(chunk_rows, bool) or chunk_rows < 1:
+        raise ValueError('chunk_rows must be a positive integer.')
+    path = os.fspath(path)
+    if '\x00' in os.fsdecode(path) or (sheet is not None and '\x00' in sheet):
+        raise ValueError('embedded null byte')
+    native = NativeExcelClient(driver._load_native_library(lib_path))
+    if not native.supports_reading:
+        raise RuntimeError('Reading is not supported by this native library.')
+    return _stream_rows(native, path, sheet, chunk_rows, raw)
+
+
+def _stream_rows(
+    native: NativeExcelClient,
+    path: str,
+    sheet: str | None,
+    chunk_rows: int,
+    raw: bool,
+) -> Iterator[list[str]]:
+    # The workbook is opened on the first next(), so a generator that is never
+    # started holds nothing to close.
+    handle = native.open_row_reader(path, sheet, chunk_rows, raw)
+    try:
+        while (chunk := native.read_row_chunk(handle)) is not None:
+            yield from _chunk_decoder.decode(chunk)
+    finally:
+        native.close_row_reader(handle)
+
+
+def read_columns(
+    path: str | os.PathLike[str],
+    sheet: str | None = None,
+    dtypes: Mapping[str, str | type] | None = None,
+    *,
+    header: bool = True,
+    numpy: bool = False,
+    lib_path: str | None = None,
+) -> dict[str, Any]:
+    """
+    Reads worksheet columns into typed arrays with the native library.
+
+    The native library decodes every cell of the selected columns into one
+    contiguous buffer per column, so no Python object is created per number.
+    Cells are read as stored, without number formats: dates arrive as serial
+    numbers. Empty ``float64`` cells become NaN; empty or unparsable cells of
+    the other numeric types raise an error naming the cell.
+
+    Args:
+        path (str | PathLike): The workbook to read.
+        sheet (str, optional): The worksheet to read. Defaults to the first one.
+        dtypes (Mapping[str, str | type], optional): The columns to read and
+            their types: ``'float64'``, ``'int64'``, ``'bool'`` or ``'str'``,
+            or ``float``, ``int``, ``bool`` and ``str``. Keys are header
+            names, or column letters such as ``'A'`` with ``header=False``.
+            Defaults to every column as ``str``.
+        header (bool): Take the column names from the first row.
+        numpy (bool): Return NumPy arrays instead of ``array.array``.
+        lib_path (str, optional): The path to the library. Defaults to the
+            bundled one.
+
+    Returns:
+        dict[str, Any]: The columns in the order of ``dtypes``. Numeric and
+            boolean columns are ``array.array`` (typecodes ``'d'``, ``'q'``
+            and ``'b'``) or NumPy arrays; ``str`` columns are lists.
+
+    Raises:
+        ValueError: If a dtype is not supported.
+        ImportError: If ``numpy=True`` and NumPy is not installed.
+        RuntimeError: If the native library predates column reads, or the
+            workbook, sheet or a cell cannot be read.
+    """
+    columns = None
+    if dtypes is not None:
+        columns = [{'key': key, 'dtype': _column_type(key, dtype)} for key, dtype in dtypes.items()]
+    if numpy:
+        import numpy as np
+    path = os.fspath(path)
+    if '\x00' in os.fsdecode(path) or (sheet is not None and '\x00' in sheet):
+        raise ValueError('embedded null byte')
+
+    native = NativeExcelClient(driver._load_native_library(lib_path))
+    result = native.read_columns(path, sheet, {'header': header, 'columns': columns})
+    metadata_length = int.from_bytes(result[:8], 'little')
+    metadata = msgspec.json.decode(result[8 : 8 + metadata_length])
+    data_start = -(-(8 + metadata_length) // _COLUMN_ALIGNMENT) * _COLUMN_ALIGNMENT
+    view = memoryview(result)
+
+    decoded = {}
+    for column in metadata['columns']:
+        start = data_start + column['offset']
+        typecode, numpy_dtype = _COLUMN_TYPES[column['dtype']]
+        if typecode is None:
+            values = _text_decoder.decode(view[start : start + column['length']])
+        elif numpy:
+            values = np.frombuffer(result, dtype=numpy_dtype, count=metadata['rows'], offset=start)
+        else:
+            values = array.array(typecode)
+            values.frombytes(view[start : start + column['length']])
+            if sys.byteorder == 'big' and values.itemsize > 1:
+                values.byteswap()
+        decoded[column['name']] = values
+    return decoded
+
+
+def _column_type(key: str, dtype: str | type) -> str:
+    name = _COLUMN_TYPE_ALIASES.get(dtype, dtype) if isinstance(dtype, type) else dtype
+    if name not in _COLUMN_TYPES:
+        raise ValueError(
+            f'Invalid dtype for column {key!r} ({dtype!r}). '
+            "Expected 'float64', 'int64', 'bool' or 'str'."
+        )
+    return name
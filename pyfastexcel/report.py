@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any
+
+
+@dataclass
+class ExportReport:
+    """
+    Describes how one export ran and where its time went.
+
+    ### Attributes:
+        wire (str): The payload format sent to the native library, ``'pfx2'``
+            or ``'json'``.
+        fallback_reason (str | None): Why the export fell back to the JSON
+            wire, or None if it did not.
+        fallback_sheet (str | None): The sheet of the cell that caused the
+            fallback.
+        fallback_row (int | None): The 1-based row of that cell.
+        fallback_column (int | None): The 1-based column of that cell.
+        fast_rows (int): Rows the PFX2 encoder passed through its fast path.
+        careful_rows (int): Rows that needed the careful, exact encoder.
+        reused_sheets (int): Sheets whose rows were unchanged since the last
+            export of the workbook, so their encoded rows were reused.
+        payload_bytes (int): The size of the payload sent to the library.
+        output_bytes (int | None): The size of the generated workbook.
+        stages (dict[str, float]): Seconds spent per stage: ``styles``,
+            ``export_data``, ``encode``, ``native`` (the whole native call),
+            ``native_build`` and ``compression`` (its parts, ABI v3 and
+            later) and ``file_write`` (Python writing the workbook bytes).
+        native (dict | None): The native library's own report, including
+            spill counters; None for libraries older than ABI v3.
+        cache (str | None): ``'memory'`` or ``'disk'`` when an ExportCache
+            returned the workbook, ``'miss'`` when it did not, ``'reused'``
+            when save() wrote the bytes of the unchanged workbook's last
+            export, None otherwise.
+    """
+
+    wire: str = 'json'
+    fallback_reason: str | None = None
+    fallback_sheet: str | None = None
+    fallback_row: int | None = None
+    fallback_column: int | None = None
+    fast_rows: int = 0
+    careful_rows: int = 0
+    reused_sheets: int = 0
+    payload_bytes: int = 0
+    output_bytes: int | None = None
+    stages: dict[str, float] = field(default_factory=dict)
+    native: dict[str, Any] | None = None
+    cache: str | None = None
+
+    @property
+    def parallel(self) -> bool | None:
+        """Whether the library wrote sheets in parallel; None if it did not say."""
+        if self.native is None or 'build' not in self.native:
+            return None
+        return self.native['build'] == 'parallel'
+
+    def _record_native(
+        self,
+        seconds: float,
+        native_report: dict[str, Any] | None,
+        output_bytes: int | None,
+    ) -> None:
+        self.stages['native'] = seconds
+        self.native = native_report
+        if native_report is not None and 'build_ns' in native_report:
+            self.stages['native_build'] = native_report['build_ns'] / 1e9
+            self.stages['compression'] = native_report['write_ns'] / 1e9
+            output_bytes = native_report.get('output_bytes', output_bytes)
+        self.output_bytes = output_bytes
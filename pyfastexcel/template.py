@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import os
+import time
+import weakref
+from collections.abc import Mapping, Sequence
+from typing import TYPE_CHECKING, Any
+
+import msgspec
+
+from .report import ExportReport
+from .utils import validate_and_format_value
+from .wire import _encode_styled_row, _UseLegacyJSON, encode_sheet_rows
+
+if TYPE_CHECKING:
+    from .driver import NativeExcelClient
+
+
+def template_value_error(exc: _UseLegacyJSON) -> ValueError:
+    """Describe a cell that templates cannot send, which need the PFX2 wire."""
+    location = ''
+    if exc.sheet is not None:
+        location = f' (sheet {exc.sheet!r}, row {exc.row}'
+        if exc.column is not None:
+            location += f', column {exc.column}'
+        location += ')'
+    return ValueError(f'Templates need the PFX2 wire: {exc.reason}{location}.')
+
+
+def _encode_plain_styled_row(row: Any, style_ids: dict[str, int]) -> list[Any]:
+    """Give plain cells of a styled sheet the default style, as cell assignment does."""
+    return _encode_styled_row(
+        [
+            cell
+            if cell is None or isinstance(cell, (list, tuple))
+            else validate_and_format_value(cell)
+            for cell in row
+        ],
+        style_ids,
+    )
+
+
+class Template:
+    """
+    A workbook compiled once by the native library and rendered with new rows.
+
+    Created by ``Workbook.compile_template()``. The native copy holds the
+    styles, the layout and the rows the workbook had when it was compiled;
+    ``render`` appends rows after them. Renders may run concurrently.
+    """
+
+    def __init__(self, native: NativeExcelClient, handle: int, export_data: dict[str, Any]):
+        self._native = native
+        self._handle = handle
+        self._sheets = [
+            (name, bool(export_data['content'][name].get('NoStyle', False)))
+            for name in export_data['sheet_order']
+        ]
+        self._style_ids = {name: index for index, name in enumerate(export_data['style'])}
+        self._finalizer = weakref.finalize(self, native.release_template, handle)
+
+    @property
+    def sheet_list(self) -> list[str]:
+        return [name for name, _ in self._sheets]
+
+    @property
+    def closed(self) -> bool:
+        return not self._finalizer.alive
+
+    def render(
+        self,
+        rows_by_sheet: Mapping[str, Sequence[Sequence[Any]]],
+        path: str | os.PathLike[str],
+        *,
+        return_report: bool = False,
+    ) -> ExportReport | None:
+        """
+        Writes the template to a file with new rows appended to its sheets.
+
+        Args:
+            rows_by_sheet (Mapping[str, Sequence[Sequence[Any]]]): The new
+                rows of each sheet. Cells of styled sheets are values or
+                ``(value, style_name)`` pairs of styles the workbook had when
+                it was compiled. Sheets left out get no new rows.
+            path (str | os.PathLike): A path to save the file.
+            return_report (bool): Return an ExportReport of the render.
+
+        Raises:
+            KeyError: If a sheet is not in the template.
+            ValueError: If a cell needs the JSON wire, which templates do not
+                use, or names an unknown style.
+        """
+        if self.closed:
+            raise RuntimeError('The template is closed.')
+        sheet_names = set(self.sheet_list)
+        for name in rows_by_sheet:
+            if name not in sheet_names:
+                raise KeyError(f'{name} Sheet Does Not Exist.')
+
+        report = ExportReport(wire='pfx2')
+        started = time.perf_counter()
+        row_stream = bytearray()
+        row_counts: list[int] = []
+        row_offsets: list[int] = []
+        encode_into = msgspec.msgpack.Encoder().encode_into
+        try:
+            for name, no_style in self._sheets:
+                rows = rows_by_sheet.get(name, ())
+                row_offsets.append(len(row_stream))
+                row_counts.append(len(rows))
+                report.careful_rows += encode_sheet_rows(
+                    name,
+                    rows,
+                    no_style,
+                    self._style_ids,
+                    encode_into,
+                    row_stream,
+                    _encode_plain_styled_row,
+                )
+        except _UseLegacyJSON as exc:
+            raise template_value_error(exc) from None
+        report.fast_rows = sum(row_counts) - report.careful_rows
+        report.payload_bytes = len(row_stream)
+        report.stages['encode'] = time.perf_counter() - started
+
+        path = os.fspath(path)
+        if '\x00' in os.fsdecode(path):
+            raise ValueError('embedded null byte')
+        started = time.perf_counter()
+        native_report = self._native.render_template(
+            self._handle, bytes(row_stream), row_counts, row_offsets, path
+        )
+        try:
+            output_bytes = os.path.getsize(path)
+        except OSError:
+            output_bytes = None
+        report._record_native(time.perf_counter() - started, native_report, output_bytes)
+        return report if return_report else None
+
+    def close(self) -> None:
+        """Frees the native copy of the template. Closing twice does nothing."""
+        self._finalizer()
+
+    def __enter__(self) -> Template:
+        return self
+
+    def __exit__(self, *_exc_info) -> None:
+        self.close()
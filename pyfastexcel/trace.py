@@ -0,0 +1,101 @@
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager, nullcontext
+from typing import Any, ContextManager
+
+TRACE_ENV_VAR = 'PYFASTEXCEL_TRACE'
+
+# Chrome trace pids of the two processes the viewer shows: the Python side
+# with one lane per thread, and the native library with one lane per
+# goroutine role.
+PYTHON_PID = 1
+NATIVE_PID = 2
+
+
+def trace_path() -> str | None:
+    """Return the file PYFASTEXCEL_TRACE asks exports to trace to, if any."""
+    return os.getenv(TRACE_ENV_VAR) or None
+
+
+class ExportTrace:
+    """
+    Collects the spans of one export as Chrome trace events.
+
+    Timestamps are Unix microseconds on both sides of the library boundary,
+    so the native spans returned in the export report line up with the
+    Python spans in chrome://tracing or Perfetto.
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.events: list[dict[str, Any]] = []
+        self._threads: dict[int, str] = {}
+
+    @classmethod
+    def from_environment(cls) -> ExportTrace | None:
+        path = trace_path()
+        return cls(path) if path is not None else None
+
+    @contextmanager
+    def span(self, name: str, **args: Any) -> Iterator[None]:
+        timestamp = time.time_ns() // 1000
+        started = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            thread_id = threading.get_native_id()
+            self._threads.setdefault(thread_id, threading.current_thread().name)
+            event = {
+                'name': name,
+                'cat': 'python',
+                'ph': 'X',
+                'ts': timestamp,
+                'dur': (time.perf_counter_ns() - started) // 1000,
+                'pid': PYTHON_PID,
+                'tid': thread_id,
+            }
+            if args:
+                event['args'] = args
+            self.events.append(event)
+
+    def add_native(self, events: list[dict[str, Any]]) -> None:
+        """Add the events of a native export report to the native process."""
+        self.events.extend({**event, 'pid': NATIVE_PID} for event in events)
+
+    def write(self) -> None:
+        """Write the trace to its path, replacing the trace of any earlier export."""
+        metadata: list[dict[str, Any]] = [
+            _metadata('process_name', PYTHON_PID, 0, 'pyfastexcel (Python)'),
+            _metadata('process_name', NATIVE_PID, 0, 'pyfastexcel native (Go)'),
+        ]
+        metadata.extend(
+            _metadata('thread_name', PYTHON_PID, thread_id, name)
+            for thread_id, name in self._threads.items()
+        )
+        document = {'traceEvents': metadata + self.events, 'displayTimeUnit': 'ms'}
+        directory = os.path.dirname(os.path.abspath(self.path))
+        descriptor, temporary = tempfile.mkstemp(prefix='.pyfastexcel-trace-', dir=directory)
+        try:
+            with os.fdopen(descriptor, 'w', encoding='utf-8') as file:
+                json.dump(document, file)
+            os.replace(temporary, self.path)
+        except BaseException:
+            os.unlink(temporary)
+            raise
+
+
+def trace_span(trace: ExportTrace | None, name: str, **args: Any) -> ContextManager[None]:
+    """Return a span of ``trace``, or a no-op context when tracing is off."""
+    if trace is None:
+        return nullcontext()
+    return trace.span(name, **args)
+
+
+def _metadata(name: str, pid: int, tid: int, value: str) -> dict[str, Any]:
+    return {'name': name, 'ph': 'M', 'pid': pid, 'tid': tid, 'args': {'name': value}}
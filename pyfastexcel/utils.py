@@ -4,13 +4,16 @@ import logging
 import re
 import string
 import warnings
-from typing import Any, Literal
+from typing import TYPE_CHECKING, Any, Literal
 
 # from dataclasses import dataclass
 from pydantic.dataclasses import dataclass
 
 from .style import CustomStyle
 
+if TYPE_CHECKING:
+    from .cache import ExportCache
+
 warnings.simplefilter('always', DeprecationWarning)
 
 
@@ -61,9 +64,10 @@ def set_zip_compression_level(level: int | None) -> None:  # noqa: D213
 
     Levels 1-9 switch the native library to klauspost/compress: 1 is fastest,
     9 is smallest. Level 6 writes the reference 1.5M-cell workload about 3x
-    faster than the default for roughly 20% larger files. ``None`` keeps the
-    Go standard library compressor, which produces the same archives as
-    previous releases.
+    faster than the default for roughly 20% larger files. Level 0 stores the
+    archive parts without compression, for output that is re-compressed or
+    consumed on the same host anyway. ``None`` keeps the Go standard library
+    compressor, which produces the same archives as previous releases.
 
     The native library reads this setting once, at the first export of the
     process, so call this before the first ``save()``.
@@ -71,13 +75,13 @@ def set_zip_compression_level(level: int | None) -> None:  # noqa: D213
     Parameters
     ----------
     level : int | None
-        Compression level from 1 to 9, or None for the backward-compatible
-        default.
+        Compression level from 0 (store) to 9, or None for the
+        backward-compatible default.
 
     Raises
     ------
     ValueError
-        If level is not None and not an integer from 1 to 9.
+        If level is not None and not an integer from 0 to 9.
     RuntimeError
         If a workbook was already exported in this process, because the
         setting can no longer take effect.
@@ -87,8 +91,8 @@ def set_zip_compression_level(level: int | None) -> None:  # noqa: D213
 
     from . import driver
 
-    if level is not None and (not isinstance(level, int) or not 1 <= level <= 9):
-        raise ValueError(f'Invalid zip compression level ({level!r}). Expected 1-9 or None.')
+    if level is not None and (not isinstance(level, int) or not 0 <= level <= 9):
+        raise ValueError(f'Invalid zip compression level ({level!r}). Expected 0-9 or None.')
     if driver.native_export_started():
         raise RuntimeError(
             'set_zip_compression_level must be called before the first workbook '
@@ -100,6 +104,121 @@ def set_zip_compression_level(level: int | None) -> None:  # noqa: D213
         os.environ['PYFASTEXCEL_ZIP_LEVEL'] = str(level)
 
 
+def set_zip_parallel_compression(mode: Literal['parts', 'blocks'] | None) -> None:  # noqa: D213
+    """Compress the parts of exported archives concurrently.
+
+    With ``'parts'`` excelize writes a cheap stored-block staging archive and
+    the native library compresses its parts (one per worksheet, plus the
+    shared strings, styles and other metadata) on a worker pool before
+    writing the final archive. Compression wall time then scales with the
+    number of cores for multi-sheet workbooks. The setting combines with
+    :func:`set_zip_compression_level`; without a level the output archives
+    are byte-for-byte the same as the serial ones.
+
+    ``'blocks'`` additionally splits every part larger than 1 MiB into blocks
+    that are compressed concurrently, each primed with the previous block's
+    32 KiB window, and joined into a single DEFLATE stream. This speeds up
+    single-sheet workbooks whose one worksheet dominates the archive, at the
+    cost of slightly larger files. Both modes require a native library built
+    with fast-zip support.
+
+    The native library reads this setting once, at the first export of the
+    process, so call this before the first ``save()``.
+
+    Parameters
+    ----------
+    mode : Literal['parts', 'blocks'] | None
+        ``'parts'`` to compress archive parts concurrently, ``'blocks'`` to
+        also split large parts into concurrently compressed blocks, or None to
+        keep excelize's serial compression.
+
+    Raises
+    ------
+    ValueError
+        If mode is not a supported mode or None.
+    RuntimeError
+        If a workbook was already exported in this process, because the
+        setting can no longer take effect.
+
+    """
+    import os
+
+    from . import driver
+
+    if mode is not None and mode not in ('parts', 'blocks'):
+        raise ValueError(
+            f"Invalid zip parallel mode ({mode!r}). Expected 'parts', 'blocks' or None.",
+        )
+    if driver.native_export_started():
+        raise RuntimeError(
+            'set_zip_parallel_compression must be called before the first workbook '
+            'export; the native library has already locked in its compression setting.',
+        )
+    if mode is None:
+        os.environ.pop('PYFASTEXCEL_ZIP_PARALLEL', None)
+    else:
+        os.environ['PYFASTEXCEL_ZIP_PARALLEL'] = mode
+
+
+def set_native_parallelism(max_workers: int | None) -> None:  # noqa: D213
+    """Cap the native threads every later export of this process may use.
+
+    A native export writes the sheets of a workbook and compresses its
+    archive parts on a pool of worker threads, one per CPU core by default.
+    In a multi-tenant service a single large workbook can then take every
+    core. This setting bounds the sheet writers, the row decoder and the
+    compressors of each export, so its CPU use stays predictable. ``1``
+    runs the export on a single thread. A ``max_workers`` argument to
+    ``save()`` overrides the setting for that export.
+
+    Unlike the compression settings, this one applies to every export that
+    starts after the call.
+
+    Parameters
+    ----------
+    max_workers : int | None
+        The largest number of native worker threads per export, or None to
+        use all CPU cores.
+
+    Raises
+    ------
+    ValueError
+        If max_workers is not None and not a positive integer.
+
+    """
+    from . import driver
+
+    driver._check_max_workers(max_workers)
+    driver._NATIVE_PARALLELISM = max_workers
+
+
+def set_export_cache(cache: ExportCache | None) -> None:  # noqa: D213
+    """Reuse identical workbooks across the exports of this process.
+
+    Every later ``save()`` and ``read_lib_and_create_excel()`` looks the
+    encoded workbook up in ``cache`` first and skips the native build on a
+    hit. A ``cache`` argument to ``save()`` overrides the setting for that
+    export.
+
+    Parameters
+    ----------
+    cache : ExportCache | None
+        The cache to use, or None to export every workbook.
+
+    Raises
+    ------
+    TypeError
+        If cache is not an ExportCache or None.
+
+    """
+    from . import driver
+    from .cache import ExportCache
+
+    if cache is not None and not isinstance(cache, ExportCache):
+        raise TypeError(f'Expected an ExportCache or None, got {type(cache).__name__}.')
+    driver._EXPORT_CACHE = cache
+
+
 def deprecated_warning(msg: str):
     warnings.warn(
         msg,
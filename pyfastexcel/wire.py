@@ -3,10 +3,17 @@ from __future__ import annotations
 import math
 import os
 import struct
-from typing import Any
+import time
+from typing import TYPE_CHECKING, Any
 
 import msgspec
 
+from .trace import trace_span
+
+if TYPE_CHECKING:
+    from .report import ExportReport
+    from .trace import ExportTrace
+
 WIRE_MAGIC = b'PFX2'
 WIRE_VERSION = 2
 WIRE_ENV_VAR = 'PYFASTEXCEL_WIRE'
@@ -19,11 +26,67 @@ _MSGPACK_MAX_INT = (1 << 64) - 1
 class _UseLegacyJSON(Exception):  # noqa: D203
     """Signal that a cell needs the legacy JSON value semantics."""
 
+    def __init__(
+        self,
+        reason: str = 'a cell value needs the JSON wire',
+        sheet: str | None = None,
+        row: int | None = None,
+        column: int | None = None,
+    ) -> None:
+        super().__init__(reason)
+        self.reason = reason
+        self.sheet = sheet
+        self.row = row
+        self.column = column
+
 
 class _RowNeedsCare(Exception):  # noqa: D203
     """Signal that a row cannot take the fast encode path."""
 
 
+class SheetSegmentCache:
+    """
+    The encoded row segments of a workbook's sheets, reused while unchanged.
+
+    ``revisions`` maps each sheet name to the revision of its rows, or to
+    None for a sheet that is always encoded again. A segment is reused when
+    its sheet's revision and the workbook's style names match the encode
+    that produced it.
+    """
+
+    def __init__(self) -> None:
+        self.revisions: dict[str, int | None] = {}
+        self._segments: dict[str, tuple[int, tuple[str, ...], bytes, int]] = {}
+
+    def lookup(self, sheet_name: str, style_names: tuple[str, ...]) -> tuple[bytes, int] | None:
+        """Return the segment and careful row count cached for ``sheet_name``."""
+        revision = self.revisions.get(sheet_name)
+        entry = self._segments.get(sheet_name)
+        if revision is None or entry is None:
+            return None
+        if entry[0] != revision or entry[1] != style_names:
+            return None
+        return entry[2], entry[3]
+
+    def store(
+        self,
+        sheet_name: str,
+        style_names: tuple[str, ...],
+        segment: bytes,
+        careful_rows: int,
+    ) -> None:
+        revision = self.revisions.get(sheet_name)
+        if revision is None:
+            self._segments.pop(sheet_name, None)
+            return
+        self._segments[sheet_name] = (revision, style_names, segment, careful_rows)
+
+    def retain(self, sheet_names: list[str]) -> None:
+        """Drop the segments of sheets that are no longer in the workbook."""
+        for sheet_name in set(self._segments) - set(sheet_names):
+            del self._segments[sheet_name]
+
+
 def use_json_wire() -> bool:
     """Return whether the human-readable legacy wire was explicitly requested."""
     return os.getenv(WIRE_ENV_VAR, '').strip().lower() in {'json', 'v1-json'}
@@ -41,14 +104,28 @@ def _normalize_scalar(value: Any) -> Any:
     if isinstance(value, int):
         if _MSGPACK_MIN_INT <= value <= _MSGPACK_MAX_INT:
             return value
-        raise _UseLegacyJSON
+        raise _UseLegacyJSON(f'integer {value} is outside the MessagePack range')
     if value is None or isinstance(value, (bool, float, str)):
         return value
 
     # msgspec JSON has established public behavior for values such as bytes
     # (base64), dates and container objects. Fall back as one complete payload
     # instead of maintaining a second, subtly different conversion table.
-    raise _UseLegacyJSON
+    raise _UseLegacyJSON(f'{type(value).__name__} values need the JSON wire')
+
+
+def _locate_legacy_json_cell(row: Any, no_style: bool) -> _UseLegacyJSON:
+    """Find the first cell of ``row`` that needs the JSON wire, for the report."""
+    for index, cell in enumerate(row):
+        value = cell
+        if not no_style and isinstance(cell, (list, tuple)) and len(cell) == 2:
+            value = cell[0]
+        try:
+            _normalize_scalar(value)
+        except _UseLegacyJSON as exc:
+            exc.column = index + 1
+            return exc
+    return _UseLegacyJSON()
 
 
 def _encode_no_style_row(row: Any) -> Any:
@@ -140,7 +217,56 @@ def _encode_styled_row(row: Any, style_ids: dict[str, int]) -> list[Any]:
     return encoded_row
 
 
-def encode_v2_payload(export_data: dict[str, Any]) -> bytes:  # noqa: D213
+def encode_sheet_rows(
+    sheet_name: str,
+    rows: Any,
+    no_style: bool,
+    style_ids: dict[str, int],
+    encode_into: Any,
+    row_stream: bytearray,
+    encode_styled_row: Any = _encode_styled_row,
+) -> int:
+    """
+    Append the PFX2 encoding of one sheet's rows to ``row_stream``.
+
+    Returns the rows that needed the careful encoders. A cell that needs the
+    JSON wire raises ``_UseLegacyJSON`` with its location.
+    """
+    row = None
+    row_index = -1
+    careful_rows = 0
+    try:
+        for row_index, row in enumerate(rows):
+            # The tight loops cover well-formed scalar rows; anything unusual
+            # retries through the careful encoders, which own the exact error
+            # messages and the legacy-JSON fallback semantics.
+            if no_style:
+                try:
+                    encoded_row = _fast_no_style_row(row)
+                except _RowNeedsCare:
+                    careful_rows += 1
+                    encoded_row = _encode_no_style_row(row)
+            else:
+                try:
+                    encoded_row = _fast_styled_row(row, style_ids)
+                except (_RowNeedsCare, TypeError, ValueError, KeyError):
+                    careful_rows += 1
+                    encoded_row = encode_styled_row(row, style_ids)
+            encode_into(encoded_row, row_stream, -1)
+    except _UseLegacyJSON:
+        located = _locate_legacy_json_cell(row, no_style)
+        located.sheet = sheet_name
+        located.row = row_index + 1
+        raise located from None
+    return careful_rows
+
+
+def encode_v2_payload(  # noqa: D213
+    export_data: dict[str, Any],
+    report: ExportReport | None = None,
+    trace: ExportTrace | None = None,
+    sheet_cache: SheetSegmentCache | None = None,
+) -> bytes:
     """Encode the version-2 metadata + row-stream framing.
 
     Layout::
@@ -148,7 +274,10 @@ def encode_v2_payload(export_data: dict[str, Any]) -> bytes:  # noqa: D213
         PFX2 | uint64(metadata length, big endian) | metadata JSON | msgpack rows...
 
     Each row is one complete msgpack object. ``row_counts`` and ``sheet_order``
-    make additional per-row framing unnecessary.
+    make additional per-row framing unnecessary. ``report`` receives the fast
+    and careful row counts; ``trace`` gets one span per sheet. With a
+    ``sheet_cache`` the segments of unchanged sheets are reused instead of
+    encoded again.
     """
     sheet_order = list(export_data['sheet_order'])
     style_names = list(export_data['style'])
@@ -171,27 +300,35 @@ def encode_v2_payload(export_data: dict[str, Any]) -> bytes:  # noqa: D213
     # multiple sheets concurrently.
     row_stream = bytearray()
     sheet_offsets: list[int] = []
-    encoder = msgspec.msgpack.Encoder()
-    encode_into = encoder.encode_into
+    encode_into = msgspec.msgpack.Encoder().encode_into
+    careful_rows = 0
+    reused_sheets = 0
+    style_key = tuple(style_names)
     for sheet_name in sheet_order:
-        sheet_offsets.append(len(row_stream))
+        offset = len(row_stream)
+        sheet_offsets.append(offset)
+        cached = sheet_cache.lookup(sheet_name, style_key) if sheet_cache is not None else None
+        if cached is not None:
+            row_stream += cached[0]
+            careful_rows += cached[1]
+            reused_sheets += 1
+            continue
         sheet = export_data['content'][sheet_name]
-        no_style = bool(sheet.get('NoStyle', False))
-        for row in sheet.get('Data', []):
-            # The tight loops cover well-formed scalar rows; anything unusual
-            # retries through the careful encoders, which own the exact error
-            # messages and the legacy-JSON fallback semantics.
-            if no_style:
-                try:
-                    encoded_row = _fast_no_style_row(row)
-                except _RowNeedsCare:
-                    encoded_row = _encode_no_style_row(row)
-            else:
-                try:
-                    encoded_row = _fast_styled_row(row, style_ids)
-                except (_RowNeedsCare, TypeError, ValueError, KeyError):
-                    encoded_row = _encode_styled_row(row, style_ids)
-            encode_into(encoded_row, row_stream, -1)
+        rows = sheet.get('Data', [])
+        with trace_span(trace, 'encode_v2_payload', sheet=sheet_name, rows=len(rows)):
+            sheet_careful_rows = encode_sheet_rows(
+                sheet_name,
+                rows,
+                bool(sheet.get('NoStyle', False)),
+                style_ids,
+                encode_into,
+                row_stream,
+            )
+        careful_rows += sheet_careful_rows
+        if sheet_cache is not None:
+            sheet_cache.store(sheet_name, style_key, bytes(row_stream[offset:]), sheet_careful_rows)
+    if sheet_cache is not None:
+        sheet_cache.retain(sheet_order)
 
     metadata['content'] = metadata_content
     metadata['_pyfastexcel_wire'] = {
@@ -202,7 +339,11 @@ def encode_v2_payload(export_data: dict[str, Any]) -> bytes:  # noqa: D213
     }
     metadata_bytes = msgspec.json.encode(metadata)
     if len(metadata_bytes) > MAX_WIRE_METADATA_BYTES:
-        raise _UseLegacyJSON
+        raise _UseLegacyJSON('workbook metadata exceeds the PFX2 limit')
+    if report is not None:
+        report.careful_rows = careful_rows
+        report.fast_rows = sum(row_counts) - careful_rows
+        report.reused_sheets = reused_sheets
 
     payload = bytearray(WIRE_MAGIC)
     payload.extend(struct.pack('>Q', len(metadata_bytes)))
@@ -211,11 +352,54 @@ def encode_v2_payload(export_data: dict[str, Any]) -> bytes:  # noqa: D213
     return bytes(payload)
 
 
-def encode_payload(export_data: dict[str, Any], *, force_json: bool = False) -> bytes:
-    """Encode an export payload, honoring the JSON debugging escape hatch."""
-    if force_json or use_json_wire():
-        return encode_json_payload(export_data)
-    try:
-        return encode_v2_payload(export_data)
-    except _UseLegacyJSON:
-        return encode_json_payload(export_data)
+def encode_payload(
+    export_data: dict[str, Any],
+    *,
+    force_json: bool = False,
+    report: ExportReport | None = None,
+    trace: ExportTrace | None = None,
+    sheet_cache: SheetSegmentCache | None = None,
+) -> bytes:
+    """
+    Encode an export payload, honoring the JSON debugging escape hatch.
+
+    ``force_json`` is set for native libraries without PFX2 support. ``report``
+    receives the wire used, any fallback reason and location, the row counts,
+    the payload size and the encode time; ``trace`` gets the encode spans.
+    ``sheet_cache`` keeps the PFX2 row segments of unchanged sheets.
+    """
+    with trace_span(trace, 'encode_payload'):
+        return _encode_payload(export_data, force_json, report, trace, sheet_cache)
+
+
+def _encode_payload(
+    export_data: dict[str, Any],
+    force_json: bool,
+    report: ExportReport | None,
+    trace: ExportTrace | None,
+    sheet_cache: SheetSegmentCache | None,
+) -> bytes:
+    started = time.perf_counter()
+    fallback = None
+    payload = None
+    if force_json:
+        fallback = _UseLegacyJSON('the native library does not support PFX2')
+    elif use_json_wire():
+        fallback = _UseLegacyJSON(f'{WIRE_ENV_VAR} requests the JSON wire')
+    else:
+        try:
+            payload = encode_v2_payload(export_data, report, trace, sheet_cache)
+        except _UseLegacyJSON as exc:
+            fallback = exc
+    if payload is None:
+        payload = encode_json_payload(export_data)
+    if report is not None:
+        report.wire = 'json' if fallback is not None else 'pfx2'
+        if fallback is not None:
+            report.fallback_reason = fallback.reason
+            report.fallback_sheet = fallback.sheet
+            report.fallback_row = fallback.row
+            report.fallback_column = fallback.column
+        report.payload_bytes = len(payload)
+        report.stages['encode'] = time.perf_counter() - started
+    return payload
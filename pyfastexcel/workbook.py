@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import os
 from typing import List, Literal, Optional, overload
 
 from pydantic import validate_call as pydantic_validate_call
@@ -146,6 +147,43 @@ class Workbook(ExcelDriver):
             raise ValueError(f'Invalid file property: {key}')
         self.file_props[key] = value
 
+    def set_export_options(
+        self,
+        temp_dir: str | os.PathLike | None = None,
+        spill_threshold: int | None = None,
+    ) -> None:
+        """
+        Sets where and when the native exporter spills to temporary files.
+
+        Options left as None keep the native defaults. The spill counts of
+        the last save are available as ``native_report``.
+
+        Args:
+            temp_dir (str | os.PathLike, optional): An existing directory for
+                every temporary file of the export.
+            spill_threshold (int, optional): The size in bytes above which
+                pyfastexcel's own export buffers move to a temporary file.
+
+        Raises:
+            ValueError: If temp_dir is not a directory or spill_threshold is
+                negative.
+        """
+        options = {}
+        if temp_dir is not None:
+            temp_dir = os.fspath(temp_dir)
+            if not os.path.isdir(temp_dir):
+                raise ValueError(f'temp_dir is not a directory: {temp_dir!r}')
+            options['temp_dir'] = os.path.abspath(temp_dir)
+        if spill_threshold is not None:
+            if (
+                not isinstance(spill_threshold, int)
+                or isinstance(spill_threshold, bool)
+                or spill_threshold < 0
+            ):
+                raise ValueError('spill_threshold must be a non-negative integer')
+            options['spill_threshold'] = spill_threshold
+        self.export_options = options
+
     @pydantic_validate_call
     def protect_workbook(
         self,
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import itertools
 from typing import Any, List, Literal, Optional, overload
 
 from pydantic import validate_call as pydantic_validate_call
@@ -34,6 +35,10 @@ from .utils import (
 )
 from .validators import validate_call
 
+# Row revisions are unique across every sheet of the process, so a segment
+# cached for one sheet can never match another.
+_ROW_REVISIONS = itertools.count(1)
+
 
 class WorkSheetBase:
     """
@@ -76,6 +81,9 @@ class WorkSheetBase:
             _grouped_columns_list (list): list of settings to group columns.
             _grouped_rows_list (list): list of settings to group rows.
             _engine (str): choice to use excelize normalWriter or openpyxl
+            _revision (int): Changes whenever the rows change.
+            _shared_data (bool): Whether the caller holds a reference to the
+                rows, so changes to them cannot be seen.
 
         Raises:
             TypeError: If `plain_data` is provided but is not a valid 2D list of strings.
@@ -97,6 +105,8 @@ class WorkSheetBase:
         self._chart_list = []
         self._pivot_table_list = []
         self._sheet_visible = True
+        self._revision = next(_ROW_REVISIONS)
+        self._shared_data = False
         # Using pyfastexcel to write as default
         self._excel_engine: Literal['pyfastexcel', 'openpyxl'] = 'pyfastexcel'
         self._writer_engine: Literal['NormalWriter', 'StreamWriter'] = 'StreamWriter'
@@ -127,13 +137,26 @@ class WorkSheetBase:
                 raise TypeError('plain_data should be a valid 2D list of strings.')
             self._data = plain_data
             self._sheet['NoStyle'] = True
+            self._shared_data = True
 
     @property
     def data(self):
+        self._shared_data = True
         return self._data
 
+    def _mark_dirty(self) -> None:
+        """Record that the rows changed, so their encoded segment is rebuilt."""
+        self._revision = next(_ROW_REVISIONS)
+
+    @property
+    def _row_revision(self) -> int | None:
+        """The revision of the rows, or None while they cannot be tracked."""
+        return None if self._shared_data else self._revision
+
     @property
     def sheet(self):
+        # The dictionary hands out the rows, like the data property.
+        self._shared_data = True
         return self._transfer_to_dict()
 
     @property
@@ -281,6 +304,7 @@ class WorkSheetBase:
         if isinstance(key, slice):
             return self._get_cell_by_slice(key)
         elif isinstance(key, int):
+            self._shared_data = True
             return self._data[key]
         elif isinstance(key, str):
             if ':' in key:
@@ -289,6 +313,7 @@ class WorkSheetBase:
             return self._get_cell_by_location(key)
 
     def __setitem__(self, key: str | slice | int, value: Any) -> None:
+        self._mark_dirty()
         if isinstance(key, slice):
             self._set_cell_by_slice(key, value)
         elif isinstance(key, int):
@@ -309,6 +334,7 @@ class WorkSheetBase:
         end_column = column_to_index(end_column)
 
         if start_row == end_row:
+            self._shared_data = True
             return self._data[start_row - 1]
 
         return [row[start_column - 1 : end_column] for row in self._data[start_row - 1 : end_row]]
@@ -354,6 +380,7 @@ class WorkSheetBase:
             raise ValueError(f'Invalid row index: {row}')
         if not isinstance(value, list):
             raise ValueError('Value should be a list.')
+        # A new list, so the caller's list is not shared with the rows.
         value = [self._validate_value_and_set_default(v) for v in value]
         self._expand_row_and_cols(row, len(value) - 1)
         self._data[row] = value
@@ -399,6 +426,7 @@ class WorkSheet(WorkSheetBase):
             raise ValueError(f'Invalid row index: {row}')
         if column < 1 or column > self.MAX_COL:
             raise ValueError(f'Invalid column index: {column}')
+        self._mark_dirty()
         try:
             self._data[row][column] = value
         except IndexError:
@@ -433,6 +461,7 @@ class WorkSheet(WorkSheetBase):
                 validate_and_register_style(style, self._style_manager)
             style = self._style_manager.get_style_name(style)
 
+        self._mark_dirty()
         if isinstance(target, str):
             if ':' in target:
                 target = transfer_string_slice_to_slice(target)
@@ -712,6 +741,7 @@ class WorkSheet(WorkSheetBase):
             }
         )
         self._excel_engine = engine
+        # Excelize's StreamWriter rewrites <cols> without outline levels.
         self._writer_engine = 'NormalWriter'
 
     @pydantic_validate_call
@@ -748,7 +778,6 @@ class WorkSheet(WorkSheetBase):
             }
         )
         self._excel_engine = engine
-        self._writer_engine = 'NormalWriter'
 
     @validate_call
     def create_table(
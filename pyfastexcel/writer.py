@@ -168,7 +168,7 @@ class StreamWriter(Workbook):
         )
 
         if create_row:
-            self.workbook[self.sheet].data.append(value)
+            self._sheet_rows().append(value)
         else:
             self._row_list.extend(value)
 
@@ -187,7 +187,7 @@ class StreamWriter(Workbook):
         if isinstance(style, (list, tuple)):
             if kwargs:
                 raise ValueError('Per-column styles cannot be combined with style kwargs.')
-            self.workbook[self.sheet].data.append(self._pair_row_with_styles(values, style))
+            self._sheet_rows().append(self._pair_row_with_styles(values, style))
             return
         self.row_append_list(values, style=style, create_row=True, **kwargs)
 
@@ -202,7 +202,7 @@ class StreamWriter(Workbook):
             if kwargs:
                 raise ValueError('Per-column styles cannot be combined with style kwargs.')
             resolved = self._resolve_style_row(style)
-            data = self.workbook[self.sheet].data
+            data = self._sheet_rows()
             for row in rows:
                 data.append(self._pair_row_with_resolved(row, resolved))
             return
@@ -246,9 +246,15 @@ class StreamWriter(Workbook):
             )
         return tuple(zip(normalized, resolved))
 
+    def _sheet_rows(self) -> list:
+        """The current sheet's rows for appending; the sheet is marked changed."""
+        worksheet = self.workbook[self.sheet]
+        worksheet._mark_dirty()
+        return worksheet._data
+
     def create_row(self):
         """
         Creates a row in the Excel data, and clean the current _row_list.
         """
-        self.workbook[self.sheet].data.append(self._row_list)
+        self._sheet_rows().append(self._row_list)
         self._row_list = []
@@ -17,3 +17,39 @@ func TestV2ErrorBounds(t *testing.T) {
 func TestExportToFileV2(t *testing.T) {
 	testExportToFileV2(t)
 }
+
+func TestExportV3Report(t *testing.T) {
+	testExportV3Report(t)
+}
+
+func TestPoolStatsV2(t *testing.T) {
+	testPoolStatsV2(t)
+}
+
+func TestRuntimeStatsV2(t *testing.T) {
+	testRuntimeStatsV2(t)
+}
+
+func TestProfileV2(t *testing.T) {
+	testProfileV2(t)
+}
+
+func TestTemplateV2(t *testing.T) {
+	testTemplateV2(t)
+}
+
+func TestExportBatchV2(t *testing.T) {
+	testExportBatchV2(t)
+}
+
+func TestExportV4Cancellation(t *testing.T) {
+	testExportV4Cancellation(t)
+}
+
+func TestRowReaderV2(t *testing.T) {
+	testRowReaderV2(t)
+}
+
+func TestReadColumnsV2(t *testing.T) {
+	testReadColumnsV2(t)
+}
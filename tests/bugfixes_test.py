@@ -29,10 +29,12 @@ class TestBug1WriterEngineTypeHint:
         ws = WorkSheet()
         assert ws._writer_engine == 'StreamWriter'
 
-    def test_writer_engine_normal_writer_assignment(self):
+    def test_row_groups_keep_stream_writer_and_column_groups_do_not(self):
         from pyfastexcel.worksheet import WorkSheet
 
         ws = WorkSheet()
+        ws.group_rows(1, 3)
+        assert ws._writer_engine == 'StreamWriter'
         ws.group_columns('A', 'B')
         assert ws._writer_engine == 'NormalWriter'
 
@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import io
+
+import pytest
+
+from pyfastexcel import CustomStyle, Workbook
+from pyfastexcel.wire import encode_v2_payload
+
+from .support import FakeNativeLibrary, decode_v2_metadata
+
+
+def test_export_cache_skips_the_native_build_for_identical_workbooks(monkeypatch):
+    from pyfastexcel import ExportCache, set_export_cache
+    from pyfastexcel.cache import CACHE_TIMESTAMP
+
+    library = FakeNativeLibrary(version=3)
+
+    def build(value):
+        workbook = Workbook()
+        monkeypatch.setattr(workbook, '_read_lib', lambda _path: library)
+        workbook['Sheet1']['A1'] = value
+        return workbook
+
+    cache = ExportCache()
+    first, report = build('same').read_lib_and_create_excel(cache=cache, return_report=True)
+    assert report.cache == 'miss' and len(library.payloads) == 1
+    metadata, _ = decode_v2_metadata(library.payloads[0])
+    assert metadata['file_props']['Created'] == CACHE_TIMESTAMP
+
+    second, report = build('same').read_lib_and_create_excel(
+        cache=cache, max_workers=2, return_report=True
+    )
+    assert second == first and report.cache == 'memory' and report.native is None
+    assert len(library.payloads) == 1
+
+    build('other').read_lib_and_create_excel(cache=cache)
+    dated = build('same')
+    dated.set_file_props('Created', '2024-01-01T00:00:00Z')
+    dated.read_lib_and_create_excel(cache=cache)
+    assert len(library.payloads) == 3
+    assert cache.stats() == {
+        'hits': 1,
+        'memory_hits': 1,
+        'disk_hits': 0,
+        'misses': 3,
+        'memory_evictions': 0,
+        'disk_evictions': 0,
+        'memory_entries': 3,
+        'memory_bytes': 3 * len(first),
+    }
+
+    set_export_cache(cache)
+    try:
+        assert build('other').save(io.BytesIO(), return_report=True).cache == 'memory'
+    finally:
+        set_export_cache(None)
+    with pytest.raises(TypeError, match='ExportCache'):
+        set_export_cache({})
+
+
+def test_export_cache_ignores_timestamps_when_asked(monkeypatch):
+    from pyfastexcel import ExportCache
+
+    library = FakeNativeLibrary(version=3)
+    cache = ExportCache(timestamps='ignore')
+    for created in ('2024-01-01T00:00:00Z', '2025-01-01T00:00:00Z'):
+        workbook = Workbook()
+        monkeypatch.setattr(workbook, '_read_lib', lambda _path: library)
+        workbook.set_file_props('Created', created)
+        workbook.read_lib_and_create_excel(cache=cache)
+    assert len(library.payloads) == 1
+    metadata, _ = decode_v2_metadata(library.payloads[0])
+    assert metadata['file_props']['Created'] == '2024-01-01T00:00:00Z'
+
+
+def test_export_cache_keys_hold_the_package_and_abi_versions(monkeypatch):
+    from pyfastexcel import ExportCache
+
+    cache = ExportCache()
+    payload = encode_v2_payload(Workbook()._build_export_data())
+    key = cache.key(payload, abi_version=3)
+    assert cache.key(payload, abi_version=3) == key
+    assert cache.key(payload, abi_version=4) != key
+    monkeypatch.setattr('pyfastexcel.cache._PACKAGE_VERSION', '0.0.0-other')
+    assert cache.key(payload, abi_version=3) != key
+
+    # A library of a new ABI version misses what an older one cached.
+    workbooks = []
+    for version in (3, 4):
+        library = FakeNativeLibrary(version=version)
+        workbook = Workbook()
+        monkeypatch.setattr(workbook, '_read_lib', lambda _path, library=library: library)
+        workbooks.append(workbook.read_lib_and_create_excel(cache=cache, return_report=True))
+    assert [report.cache for _bytes, report in workbooks] == ['miss', 'miss']
+
+
+def test_export_cache_evicts_by_size_in_memory_and_on_disk(tmp_path):
+    from pyfastexcel import ExportCache
+
+    cache = ExportCache(8, directory=tmp_path, max_disk_bytes=12)
+    cache.put('a', b'aaaa')
+    cache.put('b', b'bbbb')
+    assert cache.get('a') == b'aaaa'
+    cache.put('c', b'cccc')
+    assert cache.stats()['memory_evictions'] == 1
+    assert cache.stats()['memory_bytes'] == 8
+
+    # 'b' was dropped from memory, but the disk tier still has it.
+    assert cache.lookup('b') == (b'bbbb', 'disk')
+    cache.put('d', b'dddd')
+    assert cache.stats()['disk_evictions'] == 1
+    assert sorted(path.name for path in tmp_path.iterdir()) == [
+        'b.xlsx',
+        'c.xlsx',
+        'd.xlsx',
+    ]
+    cache.put('large', b'x' * 16)
+    assert cache.get('missing') is None
+    assert cache.stats()['misses'] == 1
+    assert not (tmp_path / 'large.xlsx').exists()
+
+    reopened = ExportCache(directory=tmp_path)
+    assert reopened.lookup('d') == (b'dddd', 'disk')
+    reopened.clear()
+    assert list(tmp_path.iterdir()) == [] and reopened.get('d') is None
+
+    with pytest.raises(ValueError, match='max_bytes'):
+        ExportCache(-1)
+    with pytest.raises(ValueError, match='timestamps'):
+        ExportCache(timestamps='keep')
+
+
+def test_real_export_cache_returns_identical_workbooks(tmp_path):
+    from pyfastexcel import ExportCache
+
+    cache = ExportCache(directory=tmp_path / 'cache')
+    saved = []
+    for name in ('first.xlsx', 'second.xlsx'):
+        workbook = Workbook()
+        workbook['Sheet1']['A1'] = ('cached', CustomStyle(font_bold=True))
+        saved.append(workbook.save(str(tmp_path / name), cache=cache, return_report=True))
+    assert [report.cache for report in saved] == ['miss', 'memory']
+    assert (tmp_path / 'first.xlsx').read_bytes() == (tmp_path / 'second.xlsx').read_bytes()
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import zipfile
+
+from pyfastexcel import CustomStyle, Workbook
+from pyfastexcel.wire import encode_v2_payload
+
+from .support import FakeNativeLibrary, decode_v2_metadata
+
+
+def test_deterministic_workbook_fixes_timestamps_and_asks_for_a_canonical_archive(monkeypatch):
+    from pyfastexcel import ExportCache
+    from pyfastexcel.cache import CACHE_TIMESTAMP
+
+    library = FakeNativeLibrary(version=3)
+    workbook = Workbook(deterministic=True)
+    monkeypatch.setattr(workbook, '_read_lib', lambda _path: library)
+    workbook['Sheet1']['A1'] = 'same'
+    workbook.read_lib_and_create_excel()
+    metadata, _ = decode_v2_metadata(library.payloads[0])
+    assert metadata['file_props']['Created'] == CACHE_TIMESTAMP
+    assert metadata['file_props']['Modified'] == CACHE_TIMESTAMP
+    assert metadata['export_options'] == {'deterministic': True}
+    assert 'deterministic' not in Workbook()._build_export_data().get('export_options', {})
+
+    # The canonical archive differs from the default layout, so it is cached apart.
+    cache = ExportCache()
+    key = cache.key(library.payloads[0], abi_version=3)
+    plain = Workbook()
+    plain.file_props = dict(workbook.file_props)
+    plain['Sheet1']['A1'] = 'same'
+    assert cache.key(encode_v2_payload(plain._build_export_data()), abi_version=3) != key
+
+
+def test_real_deterministic_workbooks_are_byte_identical(tmp_path):
+    saved = []
+    for name in ('first.xlsx', 'second.xlsx'):
+        workbook = Workbook(deterministic=True)
+        workbook.create_sheet('Report')
+        for sheet in workbook.sheet_list:
+            workbook.set_cell_width(sheet, 3, 20)
+            workbook.set_cell_width(sheet, 1, 12)
+            workbook.set_cell_width(sheet, 2, 8)
+            for row in range(50):
+                workbook[sheet][row] = [
+                    row,
+                    f'{sheet} {row}',
+                    ('styled', CustomStyle(font_bold=True)),
+                ]
+        workbook.save(str(tmp_path / name))
+        saved.append((tmp_path / name).read_bytes())
+    assert saved[0] == saved[1]
+    with zipfile.ZipFile(tmp_path / 'first.xlsx') as archive:
+        names = archive.namelist()
+        assert names[0] == '[Content_Types].xml'
+        assert names[1:] == sorted(names[1:])
+        assert {info.date_time for info in archive.infolist()} == {(1980, 0, 0, 0, 0, 0)}
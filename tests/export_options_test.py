@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import ctypes
+
+import pytest
+
+from pyfastexcel import Workbook
+from pyfastexcel.driver import NativeExcelClient
+from pyfastexcel.wire import encode_v2_payload
+
+from .support import FakeNativeLibrary, decode_v2_metadata, zip_entry_map
+
+
+def test_v3_export_report_is_decoded_and_freed(monkeypatch, tmp_path):
+    library = FakeNativeLibrary(version=3, raw_output=b'PK\x00binary')
+    client = NativeExcelClient(library)
+
+    assert client.export_bytes(b'PFX2payload', 1) == b'PK\x00binary'
+    assert client.last_report == {'buffer_spill_files': 1}
+    assert library.freed == [
+        ctypes.addressof(library.buffers[1]),
+        ctypes.addressof(library.buffers[0]),
+    ]
+
+    workbook = Workbook()
+    workbook['Sheet1']['A1'] = 'value'
+    monkeypatch.setattr(workbook, '_read_lib', lambda _path: library)
+    workbook.save(str(tmp_path / 'report.xlsx'))
+
+    assert library.paths == [str(tmp_path / 'report.xlsx').encode()]
+    assert workbook.native_report == {'buffer_spill_files': 1}
+
+
+def test_export_options_reach_native_metadata_only_when_set(tmp_path):
+    workbook = Workbook()
+    workbook['Sheet1']['A1'] = 'value'
+    assert 'export_options' not in workbook._build_export_data()
+
+    workbook.set_export_options(temp_dir=tmp_path, spill_threshold=0)
+    metadata, _rows = decode_v2_metadata(encode_v2_payload(workbook._build_export_data()))
+    assert metadata['export_options'] == {'temp_dir': str(tmp_path), 'spill_threshold': 0}
+
+    workbook.set_export_options()
+    assert 'export_options' not in workbook._build_export_data()
+
+
+def test_max_workers_reaches_native_metadata(monkeypatch, tmp_path):
+    from pyfastexcel import set_native_parallelism
+
+    library = FakeNativeLibrary(version=3)
+    workbook = Workbook()
+    workbook['Sheet1']['A1'] = 'value'
+    monkeypatch.setattr(workbook, '_read_lib', lambda _path: library)
+    monkeypatch.setattr('pyfastexcel.driver._NATIVE_PARALLELISM', None)
+
+    workbook.save(str(tmp_path / 'default.xlsx'))
+    set_native_parallelism(3)
+    workbook.save(str(tmp_path / 'process.xlsx'))
+    workbook.save(str(tmp_path / 'per-save.xlsx'), max_workers=1)
+    set_native_parallelism(None)
+    workbook.save(str(tmp_path / 'reset.xlsx'))
+
+    options = [decode_v2_metadata(payload)[0].get('export_options') for payload in library.payloads]
+    assert options == [None, {'max_workers': 3}, {'max_workers': 1}, None]
+
+
+@pytest.mark.parametrize('max_workers', [0, -2, 1.5, True, '2'])
+def test_max_workers_rejects_invalid_values(max_workers, tmp_path):
+    from pyfastexcel import set_native_parallelism
+
+    with pytest.raises(ValueError):
+        set_native_parallelism(max_workers)
+    with pytest.raises(ValueError):
+        Workbook().save(str(tmp_path / 'invalid.xlsx'), max_workers=max_workers)
+
+
+@pytest.mark.parametrize(
+    'options',
+    [
+        {'temp_dir': 'missing-directory'},
+        {'spill_threshold': -1},
+        {'spill_threshold': 1.5},
+        {'spill_threshold': True},
+    ],
+)
+def test_export_options_reject_invalid_values(options):
+    with pytest.raises(ValueError):
+        Workbook().set_export_options(**options)
+
+
+def test_real_export_honors_temp_dir_and_reports_spills(tmp_path):
+    temp_dir = tmp_path / 'spill'
+    temp_dir.mkdir()
+    workbook = Workbook()
+    workbook['Sheet1']['A1'] = 'value'
+    workbook.set_export_options(temp_dir=temp_dir, spill_threshold=0)
+
+    workbook.save(str(tmp_path / 'spilled.xlsx'))
+
+    assert set(workbook.native_report) == {
+        'stream_spill_files',
+        'stream_spill_bytes',
+        'buffer_spill_files',
+        'buffer_spill_bytes',
+        'wire',
+        'build',
+        'build_ns',
+        'write_ns',
+        'output_bytes',
+        'allocated_bytes',
+    }
+    assert list(temp_dir.iterdir()) == []
+    assert zip_entry_map(tmp_path / 'spilled.xlsx')
+    report = workbook.export_report
+    assert report.native == workbook.native_report
+    assert report.output_bytes == (tmp_path / 'spilled.xlsx').stat().st_size
+    assert (report.wire, report.parallel) == ('pfx2', False)
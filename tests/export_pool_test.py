@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import io
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from pyfastexcel import CustomStyle, Workbook
+from pyfastexcel.driver import NativeExcelClient
+
+from .support import FakeNativeLibrary, zip_entry_map
+
+
+def test_export_pool_protocol_moves_payloads_through_shared_memory(tmp_path):
+    from multiprocessing import Pipe
+    from threading import Thread
+
+    from pyfastexcel.export_pool import _ExportWorker, _serve_exports
+
+    library = FakeNativeLibrary(version=3, raw_output=b'PK\x00binary')
+    parent, child = Pipe()
+    server = Thread(target=_serve_exports, args=(child, NativeExcelClient(library)))
+    server.start()
+    worker = _ExportWorker(None, None)
+    worker.connection = parent
+    worker.wait_ready()
+
+    assert worker.supports_v2_export is True
+    assert worker.request(b'PFX2payload', None) == (b'PK\x00binary', {'buffer_spill_files': 1})
+    assert worker.request(b'PFX2saved', str(tmp_path / '報表.xlsx')) == (
+        None,
+        {'buffer_spill_files': 1},
+    )
+    assert library.payloads == [b'PFX2payload', b'PFX2saved']
+    assert library.paths == [str(tmp_path / '報表.xlsx').encode()]
+
+    library.raw_output = b''
+    with pytest.raises(RuntimeError, match='empty workbook'):
+        worker.request(b'PFX2payload', None)
+    library.raw_output = b'PK'
+    assert worker.request(b'PFX2payload', None)[0] == b'PK'
+
+    worker.stop()
+    server.join(5)
+    assert not server.is_alive()
+
+
+def test_export_pool_reports_a_worker_that_cannot_start(tmp_path):
+    from pyfastexcel import ExportPool
+
+    with pytest.raises(RuntimeError, match='exited with code 1 before it was ready'):
+        ExportPool(1, lib_path=str(tmp_path / 'missing-library.so'))
+    with pytest.raises(ValueError):
+        ExportPool(0)
+
+
+class HangingLibrary(FakeNativeLibrary):
+    """Never finishes exporting a workbook that holds the text 'hang'."""
+
+    def _export_v3(self, payload, payload_length, output_length, error, report):
+        if b'hang' in self.read_payload(payload, payload_length):
+            time.sleep(60)
+        return super()._export_v3(payload, payload_length, output_length, error, report)
+
+
+@pytest.fixture
+def forked_pool(monkeypatch):
+    """ExportPool on forked workers, which inherit the fake library."""
+    from pyfastexcel import ExportPool
+
+    context = multiprocessing.get_context('fork')
+    monkeypatch.setattr('pyfastexcel.export_pool.multiprocessing.get_context', lambda _: context)
+    monkeypatch.setattr(
+        'pyfastexcel.export_pool._load_native_library',
+        lambda _path=None: HangingLibrary(version=3, raw_output=b'PK\x00pool'),
+    )
+    return ExportPool
+
+
+def _workbook(text):
+    workbook = Workbook()
+    workbook['Sheet1']['A1'] = text
+    return workbook
+
+
+def test_export_pool_restarts_a_worker_killed_during_an_export(forked_pool):
+    with forked_pool(1) as pool:
+        process = pool._workers[0].process
+        threading.Timer(0.5, process.kill).start()
+        with pytest.raises(RuntimeError, match='exited with code -9 during an export'):
+            pool.export(_workbook('hang'))
+
+        assert pool.export(_workbook('after the crash')) == b'PK\x00pool'
+        assert pool._workers[0].process is not process
+
+
+def test_export_pool_terminates_a_worker_that_exceeds_the_timeout(forked_pool):
+    with pytest.raises(ValueError, match='timeout'):
+        forked_pool(1, timeout=0)
+    with forked_pool(1, timeout=0.5) as pool:
+        process = pool._workers[0].process
+        started = time.perf_counter()
+        with pytest.raises(RuntimeError, match='did not finish within 0.5 seconds'):
+            pool.export(_workbook('hang'))
+        assert time.perf_counter() - started < 30
+        assert not process.is_alive()
+
+        assert pool.export(_workbook('after the timeout')) == b'PK\x00pool'
+
+
+def test_real_export_pool_matches_in_process_export(tmp_path):
+    from pyfastexcel import ExportPool
+
+    workbooks = []
+    for index in range(4):
+        workbook = Workbook()
+        workbook['Sheet1'][0] = [('客戶', CustomStyle(font_bold=True)), index]
+        workbooks.append(workbook)
+
+    with ExportPool(2) as pool:
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            exported = list(executor.map(pool.export, workbooks))
+        pool.save(workbooks[0], tmp_path / 'pool.xlsx')
+
+    for workbook, workbook_bytes in zip(workbooks, exported):
+        assert (
+            zip_entry_map(io.BytesIO(workbook_bytes)).keys()
+            == zip_entry_map(io.BytesIO(workbook.read_lib_and_create_excel())).keys()
+        )
+    assert zip_entry_map(tmp_path / 'pool.xlsx') == zip_entry_map(io.BytesIO(exported[0]))
+    with pytest.raises(RuntimeError, match='closed'):
+        pool.export(workbooks[0])
@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import ctypes
+
+import pytest
+
+from pyfastexcel import Workbook
+from pyfastexcel.driver import NativeExcelClient
+
+from .support import FakeNativeLibrary
+
+
+class StatsLibrary(FakeNativeLibrary):
+    """Adds the statistics (ABI v4, v7) and profiling (ABI v8) exports."""
+
+    def __init__(self, *, version: int = 8):
+        super().__init__(version=version)
+        self.profiles = []
+        self.bind(
+            'GetPoolStatsV2',
+            ctypes.c_void_p,
+            [],
+            lambda: self.keep_buffer(b'{"row_buffers": {"gets": 2, "misses": 1}}'),
+        )
+        self.bind(
+            'GetRuntimeStatsV2',
+            ctypes.c_void_p,
+            [],
+            lambda: self.keep_buffer(b'{"heap_peak_bytes": 4096, "gc_pause_seconds": 0.5}'),
+        )
+        self.bind(
+            'StartProfileV2', ctypes.c_void_p, [ctypes.c_char_p, ctypes.c_char_p], self._start
+        )
+        self.bind('StopProfileV2', ctypes.c_void_p, [], self._stop)
+
+    def _start(self, cpu_path, heap_path):
+        if self.profiles and self.profiles[-1][0] == 'start':
+            return self.keep_buffer(b'a native profile is already running')
+        self.profiles.append(('start', cpu_path, heap_path))
+        return None
+
+    def _stop(self):
+        self.profiles.append(('stop',))
+        return None
+
+
+def test_pool_stats_are_decoded_and_freed_when_supported():
+    library = StatsLibrary(version=4)
+    client = NativeExcelClient(library)
+
+    assert client.pool_stats() == {'row_buffers': {'gets': 2, 'misses': 1}}
+    assert library.freed == [ctypes.addressof(library.buffers[0])]
+    assert NativeExcelClient(StatsLibrary(version=3)).pool_stats() is None
+
+
+def test_runtime_stats_are_decoded_and_freed_when_supported():
+    library = StatsLibrary(version=7)
+    client = NativeExcelClient(library)
+
+    assert client.runtime_stats() == {'heap_peak_bytes': 4096, 'gc_pause_seconds': 0.5}
+    assert library.freed == [ctypes.addressof(library.buffers[0])]
+    assert NativeExcelClient(StatsLibrary(version=6)).runtime_stats() is None
+
+    library.replace('GetRuntimeStatsV2', lambda: None)
+    with pytest.raises(RuntimeError, match='runtime statistics are unavailable'):
+        NativeExcelClient(library).runtime_stats()
+
+
+def test_profile_native_starts_and_stops_the_native_profile(monkeypatch, tmp_path):
+    from pyfastexcel import profile_native
+
+    library = StatsLibrary(version=8)
+    monkeypatch.setattr('pyfastexcel.driver._load_native_library', lambda _path=None: library)
+
+    with profile_native(cpu=tmp_path / 'cpu.pprof'):
+        assert library.profiles == [('start', bytes(tmp_path / 'cpu.pprof'), None)]
+        with pytest.raises(RuntimeError, match='already running'):
+            with profile_native(heap='heap.pprof'):
+                pass
+    assert library.profiles[-1] == ('stop',)
+    assert library.freed == [ctypes.addressof(library.buffers[0])]
+
+    with pytest.raises(ValueError, match='cpu or heap'):
+        with profile_native():
+            pass
+    monkeypatch.setattr(
+        'pyfastexcel.driver._load_native_library', lambda _path=None: StatsLibrary(version=7)
+    )
+    with pytest.raises(RuntimeError, match='not supported'):
+        with profile_native(heap='heap.pprof'):
+            pass
+
+
+def test_real_profile_native_writes_pprof_files(tmp_path):
+    from pyfastexcel import profile_native
+
+    workbook = Workbook()
+    for row in range(1000):
+        workbook['Sheet1'][row] = [row, f'value {row}']
+    with profile_native(cpu=tmp_path / 'cpu.pprof', heap=tmp_path / 'heap.pprof'):
+        workbook.save(str(tmp_path / 'profiled.xlsx'))
+
+    for name in ('cpu.pprof', 'heap.pprof'):
+        # pprof files are gzip-compressed protocol buffers.
+        assert (tmp_path / name).read_bytes()[:2] == b'\x1f\x8b'
+
+
+def test_real_native_stats_count_exports():
+    from pyfastexcel import native_stats
+
+    workbook = Workbook()
+    for row in range(1000):
+        workbook['Sheet1'][row] = [row, f'value {row}']
+    before = native_stats()
+    _workbook_bytes, report = workbook.read_lib_and_create_excel(return_report=True)
+    after = native_stats()
+
+    assert after['exports'] == before['exports'] + 1
+    allocated = after['export_allocated_bytes'] - before['export_allocated_bytes']
+    assert allocated == report.native['allocated_bytes'] > 0
+    assert after['heap_allocated_bytes'] > before['heap_allocated_bytes']
+    assert after['heap_peak_bytes'] >= after['heap_objects_bytes'] > 0
+    assert after['goroutines'] > 0
+
+
+def test_real_pool_stats_count_repeated_exports():
+    from pyfastexcel import native_pool_stats
+
+    workbook = Workbook()
+    workbook['Sheet1']['A1'] = 'value'
+    workbook.read_lib_and_create_excel()
+    before = native_pool_stats()
+    workbook.read_lib_and_create_excel()
+    after = native_pool_stats()
+
+    for name in ('row_buffers', 'byte_buffers'):
+        assert after[name]['gets'] > before[name]['gets']
+        assert set(after[name]) == {'gets', 'misses', 'puts', 'discarded'}
@@ -17,7 +17,12 @@ import msgspec
 import pytest
 
 import pyfastexcel.driver as driver_module
-from pyfastexcel import CustomStyle, StreamWriter, set_zip_compression_level
+from pyfastexcel import (
+    CustomStyle,
+    StreamWriter,
+    set_zip_compression_level,
+    set_zip_parallel_compression,
+)
 from pyfastexcel.utils import set_custom_style
 from pyfastexcel.wire import WIRE_MAGIC, _encode_no_style_row, _encode_styled_row, encode_v2_payload
 
@@ -197,12 +202,14 @@ def test_set_zip_compression_level_validation(monkeypatch):
     monkeypatch.delenv('PYFASTEXCEL_ZIP_LEVEL', raising=False)
 
     with pytest.raises(ValueError, match='Invalid zip compression level'):
-        set_zip_compression_level(0)
+        set_zip_compression_level(-1)
     with pytest.raises(ValueError, match='Invalid zip compression level'):
         set_zip_compression_level(10)
 
     set_zip_compression_level(6)
     assert os.environ['PYFASTEXCEL_ZIP_LEVEL'] == '6'
+    set_zip_compression_level(0)
+    assert os.environ['PYFASTEXCEL_ZIP_LEVEL'] == '0'
     set_zip_compression_level(None)
     assert 'PYFASTEXCEL_ZIP_LEVEL' not in os.environ
 
@@ -211,6 +218,27 @@ def test_set_zip_compression_level_validation(monkeypatch):
         set_zip_compression_level(6)
 
 
+def test_set_zip_parallel_compression_validation(monkeypatch):
+    monkeypatch.setattr(driver_module, '_NATIVE_EXPORT_STARTED', False)
+    monkeypatch.delenv('PYFASTEXCEL_ZIP_PARALLEL', raising=False)
+
+    with pytest.raises(ValueError, match='Invalid zip parallel mode'):
+        set_zip_parallel_compression('sheets')
+    with pytest.raises(ValueError, match='Invalid zip parallel mode'):
+        set_zip_parallel_compression(True)
+
+    set_zip_parallel_compression('parts')
+    assert os.environ['PYFASTEXCEL_ZIP_PARALLEL'] == 'parts'
+    set_zip_parallel_compression('blocks')
+    assert os.environ['PYFASTEXCEL_ZIP_PARALLEL'] == 'blocks'
+    set_zip_parallel_compression(None)
+    assert 'PYFASTEXCEL_ZIP_PARALLEL' not in os.environ
+
+    monkeypatch.setattr(driver_module, '_NATIVE_EXPORT_STARTED', True)
+    with pytest.raises(RuntimeError, match='before the first workbook export'):
+        set_zip_parallel_compression('parts')
+
+
 _SUBPROCESS_EXPORT = '''
 import sys
 sys.path.insert(0, {root!r})
@@ -222,7 +250,7 @@ class W(StreamWriter):
 writer = W()
 writer.set_file_props('Created', '2000-01-01T00:00:00Z')
 writer.set_file_props('Modified', '2000-01-01T00:00:00Z')
-for row in range(200):
+for row in range({rows}):
     for col in range(10):
         writer.row_append(row * 10 + col, style='bold')
     writer.create_row()
@@ -230,11 +258,14 @@ writer.save({path!r})
 '''
 
 
-def _export_in_subprocess(tmp_path: Path, name: str, env_extra: dict[str, str]) -> Path:
+def _export_in_subprocess(
+    tmp_path: Path, name: str, env_extra: dict[str, str], rows: int = 200
+) -> Path:
     output = tmp_path / name
     env = dict(os.environ, **env_extra)
+    script = _SUBPROCESS_EXPORT.format(root=str(ROOT), path=str(output), rows=rows)
     completed = subprocess.run(
-        [sys.executable, '-c', _SUBPROCESS_EXPORT.format(root=str(ROOT), path=str(output))],
+        [sys.executable, '-c', script],
         capture_output=True,
         text=True,
         env=env,
@@ -258,3 +289,58 @@ def test_zip_level_produces_equivalent_readable_workbook(tmp_path):
         assert default_names == fast_names
         for entry in default_names:
             assert default_zip.read(entry) == fast_zip.read(entry)
+
+
+def test_zip_parallel_parts_keeps_default_compressed_entries(tmp_path):
+    default_path = _export_in_subprocess(tmp_path, 'default.xlsx', {})
+    parallel_path = _export_in_subprocess(
+        tmp_path,
+        'parallel.xlsx',
+        {'PYFASTEXCEL_ZIP_PARALLEL': 'parts'},
+    )
+
+    with (
+        zipfile.ZipFile(default_path) as default_zip,
+        zipfile.ZipFile(parallel_path) as parallel_zip,
+    ):
+        assert parallel_zip.testzip() is None
+        default_entries = {info.filename: info for info in default_zip.infolist()}
+        parallel_entries = {info.filename: info for info in parallel_zip.infolist()}
+        assert sorted(default_entries) == sorted(parallel_entries)
+        for name, info in default_entries.items():
+            # Same standard-library compressor, so the same compressed size.
+            assert parallel_entries[name].compress_size == info.compress_size
+            assert parallel_zip.read(name) == default_zip.read(name)
+
+
+def test_zip_parallel_blocks_produces_equivalent_readable_workbook(tmp_path):
+    # Only parts over zipBlockSize (1 MiB) are cut into blocks, so the sheet
+    # must be larger than that.
+    rows = 8000
+    default_path = _export_in_subprocess(tmp_path, 'default.xlsx', {}, rows)
+    blocks_path = _export_in_subprocess(
+        tmp_path,
+        'blocks.xlsx',
+        {'PYFASTEXCEL_ZIP_PARALLEL': 'blocks', 'PYFASTEXCEL_ZIP_LEVEL': '1'},
+        rows,
+    )
+
+    with zipfile.ZipFile(default_path) as default_zip, zipfile.ZipFile(blocks_path) as blocks_zip:
+        assert blocks_zip.testzip() is None
+        assert blocks_zip.getinfo('xl/worksheets/sheet1.xml').file_size > 1 << 20
+        names = sorted(info.filename for info in default_zip.infolist())
+        assert names == sorted(info.filename for info in blocks_zip.infolist())
+        for entry in names:
+            assert blocks_zip.read(entry) == default_zip.read(entry)
+
+
+def test_zip_level_zero_stores_entries_uncompressed(tmp_path):
+    default_path = _export_in_subprocess(tmp_path, 'default.xlsx', {})
+    stored_path = _export_in_subprocess(tmp_path, 'stored.xlsx', {'PYFASTEXCEL_ZIP_LEVEL': '0'})
+
+    with zipfile.ZipFile(default_path) as default_zip, zipfile.ZipFile(stored_path) as stored_zip:
+        assert stored_zip.testzip() is None
+        for info in stored_zip.infolist():
+            assert info.compress_type == zipfile.ZIP_STORED
+            assert info.compress_size == info.file_size
+            assert stored_zip.read(info.filename) == default_zip.read(info.filename)
@@ -1,9 +1,7 @@
 from __future__ import annotations
 
-import base64
 import ctypes
 import io
-import struct
 import zipfile
 from concurrent.futures import ThreadPoolExecutor
 
@@ -17,74 +15,7 @@ from pyfastexcel.manager import StyleManager
 from pyfastexcel.utils import set_custom_style, validate_and_register_style
 from pyfastexcel.wire import WIRE_MAGIC, encode_payload, encode_v2_payload
 
-
-class FakeCFunction:
-    def __init__(self, callback):
-        self.callback = callback
-        self.argtypes = None
-        self.restype = None
-
-    def __call__(self, *args):
-        return self.callback(*args)
-
-
-class FakeNativeLibrary:
-    def __init__(self, *, version: int = 1, raw_output: bytes = b'xlsx'):
-        self.buffers = []
-        self.freed = []
-        self.payloads = []
-        self.paths = []
-        self.FreeCPointer = FakeCFunction(self._free)
-        self.Export = FakeCFunction(self._legacy_export)
-        self.raw_output = raw_output
-        if version >= 2:
-            self.GetABIVersion = FakeCFunction(lambda: version)
-            self.ExportV2 = FakeCFunction(self._export_v2)
-            self.ExportToFileV2 = FakeCFunction(self._export_to_file_v2)
-
-    @staticmethod
-    def _pointer_value(pointer):
-        return pointer.value if hasattr(pointer, 'value') else pointer
-
-    def _keep_buffer(self, data: bytes) -> int:
-        buffer = ctypes.create_string_buffer(data)
-        self.buffers.append(buffer)
-        return ctypes.addressof(buffer)
-
-    def _free(self, pointer, _debug):
-        self.freed.append(self._pointer_value(pointer))
-
-    def _legacy_export(self, payload, _catch_panic):
-        self.payloads.append(bytes(payload))
-        return self._keep_buffer(base64.b64encode(self.raw_output))
-
-    @staticmethod
-    def _read_payload(payload, payload_length):
-        address = payload.value if hasattr(payload, 'value') else payload
-        return bytes((ctypes.c_ubyte * payload_length).from_address(address))
-
-    def _export_v2(self, payload, payload_length, _catch_panic, output_length, _error):
-        self.payloads.append(self._read_payload(payload, payload_length))
-        output_length._obj.value = len(self.raw_output)
-        return self._keep_buffer(self.raw_output)
-
-    def _export_to_file_v2(self, payload, payload_length, path, _catch_panic, _error):
-        self.payloads.append(self._read_payload(payload, payload_length))
-        self.paths.append(bytes(path))
-        return 0
-
-
-def _decode_v2_metadata(payload: bytes):
-    assert payload[:4] == WIRE_MAGIC
-    metadata_length = struct.unpack('>Q', payload[4:12])[0]
-    metadata_end = 12 + metadata_length
-    return msgspec.json.decode(payload[12:metadata_end]), payload[metadata_end:]
-
-
-def _zip_entry_map(source) -> dict[str, bytes]:
-    with zipfile.ZipFile(source) as archive:
-        assert archive.testzip() is None
-        return {name: archive.read(name) for name in archive.namelist()}
+from .support import FakeNativeLibrary, decode_v2_metadata, zip_entry_map
 
 
 def test_late_process_registration_reaches_existing_workbook_and_stream_writer():
@@ -275,7 +206,7 @@ def test_v2_wire_framing_style_ids_and_public_data_compatibility():
 
     export_data = workbook._build_export_data()
     payload = encode_v2_payload(export_data)
-    metadata, row_payload = _decode_v2_metadata(payload)
+    metadata, row_payload = decode_v2_metadata(payload)
 
     assert metadata['_pyfastexcel_wire'] == {
         'version': 2,
@@ -293,7 +224,7 @@ def test_v2_wire_keeps_no_style_rows_unmodified():
     workbook = Workbook(plain_data=[[1, 'two'], [None, 4]])
     export_data = workbook._build_export_data()
     payload = encode_v2_payload(export_data)
-    metadata, row_payload = _decode_v2_metadata(payload)
+    metadata, row_payload = decode_v2_metadata(payload)
 
     assert metadata['_pyfastexcel_wire']['row_counts'] == [2]
     assert row_payload == (msgspec.msgpack.encode([1, 'two']) + msgspec.msgpack.encode([None, 4]))
@@ -310,7 +241,7 @@ def test_v2_wire_matches_json_non_finite_float_semantics_without_mutating_data()
     export_data = workbook._build_export_data()
 
     payload = encode_v2_payload(export_data)
-    metadata, row_payload = _decode_v2_metadata(payload)
+    metadata, row_payload = decode_v2_metadata(payload)
 
     assert metadata['_pyfastexcel_wire']['row_counts'] == [1, 1]
     assert row_payload == (
@@ -365,7 +296,7 @@ def test_v2_wire_accepts_msgpack_integer_boundaries(value, no_style):
 
     payload = encode_payload(workbook._build_export_data())
     assert payload.startswith(WIRE_MAGIC)
-    metadata, row_payload = _decode_v2_metadata(payload)
+    metadata, row_payload = decode_v2_metadata(payload)
     assert sum(metadata['_pyfastexcel_wire']['row_counts']) == 1
     expected = [value] if no_style else [[value, 0]]
     assert msgspec.msgpack.decode(row_payload) == expected
@@ -459,11 +390,10 @@ def test_v2_error_pointer_is_reported_and_freed():
     library = FakeNativeLibrary(version=2)
 
     def fail_export(_payload, _length, _catch_panic, _output_length, error_pointer):
-        address = library._keep_buffer(b'native failure')
-        ctypes.cast(error_pointer, ctypes.POINTER(ctypes.c_char_p))[0] = ctypes.c_char_p(address)
+        library.set_string(error_pointer, b'native failure')
         return None
 
-    library.ExportV2 = FakeCFunction(fail_export)
+    library.replace('ExportV2', fail_export)
     client = NativeExcelClient(library)
 
     with pytest.raises(RuntimeError, match='native failure'):
@@ -474,7 +404,7 @@ def test_v2_error_pointer_is_reported_and_freed():
 
 def test_v2_null_output_without_error_reports_contract_failure():
     library = FakeNativeLibrary(version=2)
-    library.ExportV2 = FakeCFunction(lambda *_args: None)
+    library.replace('ExportV2', lambda *_args: None)
     client = NativeExcelClient(library)
 
     with pytest.raises(RuntimeError, match='returned a null pointer'):
@@ -493,15 +423,13 @@ def test_v2_output_and_error_are_both_released_and_error_wins():
         output_length,
         error_pointer,
     ):
-        output_address = library._keep_buffer(b'invalid workbook')
-        error_address = library._keep_buffer(b'native rejected payload')
-        output_length._obj.value = len(b'invalid workbook')
-        ctypes.cast(error_pointer, ctypes.POINTER(ctypes.c_char_p))[0] = ctypes.c_char_p(
-            error_address
-        )
+        output_address = library.keep_buffer(b'invalid workbook')
+        error_address = library.keep_buffer(b'native rejected payload')
+        output_length[0] = len(b'invalid workbook')
+        ctypes.cast(error_pointer, ctypes.POINTER(ctypes.c_void_p))[0] = error_address
         return output_address
 
-    library.ExportV2 = FakeCFunction(export_with_output_and_error)
+    library.replace('ExportV2', export_with_output_and_error)
     client = NativeExcelClient(library)
 
     with pytest.raises(RuntimeError, match='native rejected payload'):
@@ -515,7 +443,7 @@ def test_v2_output_and_error_are_both_released_and_error_wins():
 
 def test_legacy_null_output_reports_contract_failure_without_freeing():
     library = FakeNativeLibrary(version=1)
-    library.Export = FakeCFunction(lambda *_args: None)
+    library.replace('Export', lambda *_args: None)
     client = NativeExcelClient(library)
 
     with pytest.raises(RuntimeError, match='returned a null pointer'):
@@ -551,13 +479,10 @@ def test_direct_file_failure_reports_status_and_releases_error_pointer(
 
     def fail_direct_export(_payload, _length, _path, _catch_panic, error_pointer):
         if error_message is not None:
-            error_address = library._keep_buffer(error_message)
-            ctypes.cast(error_pointer, ctypes.POINTER(ctypes.c_char_p))[0] = ctypes.c_char_p(
-                error_address
-            )
+            library.set_string(error_pointer, error_message)
         return status
 
-    library.ExportToFileV2 = FakeCFunction(fail_direct_export)
+    library.replace('ExportToFileV2', fail_direct_export)
     client = NativeExcelClient(library)
 
     with pytest.raises(RuntimeError, match=expected_message):
@@ -589,7 +514,7 @@ def test_real_memory_and_unicode_direct_file_exports_have_equivalent_zip_entries
     workbook.save(str(direct_path))
     memory_export = workbook.read_lib_and_create_excel()
 
-    assert _zip_entry_map(direct_path) == _zip_entry_map(io.BytesIO(memory_export))
+    assert zip_entry_map(direct_path) == zip_entry_map(io.BytesIO(memory_export))
 
 
 def test_real_direct_file_failure_does_not_poison_later_save(tmp_path):
@@ -603,7 +528,7 @@ def test_real_direct_file_failure_does_not_poison_later_save(tmp_path):
     recovered_path = tmp_path / '恢復成功.xlsx'
     workbook.save(str(recovered_path))
 
-    entries = _zip_entry_map(recovered_path)
+    entries = zip_entry_map(recovered_path)
     assert (
         b'<t>\xe5\x8f\xaf\xe6\x81\xa2\xe5\xbe\xa9\xe5\x85\xa7\xe5\xae\xb9</t>'
         in entries['xl/worksheets/sheet1.xml']
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import pyfastexcel.wire as wire_module
+from pyfastexcel import CustomStyle, Workbook
+from pyfastexcel.wire import encode_payload
+
+
+def test_explain_export_reports_the_plan_and_slow_paths(monkeypatch):
+    from pyfastexcel import ExportPlan
+
+    workbook = Workbook()
+    workbook.style.register_style('bold_a', CustomStyle(font_bold=True))
+    workbook.style.register_style('bold_b', CustomStyle(font_bold=True))
+    workbook['Sheet1'][0] = [('a', 'bold_a'), ('b', 'bold_b')]
+    workbook.create_sheet('Large', plain_data=[[row] for row in range(40)])
+
+    plan = workbook.explain_export(max_workers=2)
+    assert isinstance(plan, ExportPlan)
+    assert (plan.wire, plan.fallback_reason, plan.parallel, plan.workers) == ('pfx2', None, True, 2)
+    assert plan.payload_bytes == len(encode_payload(workbook._build_export_data(max_workers=2)))
+    assert 0 < plan.metadata_bytes < plan.payload_bytes
+    assert (plan.styles, plan.distinct_styles) == (3, 2)
+    assert [(sheet.name, sheet.engine, sheet.rows) for sheet in plan.sheets] == [
+        ('Sheet1', 'StreamWriter', 1),
+        ('Large', 'StreamWriter', 40),
+    ]
+    assert plan.slow_paths == []
+
+    monkeypatch.setattr('pyfastexcel.plan._SPLIT_SHEET_MIN_ROWS', 16)
+    assert [sheet.split for sheet in workbook.explain_export(max_workers=2).sheets] == [
+        False,
+        True,
+    ]
+    assert not any(sheet.split for sheet in workbook.explain_export(max_workers=1).sheets)
+
+    workbook['Sheet1']._writer_engine = 'NormalWriter'
+    plan = workbook.explain_export()
+    assert plan.parallel is False
+    assert plan.slow_paths == [
+        "sheet 'Sheet1' uses NormalWriter: it is written cell by cell "
+        'before the parallel sheet writers start'
+    ]
+
+    workbook.create_sheet('Bytes', plain_data=[[1, b'bytes']])
+    plan = workbook.explain_export()
+    assert (plan.wire, plan.metadata_bytes, plan.parallel) == ('json', None, False)
+    assert plan.slow_paths[0] == (
+        "JSON wire: bytes values need the JSON wire (sheet 'Bytes', row 1, column 2); "
+        'rows are sent as JSON and every sheet is written sequentially'
+    )
+
+    workbook.remove_sheet('Bytes')
+    monkeypatch.setattr(wire_module, 'MAX_WIRE_METADATA_BYTES', 16)
+    monkeypatch.setenv('PYFASTEXCEL_SEQUENTIAL', '1')
+    plan = workbook.explain_export()
+    assert plan.fallback_reason == 'workbook metadata exceeds the PFX2 limit'
+    assert plan.slow_paths[-1] == 'PYFASTEXCEL_SEQUENTIAL disables parallel sheet writing'
@@ -0,0 +1,133 @@
+from __future__ import annotations
+
+import ctypes
+
+import pytest
+
+from pyfastexcel import Workbook
+from pyfastexcel.driver import _PROGRESS_CALLBACK
+
+from .support import FakeNativeLibrary, c_char_pp, c_size_tp
+
+
+class ProgressLibrary(FakeNativeLibrary):
+    """Adds ExportV4 and ExportToFileV4, the ABI v6 exports with hooks."""
+
+    def __init__(self):
+        super().__init__(version=6, raw_output=b'PK\x00binary')
+        # Whether each export got a progress callback and a cancel flag.
+        self.hooks = []
+        hooks = [_PROGRESS_CALLBACK, ctypes.POINTER(ctypes.c_int32)]
+        self.bind(
+            'ExportV4',
+            ctypes.c_void_p,
+            [ctypes.c_void_p, ctypes.c_size_t, c_size_tp, c_char_pp, c_char_pp, *hooks],
+            self._export_v4,
+        )
+        self.bind(
+            'ExportToFileV4',
+            ctypes.c_int64,
+            [ctypes.c_void_p, ctypes.c_size_t, ctypes.c_char_p, c_char_pp, c_char_pp, *hooks],
+            self._export_to_file_v4,
+        )
+
+    def _run_hooks(self, error, progress, cancel) -> bool:
+        # Report one row of the first sheet, then the archive, like ExportV4.
+        # Both hooks are optional and arrive as NULL pointers when unset.
+        self.hooks.append((bool(progress), bool(cancel)))
+        for sheet, size in ((0, 0), (-1, len(self.raw_output))):
+            stopped = bool(progress) and progress(sheet, 1, size) != 0
+            if stopped or (cancel and cancel[0]):
+                self.set_string(error, b'pyfastexcel export cancelled')
+                return False
+        return True
+
+    def _export_v4(self, payload, payload_length, output_length, error, report, progress, cancel):
+        if not self._run_hooks(error, progress, cancel):
+            return None
+        return self._export_v3(payload, payload_length, output_length, error, report)
+
+    def _export_to_file_v4(self, payload, payload_length, path, error, report, progress, cancel):
+        if not self._run_hooks(error, progress, cancel):
+            return 1
+        return self._export_to_file_v3(payload, payload_length, path, error, report)
+
+
+def test_v4_export_reports_progress_by_sheet_name_and_honors_cancellation(monkeypatch, tmp_path):
+    from pyfastexcel import CancelToken, ExportCancelled
+
+    library = ProgressLibrary()
+    workbook = Workbook()
+    workbook.create_sheet('報表')
+    workbook.switch_sheet('報表')
+    workbook.remove_sheet('Sheet1')
+    workbook['報表']['A1'] = 'value'
+    monkeypatch.setattr(workbook, '_read_lib', lambda _path: library)
+    events = []
+
+    workbook.save(str(tmp_path / 'progress.xlsx'), progress=lambda *event: events.append(event))
+    assert events == [('報表', 1, 0), (None, 1, len(b'PK\x00binary'))]
+
+    token = CancelToken()
+    token.cancel()
+    assert token.cancelled
+    with pytest.raises(ExportCancelled, match='cancelled'):
+        workbook.save(str(tmp_path / 'cancelled.xlsx'), cancel=token)
+    assert library.freed[-1] == ctypes.addressof(library.buffers[-1])
+    with pytest.raises(ExportCancelled, match='cancelled'):
+        workbook.read_lib_and_create_excel(cancel=token)
+    assert workbook.read_lib_and_create_excel(progress=lambda *_event: None) == b'PK\x00binary'
+
+    def failing_progress(_sheet, _rows_written, _bytes_compressed):
+        raise ValueError('stop here')
+
+    with pytest.raises(ValueError, match='stop here'):
+        workbook.read_lib_and_create_excel(progress=failing_progress, cancel=CancelToken())
+    assert library.freed[-1] == ctypes.addressof(library.buffers[-1])
+
+
+def test_v4_export_without_hooks_passes_null_pointers(monkeypatch, tmp_path):
+    from pyfastexcel import CancelToken
+
+    library = ProgressLibrary()
+    workbook = Workbook()
+    workbook['Sheet1']['A1'] = 'value'
+    monkeypatch.setattr(workbook, '_read_lib', lambda _path: library)
+
+    assert workbook.read_lib_and_create_excel() == b'PK\x00binary'
+    workbook['Sheet1']['A2'] = 'changed'
+    workbook.save(str(tmp_path / 'plain.xlsx'))
+    workbook.read_lib_and_create_excel(progress=lambda *_event: None, cancel=CancelToken())
+    assert library.hooks == [(False, False), (False, False), (True, True)]
+    assert library.paths == [str(tmp_path / 'plain.xlsx').encode()]
+
+
+def test_real_export_progress_and_cancellation(tmp_path):
+    from pyfastexcel import CancelToken, ExportCancelled
+
+    workbook = Workbook()
+    workbook.create_sheet('Second')
+    for row in range(10000):
+        workbook['Sheet1'][row] = [row, f'value {row}']
+    workbook['Second']['A1'] = 'second'
+    events = []
+
+    workbook.save(str(tmp_path / 'progress.xlsx'), progress=lambda *event: events.append(event))
+
+    sheet_events = [event for event in events if event[0] is not None]
+    assert {('Sheet1', 10000, 0), ('Second', 1, 0)} <= set(sheet_events)
+    assert events[-1][0] is None
+    assert events[-1][1] == 10001
+    assert events[-1][2] == (tmp_path / 'progress.xlsx').stat().st_size
+
+    token = CancelToken()
+    token.cancel()
+    with pytest.raises(ExportCancelled):
+        workbook.read_lib_and_create_excel(cancel=token)
+
+    def failing_progress(_sheet, _rows_written, _bytes_compressed):
+        raise ValueError('stop here')
+
+    with pytest.raises(ValueError, match='stop here'):
+        workbook.read_lib_and_create_excel(progress=failing_progress)
+    assert workbook.read_lib_and_create_excel()[:2] == b'PK'
@@ -0,0 +1,241 @@
+from __future__ import annotations
+
+import ctypes
+import struct
+
+import msgspec
+import pytest
+
+from pyfastexcel import Workbook
+
+from .support import FakeNativeLibrary, c_char_pp, c_size_tp
+
+
+class ReaderLibrary(FakeNativeLibrary):
+    """Adds the row reader (ABI v10) and column read (ABI v11) exports."""
+
+    def __init__(self, *, version: int = 11):
+        super().__init__(version=version)
+        self.sheet_rows = {}
+        self.readers = {}
+        self.column_requests = []
+        self.column_result = b''
+        self.bind(
+            'OpenRowReaderV2',
+            ctypes.c_int64,
+            [ctypes.c_char_p, ctypes.c_char_p, ctypes.c_int64, ctypes.c_int64, c_char_pp],
+            self._open_row_reader,
+        )
+        self.bind(
+            'ReadRowChunkV2',
+            ctypes.c_void_p,
+            [ctypes.c_int64, c_size_tp, c_char_pp],
+            self._read_row_chunk,
+        )
+        self.bind(
+            'CloseRowReaderV2',
+            ctypes.c_void_p,
+            [ctypes.c_int64],
+            self._close_row_reader,
+        )
+        self.bind(
+            'ReadColumnsV2',
+            ctypes.c_void_p,
+            [ctypes.c_char_p, ctypes.c_char_p, ctypes.c_char_p, c_size_tp, c_char_pp],
+            self._read_columns,
+        )
+
+    def _open_row_reader(self, path, sheet, chunk_rows, raw, error):
+        rows = self.sheet_rows.get(sheet)
+        if rows is None:
+            self.set_string(error, b'sheet does not exist')
+            return 0
+        handle = len(self.readers) + 1
+        self.readers[handle] = [rows[i : i + chunk_rows] for i in range(0, len(rows), chunk_rows)]
+        self.paths.append((path, raw))
+        return handle
+
+    def _read_row_chunk(self, handle, output_length, error):
+        chunks = self.readers.get(handle)
+        if chunks is None:
+            self.set_string(error, b'row reader handle is not valid')
+            return None
+        if not chunks:
+            return None
+        chunk = msgspec.msgpack.encode(chunks.pop(0))
+        output_length[0] = len(chunk)
+        return self.keep_buffer(chunk)
+
+    def _close_row_reader(self, handle):
+        self.readers.pop(handle, None)
+        return None
+
+    def _read_columns(self, path, sheet, request, output_length, error):
+        self.column_requests.append((path, sheet, msgspec.json.decode(request)))
+        if not self.column_result:
+            self.set_string(error, b'cell B2 of column "qty" is "x", expected an integer')
+            return None
+        output_length[0] = len(self.column_result)
+        return self.keep_buffer(self.column_result)
+
+
+def test_read_rows_streams_native_chunks_and_closes_the_reader(monkeypatch, tmp_path):
+    from pyfastexcel import read_rows
+
+    library = ReaderLibrary(version=10)
+    library.sheet_rows[b'Data'] = [['a', '1'], [], ['', '2.5'], ['b']]
+    monkeypatch.setattr('pyfastexcel.driver._load_native_library', lambda _path=None: library)
+
+    rows = read_rows(tmp_path / 'in.xlsx', 'Data', chunk_rows=3)
+    assert library.paths == []
+    assert list(rows) == [['a', '1'], [], ['', '2.5'], ['b']]
+    assert library.paths == [(bytes(tmp_path / 'in.xlsx'), 1)]
+    assert library.readers == {}
+    assert len(library.freed) == 2
+
+    # Closing the generator early closes the native reader too.
+    rows = read_rows(tmp_path / 'in.xlsx', 'Data', raw=False, chunk_rows=1)
+    assert next(rows) == ['a', '1']
+    assert library.readers
+    rows.close()
+    assert library.readers == {} and library.paths[-1][1] == 0
+
+    with pytest.raises(RuntimeError, match='sheet does not exist'):
+        next(read_rows(tmp_path / 'in.xlsx', 'Missing'))
+    with pytest.raises(ValueError, match='chunk_rows'):
+        read_rows(tmp_path / 'in.xlsx', chunk_rows=0)
+    monkeypatch.setattr(
+        'pyfastexcel.driver._load_native_library', lambda _path=None: ReaderLibrary(version=9)
+    )
+    with pytest.raises(RuntimeError, match='not supported'):
+        read_rows(tmp_path / 'in.xlsx')
+
+
+def test_real_read_rows_matches_openpyxl_read_only(tmp_path):
+    openpyxl = pytest.importorskip('openpyxl')
+    from pyfastexcel import read_rows
+
+    workbook = Workbook()
+    workbook.create_sheet('Data')
+    for row in range(2500):
+        workbook['Data'][row] = [f'item {row}', row, row / 4, row % 2 == 0]
+    workbook['Data'][2600] = ['', 'after a gap']
+    path = tmp_path / 'read.xlsx'
+    workbook.save(str(path))
+
+    rows = list(read_rows(path, 'Data', chunk_rows=1000))
+    expected = openpyxl.load_workbook(path, read_only=True)['Data']
+    expected_rows = [
+        ['' if value is None else value for value in row]
+        for row in expected.iter_rows(values_only=True)
+    ]
+    assert len(rows) == len(expected_rows) == 2601
+    for row, expected_row in zip(rows, expected_rows):
+        while expected_row and expected_row[-1] == '':
+            expected_row.pop()
+        assert len(row) == len(expected_row)
+        for value, expected_value in zip(row, expected_row):
+            if isinstance(expected_value, bool):
+                assert value == str(int(expected_value))
+            elif isinstance(expected_value, (int, float)):
+                assert float(value) == expected_value
+            else:
+                assert value == expected_value
+    assert list(read_rows(path)) == []
+
+
+def _encode_column_result(rows: int, columns: list[tuple[str, str, bytes]]) -> bytes:
+    """Lay out columns the way the native ReadColumns result does."""
+    data = bytearray()
+    infos = []
+    for name, dtype, values in columns:
+        data += bytes(-len(data) % 8)
+        infos.append({'name': name, 'dtype': dtype, 'offset': len(data), 'length': len(values)})
+        data += values
+    metadata = msgspec.json.encode({'rows': rows, 'columns': infos})
+    header = len(metadata).to_bytes(8, 'little') + metadata
+    return header + bytes(-len(header) % 8) + bytes(data)
+
+
+def test_read_columns_decodes_typed_buffers(monkeypatch, tmp_path):
+    import array
+
+    import numpy as np
+
+    from pyfastexcel import read_columns
+
+    library = ReaderLibrary(version=11)
+    library.column_result = _encode_column_result(
+        3,
+        [
+            ('price', 'float64', struct.pack('<3d', 1.5, float('nan'), 3.0)),
+            ('qty', 'int64', struct.pack('<3q', 1, -2, 3)),
+            ('ok', 'bool', b'\x01\x00\x01'),
+            ('name', 'str', msgspec.msgpack.encode(['a', '', 'c'])),
+        ],
+    )
+    monkeypatch.setattr('pyfastexcel.driver._load_native_library', lambda _path=None: library)
+
+    dtypes = {'price': float, 'qty': 'int64', 'ok': bool, 'name': str}
+    columns = read_columns(tmp_path / 'in.xlsx', 'Data', dtypes)
+    assert library.column_requests[0] == (
+        bytes(tmp_path / 'in.xlsx'),
+        b'Data',
+        {
+            'header': True,
+            'columns': [
+                {'key': 'price', 'dtype': 'float64'},
+                {'key': 'qty', 'dtype': 'int64'},
+                {'key': 'ok', 'dtype': 'bool'},
+                {'key': 'name', 'dtype': 'str'},
+            ],
+        },
+    )
+    assert list(columns) == ['price', 'qty', 'ok', 'name']
+    assert columns['qty'] == array.array('q', [1, -2, 3])
+    assert columns['price'].typecode == 'd' and columns['price'][2] == 3.0
+    assert columns['ok'] == array.array('b', [1, 0, 1])
+    assert columns['name'] == ['a', '', 'c']
+    assert len(library.freed) == 1
+
+    arrays = read_columns(tmp_path / 'in.xlsx', header=False, numpy=True)
+    assert library.column_requests[-1][1:] == (None, {'header': False, 'columns': None})
+    assert arrays['qty'].dtype == np.int64 and arrays['qty'].tolist() == [1, -2, 3]
+    assert np.isnan(arrays['price'][1]) and arrays['ok'].tolist() == [True, False, True]
+    arrays['qty'][0] = 10
+
+    with pytest.raises(ValueError, match='Invalid dtype'):
+        read_columns(tmp_path / 'in.xlsx', dtypes={'price': 'decimal'})
+    library.column_result = b''
+    with pytest.raises(RuntimeError, match='cell B2'):
+        read_columns(tmp_path / 'in.xlsx', dtypes={'qty': int})
+    monkeypatch.setattr(
+        'pyfastexcel.driver._load_native_library', lambda _path=None: ReaderLibrary(version=10)
+    )
+    with pytest.raises(RuntimeError, match='not supported'):
+        read_columns(tmp_path / 'in.xlsx')
+
+
+def test_real_read_columns_matches_the_written_values(tmp_path):
+    np = pytest.importorskip('numpy')
+    from pyfastexcel import read_columns
+
+    workbook = Workbook()
+    workbook['Sheet1'][0] = ['name', 'qty', 'price', 'ok']
+    for row in range(1, 3001):
+        workbook['Sheet1'][row] = [f'item {row}', row, row / 8, row % 3 == 0]
+    path = tmp_path / 'columns.xlsx'
+    workbook.save(str(path))
+
+    columns = read_columns(
+        path, dtypes={'qty': int, 'price': float, 'ok': bool, 'name': str}, numpy=True
+    )
+    assert columns['qty'].tolist() == list(range(1, 3001))
+    assert np.array_equal(columns['price'], np.arange(1, 3001) / 8)
+    assert columns['ok'].sum() == 1000
+    assert columns['name'][-1] == 'item 3000'
+
+    letters = read_columns(path, dtypes={'A': str}, header=False)
+    assert len(letters['A']) == 3001 and letters['A'][0] == 'name'
+    with pytest.raises(RuntimeError, match='cell B1'):
+        read_columns(path, dtypes={'B': 'int64'}, header=False)
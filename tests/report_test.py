@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import io
+
+import pytest
+
+from pyfastexcel import Workbook
+from pyfastexcel.wire import WIRE_MAGIC, encode_payload
+
+from .support import FakeNativeLibrary
+
+
+def test_export_report_counts_encoder_paths_and_locates_json_fallback(monkeypatch):
+    from pyfastexcel import ExportReport
+
+    workbook = Workbook()
+    workbook['Sheet1'][0] = [1, 'a', 2.5]
+    workbook['Sheet1'][1] = [float('nan'), 'b']
+    workbook.create_sheet('Plain', plain_data=[[1, 2], [float('inf'), 3]])
+
+    report = ExportReport()
+    payload = encode_payload(workbook._build_export_data(report=report), report=report)
+    assert payload.startswith(WIRE_MAGIC)
+    assert (report.wire, report.fallback_reason) == ('pfx2', None)
+    assert (report.fast_rows, report.careful_rows) == (3, 1)
+    assert report.payload_bytes == len(payload)
+    assert set(report.stages) == {'styles', 'export_data', 'encode'}
+
+    workbook.create_sheet('Bytes', plain_data=[[1, 2], [3, b'bytes']])
+    report = ExportReport()
+    payload = encode_payload(workbook._build_export_data(), report=report)
+    assert not payload.startswith(WIRE_MAGIC)
+    assert report.wire == 'json'
+    assert report.fallback_reason == 'bytes values need the JSON wire'
+    assert (report.fallback_sheet, report.fallback_row, report.fallback_column) == ('Bytes', 2, 2)
+
+    report = ExportReport()
+    encode_payload(workbook._build_export_data(), force_json=True, report=report)
+    assert report.fallback_reason == 'the native library does not support PFX2'
+    assert report.fallback_sheet is None
+
+
+def test_save_returns_export_report_with_native_stages(monkeypatch, tmp_path):
+    library = FakeNativeLibrary(
+        version=3,
+        raw_output=b'PK\x00binary',
+        report=b'{"build": "parallel", "build_ns": 2000000, "write_ns": 1000000,'
+        b' "output_bytes": 9}',
+    )
+    workbook = Workbook()
+    workbook['Sheet1']['A1'] = 'value'
+    monkeypatch.setattr(workbook, '_read_lib', lambda _path: library)
+
+    assert workbook.save(str(tmp_path / 'direct.xlsx')) is None
+    report = workbook.save(str(tmp_path / 'direct.xlsx'), return_report=True)
+    assert report is workbook.export_report
+    assert report.wire == 'pfx2' and report.parallel is True
+    assert report.output_bytes == 9
+    assert report.stages['native_build'] == pytest.approx(0.002)
+    assert report.stages['compression'] == pytest.approx(0.001)
+    assert {'styles', 'export_data', 'encode', 'native'} <= set(report.stages)
+
+    workbook_bytes, report = workbook.read_lib_and_create_excel(return_report=True)
+    assert workbook_bytes == b'PK\x00binary'
+    buffer = io.BytesIO()
+    saved = workbook.save(buffer, return_report=True)
+    assert buffer.getvalue() == workbook_bytes
+    # Reusing the bytes exports nothing, so the save gets a report of its own.
+    assert saved is not report and saved is workbook.export_report
+    assert saved.cache == 'reused' and saved.output_bytes == len(workbook_bytes)
+    assert saved.native is None and set(saved.stages) == {'file_write'}
+    assert 'file_write' not in report.stages and report.cache is None
+
+    legacy = Workbook()
+    monkeypatch.setattr(legacy, '_read_lib', lambda _path: FakeNativeLibrary(version=2))
+    _workbook_bytes, report = legacy.read_lib_and_create_excel(return_report=True)
+    assert (report.native, report.parallel, report.output_bytes) == (None, None, 4)
+    assert 'native_build' not in report.stages
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import ctypes
+from pathlib import Path
+
+import pytest
+
+from pyfastexcel import CustomStyle, Workbook
+from pyfastexcel.wire import WIRE_MAGIC
+
+from .support import FakeNativeLibrary, c_size_tp, zip_entry_map
+
+c_void_pp = ctypes.POINTER(ctypes.c_void_p)
+
+
+class BatchLibrary(FakeNativeLibrary):
+    """Adds ExportBatchV2, the ABI v5 batch export."""
+
+    def __init__(self, *, version: int = 5):
+        super().__init__(version=version)
+        self.batch_max_workers = []
+        self.bind(
+            'ExportBatchV2',
+            ctypes.c_int64,
+            [
+                c_void_pp,
+                c_size_tp,
+                ctypes.POINTER(ctypes.c_char_p),
+                ctypes.c_size_t,
+                ctypes.c_int64,
+                c_void_pp,
+                c_void_pp,
+            ],
+            self._export_batch,
+        )
+
+    def _export_batch(self, payloads, lengths, paths, count, max_workers, errors, reports):
+        self.batch_max_workers.append(max_workers)
+        failed = 0
+        for index in range(count):
+            self.payloads.append(self.read_payload(payloads[index], lengths[index]))
+            self.paths.append(paths[index])
+            if b'fail' in paths[index]:
+                errors[index] = self.keep_buffer(b'open output file: denied')
+                failed += 1
+            else:
+                reports[index] = self.keep_buffer(self.report)
+        return failed
+
+
+def test_save_many_exports_in_one_native_call_with_per_item_errors(monkeypatch):
+    from pyfastexcel import save_many
+
+    library = BatchLibrary(version=5)
+    monkeypatch.setattr('pyfastexcel.driver._load_native_library', lambda: library)
+    workbooks = [Workbook() for _ in range(4)]
+    for index, workbook in enumerate(workbooks):
+        workbook['Sheet1']['A1'] = f'customer {index}'
+
+    def broken_export_data(*_args, **_kwargs):
+        raise ValueError('invalid table')
+
+    monkeypatch.setattr(workbooks[2], '_build_export_data', broken_export_data)
+    errors = save_many(
+        [
+            (workbooks[0], 'first.xlsx'),
+            (workbooks[1], Path('fail.xlsx')),
+            (workbooks[2], 'broken.xlsx'),
+            (workbooks[3], '報表.xlsx'),
+        ],
+        max_workers=2,
+    )
+
+    assert errors[0] is None and errors[3] is None
+    assert isinstance(errors[1], RuntimeError) and 'denied' in str(errors[1])
+    assert isinstance(errors[2], ValueError)
+    assert library.batch_max_workers == [2]
+    assert library.paths == [b'first.xlsx', b'fail.xlsx', '報表.xlsx'.encode()]
+    assert all(payload.startswith(WIRE_MAGIC) for payload in library.payloads)
+    assert workbooks[0].native_report == {'buffer_spill_files': 1}
+    assert workbooks[1].native_report is None
+    assert sorted(library.freed) == sorted(ctypes.addressof(buffer) for buffer in library.buffers)
+
+
+def test_save_many_falls_back_to_single_saves_without_batch_export(monkeypatch, tmp_path):
+    from pyfastexcel import save_many
+
+    library = BatchLibrary(version=4)
+    monkeypatch.setattr('pyfastexcel.driver._load_native_library', lambda: library)
+    workbooks = [Workbook(), Workbook()]
+    for workbook in workbooks:
+        monkeypatch.setattr(workbook, '_read_lib', lambda _path: library)
+    paths = [tmp_path / 'a.xlsx', tmp_path / 'b.xlsx']
+
+    assert save_many(zip(workbooks, paths)) == [None, None]
+    assert library.paths == [str(path).encode() for path in paths]
+
+
+@pytest.mark.parametrize('max_workers', [0, 1.5, True])
+def test_save_many_rejects_invalid_arguments(max_workers):
+    from pyfastexcel import save_many
+
+    with pytest.raises(ValueError):
+        save_many([(Workbook(), 'book.xlsx')], max_workers=max_workers)
+    with pytest.raises(ValueError):
+        save_many([(Workbook(), 'bad\x00name.xlsx')])
+
+
+def test_real_save_many_writes_every_workbook(tmp_path):
+    from pyfastexcel import save_many
+
+    shared_style = CustomStyle(font_bold=True, fill_color='FFEE00')
+    workbooks = []
+    for index in range(6):
+        workbook = Workbook()
+        workbook['Sheet1'][0] = [('Customer', shared_style), f'customer {index}']
+        workbooks.append(workbook)
+    paths = [tmp_path / f'customer-{index}.xlsx' for index in range(len(workbooks))]
+    paths[4] = tmp_path / 'missing-parent' / 'customer-4.xlsx'
+
+    errors = save_many(zip(workbooks, paths), max_workers=3)
+
+    assert isinstance(errors[4], RuntimeError)
+    for index, path in enumerate(paths):
+        if index == 4:
+            continue
+        assert errors[index] is None
+        sheet = zip_entry_map(path)['xl/worksheets/sheet1.xml']
+        assert f'<t>customer {index}</t>'.encode() in sheet
+        assert workbooks[index].native_report is not None
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import io
+
+from pyfastexcel import CustomStyle, Workbook
+from pyfastexcel.wire import encode_v2_payload
+
+from .support import FakeNativeLibrary, decode_v2_metadata
+
+
+def test_repeated_saves_encode_only_changed_sheets(monkeypatch):
+    library = FakeNativeLibrary(version=3)
+    workbook = Workbook()
+    monkeypatch.setattr(workbook, '_read_lib', lambda _path: library)
+    for name in ('Second', 'Third'):
+        workbook.create_sheet(name)
+        workbook[name]['A1'] = name
+    workbook['Sheet1']['A1'] = 'cover'
+    _bytes, report = workbook.read_lib_and_create_excel(return_report=True)
+    assert report.reused_sheets == 0
+
+    # An unchanged workbook reuses the exported bytes without a native call.
+    stream = io.BytesIO()
+    workbook.save(stream)
+    assert stream.getvalue() == library.raw_output and len(library.payloads) == 1
+
+    workbook['Sheet1']['A1'] = 'new cover'
+    workbook.save(io.BytesIO())
+    assert len(library.payloads) == 2
+    assert workbook.export_report.reused_sheets == 2
+    _metadata, rows = decode_v2_metadata(library.payloads[-1])
+    full_rows = encode_v2_payload(workbook._build_export_data())
+    assert library.payloads[-1].endswith(rows) and full_rows.endswith(rows)
+
+    # Layout changes reach the output although every row segment is reused.
+    workbook.set_cell_width('Second', 'A', 30)
+    workbook.save(io.BytesIO())
+    metadata, _rows = decode_v2_metadata(library.payloads[-1])
+    assert len(library.payloads) == 3 and workbook.export_report.reused_sheets == 3
+    assert metadata['content']['Second']['Width'] == {'1': 30}
+
+    # Rows handed out by reference are encoded on every export.
+    workbook['Third'].data.append([('appended', 'DEFAULT_STYLE')])
+    _bytes, report = workbook.read_lib_and_create_excel(return_report=True)
+    assert report.reused_sheets == 2
+    workbook['Third'].data[-1] = [('replaced', 'DEFAULT_STYLE')]
+    _bytes, report = workbook.read_lib_and_create_excel(return_report=True)
+    assert report.reused_sheets == 2
+    assert b'replaced' in library.payloads[-1]
+
+    # A new style renumbers the style ids, so every segment is encoded again.
+    workbook['Sheet1']['B1'] = ('bold', CustomStyle(font_bold=True))
+    _bytes, report = workbook.read_lib_and_create_excel(return_report=True)
+    assert report.reused_sheets == 0
+
+
+def test_assigned_rows_are_copied_and_the_sheet_dict_shares_them(monkeypatch):
+    library = FakeNativeLibrary(version=3)
+    workbook = Workbook()
+    monkeypatch.setattr(workbook, '_read_lib', lambda _path: library)
+    row = ['first', 'row']
+    workbook['Sheet1'][0] = row
+    workbook.save(io.BytesIO())
+
+    # Changing the assigned list does not change the sheet, so the saved
+    # bytes stay current.
+    row[0] = 'changed'
+    workbook.save(io.BytesIO())
+    assert len(library.payloads) == 1
+    assert workbook['Sheet1']['A1'] == ('first', 'DEFAULT_STYLE')
+
+    # Rows reached through the sheet dictionary are encoded on every export.
+    workbook['Sheet1'].sheet['Data'][0][0] = ('edited', 'DEFAULT_STYLE')
+    workbook.save(io.BytesIO())
+    assert len(library.payloads) == 2 and b'edited' in library.payloads[-1]
+    workbook['Sheet1'].sheet['Data'][0][0] = ('edited again', 'DEFAULT_STYLE')
+    _bytes, report = workbook.read_lib_and_create_excel(return_report=True)
+    assert report.reused_sheets == 0 and b'edited again' in library.payloads[-1]
@@ -0,0 +1,140 @@
+"""Shared helpers for the tests of the native export boundary."""
+
+from __future__ import annotations
+
+import base64
+import ctypes
+import struct
+import zipfile
+
+import msgspec
+
+from pyfastexcel.wire import WIRE_MAGIC
+
+c_char_pp = ctypes.POINTER(ctypes.c_char_p)
+c_size_tp = ctypes.POINTER(ctypes.c_size_t)
+
+
+class FakeNativeLibrary:
+    """
+    A stand-in for the native library whose exports are Python functions.
+
+    Every export is a real ctypes function pointer, so the argtypes and
+    restype NativeExcelClient declares are enforced as they are for the
+    shared library: an argument the C prototype would reject fails here too.
+    This class provides the export functions up to ABI v3; test modules
+    subclass it and ``bind`` the functions of the feature they cover.
+    """
+
+    def __init__(
+        self,
+        *,
+        version: int = 1,
+        raw_output: bytes = b'xlsx',
+        report: bytes = b'{"buffer_spill_files": 1}',
+    ):
+        self.version = version
+        self.raw_output = raw_output
+        self.report = report
+        self.buffers = []
+        self.freed = []
+        self.payloads = []
+        self.paths = []
+        self._callbacks = []
+        self._prototypes = {}
+        self.bind('FreeCPointer', None, [ctypes.c_void_p, ctypes.c_int64], self._free)
+        self.bind('Export', ctypes.c_void_p, [ctypes.c_char_p, ctypes.c_int64], self._export)
+        if version >= 2:
+            self.bind('GetABIVersion', ctypes.c_int64, [], lambda: version)
+            self.bind(
+                'ExportV2',
+                ctypes.c_void_p,
+                [ctypes.c_void_p, ctypes.c_size_t, ctypes.c_int64, c_size_tp, c_char_pp],
+                self._export_v2,
+            )
+            self.bind(
+                'ExportToFileV2',
+                ctypes.c_int64,
+                [ctypes.c_void_p, ctypes.c_size_t, ctypes.c_char_p, ctypes.c_int64, c_char_pp],
+                self._export_to_file_v2,
+            )
+        if version >= 3:
+            self.bind(
+                'ExportV3',
+                ctypes.c_void_p,
+                [ctypes.c_void_p, ctypes.c_size_t, c_size_tp, c_char_pp, c_char_pp],
+                self._export_v3,
+            )
+            self.bind(
+                'ExportToFileV3',
+                ctypes.c_int64,
+                [ctypes.c_void_p, ctypes.c_size_t, ctypes.c_char_p, c_char_pp, c_char_pp],
+                self._export_to_file_v3,
+            )
+
+    def bind(self, name: str, restype, argtypes, implementation) -> None:
+        """Export ``implementation`` as ``name`` with the given C prototype."""
+        self._prototypes[name] = (restype, argtypes)
+        callback = ctypes.CFUNCTYPE(restype, *argtypes)(implementation)
+        self._callbacks.append(callback)
+        # A function pointer of the callback's address, like an attribute of
+        # ctypes.CDLL, carries the argtypes its caller sets.
+        address = ctypes.cast(callback, ctypes.c_void_p).value
+        setattr(self, name, ctypes.CFUNCTYPE(None)(address))
+
+    def replace(self, name: str, implementation) -> None:
+        """Swap the implementation of a bound export, keeping its prototype."""
+        self.bind(name, *self._prototypes[name], implementation)
+
+    def keep_buffer(self, data: bytes) -> int:
+        """Return the address of a C copy of ``data`` that the fake owns."""
+        buffer = ctypes.create_string_buffer(data)
+        self.buffers.append(buffer)
+        return ctypes.addressof(buffer)
+
+    def set_string(self, pointer, data: bytes) -> None:
+        """Store a C copy of ``data`` in a ``char **`` out-parameter."""
+        ctypes.cast(pointer, ctypes.POINTER(ctypes.c_void_p))[0] = self.keep_buffer(data)
+
+    @staticmethod
+    def read_payload(payload: int, payload_length: int) -> bytes:
+        # Not ctypes.string_at, which some tests patch to fail the client.
+        return bytes((ctypes.c_ubyte * payload_length).from_address(payload))
+
+    def _free(self, pointer, _debug):
+        self.freed.append(pointer)
+
+    def _export(self, payload, _catch_panic):
+        self.payloads.append(payload)
+        return self.keep_buffer(base64.b64encode(self.raw_output))
+
+    def _export_v2(self, payload, payload_length, _catch_panic, output_length, _error):
+        self.payloads.append(self.read_payload(payload, payload_length))
+        output_length[0] = len(self.raw_output)
+        return self.keep_buffer(self.raw_output)
+
+    def _export_to_file_v2(self, payload, payload_length, path, _catch_panic, _error):
+        self.payloads.append(self.read_payload(payload, payload_length))
+        self.paths.append(path)
+        return 0
+
+    def _export_v3(self, payload, payload_length, output_length, error, report):
+        self.set_string(report, self.report)
+        return self._export_v2(payload, payload_length, 1, output_length, error)
+
+    def _export_to_file_v3(self, payload, payload_length, path, error, report):
+        self.set_string(report, self.report)
+        return self._export_to_file_v2(payload, payload_length, path, 1, error)
+
+
+def decode_v2_metadata(payload: bytes):
+    assert payload[:4] == WIRE_MAGIC
+    metadata_length = struct.unpack('>Q', payload[4:12])[0]
+    metadata_end = 12 + metadata_length
+    return msgspec.json.decode(payload[12:metadata_end]), payload[metadata_end:]
+
+
+def zip_entry_map(source) -> dict[str, bytes]:
+    with zipfile.ZipFile(source) as archive:
+        assert archive.testzip() is None
+        return {name: archive.read(name) for name in archive.namelist()}
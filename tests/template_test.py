@@ -0,0 +1,167 @@
+from __future__ import annotations
+
+import ctypes
+
+import msgspec
+import pytest
+
+from pyfastexcel import CustomStyle, Workbook
+
+from .support import FakeNativeLibrary, c_char_pp, decode_v2_metadata, zip_entry_map
+
+
+class TemplateLibrary(FakeNativeLibrary):
+    """Adds the ABI v9 template exports."""
+
+    def __init__(self, *, version: int = 9):
+        super().__init__(version=version)
+        self.templates = {}
+        self.renders = []
+        counts = ctypes.POINTER(ctypes.c_int64)
+        self.bind(
+            'CompileTemplateV2',
+            ctypes.c_int64,
+            [ctypes.c_void_p, ctypes.c_size_t, c_char_pp],
+            self._compile,
+        )
+        self.bind(
+            'RenderTemplateV2',
+            ctypes.c_int64,
+            [
+                ctypes.c_int64,
+                ctypes.c_void_p,
+                ctypes.c_size_t,
+                counts,
+                counts,
+                ctypes.c_size_t,
+                ctypes.c_char_p,
+                c_char_pp,
+                c_char_pp,
+            ],
+            self._render,
+        )
+        self.bind('ReleaseTemplateV2', None, [ctypes.c_int64], self.templates.pop)
+
+    def _compile(self, payload, payload_length, _error):
+        handle = len(self.payloads) + 1
+        self.payloads.append(self.read_payload(payload, payload_length))
+        self.templates[handle] = self.payloads[-1]
+        return handle
+
+    def _render(self, handle, rows, rows_length, counts, offsets, count, path, error, report):
+        if handle not in self.templates:
+            self.set_string(error, b'template handle is not valid')
+            return 1
+        rows = self.read_payload(rows, rows_length)
+        self.renders.append((handle, rows, counts[:count], offsets[:count], path))
+        self.set_string(report, self.report)
+        return 0
+
+
+def test_compiled_template_sends_only_new_rows(monkeypatch, tmp_path):
+    from pyfastexcel import Template
+
+    library = TemplateLibrary(version=9)
+    workbook = Workbook()
+    monkeypatch.setattr(workbook, '_read_lib', lambda _path: library)
+    workbook['Sheet1']['A1'] = ('Header', CustomStyle(font_bold=True))
+    workbook.create_sheet('Plain', plain_data=[])
+
+    with workbook.compile_template() as template:
+        assert isinstance(template, Template)
+        metadata, template_rows = decode_v2_metadata(library.payloads[0])
+        assert metadata['_pyfastexcel_wire']['row_counts'] == [1, 0]
+        style_ids = {name: index for index, name in enumerate(metadata['style'])}
+
+        report = template.render(
+            {'Sheet1': [[1, ('x', 'DEFAULT_STYLE')]], 'Plain': [['a', 2.5], ['b', None]]},
+            tmp_path / 'render.xlsx',
+            return_report=True,
+        )
+        handle, rows, counts, offsets, path = library.renders[0]
+        assert handle in library.templates
+        assert counts == [1, 2] and path == bytes(tmp_path / 'render.xlsx')
+        decoder = msgspec.msgpack.Decoder()
+        assert decoder.decode(rows[: offsets[1]]) == [
+            [1, style_ids['DEFAULT_STYLE']],
+            ['x', style_ids['DEFAULT_STYLE']],
+        ]
+        assert len(rows) < len(template_rows) + len(library.payloads[0])
+        assert report.wire == 'pfx2' and report.payload_bytes == len(rows)
+        assert report.native == {'buffer_spill_files': 1}
+
+        template.render({}, str(tmp_path / 'empty.xlsx'))
+        assert library.renders[1][2] == [0, 0]
+        with pytest.raises(KeyError, match='Missing Sheet Does Not Exist'):
+            template.render({'Missing': []}, str(tmp_path / 'missing.xlsx'))
+        with pytest.raises(ValueError, match="sheet 'Plain', row 1, column 1"):
+            template.render({'Plain': [[1 << 70]]}, str(tmp_path / 'large.xlsx'))
+        with pytest.raises(ValueError, match='not registered'):
+            template.render({'Sheet1': [[('x', 'unknown')]]}, str(tmp_path / 'style.xlsx'))
+
+    assert template.closed and library.templates == {}
+    template.close()
+    with pytest.raises(RuntimeError, match='closed'):
+        template.render({}, str(tmp_path / 'closed.xlsx'))
+
+
+def test_template_render_reports_do_not_share_client_state(monkeypatch, tmp_path):
+    library = TemplateLibrary(version=9)
+    workbook = Workbook()
+    monkeypatch.setattr(workbook, '_read_lib', lambda _path: library)
+    workbook['Sheet1']['A1'] = 'Header'
+    render = library._render
+    reports = []
+
+    def interleaved_render(handle, *args):
+        # A second render completes while the first is still inside the
+        # native call, as with renders running on two threads.
+        library.report = b'{"render": %d}' % len(reports)
+        if not reports:
+            reports.append(None)
+            reports[0] = template.render({}, tmp_path / 'inner.xlsx', return_report=True)
+            library.report = b'{"render": 0}'
+        return render(handle, *args)
+
+    library.replace('RenderTemplateV2', interleaved_render)
+    with workbook.compile_template() as template:
+        outer = template.render({}, tmp_path / 'outer.xlsx', return_report=True)
+        assert reports[0].native == {'render': 1}
+        assert outer.native == {'render': 0}
+        assert template._native.last_report is None
+
+
+def test_compile_template_needs_template_support_and_the_pfx2_wire(monkeypatch):
+    workbook = Workbook()
+    monkeypatch.setattr(workbook, '_read_lib', lambda _path: TemplateLibrary(version=8))
+    with pytest.raises(RuntimeError, match='Templates are not supported'):
+        workbook.compile_template()
+
+    monkeypatch.setattr(workbook, '_read_lib', lambda _path: TemplateLibrary(version=9))
+    workbook['Sheet1']['A1'] = 1 << 70
+    with pytest.raises(ValueError, match='Templates need the PFX2 wire'):
+        workbook.compile_template()
+
+
+def test_real_template_renders_match_a_full_export(tmp_path):
+    def build(rows):
+        workbook = Workbook()
+        workbook['Sheet1']['A1'] = ('Name', CustomStyle(font_bold=True))
+        workbook['Sheet1']['B1'] = ('Value', CustomStyle(font_bold=True))
+        workbook.set_cell_width('Sheet1', 'A', 20)
+        for index, row in enumerate(rows, start=2):
+            workbook['Sheet1'][f'A{index}'] = row[0]
+            workbook['Sheet1'][f'B{index}'] = row[1]
+        return workbook
+
+    rows = [[f'item {index}', index] for index in range(100)]
+    with build([]).compile_template() as template:
+        template.render({'Sheet1': rows}, str(tmp_path / 'template.xlsx'))
+        template.render({'Sheet1': rows[:1]}, str(tmp_path / 'short.xlsx'))
+    build(rows).save(str(tmp_path / 'full.xlsx'))
+
+    rendered = zip_entry_map(tmp_path / 'template.xlsx')
+    full = zip_entry_map(tmp_path / 'full.xlsx')
+    for name in ('xl/worksheets/sheet1.xml', 'xl/styles.xml', 'xl/sharedStrings.xml'):
+        assert rendered.get(name) == full.get(name)
+    assert b'item 1<' not in zip_entry_map(tmp_path / 'short.xlsx')['xl/worksheets/sheet1.xml']
@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import msgspec
+
+from pyfastexcel import Workbook
+
+from .support import FakeNativeLibrary, decode_v2_metadata
+
+
+def test_trace_env_var_merges_python_and_native_spans(monkeypatch, tmp_path):
+    trace_path = tmp_path / 'trace.json'
+    library = FakeNativeLibrary(
+        version=3,
+        report=b'{"build": "sequential", "trace": ['
+        b'{"name": "thread_name", "ph": "M", "tid": 0, "args": {"name": "export"}},'
+        b'{"name": "write archive", "cat": "native", "ph": "X", "ts": 5, "dur": 2, "tid": 0}]}',
+    )
+    workbook = Workbook()
+    workbook.create_sheet('Second')
+    workbook['Sheet1']['A1'] = 'value'
+    monkeypatch.setattr(workbook, '_read_lib', lambda _path: library)
+
+    workbook.save(str(tmp_path / 'untraced.xlsx'))
+    assert not trace_path.exists()
+    metadata, _rows = decode_v2_metadata(library.payloads[-1])
+    assert 'trace' not in metadata.get('export_options', {})
+
+    monkeypatch.setenv('PYFASTEXCEL_TRACE', str(trace_path))
+    # Unchanged sheets reuse their encoded rows; change both to trace them.
+    workbook['Sheet1']['A2'] = 'changed'
+    workbook['Second']['A1'] = 'changed'
+    workbook.read_lib_and_create_excel()
+    metadata, _rows = decode_v2_metadata(library.payloads[-1])
+    assert metadata['export_options']['trace'] is True
+    assert 'trace' not in workbook.native_report
+
+    events = msgspec.json.decode(trace_path.read_bytes())['traceEvents']
+    python_spans = [event for event in events if event['pid'] == 1 and event['ph'] == 'X']
+    assert {event['name'] for event in python_spans} == {
+        '_build_export_data',
+        '_create_style',
+        'encode_payload',
+        'encode_v2_payload',
+        'native export',
+    }
+    encoded_sheets = [
+        event['args']['sheet'] for event in python_spans if event['name'] == 'encode_v2_payload'
+    ]
+    assert encoded_sheets == ['Sheet1', 'Second']
+    assert all(event['ts'] > 1e15 and event['dur'] >= 0 for event in python_spans)
+    native_events = [event for event in events if event['pid'] == 2]
+    assert [event['name'] for event in native_events] == [
+        'process_name',
+        'thread_name',
+        'write archive',
+    ]
+    process_names = {
+        event['pid']: event['args']['name'] for event in events if event['name'] == 'process_name'
+    }
+    assert process_names == {1: 'pyfastexcel (Python)', 2: 'pyfastexcel native (Go)'}
+
+    monkeypatch.setenv('PYFASTEXCEL_TRACE', str(tmp_path / 'missing' / 'trace.json'))
+    assert workbook.read_lib_and_create_excel() == b'xlsx'
+
+
+def test_real_trace_covers_native_sheet_spans(monkeypatch, tmp_path):
+    trace_path = tmp_path / 'trace.json'
+    monkeypatch.setenv('PYFASTEXCEL_TRACE', str(trace_path))
+    workbook = Workbook()
+    workbook.create_sheet('Second')
+    for row in range(1000):
+        workbook['Sheet1'][row] = [row, f'value {row}']
+        workbook['Second'][row] = [f'second {row}']
+
+    workbook.save(str(tmp_path / 'traced.xlsx'))
+
+    events = msgspec.json.decode(trace_path.read_bytes())['traceEvents']
+    native_spans = [event for event in events if event['pid'] == 2 and event['ph'] == 'X']
+    names = {event['name'] for event in native_spans}
+    assert {'parse metadata', 'build workbook', 'write sheet', 'write archive'} <= names
+    written = {event['args']['sheet'] for event in native_spans if event['name'] == 'write sheet'}
+    assert written == {'Sheet1', 'Second'}
+    python_start = min(event['ts'] for event in events if event['pid'] == 1 and event['ph'] == 'X')
+    assert min(event['ts'] for event in native_spans) >= python_start